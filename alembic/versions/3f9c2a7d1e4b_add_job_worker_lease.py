@@ -0,0 +1,38 @@
+"""Add job parameters and worker lease columns
+
+Revision ID: 3f9c2a7d1e4b
+Revises: b648752192e5
+Create Date: 2025-11-28 09:42:11.512309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[import-not-found]
+import sqlalchemy as sa  # type: ignore[import-not-found]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1e4b'  # type: ignore[assignment]
+down_revision: Union[str, Sequence[str], None] = 'b648752192e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('processing_jobs', sa.Column('parameters', sa.JSON(), nullable=True))
+    op.add_column('processing_jobs', sa.Column('worker_id', sa.String(length=100), nullable=True))
+    op.add_column('processing_jobs', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('processing_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    op.add_column('processing_jobs', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.create_index('idx_job_status_lease', 'processing_jobs', ['status', 'lease_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_status_lease', table_name='processing_jobs')
+    op.drop_column('processing_jobs', 'lease_expires_at')
+    op.drop_column('processing_jobs', 'heartbeat_at')
+    op.drop_column('processing_jobs', 'attempts')
+    op.drop_column('processing_jobs', 'worker_id')
+    op.drop_column('processing_jobs', 'parameters')
@@ -0,0 +1,45 @@
+"""Add file_blobs table for upload deduplication
+
+Revision ID: 5a8d3e6f2c17
+Revises: 7c1e5d2b8a90
+Create Date: 2025-12-02 10:18:44.631502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[import-not-found]
+import sqlalchemy as sa  # type: ignore[import-not-found]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8d3e6f2c17'  # type: ignore[assignment]
+down_revision: Union[str, Sequence[str], None] = '7c1e5d2b8a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_blobs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('file_type', sa.String(length=10), nullable=False),
+    sa.Column('storage_path', sa.Text(), nullable=False),
+    sa.Column('job_id', sa.String(length=100), nullable=True),
+    sa.Column('fcs_result_id', sa.Integer(), nullable=True),
+    sa.Column('nta_result_id', sa.Integer(), nullable=True),
+    sa.Column('upload_count', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_uploaded_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['fcs_result_id'], ['fcs_results.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['nta_result_id'], ['nta_results.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_file_blobs_sha256'), 'file_blobs', ['sha256'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_file_blobs_sha256'), table_name='file_blobs')
+    op.drop_table('file_blobs')
@@ -0,0 +1,29 @@
+"""Add keyset pagination indexes for samples and jobs
+
+Revision ID: 7c1e5d2b8a90
+Revises: 3f9c2a7d1e4b
+Create Date: 2025-11-28 14:05:37.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[import-not-found]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5d2b8a90'  # type: ignore[assignment]
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1e4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_sample_upload_id', 'samples', ['upload_timestamp', 'id'], unique=False)
+    op.create_index('idx_job_created_id', 'processing_jobs', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_created_id', table_name='processing_jobs')
+    op.drop_index('idx_sample_upload_id', table_name='samples')
@@ -13,12 +13,23 @@ Author: CRMIT Team
 Date: November 27, 2025
 """
 
-from typing import Optional, Dict, List, Any, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, BinaryIO, Iterator, Tuple, Union
+import hashlib
+import json
+import pyarrow as pa
 import requests
 from pathlib import Path
 import os
 from loguru import logger
 
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Files above this size are sent as resumable chunked uploads (the
+# server's multipart limit, max_upload_size_mb, defaults to 100 MB)
+CHUNKED_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
 
 class CRMITAPIClient:
     """Client for CRMIT Backend API."""
@@ -33,9 +44,45 @@ class CRMITAPIClient:
         self.base_url = base_url.rstrip('/')
         self.api_base = f"{self.base_url}/api/v1"
         self.timeout = 30  # seconds
+        self._etag_cache: Dict[str, tuple] = {}  # url -> (ETag, parsed body)
         
         logger.info(f"🔌 API Client initialized: {self.base_url}")
     
+    def _get_json_conditional(self, url: str) -> Dict[str, Any]:
+        """
+        GET a JSON endpoint, revalidating the last response with If-None-Match.
+        
+        Unchanged data comes back as 304 with no body, so dashboard
+        refreshes skip both the download and the JSON parsing.
+        """
+        cached = self._etag_cache.get(url)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        response = requests.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        data = response.json()
+        if response.headers.get('ETag'):
+            self._etag_cache[url] = (response.headers['ETag'], data)
+        return data
+    
+    def _get_arrow(self, url: str, params: Optional[Dict[str, Any]] = None) -> pa.Table:
+        """
+        GET an endpoint as an Arrow IPC stream.
+        
+        The table's buffers point into the response body (no copy, no
+        JSON parsing). Compression is disabled: Arrow data is binary and
+        gzip would only cost CPU on both ends.
+        """
+        response = requests.get(
+            url,
+            params=params,
+            headers={'Accept': ARROW_STREAM, 'Accept-Encoding': 'identity'},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return pa.ipc.open_stream(pa.py_buffer(response.content)).read_all()
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Check if backend API is responding.
@@ -143,12 +190,7 @@ class CRMITAPIClient:
             }
         """
         try:
-            response = requests.get(
-                f"{self.api_base}/samples/{sample_id}",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get_json_conditional(f"{self.api_base}/samples/{sample_id}")
         except requests.RequestException as e:
             logger.error(f"❌ Failed to get sample {sample_id}: {e}")
             raise
@@ -187,11 +229,17 @@ class CRMITAPIClient:
         preparation_method: Optional[str] = None,
         operator: Optional[str] = None,
         notes: Optional[str] = None,
-        experiment_params: Optional[Dict[str, Any]] = None
+        experiment_params: Optional[Dict[str, Any]] = None,
+        chunked: Optional[bool] = None,
+        parallel: int = 4,
+        upload_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Upload FCS file with metadata and experiment parameters.
         
+        Files above CHUNKED_UPLOAD_THRESHOLD (or with chunked=True) go
+        through a resumable upload session (see upload_chunked).
+        
         Args:
             file_path: Path to .fcs file
             sample_id: Unique identifier for this sample
@@ -209,6 +257,10 @@ class CRMITAPIClient:
                 - staining_protocol: Type of staining used
                 - dilution_factor: Dilution ratio (e.g., "1:100")
                 - instrument_settings: Any special instrument settings
+            chunked: Force (True) or disable (False) the chunked upload;
+                default: by file size
+            parallel: Concurrent chunk uploads for chunked uploads
+            upload_id: Session of an interrupted chunked upload to resume
             
         Returns:
             Upload confirmation with sample_id, file_path, processing_status
@@ -235,43 +287,48 @@ class CRMITAPIClient:
             }
         """
         try:
-            # Prepare file for upload
+            # Prepare form data
+            data = {'sample_id': sample_id}
+            if treatment:
+                data['treatment'] = treatment
+            if concentration_ug is not None:
+                data['concentration_ug'] = str(concentration_ug)
+            if preparation_method:
+                data['preparation_method'] = preparation_method
+            if operator:
+                data['operator'] = operator
+            if notes:
+                data['notes'] = notes
+            
+            # Add experiment parameters (flatten for form data)
+            if experiment_params:
+                if experiment_params.get('temperature_celsius') is not None:
+                    data['temperature_celsius'] = str(experiment_params['temperature_celsius'])
+                if experiment_params.get('substrate'):
+                    data['substrate'] = experiment_params['substrate']
+                if experiment_params.get('volume_ul') is not None:
+                    data['volume_ul'] = str(experiment_params['volume_ul'])
+                if experiment_params.get('ph') is not None:
+                    data['ph'] = str(experiment_params['ph'])
+                if experiment_params.get('incubation_time_min') is not None:
+                    data['incubation_time_min'] = str(experiment_params['incubation_time_min'])
+                if experiment_params.get('staining_protocol'):
+                    data['staining_protocol'] = experiment_params['staining_protocol']
+                if experiment_params.get('dilution_factor'):
+                    data['dilution_factor'] = experiment_params['dilution_factor']
+                if experiment_params.get('instrument_settings'):
+                    data['instrument_settings'] = experiment_params['instrument_settings']
+            
+            if chunked is None:
+                chunked = os.path.getsize(file_path) > CHUNKED_UPLOAD_THRESHOLD
+            if chunked:
+                result = self.upload_chunked(file_path, data, parallel=parallel, upload_id=upload_id)
+                logger.success(f"✅ Uploaded FCS file: {sample_id}")
+                return result
+            
+            # Upload
             with open(file_path, 'rb') as f:
                 files = {'file': (Path(file_path).name, f, 'application/octet-stream')}
-                
-                # Prepare form data
-                data = {'sample_id': sample_id}
-                if treatment:
-                    data['treatment'] = treatment
-                if concentration_ug is not None:
-                    data['concentration_ug'] = str(concentration_ug)
-                if preparation_method:
-                    data['preparation_method'] = preparation_method
-                if operator:
-                    data['operator'] = operator
-                if notes:
-                    data['notes'] = notes
-                
-                # Add experiment parameters (flatten for form data)
-                if experiment_params:
-                    if experiment_params.get('temperature_celsius') is not None:
-                        data['temperature_celsius'] = str(experiment_params['temperature_celsius'])
-                    if experiment_params.get('substrate'):
-                        data['substrate'] = experiment_params['substrate']
-                    if experiment_params.get('volume_ul') is not None:
-                        data['volume_ul'] = str(experiment_params['volume_ul'])
-                    if experiment_params.get('ph') is not None:
-                        data['ph'] = str(experiment_params['ph'])
-                    if experiment_params.get('incubation_time_min') is not None:
-                        data['incubation_time_min'] = str(experiment_params['incubation_time_min'])
-                    if experiment_params.get('staining_protocol'):
-                        data['staining_protocol'] = experiment_params['staining_protocol']
-                    if experiment_params.get('dilution_factor'):
-                        data['dilution_factor'] = experiment_params['dilution_factor']
-                    if experiment_params.get('instrument_settings'):
-                        data['instrument_settings'] = experiment_params['instrument_settings']
-                
-                # Upload
                 response = requests.post(
                     f"{self.api_base}/upload/fcs",
                     files=files,
@@ -290,6 +347,104 @@ class CRMITAPIClient:
             logger.error(f"❌ FCS upload failed: {e}")
             raise
     
+    def upload_chunked(
+        self,
+        file_path: str,
+        data: Dict[str, str],
+        parallel: int = 4,
+        upload_id: Optional[str] = None,
+        max_attempts: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Upload a file through a resumable upload session.
+        
+        The file is split into the server's chunk size and the chunks are
+        PUT from `parallel` threads. Chunks that fail are retried (up to
+        max_attempts rounds, asking the server which ranges are still
+        missing); the session is then finalized, which verifies the
+        SHA-256 and starts processing.
+        
+        Args:
+            file_path: File to upload (.fcs, .txt or .csv)
+            data: Form metadata, as for the multipart upload endpoints
+            parallel: Concurrent chunk uploads
+            upload_id: Existing session to resume instead of starting one
+            max_attempts: Rounds of uploading the missing ranges
+            
+        Returns:
+            Upload confirmation (same as the multipart endpoints)
+        """
+        path = Path(file_path)
+        size = path.stat().st_size
+        sessions_url = f"{self.api_base}/upload/sessions"
+        
+        if upload_id:
+            response = requests.get(f"{sessions_url}/{upload_id}", timeout=self.timeout)
+            response.raise_for_status()
+            session = response.json()
+            logger.info(f"🔁 Resuming upload {upload_id}: {session['received_bytes']}/{size} bytes received")
+        else:
+            digest = hashlib.sha256()
+            with path.open('rb') as f:
+                while block := f.read(HASH_BLOCK_SIZE):
+                    digest.update(block)
+            response = requests.post(
+                sessions_url,
+                data={**data, 'filename': path.name, 'size_bytes': str(size), 'sha256': digest.hexdigest()},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            session = response.json()
+            upload_id = session['upload_id']
+            logger.info(f"📦 Upload session {upload_id}: {path.name} ({size / 1024 / 1024:.1f}MB)")
+        
+        def put_range(byte_range: Tuple[int, int]) -> Optional[Exception]:
+            """PUT one range; returns the error instead of raising it."""
+            start, end = byte_range
+            try:
+                with path.open('rb') as f:
+                    f.seek(start)
+                    body = f.read(end - start + 1)
+                response = requests.put(
+                    f"{sessions_url}/{upload_id}",
+                    data=body,
+                    headers={
+                        'Content-Range': f"bytes {start}-{end}/{size}",
+                        'X-Content-SHA256': hashlib.sha256(body).hexdigest(),
+                        'Content-Type': 'application/octet-stream',
+                    },
+                    timeout=(self.timeout, 300)
+                )
+                response.raise_for_status()
+                return None
+            except (OSError, requests.RequestException) as e:
+                return e
+        
+        chunk_size = session['chunk_size']
+        missing = session['missing']
+        for attempt in range(max_attempts):
+            ranges = [
+                (start, min(start + chunk_size, end + 1) - 1)
+                for start, end in missing
+                for start in range(start, end + 1, chunk_size)
+            ]
+            with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+                errors = [e for e in executor.map(put_range, ranges) if e is not None]
+            if not errors:
+                break
+            logger.warning(f"⚠️ {len(errors)} chunks failed ({errors[0]}), retrying missing ranges")
+            response = requests.get(f"{sessions_url}/{upload_id}", timeout=self.timeout)
+            response.raise_for_status()
+            missing = response.json()['missing']
+        else:
+            raise requests.RequestException(
+                f"Chunked upload {upload_id} incomplete after {max_attempts} attempts; resume with upload_id"
+            )
+        
+        response = requests.post(f"{sessions_url}/{upload_id}/finalize", timeout=(self.timeout, 600))
+        response.raise_for_status()
+        return response.json()
+    
     def upload_nta(
         self,
         file_path: str,
@@ -353,46 +508,185 @@ class CRMITAPIClient:
     # Results Retrieval
     # =========================================================================
     
-    def get_fcs_results(self, sample_id: int) -> Dict[str, Any]:
+    def get_fcs_results(self, sample_id: int, as_arrow: bool = False) -> Union[Dict[str, Any], pa.Table]:
         """
         Get FCS analysis results for a sample.
         
         Args:
             sample_id: Database ID of the sample
+            as_arrow: Return a pyarrow Table (one row per result)
             
         Returns:
             FCS results including statistics, gating, etc.
         """
         try:
+            url = f"{self.api_base}/samples/{sample_id}/fcs"
+            if as_arrow:
+                return self._get_arrow(url)
+            return self._get_json_conditional(url)
+        except requests.RequestException as e:
+            logger.error(f"❌ Failed to get FCS results for sample {sample_id}: {e}")
+            raise
+    
+    def get_nta_results(self, sample_id: int, as_arrow: bool = False) -> Union[Dict[str, Any], pa.Table]:
+        """
+        Get NTA analysis results for a sample.
+        
+        Args:
+            sample_id: Database ID of the sample
+            as_arrow: Return a pyarrow Table (one row per result)
+            
+        Returns:
+            NTA results including D10, D50, D90, concentration, etc.
+        """
+        try:
+            url = f"{self.api_base}/samples/{sample_id}/nta"
+            if as_arrow:
+                return self._get_arrow(url)
+            return self._get_json_conditional(url)
+        except requests.RequestException as e:
+            logger.error(f"❌ Failed to get NTA results for sample {sample_id}: {e}")
+            raise
+    
+    # =========================================================================
+    # Event Views (server-side binning)
+    # =========================================================================
+    
+    def get_events(
+        self,
+        sample_id: str,
+        columns: Optional[List[str]] = None,
+        gates: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        result_id: Optional[int] = None
+    ) -> pa.Table:
+        """
+        Get event-level data as a pyarrow Table (Arrow IPC stream).
+        
+        Args:
+            sample_id: Sample identifier
+            columns: Channels to fetch (default: all)
+            gates: Gates as "CHANNEL:MIN:MAX" strings
+            limit: Maximum number of events (default: all)
+            result_id: FCS result ID (default: latest)
+            
+        Returns:
+            pyarrow Table with one column per channel
+        """
+        try:
+            query: Dict[str, Any] = {}
+            if columns:
+                query['columns'] = columns
+            if gates:
+                query['gate'] = gates
+            if limit is not None:
+                query['limit'] = limit
+            if result_id is not None:
+                query['result_id'] = result_id
+            return self._get_arrow(f"{self.api_base}/samples/{sample_id}/events", query)
+        except requests.RequestException as e:
+            logger.error(f"❌ Failed to get events for sample {sample_id}: {e}")
+            raise
+    
+    def get_event_histogram(
+        self,
+        sample_id: str,
+        channel: str,
+        bins: int = 256,
+        transform: str = "linear",
+        edges: Optional[List[float]] = None,
+        gates: Optional[List[str]] = None,
+        as_arrow: bool = False,
+        **params: Any
+    ) -> Union[Dict[str, Any], pa.Table]:
+        """
+        Get a binned histogram of one channel, computed by the API.
+        
+        Args:
+            sample_id: Sample identifier (e.g. "P5_F10_CD81")
+            channel: Channel name (e.g. "VFSC-H")
+            bins: Number of equal-width bins
+            transform: "linear", "log" or "arcsinh"
+            edges: Explicit bin edges (transformed scale); overrides bins
+            gates: Gates as "CHANNEL:MIN:MAX" strings
+            as_arrow: Return a pyarrow Table (edge_low, edge_high, count;
+                totals in schema metadata) instead of a dictionary
+            **params: Other query parameters (range_min, range_max, cofactor, result_id)
+            
+        Returns:
+            Dictionary with 'edges', 'counts', 'gated_events', 'binned_events'
+        """
+        try:
+            query: Dict[str, Any] = {'channel': channel, 'bins': bins, 'transform': transform, **params}
+            if edges:
+                query['edges'] = ",".join(str(edge) for edge in edges)
+            if gates:
+                query['gate'] = gates
+            
+            url = f"{self.api_base}/samples/{sample_id}/events/histogram"
+            if as_arrow:
+                return self._get_arrow(url, query)
             response = requests.get(
-                f"{self.api_base}/samples/{sample_id}/fcs",
+                url,
+                params=query,
                 timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            logger.error(f"❌ Failed to get FCS results for sample {sample_id}: {e}")
+            logger.error(f"❌ Failed to get histogram for sample {sample_id}: {e}")
             raise
     
-    def get_nta_results(self, sample_id: int) -> Dict[str, Any]:
+    def get_event_density2d(
+        self,
+        sample_id: str,
+        x_channel: str,
+        y_channel: str,
+        bins_x: int = 64,
+        bins_y: int = 64,
+        transform: str = "linear",
+        gates: Optional[List[str]] = None,
+        as_arrow: bool = False,
+        **params: Any
+    ) -> Union[Dict[str, Any], pa.Table]:
         """
-        Get NTA analysis results for a sample.
+        Get a binned 2D density of a channel pair, computed by the API.
         
         Args:
-            sample_id: Database ID of the sample
+            sample_id: Sample identifier
+            x_channel: X channel name
+            y_channel: Y channel name
+            bins_x: Number of X bins
+            bins_y: Number of Y bins
+            transform: "linear", "log" or "arcsinh" (both axes)
+            gates: Gates as "CHANNEL:MIN:MAX" strings
+            as_arrow: Return a pyarrow Table with one row per cell
+                (x_low, x_high, y_low, y_high, count) instead of a dictionary
+            **params: Other query parameters (x_min, x_max, y_min, y_max, cofactor, result_id)
             
         Returns:
-            NTA results including D10, D50, D90, concentration, etc.
+            Dictionary with 'x_edges', 'y_edges', 'counts' (x by y)
         """
         try:
+            query: Dict[str, Any] = {
+                'x_channel': x_channel, 'y_channel': y_channel,
+                'bins_x': bins_x, 'bins_y': bins_y, 'transform': transform, **params,
+            }
+            if gates:
+                query['gate'] = gates
+            
+            url = f"{self.api_base}/samples/{sample_id}/events/density2d"
+            if as_arrow:
+                return self._get_arrow(url, query)
             response = requests.get(
-                f"{self.api_base}/samples/{sample_id}/nta",
+                url,
+                params=query,
                 timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            logger.error(f"❌ Failed to get NTA results for sample {sample_id}: {e}")
+            logger.error(f"❌ Failed to get density for sample {sample_id}: {e}")
             raise
     
     # =========================================================================
@@ -453,6 +747,35 @@ class CRMITAPIClient:
             logger.error(f"❌ Failed to get job {job_id}: {e}")
             raise
     
+    def watch_job(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Follow a job's progress via Server-Sent Events instead of polling.
+        
+        Yields the current state first, then every change, and ends after
+        the job completes, fails or is cancelled.
+        
+        Args:
+            job_id: Job UUID
+            
+        Yields:
+            Dictionaries with status, progress_percent, current_step, error_message
+        """
+        try:
+            # Read timeout above the server's keepalive interval (15s)
+            with requests.get(
+                f"{self.api_base}/jobs/{job_id}/events",
+                headers={'Accept': 'text/event-stream', 'Accept-Encoding': 'identity'},
+                stream=True,
+                timeout=(self.timeout, 60)
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if line and line.startswith('data:'):
+                        yield json.loads(line[len('data:'):])
+        except requests.RequestException as e:
+            logger.error(f"❌ Failed to watch job {job_id}: {e}")
+            raise
+    
     def trigger_processing(
         self,
         sample_ids: Optional[List[int]] = None,
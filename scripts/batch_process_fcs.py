@@ -385,8 +385,10 @@ class BatchFCSProcessor:
                 return result
             
             # Step 3: Parse FCS binary data
-            # Returns DataFrame with all events (rows) and channels (columns)
-            data = parser.parse()
+            # Arrow-native: returns a pyarrow Table with all events (rows)
+            # and channels (columns); no pandas copy is made, statistics
+            # and QC below read NumPy views of the Arrow buffers
+            data = parser.parse_arrow()
             
             # Step 4: Extract metadata
             # Gets sample IDs, instrument info, acquisition parameters
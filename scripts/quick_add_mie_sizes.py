@@ -3,6 +3,7 @@ Quick script to add Mie-based particle sizes to FCS parquet files.
 Uses percentile-based FSC normalization for speed.
 """
 
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -10,6 +11,12 @@ from loguru import logger
 import argparse
 from datetime import datetime
 
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsers.parquet_reader import ParquetReader
+
 def add_mie_sizes_fast(df: pd.DataFrame, fsc_channel: str = 'VFSC-H') -> pd.DataFrame:
     """
     Fast particle size estimation using percentile-based normalization.
@@ -88,26 +95,25 @@ def process_file(input_path: Path, output_path: Path, dry_run: bool = False):
     logger.info(f"📂 Processing: {input_path.name}")
     
     try:
-        # Read file
-        df = pd.read_parquet(input_path)
-        logger.info(f"  Events: {len(df):,}")
-        
-        # Find FSC channel
-        fsc_channels = [col for col in df.columns if 'FSC' in col and 'H' in col]
-        if not fsc_channels:
+        # Find FSC channel from the schema, then read only that column
+        fsc_channel = ParquetReader.find_channel(ParquetReader.columns(input_path))
+        if fsc_channel is None:
             logger.error(f"  ❌ No FSC-H channel found!")
-            return {"file": input_path.name, "error": "No FSC channel", "n_events": len(df)}
+            return {"file": input_path.name, "error": "No FSC channel", "n_events": 0}
         
-        fsc_channel = fsc_channels[0]
+        df = ParquetReader.read(input_path, columns=[fsc_channel])
+        logger.info(f"  Events: {len(df):,}")
         logger.info(f"  Using channel: {fsc_channel}")
         
         # Add sizes
         df = add_mie_sizes_fast(df, fsc_channel=fsc_channel)
         
-        # Save
+        # Save: stream the full file through, adding the size columns
         if not dry_run:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            df.to_parquet(output_path, compression='snappy')
+            ParquetReader.write_with_columns(
+                input_path, output_path, df.drop(columns=[fsc_channel]), compression='snappy'
+            )
             logger.info(f"  ✅ Saved to: {output_path}")
         else:
             logger.info(f"  📝 DRY RUN - would save to: {output_path}")
@@ -28,6 +28,7 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.parsers.parquet_reader import ParquetReader
 from src.visualization.fcs_plots import calculate_particle_size
 
 
@@ -58,8 +59,12 @@ def reprocess_file(
     logger.info(f"Processing: {input_file.name}")
     
     try:
-        # Load data
-        df = pd.read_parquet(input_file)
+        # Load only the scatter channel (and any previous sizes); the
+        # remaining columns are streamed through unchanged on save
+        fsc_channel = ParquetReader.find_channel(ParquetReader.columns(input_file), preferred='VFSC-H')
+        if fsc_channel is None:
+            raise KeyError("No FSC-H channel found")
+        df = ParquetReader.read(input_file, columns=[fsc_channel], optional_columns=['particle_size_nm'])
         n_events = len(df)
         
         # Check if already has particle_size_nm
@@ -70,6 +75,7 @@ def reprocess_file(
         # Calculate new sizes with Mie theory
         df = calculate_particle_size(
             df,
+            fsc_channel=fsc_channel,
             use_mie_theory=use_mie,
             calibration_beads=calibration_beads
         )
@@ -96,7 +102,8 @@ def reprocess_file(
         # Save if not dry run
         if not dry_run:
             output_file.parent.mkdir(parents=True, exist_ok=True)
-            df.to_parquet(output_file, index=False)
+            size_columns = [c for c in ('particle_size_nm', 'size_in_calibrated_range') if c in df.columns]
+            ParquetReader.write_with_columns(input_file, output_file, df[size_columns])
             logger.info(f"✅ Saved to: {output_file}")
         else:
             logger.info(f"🔍 DRY RUN - would save to: {output_file}")
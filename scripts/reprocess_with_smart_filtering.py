@@ -48,6 +48,8 @@ import json
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.parsers.parquet_reader import ParquetReader
+
 
 def analyze_fsc_distribution(df: pd.DataFrame, fsc_channel: str = 'VFSC-H') -> Dict:
     """
@@ -503,16 +505,13 @@ def process_single_file(
     logger.info(f"📂 Processing: {input_file.name}")
     
     try:
-        # Step 1: Load data
-        df = pd.read_parquet(input_file)
+        # Step 1: Load data (FSC channel only; other columns are streamed on save)
+        fsc_channel = ParquetReader.find_channel(ParquetReader.columns(input_file))
+        if fsc_channel is None:
+            raise ValueError("No FSC-H channel found in data")
+        df = ParquetReader.read(input_file, columns=[fsc_channel], optional_columns=['particle_size_nm'])
         n_original = len(df)
         logger.info(f"  Loaded: {n_original:,} events")
-        
-        # Find FSC channel
-        fsc_channels = [col for col in df.columns if 'FSC' in col and 'H' in col]
-        if not fsc_channels:
-            raise ValueError("No FSC-H channel found in data")
-        fsc_channel = fsc_channels[0]
         logger.info(f"  Using channel: {fsc_channel}")
         
         # Step 2: Filter outliers (if enabled)
@@ -535,7 +534,13 @@ def process_single_file(
         # Step 5: Save processed data
         if not dry_run:
             output_file.parent.mkdir(parents=True, exist_ok=True)
-            df.to_parquet(output_file, compression='snappy', index=False)
+            # Filtering keeps the original row index, so it doubles as the row mask
+            row_mask = np.zeros(n_original, dtype=bool)
+            row_mask[df.index.to_numpy()] = True
+            ParquetReader.write_with_columns(
+                input_file, output_file, df.drop(columns=[fsc_channel]),
+                row_mask=row_mask, compression='snappy'
+            )
             logger.info(f"  ✅ Saved: {output_file}")
         else:
             logger.info(f"  🔍 DRY RUN - would save to: {output_file}")
@@ -33,11 +33,13 @@ from scipy import stats
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.parsers.parquet_reader import ParquetReader
+
 
 def load_fcs_sizes(fcs_file: Path) -> pd.DataFrame:
     """Load FCS data and extract size statistics."""
     logger.info(f"Loading FCS: {fcs_file.name}")
-    df = pd.read_parquet(fcs_file)
+    df = ParquetReader.read(fcs_file, columns=[], optional_columns=['particle_size_nm'])
     
     if 'particle_size_nm' not in df.columns:
         raise ValueError(f"No particle_size_nm column in {fcs_file.name}")
@@ -62,7 +64,7 @@ def load_fcs_sizes(fcs_file: Path) -> pd.DataFrame:
 def load_nta_sizes(nta_file: Path) -> pd.DataFrame:
     """Load NTA data and extract size statistics."""
     logger.info(f"Loading NTA: {nta_file.name}")
-    df = pd.read_parquet(nta_file)
+    df = ParquetReader.read(nta_file, columns=[], optional_columns=['size_nm', 'diameter_nm'])
     
     # NTA files have size_nm column with particle sizes
     if 'size_nm' in df.columns:
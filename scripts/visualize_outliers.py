@@ -24,6 +24,7 @@ Date: November 19, 2025
 Author: CRM IT Project
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -31,6 +32,12 @@ from pathlib import Path
 from loguru import logger
 import seaborn as sns
 
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsers.parquet_reader import ParquetReader
+
 # Configure plotting style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
@@ -77,8 +84,8 @@ def load_sample_data(data_dir: Path, max_files: int = 5) -> pd.DataFrame:
     dfs = []
     for file_path in files_to_load:
         try:
-            # Load only essential columns to save memory
-            df = pd.read_parquet(file_path, columns=['VFSC-H'])
+            # Load only essential columns (memory-mapped) to save memory
+            df = ParquetReader.read(file_path, columns=['VFSC-H'])
             
             # Add sample identifier (file name without extension)
             df['sample_name'] = file_path.stem
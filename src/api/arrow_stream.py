@@ -0,0 +1,111 @@
+"""
+Arrow IPC Responses
+===================
+
+Content negotiation for data-heavy endpoints.
+
+Clients that send `Accept: application/vnd.apache.arrow.stream` get the
+data as an Arrow IPC stream (schema + record batches) instead of JSON.
+Batches are written as they are produced, so event data goes from the
+Parquet reader to the socket without building Python objects, and the
+client can read the buffers zero-copy with `pyarrow.ipc.open_stream`.
+
+Arrow buffers are already compact binary; clients should request them
+with `Accept-Encoding: identity` so GZipMiddleware does not spend CPU
+on them (CRMITAPIClient does this).
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+from fastapi.responses import StreamingResponse
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def wants_arrow(accept: Optional[str]) -> bool:
+    """
+    Check whether an Accept header asks for an Arrow IPC stream.
+
+    Args:
+        accept: Value of the Accept request header
+    """
+    return bool(accept) and ARROW_STREAM in accept  # type: ignore[operator]
+
+
+class _ChunkSink:
+    """File-like sink collecting the bytes written by an IPC writer."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:  # type: ignore[no-untyped-def]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> Iterator[bytes]:
+        """Yield and forget everything written since the last drain."""
+        if self._chunks:
+            chunk = b"".join(self._chunks)
+            self._chunks = []
+            yield chunk
+
+
+def ipc_stream(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> Iterator[bytes]:
+    """
+    Serialize record batches as an Arrow IPC stream, one chunk per batch.
+
+    Args:
+        schema: Stream schema (written first)
+        batches: Record batches matching the schema (consumed lazily)
+    """
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield from sink.drain()
+        for batch in batches:
+            writer.write_batch(batch)
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def arrow_response(
+    data,  # type: ignore[no-untyped-def]
+    schema: Optional[pa.Schema] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Build an Arrow IPC streaming response.
+
+    The generator is synchronous, so Starlette iterates it in the
+    threadpool and slow Parquet reads never block the event loop.
+
+    Args:
+        data: pa.Table, or an iterable of record batches (requires schema)
+        schema: Schema of the batches (default: the table's schema)
+        metadata: Extra key/value pairs stored in the schema metadata
+            (e.g. totals that would otherwise be JSON fields)
+
+    Returns:
+        StreamingResponse with media type application/vnd.apache.arrow.stream
+    """
+    if isinstance(data, pa.Table):
+        schema = schema or data.schema
+        data = data.to_batches()
+    if schema is None:
+        raise ValueError("schema is required when streaming record batches")
+    if metadata:
+        merged = dict(schema.metadata or {})
+        merged.update({key.encode(): str(value).encode() for key, value in metadata.items()})
+        schema = schema.with_metadata(merged)
+    return StreamingResponse(ipc_stream(schema, data), media_type=ARROW_STREAM)
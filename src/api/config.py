@@ -44,12 +44,28 @@ class Settings(BaseSettings):
     db_echo: bool = False  # Log SQL queries
     db_pool_size: int = 10
     db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0  # Wait for a free connection before erroring
+    db_pool_recycle_seconds: int = 1800  # Replace connections older than this
+    db_pool_pre_ping: bool = True  # Test connections on checkout
+    db_use_null_pool: bool = False  # No pooling (tests only)
+    status_cache_ttl_seconds: float = 5.0  # /status sample/job counters cache
     
     # File Storage
     upload_dir: Path = Path("data/uploads")
     parquet_dir: Path = Path("data/parquet")
     temp_dir: Path = Path("data/temp")
     max_upload_size_mb: int = 100
+    upload_chunk_size_kb: int = 1024  # Streaming write/hash chunk size
+    batch_upload_concurrency: int = 4  # Files saved/queued in parallel by /upload/batch
+    batch_upload_max_file_mb: int = 64  # Per-file budget in /upload/batch (parse memory grows with size); larger files fail, upload them singly
+    upload_session_max_size_mb: int = 51200  # Resumable (chunked) uploads: total file size limit
+    upload_session_chunk_size_mb: int = 16  # Largest range accepted per chunk PUT
+    upload_session_ttl_hours: float = 24.0  # Unfinished sessions are removed after this
+    event_query_cache_size: int = 128  # Cached histogram/density results
+    event_json_default_limit: int = 10_000  # Raw events per JSON response (default)
+    event_json_max_limit: int = 100_000  # Raw events per JSON response (max; use Arrow for more)
+    response_cache_max_mb: int = 64  # Cached sample/result JSON (per process)
+    response_cache_ttl_seconds: float = 60.0  # Bounds staleness from writes in other processes
     
     # CORS
     cors_origins: str = "http://localhost:3000,http://localhost:5173,http://localhost:8501"
@@ -62,6 +78,11 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
     
+    def create_directories(self) -> None:
+        """Create the upload, Parquet and temp directories (at startup, not on import)."""
+        for directory in (self.upload_dir, self.parquet_dir, self.temp_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+    
     # Security
     secret_key: str = "CHANGE_THIS_IN_PRODUCTION_USE_SECURE_RANDOM_KEY"
     access_token_expire_minutes: int = 30
@@ -70,6 +91,22 @@ class Settings(BaseSettings):
     # Processing
     max_workers: int = 4
     task_timeout_seconds: int = 300
+    worker_warm_up: bool = True  # Spawn worker processes and import parsers/physics at pool start
+    
+    # FCS gating (upload pipeline and backfill)
+    fcs_gate_mad_multiplier: float = 3.0  # Positive / doublet gates: median + k × robust SD (1.4826 × MAD)
+    fcs_marker_channel: str = "B531-H"  # Stain channel of the marker named in the filename (no $PnS keyword)
+    fcs_debris_max_size_nm: float = 30.0  # Sized events below this count as debris
+    
+    # Job Runner (claims pending processing_jobs rows)
+    run_worker_in_api: bool = True  # Set False when running dedicated `python -m src.worker` processes
+    job_poll_interval_seconds: float = 2.0
+    job_lease_seconds: int = 60  # Lease renewed by heartbeats; expired jobs are requeued
+    job_max_attempts: int = 3
+    job_events_refresh_seconds: float = 5.0  # SSE: shared DB re-read per job when no event arrived
+    job_events_keepalive_seconds: float = 15.0  # SSE: comment line to keep proxies from closing idle streams
+    job_events_queue_size: int = 16  # SSE: buffered snapshots per client
+    job_progress_flush_ms: int = 500  # Progress written to the DB at most this often (coalesced)
     
     # Quality Control
     qc_min_events_fcs: int = 1000
@@ -96,10 +133,3 @@ def get_settings() -> Settings:
         print(settings.database_url)
     """
     return Settings()
-
-
-# Create directories on module import
-settings = get_settings()
-settings.upload_dir.mkdir(parents=True, exist_ok=True)
-settings.parquet_dir.mkdir(parents=True, exist_ok=True)
-settings.temp_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,162 @@
+"""
+Job Event Broker
+================
+
+In-process publish/subscribe for processing job state, feeding the
+`GET /jobs/{job_id}/events` Server-Sent Events stream.
+
+The CRUD functions that change a job (update_job_progress,
+update_job_status, claim_next_job) publish a snapshot after their
+commit; every subscriber of that job receives it from memory, so any
+number of waiting clients adds no database load.
+
+Worker progress goes through ProgressReporter (src/worker/progress.py),
+which publishes every update here immediately but writes the database
+only every `job_progress_flush_ms`.
+
+Subscribers get a small bounded queue. A slow client that falls behind
+loses the oldest snapshots, never the newest: each snapshot is the full
+job state, so only the latest one matters.
+
+Jobs run by a runner in another process (`python -m src.worker`) do not
+publish here; the SSE endpoint covers them with one shared DB refresh
+per job every `job_events_refresh_seconds` (see claim_refresh()).
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+import asyncio
+import time
+
+from src.api.config import get_settings
+from src.database.crud import add_job_listener
+
+settings = get_settings()
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def job_snapshot(job) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """
+    Public state of a ProcessingJob, as sent to subscribers.
+
+    Args:
+        job: ProcessingJob instance
+    """
+    completed = getattr(job, 'completed_at', None)
+    return {
+        "job_id": str(job.job_id),
+        "status": job.status,
+        "progress_percent": job.progress_percent,
+        "current_step": job.current_step,
+        "error_message": getattr(job, 'error_message', None),
+        "completed_at": completed.isoformat() if completed else None,
+    }
+
+
+class JobEventBroker:
+    """
+    Fan-out of job snapshots to subscribers, keyed by job ID.
+
+    Usage:
+        async with broker.subscribe(job_id) as queue:
+            snapshot = await queue.get()
+    """
+
+    def __init__(self, queue_size: int = 16, history_size: int = 1024):
+        """
+        Initialize broker.
+
+        Args:
+            queue_size: Pending snapshots per subscriber before the oldest is dropped
+            history_size: Jobs whose latest snapshot is remembered
+        """
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._latest: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._refreshed: Dict[str, float] = {}
+
+    def publish(self, job_id: str, snapshot: Dict[str, Any]) -> None:
+        """Remember a job's latest state and deliver it to its subscribers."""
+        self._latest[job_id] = snapshot
+        self._latest.move_to_end(job_id)
+        while len(self._latest) > self.history_size:
+            self._latest.popitem(last=False)
+
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    def latest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Most recently published snapshot of a job, if any."""
+        return self._latest.get(job_id)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Receive snapshots of one job while the context is open."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[job_id].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+                    self._refreshed.pop(job_id, None)
+
+    def claim_refresh(self, job_id: str, interval: float) -> bool:
+        """
+        Elect one subscriber to re-read a job from the database.
+
+        Returns True at most once per `interval` seconds per job, so the
+        refresh cost does not grow with the number of subscribers.
+        """
+        now = time.monotonic()
+        if now - self._refreshed.get(job_id, 0.0) < interval:
+            return False
+        self._refreshed[job_id] = now
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Subscriber counts for /status."""
+        return {
+            "jobs_watched": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+
+# ============================================================================
+# Global Broker
+# ============================================================================
+
+_broker: Optional[JobEventBroker] = None
+
+
+def get_job_event_broker() -> JobEventBroker:
+    """
+    Get or create the global job event broker.
+
+    Returns:
+        JobEventBroker instance
+    """
+    global _broker
+    if _broker is None:
+        _broker = JobEventBroker(queue_size=settings.job_events_queue_size)
+    return _broker
+
+
+def publish_job(job) -> None:  # type: ignore[no-untyped-def]
+    """Publish a ProcessingJob's current state to its subscribers."""
+    get_job_event_broker().publish(str(job.job_id), job_snapshot(job))
+
+
+# Published after every job write made through src/database/crud.py
+add_job_listener(publish_job)
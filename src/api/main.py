@@ -7,12 +7,17 @@ CRMIT REST API for exosome/EV analysis platform.
 Endpoints:
 - GET  /               - Root redirect to docs
 - GET  /health         - Health check
+- GET  /metrics        - Prometheus metrics (latency, pipeline stages)
 - GET  /api/v1/status  - System status
 - POST /api/v1/upload/fcs  - Upload FCS file
 - POST /api/v1/upload/nta  - Upload NTA file
 - GET  /api/v1/samples     - List all samples
 - GET  /api/v1/samples/{id} - Get sample details
+- GET  /api/v1/samples/{id}/events - Raw events (JSON preview or Arrow)
+- GET  /api/v1/samples/{id}/events/histogram - Binned channel histogram
+- GET  /api/v1/samples/{id}/events/density2d - Binned 2D density
 - GET  /api/v1/jobs/{id}   - Get processing job status
+- GET  /api/v1/jobs/{id}/events - Job progress stream (SSE)
 - POST /api/v1/process     - Trigger batch processing
 
 Author: CRMIT Backend Team
@@ -31,14 +36,20 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.exceptions import RequestValidationError
 from loguru import logger
 import time
 
 from src.api.config import get_settings
-from src.api.routers import upload, samples, jobs  # type: ignore[import-not-found]
-from src.database.connection import init_database, close_connections, check_connection
+from src.api.job_events import get_job_event_broker
+from src.api.metrics import REQUEST_DURATION, registry as metrics_registry
+from src.api.response_cache import get_response_cache
+from src.api.routers import upload, samples, events, jobs  # type: ignore[import-not-found]
+from src.database.connection import init_database, close_connections, pool_stats, DatabaseSession
+from src.database.crud import get_sample_counts, get_job_counts
+from src.worker.pool import get_processing_pool
+from src.worker.runner import get_job_runner
 
 settings = get_settings()
 
@@ -50,6 +61,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # type: ignore[
     
     Handles:
     - Database connection initialization
+    - Processing worker pool startup
     - Logger configuration
     - Cleanup on shutdown
     """
@@ -58,6 +70,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # type: ignore[
     logger.info(f"   Environment: {settings.environment}")
     logger.info(f"   Upload directory: {settings.upload_dir}")
     logger.info(f"   Parquet directory: {settings.parquet_dir}")
+    settings.create_directories()
     
     # Initialize database connection pool
     try:
@@ -67,12 +80,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # type: ignore[
         logger.warning(f"   Database: Failed to initialize - {e}")
         logger.warning("   API will continue without database (file-based mode)")
     
+    # Start processing worker pool (parsing runs off the event loop)
+    get_processing_pool().start()
+    logger.info(f"   Workers: {settings.max_workers} processes")
+    if settings.run_worker_in_api:
+        await get_job_runner().start()
+        logger.info("   Job runner: in-process")
+    else:
+        logger.info("   Job runner: external (python -m src.worker)")
+    
     logger.success("✅ CRMIT API ready")
     
     yield
     
     # Shutdown
     logger.info("🛑 CRMIT API shutting down...")
+    # Stop runner and worker pool before closing the database they write to
+    if settings.run_worker_in_api:
+        await get_job_runner().stop()
+        logger.info("   Job runner stopped")
+    await get_processing_pool().shutdown()
+    logger.info("   Worker pool stopped")
     # Close database connections
     try:
         await close_connections()
@@ -109,15 +137,27 @@ app.add_middleware(
     allow_headers=settings.cors_headers,
 )
 
-# GZip compression for responses > 1KB
+# GZip compression for responses > 1KB (Arrow clients opt out with
+# Accept-Encoding: identity, see src/api/arrow_stream.py)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
+def _route_template(request: Request) -> str:
+    """
+    Path with parameter values replaced by their names (/samples/{sample_id}),
+    so metric label cardinality stays bounded. Unmatched paths share one label.
+    """
+    if request.scope.get("route") is None:
+        return "unmatched"
+    names = {str(value): name for name, value in request.path_params.items()}
+    return "/".join(f"{{{names[part]}}}" if part in names else part for part in request.url.path.split("/"))
+
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests with timing."""
-    start_time = time.time()
+    """Log all incoming requests with timing and record latency metrics."""
+    start_time = time.perf_counter()
     
     # Log request
     logger.info(f"⬇️  {request.method} {request.url.path}")
@@ -126,10 +166,14 @@ async def log_requests(request: Request, call_next):
     response = await call_next(request)
     
     # Log response
-    duration = (time.time() - start_time) * 1000
+    duration = time.perf_counter() - start_time
     logger.info(
         f"⬆️  {request.method} {request.url.path} "
-        f"→ {response.status_code} ({duration:.1f}ms)"
+        f"→ {response.status_code} ({duration * 1000:.1f}ms)"
+    )
+    
+    REQUEST_DURATION.observe(
+        duration, method=request.method, route=_route_template(request), status=str(response.status_code)
     )
     
     return response
@@ -203,6 +247,17 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Metrics in Prometheus text format.
+    
+    Request latency per route, pipeline stage durations, events and
+    bytes processed (see src/api/metrics.py).
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get(f"{settings.api_prefix}/status")
 async def system_status():
     """
@@ -211,12 +266,19 @@ async def system_status():
     Returns:
         System status with diagnostics
     """
-    # Check database connection
+    # Sample/job counters (cached; one GROUP BY per table per TTL window).
+    # A successful query also confirms the database connection.
+    counts = None
     try:
-        db_connected = await check_connection()
-        db_status = "connected" if db_connected else "disconnected"
-    except Exception:
-        db_status = "error"
+        async with DatabaseSession() as db:
+            counts = {
+                "samples": await get_sample_counts(db),
+                "jobs": await get_job_counts(db),
+            }
+        db_status = "connected"
+    except Exception as e:
+        logger.warning(f"⚠️ Status counters unavailable: {e}")
+        db_status = "disconnected"
     
     # Check storage
     upload_dir_exists = settings.upload_dir.exists()
@@ -229,14 +291,23 @@ async def system_status():
         "environment": settings.environment,
         "database": {
             "status": db_status,
+            "pool": pool_stats(),
+            "counts": counts,
             # "url": settings.database_url.split("@")[-1],  # Hide credentials
         },
+        "response_cache": get_response_cache().backend.stats(),
+        "metrics": metrics_registry.summary(),
         "storage": {
             "upload_dir": str(settings.upload_dir),
             "upload_dir_exists": upload_dir_exists,
             "parquet_dir": str(settings.parquet_dir),
             "parquet_dir_exists": parquet_dir_exists,
         },
+        "workers": {
+            **get_processing_pool().stats(),
+            "job_runner": get_job_runner().worker_id if settings.run_worker_in_api else "external",
+            "job_events": get_job_event_broker().stats(),
+        },
         "configuration": {
             "max_upload_size_mb": settings.max_upload_size_mb,
             "max_workers": settings.max_workers,
@@ -261,6 +332,12 @@ app.include_router(
     tags=["Samples"]
 )
 
+app.include_router(
+    events.router,
+    prefix=f"{settings.api_prefix}/samples",
+    tags=["Events"]
+)
+
 app.include_router(
     jobs.router,
     prefix=f"{settings.api_prefix}/jobs",
@@ -0,0 +1,272 @@
+"""
+Metrics
+=======
+
+In-process latency histograms and throughput counters, exposed in
+Prometheus text format at `/metrics` and summarized in `/status`.
+
+Recorded metrics:
+- crmit_http_request_duration_seconds{method, route, status}
+    Request latency per route template (e.g. /api/v1/samples/{sample_id})
+- crmit_pipeline_stage_duration_seconds{pipeline, stage}
+    Time per pipeline stage: upload write, parse, sizing, stats,
+    Parquet write, DB commit
+- crmit_pipeline_events_total{pipeline}
+    Events (FCS) or data points (NTA) processed
+- crmit_pipeline_bytes_total{pipeline, direction}
+    Bytes read (in) and written (out) by pipelines and uploads
+
+Pipelines run in ProcessingPool worker processes, which cannot reach
+this registry. They time their stages with StageTimer and return the
+measurements with their result. The pool then records them here with
+record_pipeline().
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
+import time
+
+# Seconds; covers sub-millisecond cache hits up to long pipeline runs
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Prometheus label set: {a="1",b="2"} (empty string if no labels)."""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            return {"/".join(key) or "total": value for key, value in sorted(self._values.items())}
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[LabelValues, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _snapshot(self) -> Dict[LabelValues, Tuple[List[int], float, int]]:
+        with self._lock:
+            return {key: (list(s[0]), s[1], s[2]) for key, s in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._snapshot().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(list(self.buckets) + [float("inf")], counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.label_names, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (None if in +Inf)."""
+        rank, cumulative = q * count, 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per series: count, total/mean ms and p50/p95 bucket bounds (ms)."""
+        result = {}
+        for key, (counts, total, count) in sorted(self._snapshot().items()):
+            p50, p95 = self._quantile(counts, count, 0.5), self._quantile(counts, count, 0.95)
+            result[" ".join(key) or "total"] = {
+                "count": count,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / count, 3) if count else None,
+                "p50_le_ms": p50 * 1000 if p50 is not None else None,
+                "p95_le_ms": p95 * 1000 if p95 is not None else None,
+            }
+        return result
+
+
+class MetricsRegistry:
+    """Named collection of counters and histograms."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help_text, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help_text, label_names, buckets))
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact per-metric summaries for /status."""
+        return {name: metric.summary() for name, metric in self._metrics.items()}
+
+
+# ============================================================================
+# Global Registry and Application Metrics
+# ============================================================================
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "crmit_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+STAGE_DURATION = registry.histogram(
+    "crmit_pipeline_stage_duration_seconds",
+    "Duration of processing pipeline stages",
+    ("pipeline", "stage"),
+)
+PIPELINE_EVENTS = registry.counter(
+    "crmit_pipeline_events_total",
+    "Events or data points processed by pipelines",
+    ("pipeline",),
+)
+PIPELINE_BYTES = registry.counter(
+    "crmit_pipeline_bytes_total",
+    "Bytes read (in) and written (out) by pipelines and uploads",
+    ("pipeline", "direction"),
+)
+
+
+class StageTimer:
+    """
+    Picklable stage timings collected inside a worker process.
+
+    Usage:
+        timer = StageTimer()
+        with timer.stage("parse"):
+            ...
+        return {..., 'metrics': timer.as_dict(events=n, bytes_in=size)}
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self, events: int = 0, bytes_in: int = 0, bytes_out: int = 0) -> Dict[str, Any]:
+        return {"stages": dict(self.stages), "events": events, "bytes_in": bytes_in, "bytes_out": bytes_out}
+
+
+def record_pipeline(pipeline: str, measurements: Optional[Dict[str, Any]]) -> None:
+    """
+    Record the measurements returned by a pipeline run (StageTimer.as_dict()).
+
+    Args:
+        pipeline: Pipeline / job type label (e.g. fcs_parse)
+        measurements: Stage durations and counts, or None if not reported
+    """
+    if not measurements:
+        return
+    for stage, seconds in measurements.get("stages", {}).items():
+        STAGE_DURATION.observe(seconds, pipeline=pipeline, stage=stage)
+    if measurements.get("events"):
+        PIPELINE_EVENTS.inc(measurements["events"], pipeline=pipeline)
+    for direction in ("in", "out"):
+        if measurements.get(f"bytes_{direction}"):
+            PIPELINE_BYTES.inc(measurements[f"bytes_{direction}"], pipeline=pipeline, direction=direction)
@@ -0,0 +1,107 @@
+"""
+Keyset Pagination
+=================
+
+Cursor-based pagination for listing endpoints.
+
+Pages are ordered newest first by a (timestamp, id) pair and the next
+page starts strictly after the last row returned, so fetching page N
+costs the same as page 1 (no OFFSET scan). Cursors are opaque to
+clients: base64url-encoded JSON of the last row's sort key.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+import base64
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_  # type: ignore[import-not-found]
+from sqlalchemy.sql import Select  # type: ignore[import-not-found]
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode the sort key of the last row on a page.
+    
+    Args:
+        timestamp: Sort timestamp (created_at / upload_timestamp)
+        row_id: Primary key (tie-breaker for equal timestamps)
+    
+    Returns:
+        Opaque cursor string
+    """
+    payload = json.dumps({"ts": timestamp.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor().
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["ts"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {e}"
+        )
+
+
+def keyset_paginate(
+    query: Select,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Select:
+    """
+    Order a query newest first and restrict it to one page.
+    
+    One extra row is fetched so callers can tell whether another page
+    exists; pass the rows to page_rows().
+    
+    Args:
+        query: Filtered select
+        sort_column: Timestamp column
+        id_column: Primary key column
+        limit: Page size
+        cursor: Cursor from the previous page (keyset mode)
+        skip: Row offset, for clients that still page with skip/limit
+    
+    Returns:
+        Paginated select
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(sort_column, id_column) < tuple_(timestamp, row_id))
+    elif skip:
+        query = query.offset(skip)
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def page_rows(rows: Sequence[Any], limit: int, sort_key) -> Tuple[List[Any], Optional[str]]:  # type: ignore[no-untyped-def]
+    """
+    Split the extra row off a keyset page and build the next cursor.
+    
+    Args:
+        rows: Rows returned by a keyset_paginate() query
+        limit: Page size
+        sort_key: Function mapping a row to its (timestamp, id)
+    
+    Returns:
+        (rows for this page, next cursor or None on the last page)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*sort_key(page[-1]))
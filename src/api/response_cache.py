@@ -0,0 +1,276 @@
+"""
+Response Cache
+==============
+
+Caches the serialized JSON of per-sample endpoints (sample details,
+FCS results, NTA results) and answers conditional GETs.
+
+Keys carry a per-sample version: `{kind}:{sample_id}:v{version}`.
+Anything that changes a sample (upload, metadata update, new result,
+job status written to the sample, deletion) calls
+invalidate_sample_responses() (registered as a crud sample listener,
+see add_sample_listener), which bumps the version; old entries are
+never read again and age out through the LRU/TTL. Because invalidation
+is a single counter increment, the same scheme works unchanged on a
+shared backend.
+
+Every response carries an ETag (version + body hash). A request whose
+If-None-Match matches gets `304 Not Modified` with no body.
+
+Backends:
+- LocalCacheBackend: in-process LRU bounded by total bytes, with TTL
+  (default). It only sees invalidations from its own process: writes by
+  other API processes or `python -m src.worker` runners show up once
+  the entry expires (response_cache_ttl_seconds).
+- Anything implementing CacheBackend (e.g. Redis) can be installed with
+  set_cache_backend() to share entries and versions between processes.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import hashlib
+import time
+
+from fastapi import Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from loguru import logger
+
+from src.api.config import get_settings
+from src.database.crud import add_sample_listener
+
+settings = get_settings()
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class CacheBackend(ABC):
+    """Storage for cached response bodies and per-sample version counters."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Cached value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Store a value for at most ttl_seconds."""
+
+    @abstractmethod
+    async def get_version(self, key: str) -> int:
+        """Current value of a counter (0 if never incremented)."""
+
+    @abstractmethod
+    async def incr_version(self, key: str) -> int:
+        """Atomically increment a counter; returns the new value."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend statistics for /status."""
+        return {"backend": type(self).__name__}
+
+
+class LocalCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by total value size, with per-entry TTL."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize backend.
+
+        Args:
+            max_bytes: Upper bound on the sum of cached value sizes
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        # key → (version, expiry), oldest first. A version only has to
+        # outlive the entries cached under the previous one; after that a
+        # missing version (0) is safe, because versions are drawn from one
+        # counter and never reused, and entries under 0 were all stored
+        # before the last increment (ResponseCache does not store a body
+        # whose version changed while it was built), so they have expired.
+        # Keeps invalidating thousands of samples (backfill, bulk load)
+        # from growing the dict forever.
+        self._versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._version_counter = 0
+        self._version_ttl = 0.0  # Longest entry TTL seen
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._version_ttl = max(self._version_ttl, ttl_seconds)
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+        self._bytes += len(value)
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    async def get_version(self, key: str) -> int:
+        self._expire_versions()
+        entry = self._versions.get(key)
+        return entry[0] if entry is not None else 0
+
+    async def incr_version(self, key: str) -> int:
+        self._expire_versions()
+        self._version_counter += 1
+        self._versions.pop(key, None)
+        self._versions[key] = (self._version_counter, time.monotonic() + self._version_ttl)
+        return self._version_counter
+
+    def _expire_versions(self) -> None:
+        now = time.monotonic()
+        while self._versions:
+            key, (_, expires_at) = next(iter(self._versions.items()))
+            if expires_at >= now:
+                break
+            del self._versions[key]
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "local",
+            "entries": len(self._entries),
+            "versions": len(self._versions),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# ============================================================================
+# Response Cache
+# ============================================================================
+
+class ResponseCache:
+    """
+    Versioned per-sample JSON response cache with ETags.
+
+    Usage:
+        body, etag = await cache.get_or_build("fcs", sample_id, build)
+        return cache.respond(body, etag, if_none_match)
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float):
+        """
+        Initialize cache.
+
+        Args:
+            backend: Storage backend
+            ttl_seconds: Lifetime of cached bodies
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    async def get_or_build(
+        self,
+        kind: str,
+        sample_id: str,
+        build: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[bytes, str]:
+        """
+        Cached JSON body and ETag, building and storing them on a miss.
+
+        Exceptions from build (e.g. 404) propagate and nothing is cached.
+
+        Args:
+            kind: Endpoint name (part of the key)
+            sample_id: Sample identifier
+            build: Coroutine function producing the response payload
+        """
+        version = await self.backend.get_version(f"sample:{sample_id}")
+        key = f"{kind}:{sample_id}:v{version}"
+
+        cached = await self.backend.get(key)
+        if cached is not None:
+            etag, _, body = cached.partition(b"\n")
+            return body, etag.decode()
+
+        body = JSONResponse(content=jsonable_encoder(await build())).body
+        etag = f'"{version}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        # Invalidated while building: the body may predate the write, and
+        # must not be cached under a version that could be read again
+        if await self.backend.get_version(f"sample:{sample_id}") == version:
+            await self.backend.set(key, etag.encode() + b"\n" + body, self.ttl_seconds)
+        return body, etag
+
+    @staticmethod
+    def respond(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+        """JSON response with ETag, or 304 if the client already has this version."""
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+        if if_none_match:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if etag in tags or "*" in tags:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, sample_id: str) -> None:
+        """Make all cached responses for a sample stale."""
+        await self.backend.incr_version(f"sample:{sample_id}")
+
+
+# ============================================================================
+# Global Cache
+# ============================================================================
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get or create the global response cache (local backend by default).
+
+    Returns:
+        ResponseCache instance
+    """
+    global _cache
+    if _cache is None:
+        backend = LocalCacheBackend(max_bytes=settings.response_cache_max_mb * 1024 * 1024)
+        _cache = ResponseCache(backend, ttl_seconds=settings.response_cache_ttl_seconds)
+    return _cache
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Install a different (e.g. shared) backend for the global cache."""
+    global _cache
+    _cache = ResponseCache(backend, ttl_seconds=settings.response_cache_ttl_seconds)
+
+
+async def invalidate_sample_responses(sample_id: Optional[str]) -> None:
+    """
+    Invalidate cached responses for a sample.
+
+    Never raises: a failing shared backend must not fail the write that
+    triggered the invalidation (entries still expire after the TTL).
+    """
+    if not sample_id:
+        return
+    try:
+        await get_response_cache().invalidate(sample_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Response cache invalidation failed for {sample_id}: {e}")
+
+
+# Run after every sample write made through src/database/crud.py
+add_sample_listener(invalidate_sample_responses)
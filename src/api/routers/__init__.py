@@ -7,6 +7,7 @@ REST API endpoint routers for CRMIT platform.
 Routers:
 - upload.py  - File upload endpoints (FCS, NTA, TEM)
 - samples.py - Sample query endpoints
+- events.py  - Binned event views (histograms, 2D densities)
 - jobs.py    - Processing job status endpoints
 
 Author: CRMIT Backend Team
@@ -0,0 +1,586 @@
+"""
+Event Query Router
+==================
+
+Server-side binned views of a sample's event-level Parquet data, so
+clients get a few KB of counts instead of downloading whole files.
+
+Endpoints:
+- GET /samples/{id}/events            - Raw events (selected channels)
+- GET /samples/{id}/events/histogram  - 1D histogram of one channel
+- GET /samples/{id}/events/density2d  - 2D histogram of a channel pair
+
+Common query parameters:
+- transform: linear | log (log10, non-positive values dropped) | arcsinh
+- cofactor: arcsinh cofactor (x → asinh(x / cofactor))
+- gate: Rectangular gate on raw values, "CHANNEL:MIN:MAX" (either bound
+  may be empty); repeat for several gates. Gates are pushed down to the
+  Parquet read so non-matching row groups are skipped.
+
+Only the requested channels are read (column projection, memory-mapped),
+binning is vectorized with NumPy in a worker thread, and results are
+cached per (file, mtime, query).
+
+All endpoints honour `Accept: application/vnd.apache.arrow.stream` and
+then return an Arrow IPC stream instead of JSON (see src/api/arrow_stream.py).
+Raw events are streamed batch by batch straight from the Parquet scan.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
+from sqlalchemy import select  # type: ignore[import-not-found]
+from loguru import logger
+
+from src.api.arrow_stream import arrow_response, wants_arrow
+from src.api.config import get_settings
+from src.database.connection import get_session
+from src.database.models import FCSResult, Sample  # type: ignore[import-not-found]
+from src.parsers.parquet_reader import ParquetReader
+
+if TYPE_CHECKING:
+    import pyarrow.dataset as ds  # Imported on first scan: it loads pandas
+
+settings = get_settings()
+router = APIRouter()
+
+TRANSFORMS = ("linear", "log", "arcsinh")
+
+# (channel, min, max) on raw values; None = open bound
+Gate = Tuple[str, Optional[float], Optional[float]]
+
+# Rows per record batch when streaming raw events
+EVENT_BATCH_SIZE = 65_536
+
+
+# ============================================================================
+# Helper Functions
+# ============================================================================
+
+def parse_gates(gates: Optional[List[str]]) -> Tuple[Gate, ...]:
+    """
+    Parse "CHANNEL:MIN:MAX" gate strings.
+
+    The channel name may itself contain ':'; the last two fields are the
+    bounds.
+
+    Raises:
+        HTTPException: 400 if a gate is malformed
+    """
+    parsed = []
+    for gate in gates or []:
+        try:
+            channel, low, high = gate.rsplit(":", 2)
+            if not channel:
+                raise ValueError("missing channel")
+            parsed.append((channel, float(low) if low else None, float(high) if high else None))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid gate '{gate}' (expected CHANNEL:MIN:MAX): {e}"
+            )
+    return tuple(parsed)
+
+
+def parse_edges(edges: Optional[str]) -> Optional[Tuple[float, ...]]:
+    """
+    Parse comma-separated, strictly increasing bin edges.
+
+    Raises:
+        HTTPException: 400 if edges are malformed
+    """
+    if not edges:
+        return None
+    try:
+        values = tuple(float(edge) for edge in edges.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid edges: {e}")
+    if len(values) < 2 or any(b <= a for a, b in zip(values, values[1:])):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="edges must contain at least two strictly increasing values"
+        )
+    return values
+
+
+def apply_transform(values: np.ndarray, transform: str, cofactor: float) -> np.ndarray:
+    """
+    Transform raw channel values; log drops non-positive values.
+
+    Returns:
+        Finite transformed values (float64)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if transform == "log":
+        values = np.log10(values[values > 0])
+    elif transform == "arcsinh":
+        values = np.arcsinh(values / cofactor)
+    return values[np.isfinite(values)]
+
+
+def _bin_edges(
+    values: np.ndarray,
+    bins: int,
+    edges: Optional[Tuple[float, ...]],
+    range_min: Optional[float],
+    range_max: Optional[float],
+) -> np.ndarray:
+    """Explicit edges, or `bins` equal-width bins over the range (default: data range)."""
+    if edges is not None:
+        return np.asarray(edges, dtype=np.float64)
+    low = range_min if range_min is not None else (float(values.min()) if values.size else 0.0)
+    high = range_max if range_max is not None else (float(values.max()) if values.size else 1.0)
+    if high <= low:
+        high = low + 1.0
+    return np.linspace(low, high, bins + 1)
+
+
+def _read_channels(parquet_path: str, channels: Sequence[str], gates: Tuple[Gate, ...]) -> Dict[str, np.ndarray]:
+    """
+    Read only the requested channels for gated events.
+
+    Raises:
+        KeyError: If a channel (or gate channel) is not in the file
+    """
+    available = ParquetReader.columns(Path(parquet_path))
+    missing = [ch for ch in list(channels) + [g[0] for g in gates] if ch not in available]
+    if missing:
+        raise KeyError(f"Channels not found: {missing}. Available: {available}")
+
+    filters = []
+    for channel, low, high in gates:
+        if low is not None:
+            filters.append((channel, '>=', low))
+        if high is not None:
+            filters.append((channel, '<=', high))
+
+    table = ParquetReader.read(
+        Path(parquet_path),
+        columns=list(dict.fromkeys(channels)),
+        filters=filters or None,
+        as_pandas=False,
+    )
+    return {ch: table.column(ch).to_numpy(zero_copy_only=False) for ch in channels}
+
+
+def _gate_expression(gates: Tuple[Gate, ...]) -> Optional[pc.Expression]:
+    """Combine gates into one dataset filter expression (None = no gates)."""
+    expression = None
+    for channel, low, high in gates:
+        for bound in (
+            pc.field(channel) >= low if low is not None else None,
+            pc.field(channel) <= high if high is not None else None,
+        ):
+            if bound is not None:
+                expression = bound if expression is None else expression & bound
+    return expression
+
+
+def scan_events(
+    parquet_path: str,
+    columns: Optional[Sequence[str]],
+    gates: Tuple[Gate, ...],
+) -> 'ds.Scanner':
+    """
+    Scanner over gated events, projected to the requested channels.
+
+    Raises:
+        KeyError: If a channel (or gate channel) is not in the file
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(parquet_path, format="parquet")
+    available = dataset.schema.names
+    columns = list(dict.fromkeys(columns)) if columns else available
+    missing = [ch for ch in columns + [g[0] for g in gates] if ch not in available]
+    if missing:
+        raise KeyError(f"Channels not found: {missing}. Available: {available}")
+    return dataset.scanner(columns=columns, filter=_gate_expression(gates), batch_size=EVENT_BATCH_SIZE)
+
+
+def limit_batches(batches: Iterator[pa.RecordBatch], limit: Optional[int]) -> Iterator[pa.RecordBatch]:
+    """Pass batches through until `limit` rows were produced (None = all)."""
+    remaining = limit
+    for batch in batches:
+        if remaining is not None:
+            if remaining <= 0:
+                return
+            if batch.num_rows > remaining:
+                batch = batch.slice(0, remaining)
+            remaining -= batch.num_rows
+        yield batch
+
+
+@lru_cache(maxsize=settings.event_query_cache_size)
+def compute_histogram(
+    parquet_path: str,
+    mtime_ns: int,
+    channel: str,
+    bins: int,
+    edges: Optional[Tuple[float, ...]],
+    range_min: Optional[float],
+    range_max: Optional[float],
+    transform: str,
+    cofactor: float,
+    gates: Tuple[Gate, ...],
+) -> Dict[str, Any]:
+    """
+    1D histogram of one channel (cached; mtime_ns invalidates on rewrite).
+
+    Returns:
+        Dictionary with edges, counts and event totals
+    """
+    raw = _read_channels(parquet_path, [channel], gates)[channel]
+    values = apply_transform(raw, transform, cofactor)
+    bin_edges = _bin_edges(values, bins, edges, range_min, range_max)
+    counts, _ = np.histogram(values, bins=bin_edges)
+    return {
+        "channel": channel,
+        "transform": transform,
+        "edges": bin_edges.tolist(),
+        "counts": counts.tolist(),
+        "gated_events": int(raw.size),
+        "binned_events": int(counts.sum()),
+    }
+
+
+@lru_cache(maxsize=settings.event_query_cache_size)
+def compute_density2d(
+    parquet_path: str,
+    mtime_ns: int,
+    x_channel: str,
+    y_channel: str,
+    bins_x: int,
+    bins_y: int,
+    x_range: Tuple[Optional[float], Optional[float]],
+    y_range: Tuple[Optional[float], Optional[float]],
+    transform: str,
+    cofactor: float,
+    gates: Tuple[Gate, ...],
+) -> Dict[str, Any]:
+    """
+    2D histogram of a channel pair (cached; mtime_ns invalidates on rewrite).
+
+    Events are kept only if both transformed values are finite.
+
+    Returns:
+        Dictionary with x/y edges, counts[x_bin][y_bin] and event totals
+    """
+    data = _read_channels(parquet_path, [x_channel, y_channel], gates)
+    x = np.asarray(data[x_channel], dtype=np.float64)
+    y = np.asarray(data[y_channel], dtype=np.float64)
+    if transform == "log":
+        keep = (x > 0) & (y > 0)
+        x, y = np.log10(x[keep]), np.log10(y[keep])
+    elif transform == "arcsinh":
+        x, y = np.arcsinh(x / cofactor), np.arcsinh(y / cofactor)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+
+    x_edges = _bin_edges(x, bins_x, None, *x_range)
+    y_edges = _bin_edges(y, bins_y, None, *y_range)
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    return {
+        "x_channel": x_channel,
+        "y_channel": y_channel,
+        "transform": transform,
+        "x_edges": x_edges.tolist(),
+        "y_edges": y_edges.tolist(),
+        "counts": counts.astype(np.int64).tolist(),
+        "gated_events": int(data[x_channel].size),
+        "binned_events": int(counts.sum()),
+    }
+
+
+async def _event_file(db: AsyncSession, sample_id: str, result_id: Optional[int]) -> Path:
+    """
+    Locate the event Parquet file of a sample's FCS result.
+
+    Args:
+        db: Database session
+        sample_id: Sample identifier
+        result_id: FCSResult ID (default: most recent result)
+
+    Raises:
+        HTTPException: 404 if the sample, result or file does not exist
+    """
+    query = (
+        select(FCSResult.parquet_file_path)
+        .join(Sample, FCSResult.sample_id == Sample.id)
+        .where(Sample.sample_id == sample_id)
+    )
+    if result_id is not None:
+        query = query.where(FCSResult.id == result_id)
+    query = query.order_by(FCSResult.processed_at.desc(), FCSResult.id.desc()).limit(1)
+    parquet_path = (await db.execute(query)).scalar_one_or_none()
+
+    if not parquet_path or not Path(parquet_path).exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No event data for sample: {sample_id}"
+        )
+    return Path(parquet_path)
+
+
+async def _run_query(func, parquet_path: Path, *args: Any) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Run a cached binning function in a worker thread, mapping errors to HTTP."""
+    try:
+        return await run_in_threadpool(func, str(parquet_path), parquet_path.stat().st_mtime_ns, *args)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.args[0]))
+
+
+def histogram_table(result: Dict[str, Any]) -> pa.Table:
+    """Histogram as one row per bin: edge_low, edge_high, count."""
+    edges = np.asarray(result["edges"], dtype=np.float64)
+    return pa.table({
+        "edge_low": edges[:-1],
+        "edge_high": edges[1:],
+        "count": np.asarray(result["counts"], dtype=np.int64),
+    })
+
+
+def density_table(result: Dict[str, Any]) -> pa.Table:
+    """2D histogram as one row per cell (x-major): x/y bin edges and count."""
+    x_edges = np.asarray(result["x_edges"], dtype=np.float64)
+    y_edges = np.asarray(result["y_edges"], dtype=np.float64)
+    nx, ny = len(x_edges) - 1, len(y_edges) - 1
+    return pa.table({
+        "x_low": np.repeat(x_edges[:-1], ny),
+        "x_high": np.repeat(x_edges[1:], ny),
+        "y_low": np.tile(y_edges[:-1], nx),
+        "y_high": np.tile(y_edges[1:], nx),
+        "count": np.asarray(result["counts"], dtype=np.int64).reshape(-1),
+    })
+
+
+def _scalar_metadata(result: Dict[str, Any], **extra: Any) -> Dict[str, str]:
+    """Non-array result fields, stored as Arrow schema metadata."""
+    fields = {key: value for key, value in result.items() if not isinstance(value, list)}
+    return {key: str(value) for key, value in {**fields, **extra}.items()}
+
+
+def _check_transform(transform: str) -> None:
+    if transform not in TRANSFORMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown transform '{transform}'. Use one of: {', '.join(TRANSFORMS)}"
+        )
+
+
+# ============================================================================
+# Raw Events Endpoint
+# ============================================================================
+
+def json_columns(table: pa.Table) -> Dict[str, List[Any]]:
+    """
+    Table columns as lists for a JSON response, NaN/±inf as null.
+
+    JSON has no non-finite numbers and the response renderer rejects
+    them (e.g. particle_size_nm of unsized events is NaN).
+    """
+    data = {}
+    for name, column in zip(table.column_names, table.columns):
+        if pa.types.is_floating(column.type):
+            column = pc.if_else(pc.is_finite(column), column, pa.scalar(None, column.type))
+        data[name] = column.to_pylist()
+    return data
+
+
+@router.get("/{sample_id}/events", response_model=dict)
+async def get_events(
+    sample_id: str,
+    columns: Optional[List[str]] = Query(None, description="Channels to return (repeatable; default: all)"),
+    gate: Optional[List[str]] = Query(None, description="Gate CHANNEL:MIN:MAX on raw values (repeatable)"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum events (JSON: default 10000, max 100000; Arrow: unlimited)"),
+    result_id: Optional[int] = Query(None, description="FCS result ID (default: latest)"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Event-level data of a sample, projected to the requested channels.
+
+    With `Accept: application/vnd.apache.arrow.stream` the gated events
+    are streamed as Arrow record batches directly from the Parquet scan.
+    The JSON form is meant for small previews and is capped at 100000
+    events.
+
+    **Response (JSON):**
+    ```json
+    {
+        "sample_id": "P5_F10_CD81",
+        "columns": ["VFSC-H", "VSSC1-H"],
+        "num_events": 10000,
+        "data": {"VFSC-H": [...], "VSSC1-H": [...]}
+    }
+    ```
+    """
+    try:
+        gates = parse_gates(gate)
+        parquet_path = await _event_file(db, sample_id, result_id)
+        try:
+            scanner = await run_in_threadpool(scan_events, str(parquet_path), columns, gates)
+        except KeyError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e.args[0]))
+
+        if wants_arrow(accept):
+            return arrow_response(
+                limit_batches(scanner.to_batches(), limit),
+                schema=scanner.projected_schema,
+                metadata={"sample_id": sample_id},
+            )
+
+        limit = min(limit or settings.event_json_default_limit, settings.event_json_max_limit)
+        table = await run_in_threadpool(scanner.head, limit)
+        return {
+            "sample_id": sample_id,
+            "columns": table.column_names,
+            "num_events": table.num_rows,
+            "data": await run_in_threadpool(json_columns, table),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Failed to read events for {sample_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read events: {str(e)}"
+        )
+
+
+# ============================================================================
+# Histogram Endpoint
+# ============================================================================
+
+@router.get("/{sample_id}/events/histogram", response_model=dict)
+async def get_event_histogram(
+    sample_id: str,
+    channel: str = Query(..., description="Channel to bin (e.g. VFSC-H)"),
+    bins: int = Query(256, ge=1, le=4096, description="Number of equal-width bins"),
+    edges: Optional[str] = Query(None, description="Explicit comma-separated bin edges (transformed scale); overrides bins"),
+    range_min: Optional[float] = Query(None, description="Lower edge (transformed scale; default: data min)"),
+    range_max: Optional[float] = Query(None, description="Upper edge (transformed scale; default: data max)"),
+    transform: str = Query("linear", description="linear, log or arcsinh"),
+    cofactor: float = Query(150.0, gt=0, description="arcsinh cofactor"),
+    gate: Optional[List[str]] = Query(None, description="Gate CHANNEL:MIN:MAX on raw values (repeatable)"),
+    result_id: Optional[int] = Query(None, description="FCS result ID (default: latest)"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    1D histogram of one channel of a sample's events.
+
+    Arrow form: one row per bin (edge_low, edge_high, count); the other
+    fields are stored in the schema metadata.
+
+    **Response:**
+    ```json
+    {
+        "sample_id": "P5_F10_CD81",
+        "channel": "VFSC-H",
+        "transform": "log",
+        "edges": [1.0, 1.02, ...],
+        "counts": [12, 40, ...],
+        "gated_events": 48210,
+        "binned_events": 48102
+    }
+    ```
+    """
+    try:
+        _check_transform(transform)
+        gates = parse_gates(gate)
+        parquet_path = await _event_file(db, sample_id, result_id)
+        result = await _run_query(
+            compute_histogram, parquet_path,
+            channel, bins, parse_edges(edges), range_min, range_max, transform, cofactor, gates,
+        )
+        if wants_arrow(accept):
+            return arrow_response(histogram_table(result), metadata=_scalar_metadata(result, sample_id=sample_id))
+        return {"sample_id": sample_id, **result}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Failed to compute histogram for {sample_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute histogram: {str(e)}"
+        )
+
+
+# ============================================================================
+# 2D Density Endpoint
+# ============================================================================
+
+@router.get("/{sample_id}/events/density2d", response_model=dict)
+async def get_event_density2d(
+    sample_id: str,
+    x_channel: str = Query(..., description="X channel (e.g. VFSC-H)"),
+    y_channel: str = Query(..., description="Y channel (e.g. VSSC1-H)"),
+    bins_x: int = Query(64, ge=1, le=512),
+    bins_y: int = Query(64, ge=1, le=512),
+    x_min: Optional[float] = Query(None, description="X lower edge (transformed scale)"),
+    x_max: Optional[float] = Query(None, description="X upper edge (transformed scale)"),
+    y_min: Optional[float] = Query(None, description="Y lower edge (transformed scale)"),
+    y_max: Optional[float] = Query(None, description="Y upper edge (transformed scale)"),
+    transform: str = Query("linear", description="linear, log or arcsinh (both axes)"),
+    cofactor: float = Query(150.0, gt=0, description="arcsinh cofactor"),
+    gate: Optional[List[str]] = Query(None, description="Gate CHANNEL:MIN:MAX on raw values (repeatable)"),
+    result_id: Optional[int] = Query(None, description="FCS result ID (default: latest)"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    2D histogram (density plot) of a channel pair.
+
+    Arrow form: one row per cell, x-major (x_low, x_high, y_low, y_high,
+    count); the other fields are stored in the schema metadata.
+
+    **Response:**
+    ```json
+    {
+        "sample_id": "P5_F10_CD81",
+        "x_channel": "VFSC-H",
+        "y_channel": "VSSC1-H",
+        "transform": "arcsinh",
+        "x_edges": [...],
+        "y_edges": [...],
+        "counts": [[0, 3, ...], ...],
+        "gated_events": 48210,
+        "binned_events": 48210
+    }
+    ```
+
+    counts[i][j] is the number of events in x bin i and y bin j.
+    """
+    try:
+        _check_transform(transform)
+        gates = parse_gates(gate)
+        parquet_path = await _event_file(db, sample_id, result_id)
+        result = await _run_query(
+            compute_density2d, parquet_path,
+            x_channel, y_channel, bins_x, bins_y, (x_min, x_max), (y_min, y_max), transform, cofactor, gates,
+        )
+        if wants_arrow(accept):
+            return arrow_response(density_table(result), metadata=_scalar_metadata(result, sample_id=sample_id))
+        return {"sample_id": sample_id, **result}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Failed to compute density for {sample_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute density: {str(e)}"
+        )
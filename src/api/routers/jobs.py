@@ -7,24 +7,62 @@ Endpoints for monitoring processing job status.
 Endpoints:
 - GET /jobs              - List all processing jobs
 - GET /jobs/{job_id}     - Get job status and details
+- GET /jobs/{job_id}/events - Stream job progress (Server-Sent Events)
 - DELETE /jobs/{job_id}  - Cancel a running job
+- POST /jobs/{job_id}/retry - Requeue a failed job
 
 Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncio
+import json
+import time
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 from sqlalchemy import select, func  # type: ignore[import-not-found]
 from loguru import logger
 
-from src.database.connection import get_session
+from src.api.config import get_settings
+from src.api.job_events import TERMINAL_STATUSES, get_job_event_broker, job_snapshot, publish_job
+from src.api.pagination import keyset_paginate, page_rows
+from src.database.connection import DatabaseSession, get_session
+from src.database.crud import create_processing_job, get_job_counts, invalidate_status_counts
 from src.database.models import ProcessingJob, Sample  # type: ignore[import-not-found]
+from src.worker.pool import get_processing_pool
+from src.worker.runner import get_job_runner
+
+settings = get_settings()
 
 router = APIRouter()
 
 
+async def _job_total(db: AsyncSession, status_filter: Optional[str], job_type: Optional[str]) -> Optional[int]:
+    """
+    Total jobs matching the list filters.
+    
+    Status-only filters are answered from the cached GROUP BY counters;
+    a job_type filter needs an exact COUNT.
+    """
+    if not job_type:
+        counts = await get_job_counts(db)
+        if not status_filter:
+            return counts["total"]
+        if status_filter in counts:
+            return counts[status_filter]
+    
+    count_query = select(func.count()).select_from(ProcessingJob)
+    if status_filter:
+        count_query = count_query.where(ProcessingJob.status == status_filter)
+    if job_type:
+        count_query = count_query.where(ProcessingJob.job_type == job_type)
+    return (await db.execute(count_query)).scalar()
+
+
 # ============================================================================
 # List Jobs Endpoint
 # ============================================================================
@@ -35,16 +73,20 @@ async def list_jobs(
     limit: int = Query(100, ge=1, le=1000),
     status_filter: Optional[str] = Query(None, description="Filter by status (pending/running/completed/failed/cancelled)"),
     job_type: Optional[str] = Query(None, description="Filter by job type (fcs_parse/nta_parse/batch_process)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
+    include_total: bool = Query(True, description="Include total count (exact COUNT only when filtering by job_type)"),
     db: AsyncSession = Depends(get_session)
 ):
     """
-    List all processing jobs with optional filters.
+    List all processing jobs with optional filters, newest first.
     
     **Query Parameters:**
-    - skip: Pagination offset
+    - skip: Pagination offset (prefer cursor for deep pages)
     - limit: Number of results
     - status_filter: Filter by job status
     - job_type: Filter by job type
+    - cursor: Keyset cursor from the previous page's next_cursor
+    - include_total: Set false to skip the total count
     
     **Response:**
     ```json
@@ -52,6 +94,7 @@ async def list_jobs(
         "total": 50,
         "skip": 0,
         "limit": 100,
+        "next_cursor": "eyJ0cyI6IjIwMjUtMTEtMjFUMTI6MDA6MDAiLCJpZCI6MX0",
         "jobs": [
             {
                 "id": 1,
@@ -67,10 +110,18 @@ async def list_jobs(
         ]
     }
     ```
+    
+    **Notes:**
+    - Pages are keyed on (created_at, id); next_cursor is null on the last page
+    - Without a job_type filter the total comes from the cached status
+      counters (may lag by up to status_cache_ttl_seconds)
     """
     try:
-        # Build query
-        query = select(ProcessingJob)
+        # Jobs with their sample identifier in one query (no per-row lookups)
+        query = (
+            select(ProcessingJob, Sample.sample_id)
+            .outerjoin(Sample, ProcessingJob.sample_id == Sample.id)
+        )
         
         # Apply filters
         if status_filter:
@@ -78,32 +129,17 @@ async def list_jobs(
         if job_type:
             query = query.where(ProcessingJob.job_type == job_type)
         
-        # Get total count
-        count_query = select(func.count()).select_from(ProcessingJob)
-        if status_filter:
-            count_query = count_query.where(ProcessingJob.status == status_filter)
-        if job_type:
-            count_query = count_query.where(ProcessingJob.job_type == job_type)
-        
-        total = (await db.execute(count_query)).scalar()
+        total = await _job_total(db, status_filter, job_type) if include_total else None
         
-        # Apply pagination and ordering
-        query = query.order_by(ProcessingJob.created_at.desc()).offset(skip).limit(limit)
-        
-        # Execute query
-        result = await db.execute(query)
-        jobs = result.scalars().all()
+        # Keyset (or legacy offset) page, newest first
+        query = keyset_paginate(query, ProcessingJob.created_at, ProcessingJob.id, limit, cursor, skip)
+        rows, next_cursor = page_rows(
+            (await db.execute(query)).all(), limit,
+            lambda row: (row[0].created_at, row[0].id),
+        )
         
-        # Get sample_id for each job
         jobs_data = []
-        for job in jobs:
-            sample_id = None
-            job_sample_id = getattr(job, 'sample_id', None)
-            if job_sample_id is not None:
-                sample_query = select(Sample.sample_id).where(Sample.id == job_sample_id)
-                sample_result = await db.execute(sample_query)
-                sample_id = sample_result.scalar_one_or_none()
-            
+        for job, sample_id in rows:
             job_status = getattr(job, 'status', None)
             job_created = getattr(job, 'created_at', None)
             job_started = getattr(job, 'started_at', None)
@@ -125,11 +161,14 @@ async def list_jobs(
         
         return {
             "total": total,
-            "skip": skip,
+            "skip": 0 if cursor else skip,
             "limit": limit,
+            "next_cursor": next_cursor,
             "jobs": jobs_data
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"❌ Failed to list jobs: {e}")
         raise HTTPException(
@@ -179,24 +218,20 @@ async def get_job_status(
     - `cancelled`: Job was cancelled by user
     """
     try:
-        # Query job
-        query = select(ProcessingJob).where(ProcessingJob.job_id == job_id)
-        result = await db.execute(query)
-        job = result.scalar_one_or_none()
+        # Query job with its sample identifier
+        query = (
+            select(ProcessingJob, Sample.sample_id)
+            .outerjoin(Sample, ProcessingJob.sample_id == Sample.id)
+            .where(ProcessingJob.job_id == job_id)
+        )
+        row = (await db.execute(query)).one_or_none()
         
-        if not job:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Job not found: {job_id}"
             )
-        
-        # Get sample_id
-        sample_id = None
-        job_sample_id = getattr(job, 'sample_id', None)
-        if job_sample_id is not None:
-            sample_query = select(Sample.sample_id).where(Sample.id == job_sample_id)
-            sample_result = await db.execute(sample_query)
-            sample_id = sample_result.scalar_one_or_none()
+        job, sample_id = row
         
         job_status = getattr(job, 'status', None)
         job_created = getattr(job, 'created_at', None)
@@ -217,6 +252,8 @@ async def get_job_status(
             "result_data": job.result_data,
             "error_message": job.error_message,
             "error_traceback": getattr(job, 'error_traceback', None) if job_status == "failed" else None,
+            "worker_id": getattr(job, 'worker_id', None),
+            "attempts": getattr(job, 'attempts', None),
         }
         
     except HTTPException:
@@ -229,6 +266,97 @@ async def get_job_status(
         )
 
 
+# ============================================================================
+# Job Events Endpoint (Server-Sent Events)
+# ============================================================================
+
+async def _load_job_snapshot(job_id: str) -> Optional[Dict[str, Any]]:
+    """Read a job's current state (short-lived session, not held by the stream)."""
+    async with DatabaseSession() as db:
+        job = (await db.execute(
+            select(ProcessingJob).where(ProcessingJob.job_id == job_id)
+        )).scalar_one_or_none()
+        return job_snapshot(job) if job is not None else None
+
+
+def _sse_message(snapshot: Dict[str, Any]) -> str:
+    return f"event: job\ndata: {json.dumps(snapshot)}\n\n"
+
+
+async def _job_event_stream(job_id: str, snapshot: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for one job until it reaches a terminal status.
+
+    Snapshots come from the in-process broker. If none arrived for
+    job_events_refresh_seconds, one subscriber per job re-reads the row
+    and publishes it to all (covers runners in other processes).
+    """
+    broker = get_job_event_broker()
+    refresh = settings.job_events_refresh_seconds
+    keepalive = settings.job_events_keepalive_seconds
+
+    async with broker.subscribe(job_id) as queue:
+        # Published between the initial read and subscribing?
+        snapshot = broker.latest(job_id) or snapshot
+        last: Optional[Dict[str, Any]] = None
+        last_sent = time.monotonic()
+        yield f"retry: {int(refresh * 1000)}\n\n"
+
+        while True:
+            if snapshot is not None and snapshot != last:
+                yield _sse_message(snapshot)
+                last, last_sent = snapshot, time.monotonic()
+                if snapshot["status"] in TERMINAL_STATUSES:
+                    return
+
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), timeout=min(refresh, keepalive))
+                continue
+            except asyncio.TimeoutError:
+                snapshot = None
+
+            if broker.claim_refresh(job_id, refresh):
+                fresh = await _load_job_snapshot(job_id)
+                if fresh is None:
+                    return  # Job deleted
+                if fresh != broker.latest(job_id):
+                    broker.publish(job_id, fresh)  # Delivered to our queue too
+            if time.monotonic() - last_sent >= keepalive:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream a job's progress as Server-Sent Events.
+    
+    Sends the current state immediately, then one `job` event per
+    change, and closes after a terminal status (completed, failed,
+    cancelled). Updates are pushed from memory: waiting clients cost no
+    database queries.
+    
+    **Event:**
+    ```
+    event: job
+    data: {"job_id": "550e...", "status": "running", "progress_percent": 60,
+           "current_step": "Computing statistics", "error_message": null,
+           "completed_at": null}
+    ```
+    """
+    snapshot = get_job_event_broker().latest(job_id) or await _load_job_snapshot(job_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return StreamingResponse(
+        _job_event_stream(job_id, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ============================================================================
 # Cancel Job Endpoint
 # ============================================================================
@@ -257,7 +385,8 @@ async def cancel_job(
     **Notes:**
     - Only jobs with status `pending` or `running` can be cancelled
     - Completed or failed jobs cannot be cancelled
-    - Cancellation may not be immediate for running jobs
+    - Jobs running in this process are stopped immediately; runners in
+      other processes stop theirs on the next lease heartbeat
     """
     try:
         # Query job
@@ -283,7 +412,13 @@ async def cancel_job(
         # Update job status using setattr for SQLAlchemy compatibility
         setattr(job, 'status', "cancelled")
         setattr(job, 'current_step', "Cancelled by user")
+        setattr(job, 'lease_expires_at', None)
         await db.commit()
+        invalidate_status_counts()
+        publish_job(job)
+        
+        # Status already written; drop the local task without overwriting it
+        get_processing_pool().cancel(job_id, outcome=None)
         
         logger.warning(f"🚫 Job cancelled: {job_id} (was: {previous_status})")
         
@@ -354,10 +489,16 @@ async def retry_job(
                 detail=f"Can only retry failed jobs. Current status: {job_status}"
             )
         
-        # TODO: Create new job with same parameters
-        # For now, just return mock response
-        import uuid
         new_job_id = str(uuid.uuid4())
+        await create_processing_job(
+            db=db,
+            job_id=new_job_id,
+            job_type=str(job.job_type),
+            sample_id=getattr(job, 'sample_id', None),
+            parameters=getattr(job, 'parameters', None),
+        )
+        if settings.run_worker_in_api:
+            get_job_runner().wake()
         
         logger.info(f"🔄 Retrying job: {job_id} → {new_job_id}")
         
@@ -11,22 +11,73 @@ Endpoints:
 - GET /samples/{id}/nta  - Get NTA results for sample
 - DELETE /samples/{id}   - Delete sample and all related data
 
+The result endpoints also answer `Accept: application/vnd.apache.arrow.stream`
+with an Arrow IPC stream (one row per result).
+
+Sample details and JSON results are served from the response cache
+(src/api/response_cache.py) with ETags; `If-None-Match` gets a 304.
+
 Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
 from typing import Optional, List  # noqa: F401
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import pyarrow as pa
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 from sqlalchemy import select, func  # type: ignore[import-not-found]
+from sqlalchemy.orm import selectinload  # type: ignore[import-not-found]
 from loguru import logger
 
+from src.api.arrow_stream import arrow_response, wants_arrow
+from src.api.pagination import keyset_paginate, page_rows
+from src.api.response_cache import get_response_cache, invalidate_sample_responses
 from src.database.connection import get_session
+from src.database.crud import get_sample_counts, invalidate_status_counts
 from src.database.models import Sample, FCSResult, NTAResult, QCReport, ProcessingJob  # type: ignore[import-not-found]
 
 router = APIRouter()
 
 
+def _related_count(model) -> object:  # type: ignore[no-untyped-def]
+    """Correlated COUNT of a child table's rows for the selected Sample."""
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(model.sample_id == Sample.id)
+        .correlate(Sample)
+        .scalar_subquery()
+    )
+
+
+async def _sample_total(
+    db: AsyncSession,
+    treatment: Optional[str],
+    qc_status: Optional[str],
+    processing_status: Optional[str],
+) -> Optional[int]:
+    """
+    Total samples matching the list filters.
+    
+    Unfiltered and processing_status-only totals are answered from the
+    cached GROUP BY counters; other filters need an exact COUNT.
+    """
+    if not treatment and not qc_status:
+        counts = await get_sample_counts(db)
+        key = {"running": "processing"}.get(processing_status, processing_status) if processing_status else "total"
+        if key in counts:
+            return counts[key]
+    
+    count_query = select(func.count()).select_from(Sample)
+    if treatment:
+        count_query = count_query.where(Sample.treatment == treatment)
+    if qc_status:
+        count_query = count_query.where(Sample.qc_status == qc_status)
+    if processing_status:
+        count_query = count_query.where(Sample.processing_status == processing_status)
+    return (await db.execute(count_query)).scalar()
+
+
 # ============================================================================
 # List Samples Endpoint
 # ============================================================================
@@ -38,17 +89,21 @@ async def list_samples(
     treatment: Optional[str] = Query(None, description="Filter by treatment"),
     qc_status: Optional[str] = Query(None, description="Filter by QC status (pass/warn/fail)"),
     processing_status: Optional[str] = Query(None, description="Filter by processing status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces skip)"),
+    include_total: bool = Query(True, description="Include total count"),
     db: AsyncSession = Depends(get_session)
 ):
     """
-    List all samples with optional filters.
+    List all samples with optional filters, most recently uploaded first.
     
     **Query Parameters:**
-    - skip: Pagination offset (default: 0)
+    - skip: Pagination offset (default: 0; prefer cursor for deep pages)
     - limit: Number of results (default: 100, max: 1000)
     - treatment: Filter by treatment (e.g., "CD81", "ISO")
     - qc_status: Filter by QC status ("pass", "warn", "fail")
     - processing_status: Filter by processing status ("pending", "completed", "failed")
+    - cursor: Keyset cursor from the previous page's next_cursor
+    - include_total: Set false to skip the total count
     
     **Response:**
     ```json
@@ -56,6 +111,7 @@ async def list_samples(
         "total": 150,
         "skip": 0,
         "limit": 100,
+        "next_cursor": "eyJ0cyI6IjIwMjUtMTEtMjFUMTI6MDA6MDAiLCJpZCI6MX0",
         "samples": [
             {
                 "id": 1,
@@ -72,6 +128,11 @@ async def list_samples(
         ]
     }
     ```
+    
+    **Notes:**
+    - Pages are keyed on (upload_timestamp, id); next_cursor is null on the last page
+    - Unfiltered and processing_status-only totals come from the cached
+      status counters (may lag by up to status_cache_ttl_seconds)
     """
     try:
         # Build query
@@ -85,24 +146,14 @@ async def list_samples(
         if processing_status:
             query = query.where(Sample.processing_status == processing_status)
         
-        # Get total count
-        count_query = select(func.count()).select_from(Sample)
-        if treatment:
-            count_query = count_query.where(Sample.treatment == treatment)
-        if qc_status:
-            count_query = count_query.where(Sample.qc_status == qc_status)
-        if processing_status:
-            count_query = count_query.where(Sample.processing_status == processing_status)
+        total = await _sample_total(db, treatment, qc_status, processing_status) if include_total else None
         
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
-        
-        # Execute query
-        result = await db.execute(query)
-        samples = result.scalars().all()
+        # Keyset (or legacy offset) page, newest first
+        query = keyset_paginate(query, Sample.upload_timestamp, Sample.id, limit, cursor, skip)
+        samples, next_cursor = page_rows(
+            (await db.execute(query)).scalars().all(), limit,
+            lambda sample: (sample.upload_timestamp, sample.id),
+        )
         
         # Format response
         samples_data = []
@@ -123,11 +174,14 @@ async def list_samples(
         
         return {
             "total": total,
-            "skip": skip,
+            "skip": 0 if cursor else skip,
             "limit": limit,
+            "next_cursor": next_cursor,
             "samples": samples_data
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"❌ Failed to list samples: {e}")
         raise HTTPException(
@@ -143,6 +197,7 @@ async def list_samples(
 @router.get("/{sample_id}", response_model=dict)
 async def get_sample(
     sample_id: str,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -177,56 +232,9 @@ async def get_sample(
     ```
     """
     try:
-        # Query sample
-        query = select(Sample).where(Sample.sample_id == sample_id)
-        result = await db.execute(query)
-        sample = result.scalar_one_or_none()
-        
-        if not sample:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sample not found: {sample_id}"
-            )
-        
-        # Get related results counts
-        fcs_query = select(func.count()).select_from(FCSResult).where(FCSResult.sample_id == sample.id)
-        fcs_count = (await db.execute(fcs_query)).scalar()
-        
-        nta_query = select(func.count()).select_from(NTAResult).where(NTAResult.sample_id == sample.id)
-        nta_count = (await db.execute(nta_query)).scalar()
-        
-        qc_query = select(func.count()).select_from(QCReport).where(QCReport.sample_id == sample.id)
-        qc_count = (await db.execute(qc_query)).scalar()
-        
-        upload_ts = getattr(sample, 'upload_timestamp', None)
-        exp_date = getattr(sample, 'experiment_date', None)
-        
-        return {
-            "id": sample.id,
-            "sample_id": sample.sample_id,
-            "biological_sample_id": sample.biological_sample_id,
-            "treatment": sample.treatment,
-            "concentration_ug": sample.concentration_ug,
-            "preparation_method": sample.preparation_method,
-            "passage_number": sample.passage_number,
-            "fraction_number": sample.fraction_number,
-            "qc_status": sample.qc_status,
-            "processing_status": sample.processing_status,
-            "operator": sample.operator,
-            "notes": sample.notes,
-            "upload_timestamp": upload_ts.isoformat() if upload_ts else None,
-            "experiment_date": exp_date.isoformat() if exp_date else None,
-            "files": {
-                "fcs": sample.file_path_fcs,
-                "nta": sample.file_path_nta,
-                "tem": sample.file_path_tem,
-            },
-            "results": {
-                "fcs_count": fcs_count,
-                "nta_count": nta_count,
-                "qc_reports_count": qc_count,
-            }
-        }
+        cache = get_response_cache()
+        body, etag = await cache.get_or_build("sample", sample_id, lambda: _sample_details(db, sample_id))
+        return cache.respond(body, etag, if_none_match)
         
     except HTTPException:
         raise
@@ -238,6 +246,55 @@ async def get_sample(
         )
 
 
+async def _sample_details(db: AsyncSession, sample_id: str) -> dict:
+    """Sample fields, file paths and result counts (404 if missing)."""
+    # Query sample and related result counts in one round trip
+    query = select(
+        Sample,
+        _related_count(FCSResult),
+        _related_count(NTAResult),
+        _related_count(QCReport),
+    ).where(Sample.sample_id == sample_id)
+    row = (await db.execute(query)).one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sample not found: {sample_id}"
+        )
+    sample, fcs_count, nta_count, qc_count = row
+    
+    upload_ts = getattr(sample, 'upload_timestamp', None)
+    exp_date = getattr(sample, 'experiment_date', None)
+    
+    return {
+        "id": sample.id,
+        "sample_id": sample.sample_id,
+        "biological_sample_id": sample.biological_sample_id,
+        "treatment": sample.treatment,
+        "concentration_ug": sample.concentration_ug,
+        "preparation_method": sample.preparation_method,
+        "passage_number": sample.passage_number,
+        "fraction_number": sample.fraction_number,
+        "qc_status": sample.qc_status,
+        "processing_status": sample.processing_status,
+        "operator": sample.operator,
+        "notes": sample.notes,
+        "upload_timestamp": upload_ts.isoformat() if upload_ts else None,
+        "experiment_date": exp_date.isoformat() if exp_date else None,
+        "files": {
+            "fcs": sample.file_path_fcs,
+            "nta": sample.file_path_nta,
+            "tem": sample.file_path_tem,
+        },
+        "results": {
+            "fcs_count": fcs_count,
+            "nta_count": nta_count,
+            "qc_reports_count": qc_count,
+        }
+    }
+
+
 # ============================================================================
 # Get FCS Results Endpoint
 # ============================================================================
@@ -245,6 +302,8 @@ async def get_sample(
 @router.get("/{sample_id}/fcs", response_model=dict)
 async def get_fcs_results(
     sample_id: str,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -270,47 +329,13 @@ async def get_fcs_results(
     ```
     """
     try:
-        # Get sample
-        sample_query = select(Sample).where(Sample.sample_id == sample_id)
-        sample_result = await db.execute(sample_query)
-        sample = sample_result.scalar_one_or_none()
-        
-        if not sample:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sample not found: {sample_id}"
-            )
+        if wants_arrow(accept):
+            payload = await _fcs_results(db, sample_id)
+            return arrow_response(pa.Table.from_pylist(payload["results"]), metadata={"sample_id": sample_id})
         
-        # Get FCS results
-        fcs_query = select(FCSResult).where(FCSResult.sample_id == sample.id)
-        fcs_result = await db.execute(fcs_query)
-        fcs_results = fcs_result.scalars().all()
-        
-        results_data = []
-        for fcs in fcs_results:
-            processed = getattr(fcs, 'processed_at', None)
-            results_data.append({
-                "id": fcs.id,
-                "total_events": fcs.total_events,
-                "fsc_mean": fcs.fsc_mean,
-                "fsc_median": fcs.fsc_median,
-                "ssc_mean": fcs.ssc_mean,
-                "ssc_median": fcs.ssc_median,
-                "particle_size_mean_nm": fcs.particle_size_mean_nm,
-                "particle_size_median_nm": fcs.particle_size_median_nm,
-                "cd9_positive_pct": fcs.cd9_positive_pct,
-                "cd81_positive_pct": fcs.cd81_positive_pct,
-                "cd63_positive_pct": fcs.cd63_positive_pct,
-                "debris_pct": fcs.debris_pct,
-                "doublets_pct": fcs.doublets_pct,
-                "processed_at": processed.isoformat() if processed else None,
-                "parquet_file": fcs.parquet_file_path,
-            })
-        
-        return {
-            "sample_id": sample_id,
-            "results": results_data
-        }
+        cache = get_response_cache()
+        body, etag = await cache.get_or_build("fcs", sample_id, lambda: _fcs_results(db, sample_id))
+        return cache.respond(body, etag, if_none_match)
         
     except HTTPException:
         raise
@@ -322,6 +347,52 @@ async def get_fcs_results(
         )
 
 
+async def _fcs_results(db: AsyncSession, sample_id: str) -> dict:
+    """All FCS results of a sample (404 if the sample is missing)."""
+    # Get sample with its FCS results eagerly loaded
+    sample_query = (
+        select(Sample)
+        .where(Sample.sample_id == sample_id)
+        .options(selectinload(Sample.fcs_results))
+    )
+    sample_result = await db.execute(sample_query)
+    sample = sample_result.scalar_one_or_none()
+    
+    if not sample:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sample not found: {sample_id}"
+        )
+    
+    fcs_results = sample.fcs_results
+    
+    results_data = []
+    for fcs in fcs_results:
+        processed = getattr(fcs, 'processed_at', None)
+        results_data.append({
+            "id": fcs.id,
+            "total_events": fcs.total_events,
+            "fsc_mean": fcs.fsc_mean,
+            "fsc_median": fcs.fsc_median,
+            "ssc_mean": fcs.ssc_mean,
+            "ssc_median": fcs.ssc_median,
+            "particle_size_mean_nm": fcs.particle_size_mean_nm,
+            "particle_size_median_nm": fcs.particle_size_median_nm,
+            "cd9_positive_pct": fcs.cd9_positive_pct,
+            "cd81_positive_pct": fcs.cd81_positive_pct,
+            "cd63_positive_pct": fcs.cd63_positive_pct,
+            "debris_pct": fcs.debris_pct,
+            "doublets_pct": fcs.doublets_pct,
+            "processed_at": processed.isoformat() if processed else None,
+            "parquet_file": fcs.parquet_file_path,
+        })
+    
+    return {
+        "sample_id": sample_id,
+        "results": results_data
+    }
+
+
 # ============================================================================
 # Get NTA Results Endpoint
 # ============================================================================
@@ -329,6 +400,8 @@ async def get_fcs_results(
 @router.get("/{sample_id}/nta", response_model=dict)
 async def get_nta_results(
     sample_id: str,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_session)
 ):
     """
@@ -354,46 +427,13 @@ async def get_nta_results(
     ```
     """
     try:
-        # Get sample
-        sample_query = select(Sample).where(Sample.sample_id == sample_id)
-        sample_result = await db.execute(sample_query)
-        sample = sample_result.scalar_one_or_none()
-        
-        if not sample:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Sample not found: {sample_id}"
-            )
+        if wants_arrow(accept):
+            payload = await _nta_results(db, sample_id)
+            return arrow_response(pa.Table.from_pylist(payload["results"]), metadata={"sample_id": sample_id})
         
-        # Get NTA results
-        nta_query = select(NTAResult).where(NTAResult.sample_id == sample.id)
-        nta_result = await db.execute(nta_query)
-        nta_results = nta_result.scalars().all()
-        
-        results_data = []
-        for nta in nta_results:
-            processed = getattr(nta, 'processed_at', None)
-            results_data.append({
-                "id": nta.id,
-                "mean_size_nm": nta.mean_size_nm,
-                "median_size_nm": nta.median_size_nm,
-                "d10_nm": nta.d10_nm,
-                "d50_nm": nta.d50_nm,
-                "d90_nm": nta.d90_nm,
-                "concentration_particles_ml": nta.concentration_particles_ml,
-                "temperature_celsius": nta.temperature_celsius,
-                "ph": nta.ph,
-                "bin_50_80nm_pct": nta.bin_50_80nm_pct,
-                "bin_80_100nm_pct": nta.bin_80_100nm_pct,
-                "bin_100_120nm_pct": nta.bin_100_120nm_pct,
-                "processed_at": processed.isoformat() if processed else None,
-                "parquet_file": nta.parquet_file_path,
-            })
-        
-        return {
-            "sample_id": sample_id,
-            "results": results_data
-        }
+        cache = get_response_cache()
+        body, etag = await cache.get_or_build("nta", sample_id, lambda: _nta_results(db, sample_id))
+        return cache.respond(body, etag, if_none_match)
         
     except HTTPException:
         raise
@@ -405,6 +445,51 @@ async def get_nta_results(
         )
 
 
+async def _nta_results(db: AsyncSession, sample_id: str) -> dict:
+    """All NTA results of a sample (404 if the sample is missing)."""
+    # Get sample with its NTA results eagerly loaded
+    sample_query = (
+        select(Sample)
+        .where(Sample.sample_id == sample_id)
+        .options(selectinload(Sample.nta_results))
+    )
+    sample_result = await db.execute(sample_query)
+    sample = sample_result.scalar_one_or_none()
+    
+    if not sample:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sample not found: {sample_id}"
+        )
+    
+    nta_results = sample.nta_results
+    
+    results_data = []
+    for nta in nta_results:
+        processed = getattr(nta, 'processed_at', None)
+        results_data.append({
+            "id": nta.id,
+            "mean_size_nm": nta.mean_size_nm,
+            "median_size_nm": nta.median_size_nm,
+            "d10_nm": nta.d10_nm,
+            "d50_nm": nta.d50_nm,
+            "d90_nm": nta.d90_nm,
+            "concentration_particles_ml": nta.concentration_particles_ml,
+            "temperature_celsius": nta.temperature_celsius,
+            "ph": nta.ph,
+            "bin_50_80nm_pct": nta.bin_50_80nm_pct,
+            "bin_80_100nm_pct": nta.bin_80_100nm_pct,
+            "bin_100_120nm_pct": nta.bin_100_120nm_pct,
+            "processed_at": processed.isoformat() if processed else None,
+            "parquet_file": nta.parquet_file_path,
+        })
+    
+    return {
+        "sample_id": sample_id,
+        "results": results_data
+    }
+
+
 # ============================================================================
 # Delete Sample Endpoint
 # ============================================================================
@@ -440,37 +525,28 @@ async def delete_sample(
     ```
     """
     try:
-        # Get sample
-        query = select(Sample).where(Sample.sample_id == sample_id)
-        result = await db.execute(query)
-        sample = result.scalar_one_or_none()
-        
-        if not sample:
+        # Get sample and related record counts (for response) in one query
+        query = select(
+            Sample,
+            _related_count(FCSResult),
+            _related_count(NTAResult),
+            _related_count(QCReport),
+            _related_count(ProcessingJob),
+        ).where(Sample.sample_id == sample_id)
+        row = (await db.execute(query)).one_or_none()
+        
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sample not found: {sample_id}"
             )
-        
-        # Count related records (for response)
-        fcs_count = (await db.execute(
-            select(func.count()).select_from(FCSResult).where(FCSResult.sample_id == sample.id)
-        )).scalar()
-        
-        nta_count = (await db.execute(
-            select(func.count()).select_from(NTAResult).where(NTAResult.sample_id == sample.id)
-        )).scalar()
-        
-        qc_count = (await db.execute(
-            select(func.count()).select_from(QCReport).where(QCReport.sample_id == sample.id)
-        )).scalar()
-        
-        job_count = (await db.execute(
-            select(func.count()).select_from(ProcessingJob).where(ProcessingJob.sample_id == sample.id)
-        )).scalar()
+        sample, fcs_count, nta_count, qc_count, job_count = row
         
         # Delete sample (cascade will delete related records)
         await db.delete(sample)
         await db.commit()
+        invalidate_status_counts()
+        await invalidate_sample_responses(sample_id)
         
         logger.warning(f"🗑️  Deleted sample: {sample_id} (FCS: {fcs_count}, NTA: {nta_count}, QC: {qc_count}, Jobs: {job_count})")
         
@@ -4,42 +4,62 @@ File Upload Router
 
 Endpoints for uploading and processing FCS, NTA, and TEM files.
 
+Uploads are deduplicated by content: the SHA-256 computed while
+streaming is looked up in file_blobs. A re-upload of known content
+points the sample at the stored file instead of keeping a second copy
+and, once the first upload was processed, links its results to the
+sample and skips processing.
+
 Endpoints:
 - POST /upload/fcs  - Upload and process FCS file
 - POST /upload/nta  - Upload and process NTA file
+- POST /upload/batch - Upload several FCS/NTA files concurrently
+- POST /upload/sessions - Start a resumable chunked upload
+- PUT /upload/sessions/{upload_id} - Upload one byte range (Content-Range)
+- GET /upload/sessions/{upload_id} - Received and missing ranges
+- POST /upload/sessions/{upload_id}/finalize - Verify, assemble and process
+- DELETE /upload/sessions/{upload_id} - Abort a resumable upload
 - POST /upload/tem  - Upload and process TEM file (future)
 
 Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-import shutil
+from typing import Any, BinaryIO, Dict, List, Optional
+import asyncio
+import hashlib
+import os
+import re
 import uuid
 from datetime import datetime
 import sys
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, status
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse  # noqa: F401
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 from loguru import logger
 
 from src.api.config import get_settings
-from src.database.connection import get_session
-from src.database.models import Sample, FCSResult, NTAResult, ProcessingJob  # type: ignore[import-not-found]
+from src.api.metrics import PIPELINE_BYTES, STAGE_DURATION
+from src.api.upload_sessions import UploadSessionError, get_upload_session_store
+from src.database.connection import DatabaseSession, get_session
+from src.database.models import Sample, FCSResult, NTAResult, ProcessingJob, FileBlob  # type: ignore[import-not-found]
 from src.database.crud import (
     create_sample,
     get_sample_by_id,
     update_sample,
-    create_fcs_result,
     create_nta_result,
     create_processing_job,
-    update_job_status,
+    create_file_blob,
+    get_file_blob,
+    link_blob_results,
+    record_blob_upload,
 )
-# Import professional parsers
-from src.parsers.fcs_parser import FCSParser
-from src.parsers.nta_parser import NTAParser
+from src.worker.pool import get_processing_pool
+from src.worker.runner import get_job_runner
 
 settings = get_settings()
 router = APIRouter()
@@ -49,42 +69,87 @@ router = APIRouter()
 # Helper Functions
 # ============================================================================
 
-async def save_uploaded_file(upload_file: UploadFile, destination: Path) -> Path:
+@dataclass
+class SavedUpload:
+    """Result of streaming an upload to disk."""
+    path: Path
+    size_bytes: int
+    sha256: str
+
+
+def _copy_upload(source: BinaryIO, destination: Path, max_bytes: int, chunk_size: int) -> SavedUpload:
     """
-    Save uploaded file to disk.
+    Copy an upload stream to disk in fixed-size chunks (runs in a thread).
+    
+    The file is written to a hidden ``.part`` file next to the destination
+    and renamed into place only when complete, so readers never see a
+    partial upload. The SHA-256 and size are computed while copying; the
+    copy aborts as soon as ``max_bytes`` is exceeded.
+    
+    Raises:
+        HTTPException: 413 if the upload exceeds max_bytes
+    """
+    partial = destination.with_name(f".{destination.name}.{uuid.uuid4().hex[:8]}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with partial.open("wb") as buffer:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds limit of {settings.max_upload_size_mb}MB"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+        os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
+    return SavedUpload(path=destination, size_bytes=size, sha256=digest.hexdigest())
+
+
+async def save_uploaded_file(upload_file: UploadFile, destination: Path) -> SavedUpload:
+    """
+    Stream uploaded file to disk without blocking the event loop.
     
     Args:
         upload_file: FastAPI UploadFile object
         destination: Destination file path
     
     Returns:
-        Path to saved file
+        SavedUpload with path, size and SHA-256 of the content
     
     Raises:
         HTTPException: If file size exceeds limit or save fails
     """
     destination.parent.mkdir(parents=True, exist_ok=True)
+    max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
+    
+    # Reject early when the multipart part size is already known
+    if upload_file.size is not None and upload_file.size > max_size_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size {upload_file.size / 1024 / 1024:.1f}MB exceeds limit of {settings.max_upload_size_mb}MB"
+        )
     
     try:
-        # Check file size
-        upload_file.file.seek(0, 2)  # Seek to end
-        file_size = upload_file.file.tell()
-        upload_file.file.seek(0)  # Reset to start
-        
-        max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
-        if file_size > max_size_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size {file_size / 1024 / 1024:.1f}MB exceeds limit of {settings.max_upload_size_mb}MB"
+        await upload_file.seek(0)
+        with STAGE_DURATION.time(pipeline="upload", stage="upload_write"):
+            saved = await run_in_threadpool(
+                _copy_upload,
+                upload_file.file,
+                destination,
+                max_size_bytes,
+                settings.upload_chunk_size_kb * 1024,
             )
+        PIPELINE_BYTES.inc(saved.size_bytes, pipeline="upload", direction="in")
+        logger.info(f"✅ Saved uploaded file: {destination.name} ({saved.size_bytes / 1024:.1f}KB, sha256 {saved.sha256[:12]})")
+        return saved
         
-        # Save file
-        with destination.open("wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-        
-        logger.info(f"✅ Saved uploaded file: {destination.name} ({file_size / 1024:.1f}KB)")
-        return destination
-        
+    except HTTPException:
+        logger.warning(f"⚠️ Upload rejected: {destination.name} exceeds {settings.max_upload_size_mb}MB")
+        raise
     except Exception as e:
         logger.error(f"❌ Failed to save file: {e}")
         raise HTTPException(
@@ -93,6 +158,18 @@ async def save_uploaded_file(upload_file: UploadFile, destination: Path) -> Path
         )
 
 
+def stored_path(path: Path) -> str:
+    """
+    Path as stored on Sample rows: relative to the working directory when
+    the file lives under it, absolute otherwise.
+    """
+    resolved = path.resolve()
+    try:
+        return str(resolved.relative_to(Path.cwd()))
+    except ValueError:
+        return str(resolved)
+
+
 def generate_sample_id(filename: str) -> str:
     """
     Generate sample ID from filename.
@@ -120,6 +197,310 @@ def generate_sample_id(filename: str) -> str:
     return name
 
 
+async def find_duplicate(db: AsyncSession, saved: SavedUpload) -> Optional[FileBlob]:
+    """
+    Look up an earlier upload of the same content.
+    
+    If the earlier stored file still exists, the new copy is deleted and
+    the caller switches to blob.storage_path. If it is gone, the new copy
+    becomes the blob's stored file.
+    
+    Args:
+        db: Database session
+        saved: Just-saved upload (with its SHA-256)
+    
+    Returns:
+        The FileBlob for this content, or None if it is new
+    """
+    blob = await get_file_blob(db, saved.sha256)
+    if blob is None:
+        return None
+    
+    stored = Path(blob.storage_path)
+    if stored.exists() and stored.resolve() != saved.path.resolve():
+        saved.path.unlink(missing_ok=True)
+        logger.info(f"♻️ Duplicate upload of {stored.name} (sha256 {saved.sha256[:12]}), reusing stored file")
+        return await record_blob_upload(db, blob)
+    return await record_blob_upload(db, blob, storage_path=str(saved.path))
+
+
+def blob_results_ready(blob: Optional[FileBlob], file_type: str) -> bool:
+    """Whether the content of a blob was already parsed into results of this type."""
+    if blob is None:
+        return False
+    return (blob.fcs_result_id if file_type == "fcs" else blob.nta_result_id) is not None
+
+
+def dispatch_job(
+    job_id: str,
+    job_type: str,
+    file_path: Path,
+    sample_id: str,
+    db_sample: Optional[Sample],
+    db_job: Optional[ProcessingJob],
+) -> None:
+    """
+    Hand an uploaded file to the worker tier.
+    
+    Queued jobs are claimed by a job runner (in-process when
+    run_worker_in_api, otherwise `python -m src.worker`). Without a job
+    row (database unavailable) the file is submitted to the local pool.
+    """
+    if db_job is not None:
+        if settings.run_worker_in_api:
+            get_job_runner().wake()
+        return
+    
+    get_processing_pool().submit(
+        job_id=job_id,
+        job_type=job_type,
+        file_path=file_path,
+        sample_id=sample_id,
+        sample_db_id=db_sample.id if db_sample else None,
+    )
+
+
+# ============================================================================
+# Upload Registration
+# ============================================================================
+
+async def register_fcs_upload(
+    db: AsyncSession,
+    sample_id: str,
+    saved: SavedUpload,
+    treatment: Optional[str] = None,
+    concentration_ug: Optional[float] = None,
+    preparation_method: Optional[str] = None,
+    operator: Optional[str] = None,
+    notes: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Register a stored FCS file: sample record, deduplication, processing job.
+    
+    Shared by the multipart upload and finalized upload sessions.
+    
+    Returns:
+        Upload response (see upload_fcs_file)
+    """
+    file_path = saved.path
+    
+    # Create sample record in database
+    db_sample = None
+    db_job = None
+    blob = None
+    deduplicated = False
+    job_id: Optional[str] = str(uuid.uuid4())
+    
+    try:
+        # Same content uploaded before: reuse the stored file
+        blob = await find_duplicate(db, saved)
+        if blob is not None:
+            file_path = Path(blob.storage_path)
+        
+        # Check if sample already exists
+        existing_sample = await get_sample_by_id(db, sample_id)
+        
+        if existing_sample:
+            # Update existing sample with FCS file path
+            # Only overwrite metadata the client actually sent
+            metadata = {
+                "treatment": treatment,
+                "concentration_ug": concentration_ug,
+                "preparation_method": preparation_method,
+                "operator": operator,
+                "notes": notes,
+            }
+            db_sample = await update_sample(
+                db=db,
+                sample_id=sample_id,
+                file_path_fcs=stored_path(file_path),
+                **{key: value for key, value in metadata.items() if value is not None},
+            )
+            logger.info(f"📝 Updated existing sample: {sample_id}")
+        else:
+            # Create new sample record
+            db_sample = await create_sample(
+                db=db,
+                sample_id=sample_id,
+                file_path_fcs=stored_path(file_path),
+                treatment=treatment,
+                concentration_ug=concentration_ug,
+                preparation_method=preparation_method,
+                operator=operator,
+                notes=notes,
+            )
+            logger.info(f"✨ Created new sample: {sample_id}")
+        
+        if db_sample and blob_results_ready(blob, "fcs"):
+            # Already parsed: link the results, nothing to process
+            await link_blob_results(db, blob, db_sample.id)
+            db_sample = await update_sample(db, sample_id, processing_status="completed")
+            job_id = blob.job_id
+            deduplicated = True
+        elif db_sample:
+            # Create processing job
+            db_job = await create_processing_job(
+                db=db,
+                job_id=job_id,
+                job_type="fcs_parse",
+                sample_id=db_sample.id,
+                parameters={"file_path": str(file_path)},
+            )
+            logger.info(f"📋 Created processing job: {job_id}")
+            if blob is None:
+                await create_file_blob(db, saved.sha256, saved.size_bytes, "fcs", str(file_path), job_id)
+                
+    except Exception as db_error:
+        logger.warning(f"⚠️ Database operation failed: {db_error}")
+        logger.warning("   Continuing with file-based response...")
+        db_sample = None
+    
+    # Parse, size and save results in a worker process (never on the event loop)
+    if not deduplicated:
+        dispatch_job(job_id, "fcs_parse", file_path, sample_id, db_sample, db_job)
+    
+    # Get database ID or use temporary ID
+    db_id = db_sample.id if db_sample else abs(hash(sample_id)) % 1000000
+    
+    logger.success(f"✅ FCS file uploaded: {sample_id} (job: {job_id})")
+    
+    return {
+        "success": True,
+        "id": db_id,  # Database ID (real if DB connected, temp otherwise)
+        "sample_id": sample_id,  # String display name
+        "treatment": treatment,
+        "concentration_ug": concentration_ug,
+        "preparation_method": preparation_method,
+        "operator": operator,
+        "notes": notes,
+        "job_id": job_id,
+        "status": "uploaded",
+        "processing_status": "completed" if deduplicated else "pending",
+        "message": (
+            "Identical file uploaded before, existing results linked" if deduplicated
+            else "File uploaded successfully, processing started"
+        ),
+        "deduplicated": deduplicated,
+        "file_size_mb": saved.size_bytes / 1024 / 1024,
+        "content_sha256": saved.sha256,
+        "upload_timestamp": datetime.now().isoformat(),
+    }
+
+
+async def register_nta_upload(
+    db: AsyncSession,
+    sample_id: str,
+    saved: SavedUpload,
+    treatment: Optional[str] = None,
+    temperature_celsius: Optional[float] = None,
+    operator: Optional[str] = None,
+    notes: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Register a stored NTA file: sample record, deduplication, processing job.
+    
+    Shared by the multipart upload and finalized upload sessions.
+    
+    Returns:
+        Upload response (see upload_nta_file)
+    """
+    file_path = saved.path
+    
+    # Create or update sample record in database
+    db_sample = None
+    db_job = None
+    blob = None
+    deduplicated = False
+    job_id: Optional[str] = str(uuid.uuid4())
+    
+    try:
+        # Same content uploaded before: reuse the stored file
+        blob = await find_duplicate(db, saved)
+        if blob is not None:
+            file_path = Path(blob.storage_path)
+        
+        # Check if sample already exists
+        existing_sample = await get_sample_by_id(db, sample_id)
+        
+        if existing_sample:
+            # Update existing sample with NTA file path
+            # Only overwrite metadata the client actually sent
+            metadata = {"treatment": treatment, "operator": operator, "notes": notes}
+            db_sample = await update_sample(
+                db=db,
+                sample_id=sample_id,
+                file_path_nta=stored_path(file_path),
+                **{key: value for key, value in metadata.items() if value is not None},
+            )
+            logger.info(f"📝 Updated existing sample with NTA: {sample_id}")
+        else:
+            # Create new sample record
+            db_sample = await create_sample(
+                db=db,
+                sample_id=sample_id,
+                file_path_nta=stored_path(file_path),
+                treatment=treatment,
+                operator=operator,
+                notes=notes,
+            )
+            logger.info(f"✨ Created new sample: {sample_id}")
+        
+        if db_sample and blob_results_ready(blob, "nta"):
+            # Already parsed: link the results, nothing to process
+            await link_blob_results(db, blob, db_sample.id)
+            db_sample = await update_sample(db, sample_id, processing_status="completed")
+            job_id = blob.job_id
+            deduplicated = True
+        elif db_sample:
+            # Create processing job
+            db_job = await create_processing_job(
+                db=db,
+                job_id=job_id,
+                job_type="nta_parse",
+                sample_id=db_sample.id,
+                parameters={"file_path": str(file_path)},
+            )
+            logger.info(f"📋 Created processing job: {job_id}")
+            if blob is None:
+                await create_file_blob(db, saved.sha256, saved.size_bytes, "nta", str(file_path), job_id)
+            
+    except Exception as db_error:
+        logger.warning(f"⚠️ Database operation failed: {db_error}")
+        logger.warning("   Continuing with file-based response...")
+        db_sample = None
+    
+    # Parse and summarize the size distribution in a worker process
+    if not deduplicated:
+        dispatch_job(job_id, "nta_parse", file_path, sample_id, db_sample, db_job)
+    
+    # Get database ID or use temporary ID
+    db_id = db_sample.id if db_sample else abs(hash(sample_id)) % 1000000
+    
+    logger.success(f"✅ NTA file uploaded: {sample_id} (job: {job_id})")
+    
+    # Return complete sample data to avoid additional API calls
+    return {
+        "success": True,
+        "id": db_id,  # Database ID (real if DB connected, temp otherwise)
+        "sample_id": sample_id,  # String display name
+        "treatment": treatment,
+        "temperature_celsius": temperature_celsius,
+        "operator": operator,
+        "notes": notes,
+        "job_id": job_id,
+        "status": "uploaded",
+        "processing_status": "completed" if deduplicated else "pending",
+        "message": (
+            "Identical file uploaded before, existing results linked" if deduplicated
+            else "File uploaded successfully, processing started"
+        ),
+        "deduplicated": deduplicated,
+        "file_size_mb": saved.size_bytes / 1024 / 1024,
+        "content_sha256": saved.sha256,
+        "upload_timestamp": datetime.now().isoformat(),
+    }
+
+
 # ============================================================================
 # FCS Upload Endpoint
 # ============================================================================
@@ -157,12 +538,15 @@ async def upload_fcs_file(
     ```
     
     **Processing Pipeline:**
-    1. Save uploaded file to `data/uploads/`
+    1. Save uploaded file to `data/uploads/`, hashing it while streaming;
+       known content reuses the stored file and, if it was processed
+       before, its results are linked and the steps below are skipped
+       (`"deduplicated": true`, `processing_status` "completed")
     2. Create sample record in database
-    3. Create processing job (async)
+    3. Create processing job and submit it to the worker pool
     4. Return immediately with job ID
-    5. Background worker parses FCS file
-    6. Background worker saves results to database and Parquet
+    5. Worker process parses FCS file, sizes particles, computes statistics
+    6. Results are saved to database and Parquet; progress via GET /jobs/{job_id}
     """
     logger.info(f"📤 Uploading FCS file: {file.filename}")
     
@@ -181,131 +565,16 @@ async def upload_fcs_file(
         # Save uploaded file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         file_path = settings.upload_dir / f"{timestamp}_{file.filename}"
-        await save_uploaded_file(file, file_path)
-        
-        # Parse FCS file using professional parser
-        fcs_results = None
-        try:
-            logger.info(f"🔬 Parsing FCS file with professional parser...")
-            parser = FCSParser(file_path)
-            
-            # Validate file
-            if not parser.validate():
-                logger.warning(f"⚠️ FCS file validation failed, continuing anyway...")
-            
-            # Parse and get results
-            parsed_data = parser.parse()
-            
-            if parsed_data is not None and len(parsed_data) > 0:
-                # Extract key metrics
-                fcs_results = {
-                    "event_count": len(parsed_data) if hasattr(parsed_data, '__len__') else parsed_data.get('event_count', 0),
-                    "channels": list(parsed_data.columns) if hasattr(parsed_data, 'columns') else [],
-                    "mean_fsc": float(parsed_data[parsed_data.columns[0]].mean()) if hasattr(parsed_data, 'columns') and len(parsed_data.columns) > 0 else None,
-                    "mean_ssc": float(parsed_data[parsed_data.columns[1]].mean()) if hasattr(parsed_data, 'columns') and len(parsed_data.columns) > 1 else None,
-                }
-                logger.success(f"✅ Parsed {fcs_results['event_count']} events with {len(fcs_results['channels'])} channels")
-        except Exception as parse_error:
-            logger.error(f"⚠️ Parser failed: {parse_error}, continuing with upload...")
-            fcs_results = None
-        
-        # Create sample record in database
-        db_sample = None
-        db_job = None
-        job_id = str(uuid.uuid4())
-        
-        try:
-            # Check if sample already exists
-            existing_sample = await get_sample_by_id(db, sample_id)
-            
-            if existing_sample:
-                # Update existing sample with FCS file path
-                db_sample = await update_sample(
-                    db=db,
-                    sample_id=sample_id,
-                    file_path_fcs=str(file_path.relative_to(Path.cwd())),
-                    treatment=treatment,
-                    concentration_ug=concentration_ug,
-                    preparation_method=preparation_method,
-                    operator=operator,
-                    notes=notes,
-                )
-                logger.info(f"📝 Updated existing sample: {sample_id}")
-            else:
-                # Create new sample record
-                db_sample = await create_sample(
-                    db=db,
-                    sample_id=sample_id,
-                    file_path_fcs=str(file_path.relative_to(Path.cwd())),
-                    treatment=treatment,
-                    concentration_ug=concentration_ug,
-                    preparation_method=preparation_method,
-                    operator=operator,
-                    notes=notes,
-                )
-                logger.info(f"✨ Created new sample: {sample_id}")
-            
-            # Create processing job
-            if db_sample:
-                db_job = await create_processing_job(
-                    db=db,
-                    job_id=job_id,
-                    job_type="fcs_parse",
-                    sample_id=db_sample.id,
-                )
-                logger.info(f"📋 Created processing job: {job_id}")
-                
-                # If parsing succeeded, save FCS results to database
-                if fcs_results:
-                    await create_fcs_result(
-                        db=db,
-                        sample_id=db_sample.id,
-                        total_events=fcs_results.get('event_count', 0),
-                        fsc_mean=fcs_results.get('mean_fsc'),
-                        ssc_mean=fcs_results.get('mean_ssc'),
-                    )
-                    # Mark job as completed
-                    await update_job_status(
-                        db=db,
-                        job_id=job_id,
-                        status="completed",
-                        result_data=fcs_results,
-                    )
-                    logger.success(f"💾 Saved FCS results to database")
-                    
-        except Exception as db_error:
-            logger.warning(f"⚠️ Database operation failed: {db_error}")
-            logger.warning("   Continuing with file-based response...")
-            db_sample = None
-        
-        # Get database ID or use temporary ID
-        db_id = db_sample.id if db_sample else abs(hash(sample_id)) % 1000000
-        
-        logger.success(f"✅ FCS file uploaded: {sample_id} (job: {job_id})")
+        saved = await save_uploaded_file(file, file_path)
         
-        # Build response with parsed results
-        response_data = {
-            "success": True,
-            "id": db_id,  # Database ID (real if DB connected, temp otherwise)
-            "sample_id": sample_id,  # String display name
-            "treatment": treatment,
-            "concentration_ug": concentration_ug,
-            "preparation_method": preparation_method,
-            "operator": operator,
-            "notes": notes,
-            "job_id": job_id,
-            "status": "uploaded",
-            "processing_status": "completed" if fcs_results else "pending",
-            "message": "File uploaded successfully, processing started",
-            "file_size_mb": file_path.stat().st_size / 1024 / 1024,
-            "upload_timestamp": datetime.now().isoformat(),
-        }
-        
-        # Add parsed FCS results if available
-        if fcs_results:
-            response_data["fcs_results"] = fcs_results
-        
-        return response_data
+        return await register_fcs_upload(
+            db, sample_id, saved,
+            treatment=treatment,
+            concentration_ug=concentration_ug,
+            preparation_method=preparation_method,
+            operator=operator,
+            notes=notes,
+        )
         
     except HTTPException:
         raise
@@ -352,7 +621,8 @@ async def upload_nta_file(
     ```
     
     **Processing Pipeline:**
-    1. Save uploaded file to `data/uploads/`
+    1. Save uploaded file to `data/uploads/` (known content is
+       deduplicated as for FCS uploads)
     2. Create sample record (or update existing)
     3. Create processing job (async)
     4. Background worker parses NTA file
@@ -375,76 +645,15 @@ async def upload_nta_file(
         # Save uploaded file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         file_path = settings.upload_dir / f"{timestamp}_{file.filename}"
-        await save_uploaded_file(file, file_path)
-        
-        # Create or update sample record in database
-        db_sample = None
-        db_job = None
-        job_id = str(uuid.uuid4())
-        
-        try:
-            # Check if sample already exists
-            existing_sample = await get_sample_by_id(db, sample_id)
-            
-            if existing_sample:
-                # Update existing sample with NTA file path
-                db_sample = await update_sample(
-                    db=db,
-                    sample_id=sample_id,
-                    file_path_nta=str(file_path.relative_to(Path.cwd())),
-                    treatment=treatment,
-                    operator=operator,
-                    notes=notes,
-                )
-                logger.info(f"📝 Updated existing sample with NTA: {sample_id}")
-            else:
-                # Create new sample record
-                db_sample = await create_sample(
-                    db=db,
-                    sample_id=sample_id,
-                    file_path_nta=str(file_path.relative_to(Path.cwd())),
-                    treatment=treatment,
-                    operator=operator,
-                    notes=notes,
-                )
-                logger.info(f"✨ Created new sample: {sample_id}")
-            
-            # Create processing job
-            if db_sample:
-                db_job = await create_processing_job(
-                    db=db,
-                    job_id=job_id,
-                    job_type="nta_parse",
-                    sample_id=db_sample.id,
-                )
-                logger.info(f"📋 Created processing job: {job_id}")
-                
-        except Exception as db_error:
-            logger.warning(f"⚠️ Database operation failed: {db_error}")
-            logger.warning("   Continuing with file-based response...")
-            db_sample = None
-        
-        # Get database ID or use temporary ID
-        db_id = db_sample.id if db_sample else abs(hash(sample_id)) % 1000000
+        saved = await save_uploaded_file(file, file_path)
         
-        logger.success(f"✅ NTA file uploaded: {sample_id} (job: {job_id})")
-        
-        # Return complete sample data to avoid additional API calls
-        return {
-            "success": True,
-            "id": db_id,  # Database ID (real if DB connected, temp otherwise)
-            "sample_id": sample_id,  # String display name
-            "treatment": treatment,
-            "temperature_celsius": temperature_celsius,
-            "operator": operator,
-            "notes": notes,
-            "job_id": job_id,
-            "status": "uploaded",
-            "processing_status": "pending",
-            "message": "File uploaded successfully, processing started",
-            "file_size_mb": file_path.stat().st_size / 1024 / 1024,
-            "upload_timestamp": datetime.now().isoformat(),
-        }
+        return await register_nta_upload(
+            db, sample_id, saved,
+            treatment=treatment,
+            temperature_celsius=temperature_celsius,
+            operator=operator,
+            notes=notes,
+        )
         
     except HTTPException:
         raise
@@ -460,14 +669,80 @@ async def upload_nta_file(
 # Batch Upload Endpoint
 # ============================================================================
 
+def _upload_size(file: UploadFile) -> int:
+    """Size of a received multipart file (its spooled copy is seekable)."""
+    if file.size is not None:
+        return file.size
+    position = file.file.tell()
+    size = file.file.seek(0, os.SEEK_END)
+    file.file.seek(position)
+    return size
+
+
+async def _upload_batch_group(files: List[UploadFile], semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+    """
+    Save and queue files that share a sample ID, one after another.
+    
+    Files for the same sample (e.g. its FCS and NTA file) update one
+    Sample row, so they are not run concurrently.
+    """
+    details = []
+    for file in files:
+        filename = file.filename or ""
+        async with semaphore:
+            try:
+                # Parse memory in the worker grows with the file: keep a
+                # plate of large files from being queued all at once
+                budget_mb = settings.batch_upload_max_file_mb
+                if budget_mb and _upload_size(file) > budget_mb * 1024 * 1024:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds the batch limit of {budget_mb}MB per file; upload it on its own",
+                    )
+                async with DatabaseSession() as session:
+                    if filename.lower().endswith('.fcs'):
+                        result = await upload_fcs_file(
+                            file=file, treatment=None, concentration_ug=None,
+                            preparation_method=None, operator=None, notes=None, db=session,
+                        )
+                    elif filename.lower().endswith(('.txt', '.csv')):
+                        result = await upload_nta_file(
+                            file=file, treatment=None, temperature_celsius=None,
+                            operator=None, notes=None, db=session,
+                        )
+                    else:
+                        raise ValueError(f"Unsupported file type: {filename}")
+                
+                details.append({
+                    "filename": filename,
+                    "sample_id": result["sample_id"],
+                    "job_id": result["job_id"],
+                    "status": "success",
+                    "processing_status": result["processing_status"],
+                })
+                
+            except Exception as e:
+                error = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.error(f"❌ Failed to upload {filename}: {error}")
+                details.append({
+                    "filename": filename,
+                    "status": "failed",
+                    "error": error,
+                })
+    return details
+
+
 @router.post("/batch", response_model=dict)
 async def upload_batch(
     files: list[UploadFile] = File(...),
-    db: AsyncSession = Depends(get_session)
 ):
     """
     Upload multiple files at once.
     
+    Files are saved and queued concurrently (up to
+    batch_upload_concurrency at a time). The response returns as soon as
+    every file is queued; follow each job with GET /jobs/{job_id}.
+    
     **Request:**
     - files: List of FCS and/or NTA files
     
@@ -479,53 +754,259 @@ async def upload_batch(
         "failed": 0,
         "job_ids": ["uuid1", "uuid2", "uuid3", "uuid4", "uuid5"],
         "details": [
-            {"filename": "file1.fcs", "sample_id": "S001", "status": "success"},
+            {"filename": "file1.fcs", "sample_id": "S001", "job_id": "uuid1",
+             "status": "success", "processing_status": "pending"},
             ...
         ]
     }
     ```
+    
+    **Notes:**
+    - Each concurrent file uses one upload_chunk_size_kb copy buffer, so
+      batch memory is bounded by batch_upload_concurrency × chunk size
+    - Files above batch_upload_max_file_mb are reported failed without
+      being saved or queued, bounding what one file costs to parse
+    - Files with the same sample ID are processed in upload order
     """
     logger.info(f"📤 Batch upload: {len(files)} files")
     
+    # Group by sample ID; details are reported in upload order
+    groups: Dict[str, List[int]] = {}
+    for index, file in enumerate(files):
+        groups.setdefault(generate_sample_id(file.filename or ""), []).append(index)
+    
+    semaphore = asyncio.Semaphore(max(1, settings.batch_upload_concurrency))
+    grouped_details = await asyncio.gather(
+        *(_upload_batch_group([files[i] for i in indices], semaphore) for indices in groups.values())
+    )
+    details: List[Dict[str, Any]] = [{} for _ in files]
+    for indices, group_details in zip(groups.values(), grouped_details):
+        for index, detail in zip(indices, group_details):
+            details[index] = detail
+    
+    uploaded = [d for d in details if d["status"] == "success"]
     results = {
-        "success": True,
-        "uploaded": 0,
-        "failed": 0,
-        "job_ids": [],
-        "details": []
+        "success": len(uploaded) == len(details),
+        "uploaded": len(uploaded),
+        "failed": len(details) - len(uploaded),
+        "job_ids": [d["job_id"] for d in uploaded],
+        "details": details,
     }
     
-    for file in files:
-        try:
-            # Determine file type
-            filename = file.filename or ""
-            if filename.lower().endswith('.fcs'):
-                result = await upload_fcs_file(file=file, db=db)
-            elif filename.lower().endswith(('.txt', '.csv')):
-                result = await upload_nta_file(file=file, db=db)
-            else:
-                raise ValueError(f"Unsupported file type: {filename}")
-            
-            results["uploaded"] += 1
-            results["job_ids"].append(result["job_id"])
-            results["details"].append({
-                "filename": file.filename,
-                "sample_id": result["sample_id"],
-                "status": "success"
-            })
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to upload {file.filename}: {e}")
-            results["failed"] += 1
-            results["details"].append({
-                "filename": file.filename,
-                "status": "failed",
-                "error": str(e)
-            })
-    
-    if results["failed"] > 0:
-        results["success"] = False
-    
     logger.info(f"✅ Batch upload complete: {results['uploaded']} succeeded, {results['failed']} failed")
     
     return results
+
+
+# ============================================================================
+# Resumable Upload Endpoints
+# ============================================================================
+
+# Content-Range of a chunk PUT: "bytes <start>-<end>/<total>" (end inclusive)
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+def upload_file_type(filename: str) -> str:
+    """
+    File type of an upload by extension.
+    
+    Raises:
+        HTTPException: 400 for anything but .fcs, .txt and .csv
+    """
+    name = filename.lower()
+    if name.endswith('.fcs'):
+        return "fcs"
+    if name.endswith(('.txt', '.csv')):
+        return "nta"
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid file type. Only .fcs, .txt and .csv files are accepted."
+    )
+
+
+def _session_error(error: UploadSessionError) -> HTTPException:
+    return HTTPException(status_code=error.status_code, detail=str(error))
+
+
+@router.post("/sessions", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    filename: str = Form(...),
+    size_bytes: int = Form(...),
+    sha256: str = Form(...),
+    treatment: Optional[str] = Form(None),
+    concentration_ug: Optional[float] = Form(None),
+    preparation_method: Optional[str] = Form(None),
+    temperature_celsius: Optional[float] = Form(None),
+    operator: Optional[str] = Form(None),
+    notes: Optional[str] = Form(None),
+):
+    """
+    Start a resumable chunked upload.
+    
+    For files above max_upload_size_mb (up to upload_session_max_size_mb)
+    or unreliable links. The metadata fields are those of POST /upload/fcs
+    and /upload/nta and are applied when the upload is finalized.
+    
+    **Request:**
+    - filename: Original filename (.fcs, .txt or .csv)
+    - size_bytes: Total file size
+    - sha256: SHA-256 of the whole file (hex), verified on finalize
+    
+    **Response:**
+    ```json
+    {
+        "upload_id": "3f2a...",
+        "chunk_size": 16777216,
+        "missing": [[0, 1073741823]],
+        "expires_at": "2025-11-22T10:15:00"
+    }
+    ```
+    
+    **Protocol:**
+    1. PUT /upload/sessions/{upload_id} once per range, with header
+       `Content-Range: bytes <start>-<end>/<size>` and the raw bytes as
+       body (at most chunk_size). Ranges may be sent in parallel and in
+       any order; an optional `X-Content-SHA256` header is verified per
+       range
+    2. After an interruption, GET /upload/sessions/{upload_id} and send
+       the ranges listed under "missing"
+    3. POST /upload/sessions/{upload_id}/finalize: the file is verified
+       against sha256 and processed like a regular upload
+    """
+    file_type = upload_file_type(filename)
+    metadata = {
+        "treatment": treatment,
+        "concentration_ug": concentration_ug,
+        "preparation_method": preparation_method,
+        "temperature_celsius": temperature_celsius,
+        "operator": operator,
+        "notes": notes,
+    }
+    try:
+        session = get_upload_session_store().create(filename, file_type, size_bytes, sha256, metadata)
+    except UploadSessionError as e:
+        raise _session_error(e)
+    
+    return {
+        "upload_id": session.upload_id,
+        "filename": session.filename,
+        "size_bytes": session.size_bytes,
+        "chunk_size": settings.upload_session_chunk_size_mb * 1024 * 1024,
+        "received": [],
+        "missing": [[0, session.size_bytes - 1]],
+        "expires_at": session.expires_at.isoformat(),
+    }
+
+
+@router.put("/sessions/{upload_id}", response_model=dict)
+async def upload_session_range(
+    upload_id: str,
+    request: Request,
+    content_range: str = Header(...),
+    x_content_sha256: Optional[str] = Header(None),
+):
+    """
+    Upload one byte range of a resumable upload.
+    
+    **Request:**
+    - Header `Content-Range: bytes <start>-<end>/<size>` (end inclusive)
+    - Optional header `X-Content-SHA256`: SHA-256 of this range
+    - Body: the raw bytes of the range
+    
+    **Response:** received / missing ranges (as GET /upload/sessions/{upload_id})
+    """
+    match = _CONTENT_RANGE.match(content_range.strip())
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Content-Range must be 'bytes <start>-<end>/<size>'"
+        )
+    start, end, total = (int(value) for value in match.groups())
+    
+    store = get_upload_session_store()
+    try:
+        if total != store.get(upload_id).size_bytes:
+            raise UploadSessionError(f"Content-Range size {total} does not match the session")
+        with STAGE_DURATION.time(pipeline="upload", stage="upload_write"):
+            written = await store.write_range(upload_id, start, end, request.stream(), sha256=x_content_sha256)
+        PIPELINE_BYTES.inc(written, pipeline="upload", direction="in")
+        return store.progress(upload_id)
+    except UploadSessionError as e:
+        raise _session_error(e)
+
+
+@router.get("/sessions/{upload_id}", response_model=dict)
+async def get_upload_session(upload_id: str):
+    """Status of a resumable upload: received and missing byte ranges."""
+    try:
+        return get_upload_session_store().progress(upload_id)
+    except UploadSessionError as e:
+        raise _session_error(e)
+
+
+@router.post("/sessions/{upload_id}/finalize", response_model=dict)
+async def finalize_upload_session(
+    upload_id: str,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Verify and assemble a resumable upload, then process it.
+    
+    Fails with 409 while ranges are missing (the session is kept) and
+    with 422 if the assembled file does not match the declared SHA-256
+    (the session is removed; upload again). On success the response is
+    that of POST /upload/fcs or /upload/nta, including deduplication.
+    """
+    store = get_upload_session_store()
+    try:
+        session = store.get(upload_id)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = settings.upload_dir / f"{timestamp}_{session.filename}"
+        with STAGE_DURATION.time(pipeline="upload", stage="upload_assemble"):
+            session, sha256 = await store.assemble(upload_id, file_path)
+    except UploadSessionError as e:
+        if e.status_code == 422:  # Checksum mismatch
+            logger.warning(f"⚠️ Upload {upload_id} rejected: {e}")
+        raise _session_error(e)
+    
+    saved = SavedUpload(path=file_path, size_bytes=session.size_bytes, sha256=sha256)
+    sample_id = generate_sample_id(session.filename)
+    metadata = session.metadata
+    try:
+        if session.file_type == "fcs":
+            return await register_fcs_upload(
+                db, sample_id, saved,
+                treatment=metadata.get("treatment"),
+                concentration_ug=metadata.get("concentration_ug"),
+                preparation_method=metadata.get("preparation_method"),
+                operator=metadata.get("operator"),
+                notes=metadata.get("notes"),
+            )
+        return await register_nta_upload(
+            db, sample_id, saved,
+            treatment=metadata.get("treatment"),
+            temperature_celsius=metadata.get("temperature_celsius"),
+            operator=metadata.get("operator"),
+            notes=metadata.get("notes"),
+        )
+    except Exception as e:
+        logger.exception(f"❌ Failed to register upload {upload_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process upload: {str(e)}"
+        )
+
+
+@router.delete("/sessions/{upload_id}", response_model=dict)
+async def delete_upload_session(upload_id: str):
+    """Abort a resumable upload and delete its received data."""
+    try:
+        deleted = get_upload_session_store().delete(upload_id)
+    except UploadSessionError as e:
+        raise _session_error(e)
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload session {upload_id} not found"
+        )
+    return {"success": True, "upload_id": upload_id}
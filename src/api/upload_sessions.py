@@ -0,0 +1,347 @@
+"""
+Upload Sessions
+===============
+
+Server side of resumable chunked uploads (POST/PUT/GET/DELETE
+/upload/sessions), for files beyond max_upload_size_mb or links that
+drop.
+
+Layout: upload_dir/.sessions/{upload_id}/
+- session.json: filename, file type, declared size and SHA-256, form
+  metadata, creation time
+- data: the file, preallocated (sparse) to its declared size. Each PUT
+  writes its byte range in place with pwrite, so chunks can arrive in
+  any order and in parallel without locking
+- ranges/{start}-{end}: one empty marker per completed range, created
+  only after the whole range was written (and matched its optional
+  checksum). A PUT cut off halfway leaves no marker, so its range is
+  reported missing and sent again
+
+Finalizing checks that the ranges cover the file, hashes it and compares
+against the SHA-256 declared when the session was created, then moves
+the data file into upload_dir (same filesystem: a rename, no copy).
+Sessions older than upload_session_ttl_hours are removed whenever a new
+one is created.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+
+from src.api.config import get_settings
+
+settings = get_settings()
+
+SESSIONS_DIR = ".sessions"
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadSessionError(Exception):
+    """Invalid request against an upload session; status_code maps to HTTP."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class UploadSession:
+    """Metadata of one resumable upload (stored as session.json)."""
+    upload_id: str
+    filename: str
+    file_type: str
+    size_bytes: int
+    sha256: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromisoformat(self.created_at) + timedelta(hours=settings.upload_session_ttl_hours)
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge inclusive byte ranges into sorted, non-overlapping, non-adjacent ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(received: List[Tuple[int, int]], size_bytes: int) -> List[Tuple[int, int]]:
+    """Inclusive byte ranges of [0, size_bytes) not covered by the merged received ranges."""
+    missing, position = [], 0
+    for start, end in received:
+        if start > position:
+            missing.append((position, start - 1))
+        position = max(position, end + 1)
+    if position < size_bytes:
+        missing.append((position, size_bytes - 1))
+    return missing
+
+
+def _hash_file(path: Path, chunk_size: int) -> str:
+    """SHA-256 of a file, read in fixed-size chunks (runs in a thread)."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadSessionStore:
+    """Upload sessions kept on disk under a root directory."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _dir(self, upload_id: str) -> Path:
+        if not _UPLOAD_ID.match(upload_id):
+            raise UploadSessionError(f"Invalid upload ID: {upload_id}", status_code=404)
+        return self.root / upload_id
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def create(
+        self,
+        filename: str,
+        file_type: str,
+        size_bytes: int,
+        sha256: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> UploadSession:
+        """
+        Start a session: validate the declared file and preallocate it.
+
+        Raises:
+            UploadSessionError: 400 for a bad checksum or size, 413 above
+                upload_session_max_size_mb
+        """
+        sha256 = sha256.lower()
+        if not _SHA256.match(sha256):
+            raise UploadSessionError("sha256 must be 64 hexadecimal characters")
+        if size_bytes <= 0:
+            raise UploadSessionError("size_bytes must be positive")
+        if size_bytes > settings.upload_session_max_size_mb * 1024 * 1024:
+            raise UploadSessionError(
+                f"File exceeds limit of {settings.upload_session_max_size_mb}MB", status_code=413
+            )
+
+        self.sweep_expired()
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            filename=Path(filename).name,
+            file_type=file_type,
+            size_bytes=size_bytes,
+            sha256=sha256,
+            metadata={key: value for key, value in (metadata or {}).items() if value is not None},
+        )
+        directory = self.root / session.upload_id
+        (directory / "ranges").mkdir(parents=True)
+        with (directory / "data").open("wb") as f:
+            f.truncate(size_bytes)
+        (directory / "session.json").write_text(json.dumps(asdict(session)))
+        logger.info(f"📦 Upload session {session.upload_id}: {session.filename} ({size_bytes / 1024 / 1024:.1f}MB)")
+        return session
+
+    def get(self, upload_id: str) -> UploadSession:
+        """
+        Load a session.
+
+        Raises:
+            UploadSessionError: 404 if unknown or expired
+        """
+        path = self._dir(upload_id) / "session.json"
+        try:
+            session = UploadSession(**json.loads(path.read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            raise UploadSessionError(f"Upload session {upload_id} not found", status_code=404)
+        if session.expires_at < datetime.now():
+            self.delete(upload_id)
+            raise UploadSessionError(f"Upload session {upload_id} expired", status_code=404)
+        return session
+
+    def delete(self, upload_id: str) -> bool:
+        """Remove a session and its data; returns whether it existed."""
+        directory = self._dir(upload_id)
+        if not directory.exists():
+            return False
+        shutil.rmtree(directory, ignore_errors=True)
+        return True
+
+    def sweep_expired(self) -> int:
+        """Remove expired sessions (unreadable ones by directory age); returns how many."""
+        if not self.root.exists():
+            return 0
+        now = datetime.now()
+        removed = 0
+        for directory in self.root.iterdir():
+            if not _UPLOAD_ID.match(directory.name):
+                continue
+            try:
+                expires_at = UploadSession(**json.loads((directory / "session.json").read_text())).expires_at
+            except (FileNotFoundError, ValueError, TypeError):
+                # Being created right now, or left behind half-written
+                ttl = timedelta(hours=settings.upload_session_ttl_hours)
+                expires_at = datetime.fromtimestamp(directory.stat().st_mtime) + ttl
+            if expires_at < now:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f"🧹 Removed {removed} expired upload sessions")
+        return removed
+
+    # ------------------------------------------------------------------
+    # Ranges
+    # ------------------------------------------------------------------
+
+    def received_ranges(self, upload_id: str) -> List[Tuple[int, int]]:
+        """Merged inclusive byte ranges written so far."""
+        ranges = []
+        for marker in (self._dir(upload_id) / "ranges").iterdir():
+            start, _, end = marker.name.partition("-")
+            ranges.append((int(start), int(end)))
+        return merge_ranges(ranges)
+
+    def progress(self, upload_id: str) -> Dict[str, Any]:
+        """Session status: received and missing ranges, bytes received."""
+        session = self.get(upload_id)
+        received = self.received_ranges(upload_id)
+        return {
+            "upload_id": upload_id,
+            "filename": session.filename,
+            "size_bytes": session.size_bytes,
+            "chunk_size": settings.upload_session_chunk_size_mb * 1024 * 1024,
+            "received_bytes": sum(end - start + 1 for start, end in received),
+            "received": [list(r) for r in received],
+            "missing": [list(r) for r in missing_ranges(received, session.size_bytes)],
+            "expires_at": session.expires_at.isoformat(),
+        }
+
+    async def write_range(
+        self,
+        upload_id: str,
+        start: int,
+        end: int,
+        chunks: AsyncIterator[bytes],
+        sha256: Optional[str] = None,
+    ) -> int:
+        """
+        Write one inclusive byte range of the file from a request body.
+
+        Body chunks are buffered up to upload_chunk_size_kb and written
+        in place with pwrite in a thread. The range is marked received
+        only once every byte arrived (and, if given, matched sha256).
+
+        Raises:
+            UploadSessionError: 400 for a range outside the file, a body
+                of the wrong length or a checksum mismatch; 413 above
+                upload_session_chunk_size_mb
+        """
+        session = self.get(upload_id)
+        if not 0 <= start <= end < session.size_bytes:
+            raise UploadSessionError(f"Range {start}-{end} is outside the file (0-{session.size_bytes - 1})")
+        expected = end - start + 1
+        if expected > settings.upload_session_chunk_size_mb * 1024 * 1024:
+            raise UploadSessionError(
+                f"Chunk exceeds limit of {settings.upload_session_chunk_size_mb}MB", status_code=413
+            )
+
+        directory = self._dir(upload_id)
+        digest = hashlib.sha256() if sha256 else None
+        buffer_size = settings.upload_chunk_size_kb * 1024
+        buffer = bytearray()
+        offset = start
+        written = 0
+        fd = os.open(directory / "data", os.O_WRONLY)
+        try:
+            async for chunk in chunks:
+                written += len(chunk)
+                if written > expected:
+                    raise UploadSessionError(f"Body is longer than range {start}-{end}")
+                if digest is not None:
+                    digest.update(chunk)
+                buffer += chunk
+                if len(buffer) >= buffer_size:
+                    await run_in_threadpool(os.pwrite, fd, bytes(buffer), offset)
+                    offset += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await run_in_threadpool(os.pwrite, fd, bytes(buffer), offset)
+        finally:
+            os.close(fd)
+
+        if written != expected:
+            raise UploadSessionError(f"Expected {expected} bytes for range {start}-{end}, received {written}")
+        if digest is not None and digest.hexdigest() != sha256.lower():  # type: ignore[union-attr]
+            raise UploadSessionError(f"Checksum mismatch for range {start}-{end}")
+        (directory / "ranges" / f"{start}-{end}").touch()
+        return written
+
+    # ------------------------------------------------------------------
+    # Finalize
+    # ------------------------------------------------------------------
+
+    async def assemble(self, upload_id: str, destination: Path) -> Tuple[UploadSession, str]:
+        """
+        Verify a complete upload and move it to its destination.
+
+        The session is removed afterwards, also when the checksum does
+        not match (the file must then be uploaded again).
+
+        Returns:
+            (session, SHA-256 of the assembled file)
+
+        Raises:
+            UploadSessionError: 409 while ranges are missing, 422 if the
+                content does not match the declared SHA-256
+        """
+        session = self.get(upload_id)
+        missing = missing_ranges(self.received_ranges(upload_id), session.size_bytes)
+        if missing:
+            raise UploadSessionError(
+                f"Upload incomplete: {len(missing)} ranges missing, first {missing[0][0]}-{missing[0][1]}",
+                status_code=409,
+            )
+
+        data = self._dir(upload_id) / "data"
+        sha256 = await run_in_threadpool(_hash_file, data, settings.upload_chunk_size_kb * 1024)
+        if sha256 != session.sha256:
+            self.delete(upload_id)
+            raise UploadSessionError(
+                f"Checksum mismatch: declared {session.sha256[:12]}, received {sha256[:12]}", status_code=422
+            )
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(data, destination)
+        self.delete(upload_id)
+        logger.success(f"✅ Assembled upload {upload_id}: {destination.name} (sha256 {sha256[:12]})")
+        return session, sha256
+
+
+def get_upload_session_store() -> UploadSessionStore:
+    """Session store under the current upload directory."""
+    return UploadSessionStore(settings.upload_dir / SESSIONS_DIR)
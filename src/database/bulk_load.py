@@ -0,0 +1,309 @@
+"""
+Bulk Result Loader
+==================
+
+Loads the outputs of the batch scripts into fcs_results / nta_results.
+
+Inputs (CSV or Parquet, one row per result):
+- Processing logs of scripts/batch_process_fcs.py and
+  scripts/batch_process_nta.py (sample_id, output_file, events_parsed, ...)
+- Any table whose columns are FCSResult / NTAResult fields plus the
+  sample identifier, e.g. the statistics written by
+  create_fcs_statistics.py / create_nta_statistics.py
+
+Rows of failed runs are skipped and the scripts' column names are mapped
+onto result fields (COLUMN_ALIASES). NTA rows without size statistics
+(the NTA processing log) are summarized from their Parquet output with
+the same code as the upload pipeline. Samples are looked up by
+sample_id and created when missing. Rows whose Parquet file is already
+recorded are skipped, so loading the same log twice is harmless.
+
+On PostgreSQL (asyncpg) rows are written with COPY; on other databases
+with the bulk_create_* CRUD functions (one executemany INSERT).
+
+Usage:
+    python -m src.database.bulk_load fcs logs/processing_log_20251121_101500.csv
+    python -m src.database.bulk_load nta data/statistics/nta/processing_log_*.csv
+    python -m src.database.bulk_load nta data/statistics/nta_statistics.parquet --no-copy
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import json
+import math
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from loguru import logger
+from sqlalchemy import JSON, select  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
+
+from src.database.crud import (
+    bulk_create_fcs_results,
+    bulk_create_nta_results,
+    get_or_create_sample_ids,
+    invalidate_samples_by_db_ids,
+)
+from src.database.models import FCSResult, NTAResult
+
+# Result kind → (model, bulk insert function)
+TARGETS = {
+    "fcs": (FCSResult, bulk_create_fcs_results),
+    "nta": (NTAResult, bulk_create_nta_results),
+}
+
+# Script output column → result field
+COLUMN_ALIASES: Dict[str, Dict[str, str]] = {
+    "fcs": {
+        "events_parsed": "total_events",
+        "output_file": "parquet_file_path",
+    },
+    "nta": {
+        "output_file": "parquet_file_path",
+        "std_size_nm": "std_dev_nm",
+        "total_concentration_particles_ml": "concentration_particles_ml",
+        "temperature": "temperature_celsius",
+    },
+}
+
+# Fields a Sample may be created with, when present in the input
+SAMPLE_FIELDS = ("biological_sample_id", "treatment", "operator", "preparation_method")
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+def read_table(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read a CSV or Parquet file as a list of row dicts.
+
+    Args:
+        path: .csv or .parquet file
+
+    Returns:
+        Rows (NaN values become None)
+    """
+    if path.suffix.lower() == ".parquet":
+        table = pq.read_table(path)
+    else:
+        table = pa_csv.read_csv(path)
+    return [
+        {key: None if isinstance(value, float) and math.isnan(value) else value for key, value in row.items()}
+        for row in table.to_pylist()
+    ]
+
+
+def _succeeded(row: Dict[str, Any]) -> bool:
+    """Whether a processing log row is a successful run (rows without status count as such)."""
+    if "status" in row and row["status"] is not None:
+        return row["status"] == "success"
+    if "success" in row and row["success"] is not None:
+        return row["success"] in (True, "True", "true", 1)
+    return True
+
+
+def _summarize_nta_output(parquet_path: str) -> Optional[Dict[str, Any]]:
+    """NTAResult size fields from a batch_process_nta.py Parquet output."""
+    from src.worker.tasks import size_distribution_summary  # Parsers are only needed here
+
+    path = Path(parquet_path)
+    if not path.exists():
+        return None
+    return size_distribution_summary(pq.read_table(path).to_pandas())
+
+
+def prepare_rows(
+    kind: str,
+    records: Sequence[Dict[str, Any]],
+) -> Tuple[List[Tuple[str, Dict[str, Any], Dict[str, Any]]], int]:
+    """
+    Map input rows onto result fields.
+
+    Args:
+        kind: "fcs" or "nta"
+        records: Rows from read_table()
+
+    Returns:
+        ([(sample_id, result fields, sample fields), ...], number of rows skipped)
+    """
+    model, _ = TARGETS[kind]
+    columns = {column.name for column in model.__table__.columns} - {"id", "sample_id", "processed_at"}
+    required = {
+        column.name for column in model.__table__.columns
+        if not column.nullable and column.name in columns
+    }
+    aliases = COLUMN_ALIASES[kind]
+
+    prepared, skipped = [], 0
+    for record in records:
+        sample_id = record.get("sample_id")
+        if sample_id is None or not _succeeded(record):
+            skipped += 1
+            continue
+
+        fields: Dict[str, Any] = {}
+        for key, value in record.items():
+            field = aliases.get(key, key)
+            if field in columns and value is not None:
+                fields.setdefault(field, value)
+        if kind == "nta" and "mean_size_nm" not in fields and fields.get("parquet_file_path"):
+            fields.update(_summarize_nta_output(fields["parquet_file_path"]) or {})
+
+        if not required <= fields.keys():
+            skipped += 1
+            continue
+        sample_fields = {key: record[key] for key in SAMPLE_FIELDS if record.get(key) is not None}
+        prepared.append((str(sample_id), fields, sample_fields))
+    return prepared, skipped
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+async def copy_rows(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> int:  # type: ignore[no-untyped-def]
+    """
+    Write rows with PostgreSQL COPY (asyncpg copy_records_to_table).
+
+    All rows must have the same keys.
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+    columns = list(rows[0])
+    json_columns = {column.name for column in model.__table__.columns if isinstance(column.type, JSON)}
+    records = [
+        tuple(
+            json.dumps(row[column]) if column in json_columns and row[column] is not None else row[column]
+            for column in columns
+        )
+        for row in rows
+    ]
+    try:
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            model.__tablename__, records=records, columns=columns
+        )
+        await db.commit()
+        logger.success(f"✅ Copied {len(rows)} rows into {model.__tablename__}")
+        return len(rows)
+
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ COPY into {model.__tablename__} failed: {e}")
+        raise
+
+
+async def _supports_copy(db: AsyncSession) -> bool:
+    dialect = (await db.connection()).dialect
+    return dialect.name == "postgresql" and dialect.driver == "asyncpg"
+
+
+async def load_results(
+    db: AsyncSession,
+    kind: str,
+    paths: Sequence[Path],
+    use_copy: Optional[bool] = None,
+) -> Dict[str, int]:
+    """
+    Load batch outputs into the results table of one kind.
+
+    Args:
+        db: Database session
+        kind: "fcs" or "nta"
+        paths: CSV / Parquet files
+        use_copy: Force COPY on/off (default: COPY on PostgreSQL + asyncpg)
+
+    Returns:
+        Dictionary with rows_read, loaded, skipped and duplicates
+    """
+    model, bulk_create = TARGETS[kind]
+    records: List[Dict[str, Any]] = []
+    for path in paths:
+        records.extend(read_table(Path(path)))
+    prepared, skipped = prepare_rows(kind, records)
+
+    # Already loaded (same Parquet output) or repeated within the input
+    paths_seen = [fields["parquet_file_path"] for _, fields, _ in prepared]
+    existing = set((await db.execute(
+        select(model.parquet_file_path).where(model.parquet_file_path.in_(paths_seen))
+    )).scalars()) if paths_seen else set()
+    fresh = []
+    for sample_id, fields, sample_fields in prepared:
+        if fields["parquet_file_path"] not in existing:
+            existing.add(fields["parquet_file_path"])
+            fresh.append((sample_id, fields, sample_fields))
+
+    sample_ids = await get_or_create_sample_ids(
+        db, {sample_id: sample_fields for sample_id, _, sample_fields in fresh}
+    )
+    rows = [{**fields, "sample_id": sample_ids[sample_id]} for sample_id, fields, _ in fresh]
+
+    if use_copy is None:
+        use_copy = await _supports_copy(db)
+    if use_copy and rows:
+        keys = sorted({key for row in rows for key in row})
+        loaded = await copy_rows(db, model, [{key: row.get(key) for key in keys} for row in rows])
+        await invalidate_samples_by_db_ids(db, [row["sample_id"] for row in rows])
+    else:
+        loaded = await bulk_create(db, rows)
+
+    summary = {
+        "rows_read": len(records),
+        "loaded": loaded,
+        "skipped": skipped,
+        "duplicates": len(prepared) - len(fresh),
+    }
+    logger.info(f"📥 {kind.upper()} results: {summary}")
+    return summary
+
+
+# ============================================================================
+# Command Line
+# ============================================================================
+
+def parse_args(argv=None) -> argparse.Namespace:  # type: ignore[no-untyped-def]
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Load batch processing outputs into the database")
+    parser.add_argument("kind", choices=sorted(TARGETS), help="Result table to load")
+    parser.add_argument("paths", nargs="+", type=Path, help="Processing log / statistics files (CSV or Parquet)")
+    parser.add_argument("--no-copy", dest="use_copy", action="store_false", default=None,
+                        help="Use INSERT even on PostgreSQL")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Load the files; returns the process exit code."""
+    from src.database.connection import DatabaseSession, close_connections
+
+    try:
+        async with DatabaseSession() as db:
+            await load_results(db, args.kind, args.paths, use_copy=args.use_copy)
+    except Exception as e:
+        logger.error(f"❌ Load failed: {e}")
+        return 1
+    finally:
+        await close_connections()
+    return 0
+
+
+def main() -> None:
+    """Entry point for `python -m src.database.bulk_load`."""
+    sys.exit(asyncio.run(run(parse_args())))
+
+
+if __name__ == "__main__":
+    main()
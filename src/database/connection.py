@@ -8,13 +8,14 @@ Provides:
 - Async database engine
 - Session factory
 - Dependency injection for FastAPI
-- Connection pool management
+- Connection pool management and statistics
 
 Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
+from sqlalchemy.engine import make_url  # type: ignore[import-not-found]
 from sqlalchemy.ext.asyncio import (  # type: ignore[import-not-found]
     create_async_engine,
     AsyncSession,
@@ -37,6 +38,30 @@ _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
+def _pool_options() -> Dict[str, Any]:
+    """
+    Engine pool arguments from settings.
+    
+    Returns:
+        create_async_engine keyword arguments
+    """
+    if settings.db_use_null_pool:
+        return {"poolclass": NullPool}
+    
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}  # In-memory SQLite: single static connection
+    
+    # Default async pool (AsyncAdaptedQueuePool)
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
 def get_engine() -> AsyncEngine:
     """
     Get or create the async database engine.
@@ -45,9 +70,11 @@ def get_engine() -> AsyncEngine:
         AsyncEngine instance
     
     Configuration:
-    - Pool size: Configurable via settings
+    - Pool size/overflow: settings.db_pool_size / settings.db_max_overflow
     - Echo SQL: Controlled by settings.db_echo
-    - Connection recycling: 3600 seconds (1 hour)
+    - Connection recycling: settings.db_pool_recycle_seconds
+    - Pre-ping: settings.db_pool_pre_ping
+    - NullPool (no pooling): settings.db_use_null_pool, for tests only
     
     Usage:
         from src.database.connection import get_engine
@@ -59,22 +86,44 @@ def get_engine() -> AsyncEngine:
         logger.info("🔌 Creating database engine...")
         logger.info(f"   Database URL: {settings.database_url.split('@')[-1]}")  # Hide credentials
         
-        # Use NullPool for async engines (required for asyncpg)
-        poolclass = NullPool
-        logger.info("   Pool: NullPool (async engine)")
-        
+        options = _pool_options()
         _engine = create_async_engine(
             settings.database_url,
             echo=settings.db_echo,
-            poolclass=poolclass,
-            pool_pre_ping=True,  # Verify connections before using
+            **options,
         )
+        logger.info(f"   Pool: {type(_engine.pool).__name__} "
+                    f"(size={options.get('pool_size', '-')}, overflow={options.get('max_overflow', '-')})")
         
         logger.success("✅ Database engine created")
     
     return _engine
 
 
+def pool_stats() -> Dict[str, Any]:
+    """
+    Connection pool statistics for monitoring.
+    
+    Returns:
+        Dictionary with pool class and, for queue pools, size,
+        checked-in/checked-out connections and current overflow
+    """
+    if _engine is None:
+        return {"pool": None}
+    
+    pool = _engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.db_max_overflow,
+        })
+    return stats
+
+
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """
     Get or create the async session factory.
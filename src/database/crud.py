@@ -15,22 +15,65 @@ Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Awaitable, Callable, Sequence, Tuple
+from datetime import datetime, timedelta
+import time
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
-from sqlalchemy import select, func, delete  # type: ignore[import-not-found]
+from sqlalchemy.exc import IntegrityError  # type: ignore[import-not-found]
+from sqlalchemy import select, func, delete, update, insert, and_, or_, case, bindparam  # type: ignore[import-not-found]
 from loguru import logger
 
+from src.api.config import get_settings
 from src.database.models import (  # type: ignore[import-not-found]
     Sample,
     FCSResult,
     NTAResult,
     ProcessingJob,
     QCReport,
+    FileBlob,
     ProcessingStatus,
     QCStatus,
 )
 
+settings = get_settings()
+
+
+# ============================================================================
+# Change Hooks
+# ============================================================================
+# Writes notify whoever registered here: the API registers job event
+# publishing (src/api/job_events.py) and response cache invalidation
+# (src/api/response_cache.py) when those modules are imported. The
+# database layer does not import them, so scripts, backfills and bulk
+# loads use CRUD without loading API state.
+
+_job_listeners: List[Callable[[ProcessingJob], None]] = []
+_sample_listeners: List[Callable[[Optional[str]], Awaitable[None]]] = []
+
+
+def add_job_listener(listener: Callable[[ProcessingJob], None]) -> None:
+    """Call listener(job) after every committed job status/progress change."""
+    if listener not in _job_listeners:
+        _job_listeners.append(listener)
+
+
+def add_sample_listener(listener: Callable[[Optional[str]], Awaitable[None]]) -> None:
+    """Await listener(sample_id) after every committed change to a sample or its results."""
+    if listener not in _sample_listeners:
+        _sample_listeners.append(listener)
+
+
+def _notify_job(job: ProcessingJob) -> None:
+    """Notify job listeners of a job's current state."""
+    for listener in _job_listeners:
+        listener(job)
+
+
+async def _notify_sample(sample_id: Optional[str]) -> None:
+    """Notify sample listeners that a sample changed."""
+    for listener in _sample_listeners:
+        await listener(sample_id)
+
 
 # ============================================================================
 # Sample CRUD Operations
@@ -47,6 +90,7 @@ async def create_sample(
     file_path_tem: Optional[str] = None,
     operator: Optional[str] = None,
     notes: Optional[str] = None,
+    biological_sample_id: Optional[str] = None,
 ) -> Sample:
     """
     Create a new sample record.
@@ -62,6 +106,7 @@ async def create_sample(
         file_path_tem: Path to TEM file
         operator: Person who performed the experiment
         notes: Additional notes
+        biological_sample_id: Biological sample (e.g., "P5_F10"; default: sample_id)
         
     Returns:
         Created Sample object
@@ -69,7 +114,8 @@ async def create_sample(
     try:
         sample = Sample(
             sample_id=sample_id,
-            treatment=treatment,
+            biological_sample_id=biological_sample_id or sample_id,
+            treatment=treatment or "Unknown",
             concentration_ug=concentration_ug,
             preparation_method=preparation_method,
             file_path_fcs=file_path_fcs,
@@ -84,6 +130,8 @@ async def create_sample(
         db.add(sample)
         await db.commit()
         await db.refresh(sample)
+        invalidate_status_counts()
+        await _notify_sample(sample_id)
         
         logger.success(f"✅ Created sample: {sample_id} (DB ID: {sample.id})")  # type: ignore[attr-defined]
         return sample
@@ -194,6 +242,9 @@ async def update_sample(
         
         await db.commit()
         await db.refresh(sample)
+        if 'processing_status' in kwargs:
+            invalidate_status_counts()
+        await _notify_sample(sample_id)
         
         logger.info(f"📝 Updated sample: {sample_id}")
         return sample
@@ -223,6 +274,8 @@ async def delete_sample(db: AsyncSession, sample_id: str) -> bool:
         
         await db.delete(sample)
         await db.commit()
+        invalidate_status_counts()
+        await _notify_sample(sample_id)
         
         logger.warning(f"🗑️ Deleted sample: {sample_id}")
         return True
@@ -233,6 +286,14 @@ async def delete_sample(db: AsyncSession, sample_id: str) -> bool:
         raise
 
 
+async def _invalidate_sample_by_db_id(db: AsyncSession, sample_db_id: int) -> None:
+    """Invalidate cached API responses of the sample with this primary key."""
+    sample_id = (await db.execute(
+        select(Sample.sample_id).where(Sample.id == sample_db_id)
+    )).scalar_one_or_none()
+    await _notify_sample(sample_id)
+
+
 # ============================================================================
 # FCS Result CRUD Operations
 # ============================================================================
@@ -259,6 +320,7 @@ async def create_fcs_result(
         db.add(fcs_result)
         await db.commit()
         await db.refresh(fcs_result)
+        await _invalidate_sample_by_db_id(db, sample_id)
         
         logger.success(f"✅ Created FCS result for sample ID {sample_id}")
         return fcs_result
@@ -314,6 +376,7 @@ async def create_nta_result(
         db.add(nta_result)
         await db.commit()
         await db.refresh(nta_result)
+        await _invalidate_sample_by_db_id(db, sample_id)
         
         logger.success(f"✅ Created NTA result for sample ID {sample_id}")
         return nta_result
@@ -350,6 +413,7 @@ async def create_processing_job(
     job_id: str,
     job_type: str,
     sample_id: Optional[int] = None,
+    parameters: Optional[Dict[str, Any]] = None,
 ) -> ProcessingJob:
     """
     Create a new processing job.
@@ -359,6 +423,7 @@ async def create_processing_job(
         job_id: UUID for the job
         job_type: Type of job (fcs_parse, nta_parse, batch_process)
         sample_id: Database ID of associated sample (optional)
+        parameters: Job input (e.g. {"file_path": ...}) for workers and retries
         
     Returns:
         Created ProcessingJob object
@@ -370,11 +435,14 @@ async def create_processing_job(
             sample_id=sample_id,
             status="pending",
             progress_percent=0,
+            parameters=parameters,
+            attempts=0,
         )
         
         db.add(job)
         await db.commit()
         await db.refresh(job)
+        invalidate_status_counts()
         
         logger.success(f"✅ Created processing job: {job_id} (type: {job_type})")
         return job
@@ -437,6 +505,9 @@ async def update_job_progress(
         
         await db.commit()
         await db.refresh(job)
+        if job_status == "pending":
+            invalidate_status_counts()
+        _notify_job(job)
         
         logger.info(f"📊 Job progress: {job_id} → {progress_percent}%")
         return job
@@ -447,6 +518,132 @@ async def update_job_progress(
         raise
 
 
+async def update_jobs_progress(
+    db: AsyncSession,
+    updates: Sequence[Tuple[str, int, Optional[str]]],
+) -> int:
+    """
+    Write progress for several jobs in one transaction (one executemany UPDATE).
+    
+    Used by the coalescing ProgressReporter. Jobs that already reached a
+    terminal status are left untouched, so a late flush never overwrites
+    a final state; pending jobs move to running.
+    
+    Args:
+        db: Database session
+        updates: (job_id, progress_percent, current_step or None) tuples
+        
+    Returns:
+        Number of updates written
+    """
+    if not updates:
+        return 0
+    jobs = ProcessingJob.__table__
+    statement = (
+        update(jobs)
+        .where(
+            jobs.c.job_id == bindparam("b_job_id"),
+            # No IN (...): expanding parameters cannot be used with executemany
+            or_(jobs.c.status == "pending", jobs.c.status == "running"),
+        )
+        .values(
+            progress_percent=bindparam("b_percent"),
+            current_step=func.coalesce(bindparam("b_step"), jobs.c.current_step),
+            status="running",
+            started_at=func.coalesce(jobs.c.started_at, bindparam("b_now")),
+        )
+    )
+    now = datetime.utcnow()
+    try:
+        await db.execute(statement, [
+            {"b_job_id": job_id, "b_percent": percent, "b_step": step, "b_now": now}
+            for job_id, percent, step in updates
+        ])
+        await db.commit()
+        invalidate_status_counts()
+        logger.debug(f"📊 Flushed progress for {len(updates)} job(s)")
+        return len(updates)
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to write job progress: {e}")
+        raise
+
+
+def _apply_job_status(
+    job: ProcessingJob,
+    status: str,
+    result_data: Optional[Dict[str, Any]] = None,
+    error_message: Optional[str] = None,
+    error_traceback: Optional[str] = None,
+) -> None:
+    """Set a job's status and the timestamps and data that go with it (no commit)."""
+    setattr(job, 'status', status)
+    
+    # Set started_at if transitioning to running
+    job_started = getattr(job, 'started_at', None)
+    if status == "running" and job_started is None:
+        setattr(job, 'started_at', datetime.utcnow())
+    
+    # Set completed_at if transitioning to terminal state
+    job_completed = getattr(job, 'completed_at', None)
+    if status in ["completed", "failed", "cancelled"] and job_completed is None:
+        setattr(job, 'completed_at', datetime.utcnow())
+        if status == "completed":
+            setattr(job, 'progress_percent', 100)
+    
+    # Set result or error data
+    if result_data:
+        setattr(job, 'result_data', result_data)
+    if error_message:
+        setattr(job, 'error_message', error_message)
+    if error_traceback:
+        setattr(job, 'error_traceback', error_traceback)
+
+
+async def _update_if_lease_held(
+    db: AsyncSession,
+    job_id: str,
+    worker_id: str,
+    status: str,
+    result_data: Optional[Dict[str, Any]] = None,
+    error_message: Optional[str] = None,
+    error_traceback: Optional[str] = None,
+) -> bool:
+    """
+    Set a job's status only while worker_id still holds its lease (no commit).
+    
+    A single conditional UPDATE, so it cannot race with requeue_expired_jobs
+    or another worker's claim: once the lease expired and the job was
+    requeued, reclaimed or cancelled, nothing is written.
+    
+    Returns:
+        True if the job was updated
+    """
+    values: Dict[str, Any] = {"status": status}
+    if status in ["completed", "failed", "cancelled"]:
+        values["completed_at"] = func.coalesce(ProcessingJob.completed_at, datetime.utcnow())
+        if status == "completed":
+            values["progress_percent"] = 100
+    if result_data:
+        values["result_data"] = result_data
+    if error_message:
+        values["error_message"] = error_message
+    if error_traceback:
+        values["error_traceback"] = error_traceback
+    result = await db.execute(
+        update(ProcessingJob)
+        .where(
+            ProcessingJob.job_id == job_id,
+            ProcessingJob.worker_id == worker_id,
+            ProcessingJob.status == "running",
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
 async def update_job_status(
     db: AsyncSession,
     job_id: str,
@@ -454,6 +651,7 @@ async def update_job_status(
     result_data: Optional[Dict[str, Any]] = None,
     error_message: Optional[str] = None,
     error_traceback: Optional[str] = None,
+    worker_id: Optional[str] = None,
 ) -> Optional[ProcessingJob]:
     """
     Update job status.
@@ -465,9 +663,13 @@ async def update_job_status(
         result_data: Result data (for completed jobs)
         error_message: Error message (for failed jobs)
         error_traceback: Full error traceback (for failed jobs)
+        worker_id: Only update while this worker holds the job's lease
+            (job runners; a job requeued or claimed by another worker
+            meanwhile is left alone)
         
     Returns:
-        Updated ProcessingJob object or None if not found
+        Updated ProcessingJob object, or None if not found or the lease
+        was lost
     """
     try:
         job = await get_job_by_id(db, job_id)
@@ -476,30 +678,19 @@ async def update_job_status(
             return None
         
         old_status = getattr(job, 'status', None)
-        setattr(job, 'status', status)
-        
-        # Set started_at if transitioning to running
-        job_started = getattr(job, 'started_at', None)
-        if status == "running" and job_started is None:
-            setattr(job, 'started_at', datetime.utcnow())
-        
-        # Set completed_at if transitioning to terminal state
-        job_completed = getattr(job, 'completed_at', None)
-        if status in ["completed", "failed", "cancelled"] and job_completed is None:
-            setattr(job, 'completed_at', datetime.utcnow())
-            if status == "completed":
-                setattr(job, 'progress_percent', 100)
-        
-        # Set result or error data
-        if result_data:
-            setattr(job, 'result_data', result_data)
-        if error_message:
-            setattr(job, 'error_message', error_message)
-        if error_traceback:
-            setattr(job, 'error_traceback', error_traceback)
+        if worker_id is None:
+            _apply_job_status(job, status, result_data, error_message, error_traceback)
+        elif not await _update_if_lease_held(
+            db, job_id, worker_id, status, result_data, error_message, error_traceback
+        ):
+            await db.rollback()
+            logger.warning(f"⚠️ {worker_id} no longer holds job {job_id}; status {status} not written")
+            return None
         
         await db.commit()
         await db.refresh(job)
+        invalidate_status_counts()
+        _notify_job(job)
         
         logger.info(f"🔄 Job status: {job_id} → {old_status} → {status}")
         return job
@@ -510,6 +701,91 @@ async def update_job_status(
         raise
 
 
+async def save_job_results(
+    db: AsyncSession,
+    job_id: str,
+    sample_id: str,
+    sample_db_id: Optional[int],
+    storage_path: str,
+    result_data: Optional[Dict[str, Any]] = None,
+    fcs_result: Optional[Dict[str, Any]] = None,
+    nta_result: Optional[Dict[str, Any]] = None,
+    worker_id: Optional[str] = None,
+) -> Optional[ProcessingJob]:
+    """
+    Save a finished job's results and mark it completed in one transaction.
+    
+    Result rows, blob links, the sample status and the job status are
+    committed together: either the job is completed with its results,
+    or nothing is written. Results of a job cancelled meanwhile are
+    discarded, and so are those of a worker that lost its lease (the job
+    was requeued and possibly claimed by another worker).
+    
+    Args:
+        db: Database session
+        job_id: Job UUID
+        sample_id: Sample identifier
+        sample_db_id: Database ID of the sample (None: only the job is updated)
+        storage_path: Stored file the job processed (its blob gets the results)
+        result_data: Result summary stored on the job
+        fcs_result: FCSResult fields
+        nta_result: NTAResult fields
+        worker_id: Worker that must still hold the job's lease (job
+            runners; None for jobs submitted without a claim)
+        
+    Returns:
+        The job, with status "completed" only if the results were saved,
+        or None if it does not exist
+    """
+    try:
+        job = await get_job_by_id(db, job_id)
+        if job is not None and job.status == "cancelled":
+            return job
+        if worker_id is not None:
+            # Completes the job first: on PostgreSQL the row stays locked
+            # until the results are committed with it
+            if not await _update_if_lease_held(db, job_id, worker_id, "completed", result_data=result_data):
+                await db.rollback()
+                if job is not None:
+                    await db.refresh(job)
+                logger.warning(f"⚠️ {worker_id} no longer holds job {job_id}; discarding its results")
+                return job
+        if sample_db_id is not None:
+            fcs_row = FCSResult(sample_id=sample_db_id, **fcs_result) if fcs_result else None
+            nta_row = NTAResult(sample_id=sample_db_id, **nta_result) if nta_result else None
+            db.add_all([row for row in (fcs_row, nta_row) if row is not None])
+            await db.flush()
+            # Later uploads of the same content reuse these results
+            blob_values = {
+                key: row.id for key, row in (("fcs_result_id", fcs_row), ("nta_result_id", nta_row))
+                if row is not None
+            }
+            if blob_values:
+                await db.execute(
+                    update(FileBlob).where(FileBlob.storage_path == storage_path).values(**blob_values)
+                )
+            await db.execute(
+                update(Sample).where(Sample.id == sample_db_id).values(processing_status="completed")
+            )
+        if job is not None and worker_id is None:
+            _apply_job_status(job, "completed", result_data=result_data)
+        
+        await db.commit()
+        if job is not None:
+            await db.refresh(job)
+            _notify_job(job)
+        invalidate_status_counts()
+        await _notify_sample(sample_id)
+        
+        logger.info(f"💾 Saved results of job {job_id} for sample {sample_id}")
+        return job
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to save results of job {job_id}: {e}")
+        raise
+
+
 async def get_jobs_by_sample(
     db: AsyncSession,
     sample_id: int
@@ -531,6 +807,404 @@ async def get_jobs_by_sample(
     return list(result.scalars().all())
 
 
+# ============================================================================
+# Job Queue Operations (worker claims, heartbeats, lease expiry)
+# ============================================================================
+
+def _lease_values(worker_id: str, lease_seconds: float) -> Dict[str, Any]:
+    """Column values for a job claimed (or renewed) by a worker."""
+    now = datetime.utcnow()
+    return {
+        "worker_id": worker_id,
+        "heartbeat_at": now,
+        "lease_expires_at": now + timedelta(seconds=lease_seconds),
+    }
+
+
+async def claim_next_job(
+    db: AsyncSession,
+    worker_id: str,
+    lease_seconds: float,
+    job_types: Optional[Sequence[str]] = None,
+) -> Optional[ProcessingJob]:
+    """
+    Atomically claim the oldest pending job.
+    
+    PostgreSQL uses SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+    workers never block on or double-claim the same row. SQLite has no
+    row locks; the claim is a conditional UPDATE (status still 'pending')
+    that only one writer can win, retried on the next candidate if lost.
+    
+    Args:
+        db: Database session
+        worker_id: Identifier of the claiming worker (host:pid)
+        lease_seconds: Lease duration; renew with heartbeat_job()
+        job_types: Only claim these job types (default: any)
+        
+    Returns:
+        Claimed ProcessingJob (status 'running') or None if the queue is empty
+    """
+    candidates = select(ProcessingJob).where(ProcessingJob.status == "pending")
+    if job_types:
+        candidates = candidates.where(ProcessingJob.job_type.in_(list(job_types)))
+    candidates = candidates.order_by(ProcessingJob.created_at, ProcessingJob.id)
+    
+    try:
+        if db.bind.dialect.name == "postgresql":
+            job = (await db.execute(
+                candidates.limit(1).with_for_update(skip_locked=True)
+            )).scalar_one_or_none()
+            if job is None:
+                await db.rollback()
+                return None
+            for key, value in _lease_values(worker_id, lease_seconds).items():
+                setattr(job, key, value)
+            setattr(job, 'status', "running")
+            setattr(job, 'attempts', (job.attempts or 0) + 1)
+            if job.started_at is None:
+                setattr(job, 'started_at', datetime.utcnow())
+            await db.commit()
+            await db.refresh(job)
+        else:
+            job = None
+            for _ in range(5):
+                candidate_id = (await db.execute(
+                    candidates.with_only_columns(ProcessingJob.id).limit(1)
+                )).scalar_one_or_none()
+                if candidate_id is None:
+                    break
+                claimed = await db.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id == candidate_id, ProcessingJob.status == "pending")
+                    .values(
+                        status="running",
+                        attempts=ProcessingJob.attempts + 1,
+                        started_at=func.coalesce(ProcessingJob.started_at, datetime.utcnow()),
+                        **_lease_values(worker_id, lease_seconds),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    job = await db.get(ProcessingJob, candidate_id, populate_existing=True)
+                    break
+        
+        if job is not None:
+            invalidate_status_counts()
+            _notify_job(job)
+            logger.info(f"📥 Job claimed: {job.job_id} ({job.job_type}) by {worker_id}")
+        return job
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to claim job: {e}")
+        raise
+
+
+async def heartbeat_job(
+    db: AsyncSession,
+    job_id: str,
+    worker_id: str,
+    lease_seconds: float,
+) -> bool:
+    """
+    Renew a worker's lease on a running job.
+    
+    Args:
+        db: Database session
+        job_id: Job UUID
+        worker_id: Worker holding the lease
+        lease_seconds: New lease duration from now
+        
+    Returns:
+        True if the lease was renewed; False if the job was cancelled,
+        finished, or claimed by another worker (the caller should stop)
+    """
+    try:
+        result = await db.execute(
+            update(ProcessingJob)
+            .where(
+                ProcessingJob.job_id == job_id,
+                ProcessingJob.worker_id == worker_id,
+                ProcessingJob.status == "running",
+            )
+            .values(**_lease_values(worker_id, lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount == 1
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to renew lease for job {job_id}: {e}")
+        raise
+
+
+async def release_job(db: AsyncSession, job_id: str, worker_id: str) -> bool:
+    """
+    Return a claimed job to the queue (graceful worker shutdown).
+    
+    The attempt is not counted against job_max_attempts.
+    
+    Args:
+        db: Database session
+        job_id: Job UUID
+        worker_id: Worker holding the lease
+        
+    Returns:
+        True if the job was released
+    """
+    try:
+        result = await db.execute(
+            update(ProcessingJob)
+            .where(
+                ProcessingJob.job_id == job_id,
+                ProcessingJob.worker_id == worker_id,
+                ProcessingJob.status == "running",
+            )
+            .values(
+                status="pending",
+                worker_id=None,
+                heartbeat_at=None,
+                lease_expires_at=None,
+                attempts=case((ProcessingJob.attempts > 0, ProcessingJob.attempts - 1), else_=0),
+                current_step="Released by worker",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount == 1:
+            invalidate_status_counts()
+            logger.info(f"↩️ Job released: {job_id}")
+        return result.rowcount == 1
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to release job {job_id}: {e}")
+        raise
+
+
+async def requeue_expired_jobs(db: AsyncSession, max_attempts: int) -> Dict[str, int]:
+    """
+    Recover running jobs whose worker stopped heartbeating.
+    
+    Jobs with attempts left go back to 'pending'; the rest are failed.
+    
+    Args:
+        db: Database session
+        max_attempts: Attempts allowed before a job is failed
+        
+    Returns:
+        Dictionary with 'requeued' and 'failed' counts
+    """
+    now = datetime.utcnow()
+    expired = and_(
+        ProcessingJob.status == "running",
+        ProcessingJob.lease_expires_at.is_not(None),
+        ProcessingJob.lease_expires_at < now,
+    )
+    try:
+        failed = await db.execute(
+            update(ProcessingJob)
+            .where(expired, ProcessingJob.attempts >= max_attempts)
+            .values(
+                status="failed",
+                completed_at=now,
+                error_message=f"Worker lease expired after {max_attempts} attempts",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        requeued = await db.execute(
+            update(ProcessingJob)
+            .where(expired, ProcessingJob.attempts < max_attempts)
+            .values(
+                status="pending",
+                worker_id=None,
+                heartbeat_at=None,
+                lease_expires_at=None,
+                current_step="Requeued after worker lease expired",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        
+        counts = {"requeued": requeued.rowcount, "failed": failed.rowcount}
+        if counts["requeued"] or counts["failed"]:
+            invalidate_status_counts()
+            logger.warning(f"⏰ Expired job leases: {counts['requeued']} requeued, {counts['failed']} failed")
+        return counts
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to requeue expired jobs: {e}")
+        raise
+
+
+# ============================================================================
+# File Blob CRUD Operations
+# ============================================================================
+
+async def get_file_blob(db: AsyncSession, sha256: str) -> Optional[FileBlob]:
+    """
+    Get the stored upload with this content hash.
+    
+    Args:
+        db: Database session
+        sha256: Hex SHA-256 of the file content
+        
+    Returns:
+        FileBlob object or None if this content was never uploaded
+    """
+    result = await db.execute(select(FileBlob).where(FileBlob.sha256 == sha256))
+    return result.scalar_one_or_none()
+
+
+async def create_file_blob(
+    db: AsyncSession,
+    sha256: str,
+    size_bytes: int,
+    file_type: str,
+    storage_path: str,
+    job_id: Optional[str] = None,
+) -> Optional[FileBlob]:
+    """
+    Record newly stored upload content.
+    
+    Args:
+        db: Database session
+        sha256: Hex SHA-256 of the file content
+        size_bytes: File size
+        file_type: "fcs" or "nta"
+        storage_path: Stored file path (as passed to the processing job)
+        job_id: Job processing this content
+        
+    Returns:
+        Created FileBlob, or None if a concurrent upload of the same
+        content recorded it first
+    """
+    try:
+        blob = FileBlob(
+            sha256=sha256,
+            size_bytes=size_bytes,
+            file_type=file_type,
+            storage_path=storage_path,
+            job_id=job_id,
+        )
+        db.add(blob)
+        await db.commit()
+        await db.refresh(blob)
+        logger.debug(f"🔑 Recorded file blob {sha256[:12]} ({file_type})")
+        return blob
+        
+    except IntegrityError:
+        await db.rollback()
+        logger.info(f"🔑 File blob {sha256[:12]} was recorded by a concurrent upload")
+        return None
+
+
+async def record_blob_upload(
+    db: AsyncSession,
+    blob: FileBlob,
+    storage_path: Optional[str] = None,
+) -> FileBlob:
+    """
+    Count a repeated upload of existing content.
+    
+    Args:
+        db: Database session
+        blob: Existing FileBlob
+        storage_path: New stored file, if the old one no longer exists
+        
+    Returns:
+        Updated FileBlob
+    """
+    values: Dict[str, Any] = {
+        "upload_count": FileBlob.upload_count + 1,
+        "last_uploaded_at": datetime.utcnow(),
+    }
+    if storage_path is not None:
+        values["storage_path"] = storage_path
+    await db.execute(update(FileBlob).where(FileBlob.id == blob.id).values(**values))
+    await db.commit()
+    await db.refresh(blob)
+    return blob
+
+
+async def set_blob_results(
+    db: AsyncSession,
+    storage_path: str,
+    fcs_result_id: Optional[int] = None,
+    nta_result_id: Optional[int] = None,
+) -> None:
+    """
+    Attach the results parsed from a stored file to its blob.
+    
+    Called when a processing job saves its results, so later uploads of
+    the same content can reuse them. No-op for files without a blob.
+    
+    Args:
+        db: Database session
+        storage_path: Stored file the job processed
+        fcs_result_id: Created FCSResult ID
+        nta_result_id: Created NTAResult ID
+    """
+    values = {
+        key: value for key, value in
+        (("fcs_result_id", fcs_result_id), ("nta_result_id", nta_result_id)) if value is not None
+    }
+    if not values:
+        return
+    await db.execute(update(FileBlob).where(FileBlob.storage_path == storage_path).values(**values))
+    await db.commit()
+
+
+async def link_blob_results(db: AsyncSession, blob: FileBlob, sample_db_id: int) -> int:
+    """
+    Give a sample the results already parsed from a blob's content.
+    
+    The result rows are copied to the sample (sharing the Parquet file);
+    results the sample already has are not duplicated.
+    
+    Args:
+        db: Database session
+        blob: FileBlob with fcs_result_id and/or nta_result_id
+        sample_db_id: Database ID of the sample receiving the results
+        
+    Returns:
+        Number of result rows created
+    """
+    created = 0
+    try:
+        for model, result_id in ((FCSResult, blob.fcs_result_id), (NTAResult, blob.nta_result_id)):
+            if result_id is None:
+                continue
+            source = await db.get(model, result_id)
+            if source is None:
+                continue
+            already_linked = await db.scalar(select(func.count()).where(
+                model.sample_id == sample_db_id,
+                model.parquet_file_path == source.parquet_file_path,
+            ))
+            if already_linked:
+                continue
+            values = {
+                column.name: getattr(source, column.name) for column in model.__table__.columns
+                if column.name not in ("id", "sample_id", "processed_at")
+            }
+            db.add(model(sample_id=sample_db_id, **values))
+            created += 1
+        await db.commit()
+        await _invalidate_sample_by_db_id(db, sample_db_id)
+        
+        logger.success(f"✅ Linked {created} existing result(s) to sample ID {sample_db_id}")
+        return created
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to link results of blob {blob.sha256[:12]}: {e}")
+        raise
+
+
 # ============================================================================
 # QC Report CRUD Operations
 # ============================================================================
@@ -566,6 +1240,7 @@ async def create_qc_report(
         db.add(qc_report)
         await db.commit()
         await db.refresh(qc_report)
+        await _invalidate_sample_by_db_id(db, sample_id)
         
         logger.success(f"✅ Created QC report for sample ID {sample_id}: {qc_status}")
         return qc_report
@@ -598,92 +1273,294 @@ async def get_qc_reports_by_sample(
 
 
 # ============================================================================
-# Utility Functions
+# Bulk Operations
 # ============================================================================
+# Batch runs and backfills produce thousands of rows; the create_* functions
+# above cost one INSERT, commit and refresh per row. These variants write a
+# whole batch with a single executemany INSERT (batched into multi-row
+# INSERT ... VALUES statements by the driver) and one commit, and do not
+# return ORM objects. For very large PostgreSQL loads see
+# src/database/bulk_load.py (COPY).
 
-async def get_sample_counts(db: AsyncSession) -> Dict[str, int]:
+def _uniform_rows(rows: Sequence[Dict[str, Any]], **defaults: Any) -> List[Dict[str, Any]]:
     """
-    Get counts of samples by status.
+    Give all rows the same keys (executemany needs one column set).
+
+    Keys missing from a row are filled from defaults, else None.
+    """
+    keys = set(defaults)
+    for row in rows:
+        keys.update(row)
+    return [{key: row.get(key, defaults.get(key)) for key in keys} for row in rows]
+
+
+async def _bulk_insert(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> int:  # type: ignore[no-untyped-def]
+    """Insert rows into a model's table in one executemany statement and commit."""
+    if not rows:
+        return 0
+    try:
+        await db.execute(insert(model.__table__), rows)
+        await db.commit()
+        logger.success(f"✅ Inserted {len(rows)} rows into {model.__tablename__}")
+        return len(rows)
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to bulk insert into {model.__tablename__}: {e}")
+        raise
+
+
+async def invalidate_samples_by_db_ids(db: AsyncSession, sample_db_ids: Sequence[int]) -> None:
+    """Invalidate cached API responses of several samples (one query)."""
+    ids = {sample_db_id for sample_db_id in sample_db_ids if sample_db_id is not None}
+    if not ids:
+        return
+    rows = await db.execute(select(Sample.sample_id).where(Sample.id.in_(ids)))
+    for sample_id in rows.scalars():
+        await _notify_sample(sample_id)
+
+
+async def bulk_create_fcs_results(db: AsyncSession, results: Sequence[Dict[str, Any]]) -> int:
+    """
+    Create many FCS results in one statement.
     
     Args:
         db: Database session
+        results: Dicts of FCSResult fields, each with sample_id (database ID)
         
     Returns:
-        Dictionary with counts
+        Number of rows inserted
+    """
+    count = await _bulk_insert(db, FCSResult, _uniform_rows(results))
+    await invalidate_samples_by_db_ids(db, [row["sample_id"] for row in results])
+    return count
+
+
+async def bulk_create_nta_results(db: AsyncSession, results: Sequence[Dict[str, Any]]) -> int:
     """
-    # Total samples
-    total_query = select(func.count()).select_from(Sample)
-    total = (await db.execute(total_query)).scalar() or 0
+    Create many NTA results in one statement.
     
-    # By processing status
-    pending_query = select(func.count()).select_from(Sample).where(  # type: ignore[arg-type]
-        Sample.processing_status == ProcessingStatus.PENDING
-    )
-    pending = (await db.execute(pending_query)).scalar() or 0
+    Args:
+        db: Database session
+        results: Dicts of NTAResult fields, each with sample_id (database ID)
+        
+    Returns:
+        Number of rows inserted
+    """
+    count = await _bulk_insert(db, NTAResult, _uniform_rows(results))
+    await invalidate_samples_by_db_ids(db, [row["sample_id"] for row in results])
+    return count
+
+
+async def bulk_create_qc_reports(db: AsyncSession, reports: Sequence[Dict[str, Any]]) -> int:
+    """
+    Create many QC reports in one statement.
     
-    processing_query = select(func.count()).select_from(Sample).where(  # type: ignore[arg-type]
-        Sample.processing_status == ProcessingStatus.RUNNING
-    )
-    processing = (await db.execute(processing_query)).scalar() or 0
+    Args:
+        db: Database session
+        reports: Dicts of QCReport fields (sample_id, instrument_type,
+            qc_status, checks_performed, checks_passed, checks_failed, ...)
+        
+    Returns:
+        Number of rows inserted
+    """
+    count = await _bulk_insert(db, QCReport, _uniform_rows(reports))
+    await invalidate_samples_by_db_ids(db, [row["sample_id"] for row in reports])
+    return count
+
+
+async def bulk_create_processing_jobs(db: AsyncSession, jobs: Sequence[Dict[str, Any]]) -> int:
+    """
+    Create many pending processing jobs in one statement.
     
-    completed_query = select(func.count()).select_from(Sample).where(  # type: ignore[arg-type]
-        Sample.processing_status == ProcessingStatus.COMPLETED
-    )
-    completed = (await db.execute(completed_query)).scalar() or 0
+    Args:
+        db: Database session
+        jobs: Dicts with job_id, job_type and optionally sample_id, parameters
+        
+    Returns:
+        Number of rows inserted
+    """
+    rows = _uniform_rows(jobs, status="pending", progress_percent=0, attempts=0)
+    count = await _bulk_insert(db, ProcessingJob, rows)
+    invalidate_status_counts()
+    return count
+
+
+async def _bulk_upsert(db: AsyncSession, model, rows: Sequence[Dict[str, Any]]) -> Dict[str, int]:  # type: ignore[no-untyped-def]
+    """
+    Insert or update result rows keyed by parquet_file_path.
+
+    Rows whose Parquet file is already recorded update that result (one
+    executemany UPDATE by primary key); the rest are inserted (one
+    executemany INSERT). Both happen in one transaction.
+    """
+    if not rows:
+        return {"inserted": 0, "updated": 0}
+    paths = [row["parquet_file_path"] for row in rows]
+    existing = dict((await db.execute(
+        select(model.parquet_file_path, model.id).where(model.parquet_file_path.in_(paths))
+    )).all())
+
+    updates = [{**row, "id": existing[row["parquet_file_path"]]} for row in rows if row["parquet_file_path"] in existing]
+    inserts = _uniform_rows([row for row in rows if row["parquet_file_path"] not in existing])
+    try:
+        if updates:
+            await db.execute(update(model), updates)  # ORM bulk UPDATE by primary key
+        if inserts:
+            await db.execute(insert(model.__table__), inserts)
+        await db.commit()
+        logger.success(f"✅ Upserted {model.__tablename__}: {len(inserts)} inserted, {len(updates)} updated")
+        
+    except Exception as e:
+        await db.rollback()
+        logger.exception(f"❌ Failed to upsert {model.__tablename__}: {e}")
+        raise
     
-    failed_query = select(func.count()).select_from(Sample).where(
-        Sample.processing_status == ProcessingStatus.FAILED
-    )
-    failed = (await db.execute(failed_query)).scalar() or 0
+    await invalidate_samples_by_db_ids(db, [row["sample_id"] for row in rows])
+    return {"inserted": len(inserts), "updated": len(updates)}
+
+
+async def bulk_upsert_fcs_results(db: AsyncSession, results: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Insert or update many FCS results, matched on parquet_file_path.
     
-    return {
-        "total": total,
-        "pending": pending,
-        "processing": processing,
-        "completed": completed,
-        "failed": failed,
-    }
+    Args:
+        db: Database session
+        results: Dicts of FCSResult fields, each with sample_id and parquet_file_path
+        
+    Returns:
+        Dictionary with inserted and updated counts
+    """
+    return await _bulk_upsert(db, FCSResult, results)
 
 
-async def get_job_counts(db: AsyncSession) -> Dict[str, int]:
+async def bulk_upsert_nta_results(db: AsyncSession, results: Sequence[Dict[str, Any]]) -> Dict[str, int]:
     """
-    Get counts of jobs by status.
+    Insert or update many NTA results, matched on parquet_file_path.
     
     Args:
         db: Database session
+        results: Dicts of NTAResult fields, each with sample_id and parquet_file_path
         
     Returns:
-        Dictionary with counts
+        Dictionary with inserted and updated counts
     """
-    # Total jobs
-    total_query = select(func.count()).select_from(ProcessingJob)
-    total = (await db.execute(total_query)).scalar() or 0
+    return await _bulk_upsert(db, NTAResult, results)
+
+
+async def get_or_create_sample_ids(
+    db: AsyncSession,
+    samples: Dict[str, Dict[str, Any]],
+) -> Dict[str, int]:
+    """
+    Map sample identifiers to database IDs, creating missing samples in bulk.
     
-    # By status
-    pending_query = select(func.count()).select_from(ProcessingJob).where(
-        ProcessingJob.status == "pending"
-    )
-    pending = (await db.execute(pending_query)).scalar() or 0
+    Args:
+        db: Database session
+        samples: sample_id → fields for a new Sample (biological_sample_id,
+            treatment, ...; defaults as in create_sample())
+        
+    Returns:
+        Dictionary of sample_id → database ID for all requested samples
+    """
+    if not samples:
+        return {}
+    query = select(Sample.sample_id, Sample.id).where(Sample.sample_id.in_(list(samples)))
+    ids = {sample_id: db_id for sample_id, db_id in (await db.execute(query)).all()}
     
-    running_query = select(func.count()).select_from(ProcessingJob).where(
-        ProcessingJob.status == "running"
-    )
-    running = (await db.execute(running_query)).scalar() or 0
+    missing = [
+        {
+            **fields,
+            "sample_id": sample_id,
+            "biological_sample_id": fields.get("biological_sample_id") or sample_id,
+            "treatment": fields.get("treatment") or "Unknown",
+        }
+        for sample_id, fields in samples.items() if sample_id not in ids
+    ]
+    if missing:
+        rows = _uniform_rows(
+            missing,
+            processing_status=ProcessingStatus.COMPLETED.value,  # Created from processed outputs
+            qc_status=QCStatus.PENDING.value,
+        )
+        await _bulk_insert(db, Sample, rows)
+        invalidate_status_counts()
+        query = select(Sample.sample_id, Sample.id).where(Sample.sample_id.in_([row["sample_id"] for row in missing]))
+        ids.update({sample_id: db_id for sample_id, db_id in (await db.execute(query)).all()})
+    return ids
+
+
+# ============================================================================
+# Utility Functions
+# ============================================================================
+
+# Status counters are polled by the dashboard (/status). They are cached
+# for settings.status_cache_ttl_seconds and dropped on every sample/job
+# state change made through this module. Changes made by other processes
+# (standalone workers) become visible when the TTL expires.
+_status_counts_cache: Dict[str, tuple] = {}
+
+
+def invalidate_status_counts() -> None:
+    """Drop cached sample/job counters (call after any status change)."""
+    _status_counts_cache.clear()
+
+
+async def _grouped_counts(db: AsyncSession, column, key: str) -> Dict[str, int]:  # type: ignore[no-untyped-def]
+    """
+    Row counts per status value with one GROUP BY query, cached.
     
-    completed_query = select(func.count()).select_from(ProcessingJob).where(
-        ProcessingJob.status == "completed"
-    )
-    completed = (await db.execute(completed_query)).scalar() or 0
+    Returns:
+        Dictionary of status → count plus "total"
+    """
+    cached = _status_counts_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return dict(cached[1])
     
-    failed_query = select(func.count()).select_from(ProcessingJob).where(
-        ProcessingJob.status == "failed"
-    )
-    failed = (await db.execute(failed_query)).scalar() or 0
+    rows = (await db.execute(select(column, func.count()).group_by(column))).all()
+    counts = {str(getattr(status, 'value', status)): count for status, count in rows}
+    counts["total"] = sum(counts.values())
+    
+    _status_counts_cache[key] = (time.monotonic() + settings.status_cache_ttl_seconds, counts)
+    return dict(counts)
+
+
+async def get_sample_counts(db: AsyncSession) -> Dict[str, int]:
+    """
+    Get counts of samples by status.
     
+    Args:
+        db: Database session
+        
+    Returns:
+        Dictionary with counts
+    """
+    counts = await _grouped_counts(db, Sample.processing_status, "samples")
+    return {
+        "total": counts["total"],
+        "pending": counts.get(ProcessingStatus.PENDING.value, 0),
+        "processing": counts.get(ProcessingStatus.RUNNING.value, 0),
+        "completed": counts.get(ProcessingStatus.COMPLETED.value, 0),
+        "failed": counts.get(ProcessingStatus.FAILED.value, 0),
+    }
+
+
+async def get_job_counts(db: AsyncSession) -> Dict[str, int]:
+    """
+    Get counts of jobs by status.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Dictionary with counts
+    """
+    counts = await _grouped_counts(db, ProcessingJob.status, "jobs")
     return {
-        "total": total,
-        "pending": pending,
-        "running": running,
-        "completed": completed,
-        "failed": failed,
+        "total": counts["total"],
+        "pending": counts.get("pending", 0),
+        "running": counts.get("running", 0),
+        "completed": counts.get("completed", 0),
+        "failed": counts.get("failed", 0),
+        "cancelled": counts.get("cancelled", 0),
     }
@@ -11,8 +11,9 @@ Tables:
 4. tem_results      - Transmission electron microscopy results (future)
 5. processing_jobs  - Async processing job queue
 6. qc_reports       - Quality control reports
-7. users            - User accounts (future)
-8. audit_log        - Activity audit trail
+7. file_blobs       - Content-addressed uploads (deduplication)
+8. users            - User accounts (future)
+9. audit_log        - Activity audit trail
 
 Author: CRMIT Backend Team
 Date: November 21, 2025
@@ -116,6 +117,7 @@ class Sample(Base):
     __table_args__ = (
         Index('idx_sample_treatment_date', 'treatment', 'experiment_date'),
         Index('idx_sample_status', 'processing_status', 'qc_status'),
+        Index('idx_sample_upload_id', 'upload_timestamp', 'id'),  # Keyset pagination
     )
     
     def __repr__(self) -> str:
@@ -273,11 +275,20 @@ class ProcessingJob(Base):
     progress_percent = Column(Integer, nullable=False, default=0)
     current_step = Column(String(255), nullable=True)
     
+    # Input
+    parameters = Column(JSON, nullable=True)  # e.g. {"file_path": "data/uploads/..."}; reused by retries
+    
     # Results
     result_data = Column(JSON, nullable=True)  # Arbitrary result data
     error_message = Column(Text, nullable=True)
     error_traceback = Column(Text, nullable=True)
     
+    # Worker Lease (set when a worker claims the job, renewed by heartbeats)
+    worker_id = Column(String(100), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    heartbeat_at = Column(DateTime, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     started_at = Column(DateTime, nullable=True)
@@ -289,6 +300,8 @@ class ProcessingJob(Base):
     # Indexes
     __table_args__ = (
         Index('idx_job_status_created', 'status', 'created_at'),
+        Index('idx_job_status_lease', 'status', 'lease_expires_at'),
+        Index('idx_job_created_id', 'created_at', 'id'),  # Keyset pagination
     )
     
     def __repr__(self) -> str:
@@ -342,6 +355,43 @@ class QCReport(Base):
         return f"<QCReport(id={self.id}, sample_id={self.sample_id}, status='{self.qc_status}')>"
 
 
+# ============================================================================
+# File Blobs
+# ============================================================================
+
+class FileBlob(Base):
+    """
+    Uploaded file content, addressed by SHA-256.
+    
+    One row per distinct file content. A re-upload of the same bytes
+    reuses the stored file and, once it has been processed, the parsed
+    results instead of storing and parsing it again.
+    """
+    __tablename__ = "file_blobs"
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Content
+    sha256 = Column(String(64), unique=True, nullable=False, index=True)
+    size_bytes = Column(Integer, nullable=False)
+    file_type = Column(String(10), nullable=False)  # "fcs", "nta"
+    storage_path = Column(Text, nullable=False)  # As passed to processing jobs
+    
+    # Processing (set when the first job for this content saves its results)
+    job_id = Column(String(100), nullable=True)
+    fcs_result_id = Column(Integer, ForeignKey("fcs_results.id", ondelete="SET NULL"), nullable=True)
+    nta_result_id = Column(Integer, ForeignKey("nta_results.id", ondelete="SET NULL"), nullable=True)
+    
+    # Usage
+    upload_count = Column(Integer, nullable=False, default=1, server_default="1")
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    last_uploaded_at = Column(DateTime, nullable=False, server_default=func.now())
+    
+    def __repr__(self) -> str:
+        return f"<FileBlob(id={self.id}, sha256='{self.sha256[:12]}', uploads={self.upload_count})>"
+
+
 # ============================================================================
 # User Management (Future)
 # ============================================================================
@@ -1,9 +1,28 @@
 ﻿"""
 Data parsers for different instrument types.
+
+Exports are loaded on first access, so importing e.g.
+src.parsers.parquet_reader does not pull in fcsparser and pandas.
 """
 
-from .base_parser import BaseParser
-from .fcs_parser import FCSParser
-from .parquet_writer import ParquetWriter
+from importlib import import_module
+from typing import Any
+
+# Exported name → submodule
+_EXPORTS = {
+    'BaseParser': '.base_parser',
+    'FCSParser': '.fcs_parser',
+    'ParquetWriter': '.parquet_writer',
+    'ParquetAppendWriter': '.parquet_writer',
+    'ParquetReader': '.parquet_reader',
+}
+
+__all__ = ['BaseParser', 'FCSParser', 'ParquetWriter', 'ParquetAppendWriter', 'ParquetReader']
+
 
-__all__ = ['BaseParser', 'FCSParser', 'ParquetWriter']
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
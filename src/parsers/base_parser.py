@@ -4,12 +4,15 @@ Base parser class for all instrument data parsers.
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 from loguru import logger
 
+from .parquet_writer import DEFAULT_ROW_GROUP_SIZE, encode_metadata
+
 
 class BaseParser(ABC):
     """Abstract base class for all data parsers."""
@@ -24,6 +27,9 @@ class BaseParser(ABC):
         self.file_path = Path(file_path)
         self.metadata: Dict[str, Any] = {}
         self.data: Optional[pd.DataFrame] = None
+        # Arrow-native parse result (see FCSParser.parse_arrow); when set,
+        # self.data is only materialized on demand via to_pandas()
+        self.table: Optional[pa.Table] = None
         
     @abstractmethod
     def parse(self) -> pd.DataFrame:
@@ -55,6 +61,57 @@ class BaseParser(ABC):
         """
         pass
     
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Get parsed data as a DataFrame, converting from Arrow on first use.
+        
+        Returns:
+            Parsed data as DataFrame
+        """
+        if self.data is None:
+            if self.table is None:
+                raise ValueError("No data available. Call parse() first.")
+            self.data = self.table.to_pandas()
+        return self.data
+    
+    def column_names(self) -> List[str]:
+        """Column names of the parsed data (Arrow or pandas)."""
+        if self.table is not None:
+            return list(self.table.column_names)
+        if self.data is not None:
+            return list(self.data.columns)
+        return []
+    
+    def event_count(self) -> int:
+        """Number of parsed rows (Arrow or pandas)."""
+        if self.table is not None:
+            return self.table.num_rows
+        if self.data is not None:
+            return len(self.data)
+        return 0
+    
+    def column_values(self, column: str) -> np.ndarray:
+        """
+        Get a column as a NumPy array.
+        
+        For Arrow-backed parsers this is a zero-copy view of the Arrow
+        buffer when the column is a single null-free numeric chunk.
+        
+        Args:
+            column: Column name
+        
+        Returns:
+            Column values (read-only when backed by Arrow)
+        """
+        if self.table is not None:
+            chunked = self.table.column(column)
+            if chunked.num_chunks == 1:
+                return chunked.chunk(0).to_numpy(zero_copy_only=False)
+            return chunked.to_numpy()
+        if self.data is not None:
+            return self.data[column].to_numpy()
+        raise ValueError("No data available. Call parse() first.")
+    
     def to_parquet(
         self, 
         output_path: Path, 
@@ -73,8 +130,8 @@ class BaseParser(ABC):
         -------------
         1. Validate data exists (must call parse() first)
         2. Create output directory if needed
-        3. Convert pandas DataFrame to PyArrow Table
-        4. Embed metadata in Parquet file header
+        3. Use the Arrow Table directly, or convert the DataFrame (without the index)
+        4. Attach metadata to the schema as one JSON entry
         5. Write with compression and optimizations
         6. Log file size for monitoring
         
@@ -89,7 +146,7 @@ class BaseParser(ABC):
         # Step 1: Validate that data has been parsed
         # -------------------------------------------
         # If parse() hasn't been called yet, self.data will be None
-        if self.data is None:
+        if self.data is None and self.table is None:
             raise ValueError("No data to convert. Call parse() first.")
         
         # Step 2: Create output directory if it doesn't exist
@@ -103,17 +160,20 @@ class BaseParser(ABC):
         # Step 3: Convert pandas DataFrame to Apache Arrow Table
         # -------------------------------------------------------
         # Arrow is columnar in-memory format (like Parquet but uncompressed)
-        # Benefits of Arrow intermediate step:
-        # - Type safety: pandas int64 -> Arrow int64 -> Parquet INT64
-        # - Memory efficiency: Zero-copy when possible
-        # - Fast conversion: Native C++ implementation
-        table = pa.Table.from_pandas(self.data)
-        
-        # Step 4: Prepare metadata to embed in Parquet file
-        # --------------------------------------------------
-        # Parquet files can store custom key-value metadata in the header
-        # This is separate from the data itself (doesn't affect queries)
-        # Useful for: provenance, processing history, quality metrics
+        # Arrow-native parsers already hold a Table: persist it as-is.
+        # Otherwise preserve_index=False: the RangeIndex carries no
+        # information, and materializing it would add an int64 column per event
+        if self.table is not None:
+            table = self.table
+        else:
+            table = pa.Table.from_pandas(self.data, preserve_index=False)
+        
+        # Step 4: Attach metadata to the schema
+        # --------------------------------------
+        # Parquet files can store custom key-value metadata in the footer
+        # Provenance + all parsed metadata (FCS TEXT keywords can number in
+        # the hundreds) are stored as ONE compact JSON entry under
+        # METADATA_KEY; read back with ParquetWriter.read_with_metadata().
         metadata_dict = {
             'source_file': str(self.file_path),     # Original FCS filename
             'parser_version': '1.0.0',              # Track parser version
@@ -121,27 +181,17 @@ class BaseParser(ABC):
         }
         
         # Add any additional metadata passed by caller
-        # Example: {'qc_passed': 'True', 'analyst': 'John'}
+        # Example: {'qc_passed': True, 'analyst': 'John'}
         if metadata:
             metadata_dict.update(metadata)
         
-        # Step 5: Convert metadata to bytes (Parquet requirement)
-        # --------------------------------------------------------
-        # Parquet metadata must be bytes, not strings
-        # Convert: {'key': 'value'} -> {b'key': b'value'}
-        metadata_bytes = {
-            k.encode(): str(v).encode() 
-            for k, v in metadata_dict.items()
-        }
-        
-        # Step 6: Attach metadata to Arrow Table schema
-        # ----------------------------------------------
-        # Schema defines column names, types, and file-level metadata
-        # Create new schema with our custom metadata attached
-        schema = table.schema.with_metadata(metadata_bytes)
-        table = table.cast(schema)  # Apply new schema to table
+        # replace_schema_metadata only swaps the schema object; unlike
+        # table.cast(schema) it does not rebuild the column buffers
+        table = table.replace_schema_metadata(
+            encode_metadata(metadata_dict, table.schema.metadata)
+        )
         
-        # Step 7: Write to Parquet file with optimizations
+        # Step 5: Write to Parquet file with optimizations
         # -------------------------------------------------
         pq.write_table(
             table, 
@@ -149,6 +199,7 @@ class BaseParser(ABC):
             compression=compression,       # Compress data (snappy=fast, gzip=small)
             use_dictionary=True,           # Encode repeated values once (saves space)
             write_statistics=True,         # Min/max per column (faster queries)
+            row_group_size=DEFAULT_ROW_GROUP_SIZE,
             version='2.6'                  # Latest Parquet format (best features)
         )
         # Dictionary encoding example:
@@ -159,7 +210,7 @@ class BaseParser(ABC):
         # Store: column_FSC_min=100, column_FSC_max=50000
         # Query: SELECT * WHERE FSC > 60000 → Skip file instantly (no read)
         
-        # Step 8: Log file size for monitoring
+        # Step 6: Log file size for monitoring
         # -------------------------------------
         # Get file size in MB to track compression ratio
         file_size_mb = output_path.stat().st_size / (1024 * 1024)
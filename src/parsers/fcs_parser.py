@@ -4,10 +4,12 @@ Supports FCS 2.0, 3.0, and 3.1 formats with memory-efficient chunked processing.
 """
 
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Union
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import fcsparser
+from fcsparser.api import FCSParser as _FCSFile
 from loguru import logger
 import gc
 
@@ -129,6 +131,7 @@ class FCSParser(BaseParser):
             data['is_baseline'] = self.is_baseline
             data['file_name'] = self.file_path.name
             data['instrument_type'] = 'flow_cytometry'
+            data['acquisition_date'] = self._acquisition_date()
             data['parse_timestamp'] = pd.Timestamp.now()
             self.data = data
             
@@ -153,6 +156,109 @@ class FCSParser(BaseParser):
             logger.error(f"Failed to parse FCS file: {e}")
             raise
     
+    def parse_arrow(self, dtype: Optional[Any] = None) -> pa.Table:
+        """
+        Parse FCS file directly into an Arrow Table, bypassing pandas.
+        
+        The DATA segment is decoded by fcsparser into one NumPy array and
+        transposed once into contiguous columns; each column is then
+        wrapped as an Arrow array without copying. Channels keep the
+        file's data type ($DATATYPE F/D/I, as parse() does) unless dtype
+        is given. Metadata columns are dictionary-encoded (one value +
+        int32 indices) instead of per-event Python objects. Use
+        to_pandas() when a DataFrame is needed (e.g. plotting);
+        statistics, QC and to_parquet() work on the Table directly.
+        
+        Args:
+            dtype: Cast every channel to this NumPy dtype (e.g. np.float32
+                to halve memory for float64 files, at the cost of
+                precision). Default: keep the source dtype
+        
+        Returns:
+            Arrow Table with all events and metadata columns
+        """
+        try:
+            logger.info(f"Parsing FCS file (Arrow): {self.file_path.name}")
+            
+            fcs = _FCSFile(str(self.file_path), read_data=True)
+            fcs.reformat_meta()
+            self.metadata = fcs.annotation
+            self._extract_identifiers()
+            
+            self.channel_names = list(fcs.get_channel_names())
+            raw = fcs.data
+            
+            # Single copy: row-major events x channels -> column-major,
+            # native byte order (Arrow cannot wrap swapped arrays)
+            if raw.dtype.names:
+                columns = [
+                    np.ascontiguousarray(raw[name], dtype=dtype or raw.dtype[name].newbyteorder('='))
+                    for name in raw.dtype.names
+                ]
+            else:
+                matrix = np.ascontiguousarray(raw.T, dtype=dtype or raw.dtype.newbyteorder('='))
+                columns = [matrix[i] for i in range(matrix.shape[0])]
+            del raw, fcs
+            
+            n_events = len(columns[0]) if columns else 0
+            arrays: List[pa.Array] = [pa.array(col) for col in columns]
+            names = list(self.channel_names)
+            
+            metadata_columns = {
+                'sample_id': self.sample_id,
+                'biological_sample_id': self.biological_sample_id,
+                'measurement_id': self.measurement_id,
+                'is_baseline': self.is_baseline,
+                'file_name': self.file_path.name,
+                'instrument_type': 'flow_cytometry',
+                'acquisition_date': self._acquisition_date(),
+                'parse_timestamp': pd.Timestamp.now(),
+            }
+            for name, value in metadata_columns.items():
+                names.append(name)
+                arrays.append(self._constant_array(value, n_events))
+            
+            self.table = pa.Table.from_arrays(arrays, names=names)
+            self.data = None
+            logger.info(f"Found {len(self.channel_names)} channels: {self.channel_names[:5]}...")
+            
+            if self.compensate and self._has_compensation_matrix():
+                logger.warning("Compensation not yet fully implemented")
+            
+            logger.info(f"Γ£ô Parsed {n_events:,} events from {self.file_path.name}")
+            return self.table
+            
+        except Exception as e:
+            logger.error(f"Failed to parse FCS file: {e}")
+            raise
+    
+    def iter_record_batches(self, batch_size: Optional[int] = None) -> Iterator[pa.RecordBatch]:
+        """
+        Iterate over parsed events as Arrow RecordBatches.
+        
+        Batches are zero-copy slices of the parsed Table.
+        
+        Args:
+            batch_size: Events per batch (default: self.chunk_size)
+        
+        Yields:
+            RecordBatch of at most batch_size events
+        """
+        if self.table is None:
+            self.parse_arrow()
+        assert self.table is not None
+        yield from self.table.to_batches(max_chunksize=batch_size or self.chunk_size)
+    
+    @staticmethod
+    def _constant_array(value: Any, length: int) -> pa.Array:
+        """Build a column holding one repeated value without per-row objects."""
+        if isinstance(value, bool):
+            return pa.array(np.full(length, value, dtype=bool))
+        if isinstance(value, pd.Timestamp):
+            return pa.array(np.full(length, value.to_datetime64(), dtype='datetime64[us]'))
+        dictionary = pa.array([value], type=pa.string())
+        return pa.DictionaryArray.from_arrays(pa.array(np.zeros(length, dtype=np.int32)), dictionary)
+    
     def _extract_identifiers(self) -> None:
         """
         Extract sample identifiers from filename.
@@ -240,6 +346,22 @@ class FCSParser(BaseParser):
         logger.info(f"Extracted IDs: biological={self.biological_sample_id}, "
                    f"measurement={self.measurement_id}, baseline={self.is_baseline}")
     
+    def _acquisition_date(self) -> str:
+        """
+        Normalize the $DATE keyword to ISO format (YYYY-MM-DD).
+        
+        Used as a partition key for event datasets, so it must be stable
+        and filesystem-safe. Returns 'unknown' when $DATE is missing or
+        cannot be parsed (e.g. "19-FEB-2025" parses, "n/a" does not).
+        """
+        raw = self.metadata.get('$DATE')
+        if not raw:
+            return 'unknown'
+        parsed = pd.to_datetime(str(raw), errors='coerce')
+        if pd.isna(parsed):
+            return 'unknown'
+        return parsed.strftime('%Y-%m-%d')
+    
     def extract_metadata(self) -> Dict[str, Any]:
         """
         Extract relevant metadata from FCS file.
@@ -306,62 +428,89 @@ class FCSParser(BaseParser):
         logger.warning("Compensation not yet fully implemented")
         return data
     
+    @staticmethod
+    def _channel_stats(values: np.ndarray) -> Dict[str, float]:
+        """
+        Vectorized channel statistics matching pandas semantics.
+        
+        NaNs are skipped; std uses ddof=1; skewness/kurtosis are the
+        bias-corrected sample estimators used by Series.skew()/kurtosis().
+        """
+        values = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+        values = values.astype(np.float64, copy=False)
+        n = values.size
+        if n == 0:
+            nan = float('nan')
+            return {k: nan for k in ('mean', 'median', 'std', 'min', 'max', 'q10', 'q25',
+                                     'q50', 'q75', 'q90', 'q95', 'cv', 'iqr', 'skewness', 'kurtosis')}
+        
+        mean_val = float(values.mean())
+        std_val = float(values.std(ddof=1)) if n > 1 else float('nan')
+        q10, q25, q50, q75, q90, q95 = np.percentile(values, [10, 25, 50, 75, 90, 95])
+        
+        # Central moments for skewness/kurtosis
+        deviations = values - mean_val
+        m2 = float(np.mean(deviations ** 2))
+        skew_float = float('nan')
+        kurt_float = float('nan')
+        if m2 > 0:
+            m3 = float(np.mean(deviations ** 3))
+            m4 = float(np.mean(deviations ** 4))
+            if n > 2:
+                skew_float = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+            if n > 3:
+                g2 = m4 / m2 ** 2 - 3
+                kurt_float = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+        elif n > 3:
+            skew_float = 0.0
+            kurt_float = 0.0
+        
+        return {
+            'mean': mean_val,
+            'median': float(q50),
+            'std': std_val,
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'q10': float(q10),
+            'q25': float(q25),
+            'q50': float(q50),
+            'q75': float(q75),
+            'q90': float(q90),
+            'q95': float(q95),
+            'cv': float(std_val / mean_val) if mean_val != 0 else 0,
+            'iqr': float(q75 - q25),
+            'skewness': float(skew_float),
+            'kurtosis': float(kurt_float),
+        }
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Calculate comprehensive statistics for each channel.
         Pre-calculates stats to avoid loading raw events for every analysis.
         
+        Works on NumPy views of either the Arrow Table (parse_arrow) or
+        the DataFrame (parse), so no pandas conversion is triggered.
+        
         Returns:
             Dictionary of channel statistics
         """
-        if self.data is None:
+        if self.data is None and self.table is None:
             raise ValueError("No data available. Call parse() first.")
         
         stats = {}
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
-        
-        for col in numeric_cols:
-            if col in self.channel_names:
-                series = self.data[col]
-                mean_val = series.mean()
-                std_val = series.std()
-                
-                # Calculate skewness and kurtosis - handle potential complex numbers
-                skew_val = series.skew()
-                kurt_val = series.kurtosis()
-                
-                # Convert to float, handling complex numbers if they occur
-                if isinstance(skew_val, complex):
-                    skew_float = float(skew_val.real)
-                else:
-                    skew_float = float(skew_val)
-                
-                if isinstance(kurt_val, complex):
-                    kurt_float = float(kurt_val.real)
-                else:
-                    kurt_float = float(kurt_val)
-                
-                stats[col] = {
-                    'mean': float(mean_val),
-                    'median': float(series.median()),
-                    'std': float(std_val),
-                    'min': float(series.min()),
-                    'max': float(series.max()),
-                    'q10': float(series.quantile(0.10)),
-                    'q25': float(series.quantile(0.25)),
-                    'q50': float(series.quantile(0.50)),
-                    'q75': float(series.quantile(0.75)),
-                    'q90': float(series.quantile(0.90)),
-                    'q95': float(series.quantile(0.95)),
-                    'cv': float(std_val / mean_val) if mean_val != 0 else 0,
-                    'iqr': float(series.quantile(0.75) - series.quantile(0.25)),
-                    'skewness': skew_float,
-                    'kurtosis': kurt_float,
-                }
+        columns = self.column_names()
+        
+        for col in self.channel_names:
+            if col not in columns:
+                continue
+            values = self.column_values(col)
+            if values.dtype.kind not in 'iuf':
+                continue
+            stats[col] = self._channel_stats(values)
         
         # Add overall statistics
         stats['_summary'] = {
-            'total_events': len(self.data),
+            'total_events': self.event_count(),
             'sample_id': self.sample_id,
             'biological_sample_id': self.biological_sample_id,
             'measurement_id': self.measurement_id,
@@ -379,7 +528,7 @@ class FCSParser(BaseParser):
         Returns:
             Dictionary with QC results
         """
-        if self.data is None:
+        if self.data is None and self.table is None:
             raise ValueError("No data available. Call parse() first.")
         
         qc_results = {
@@ -387,9 +536,10 @@ class FCSParser(BaseParser):
             'warnings': [],
             'errors': [],
         }
+        columns = self.column_names()
         
         # Check 1: Minimum event count
-        event_count = len(self.data)
+        event_count = self.event_count()
         if event_count < 1000:
             qc_results['passed'] = False
             qc_results['errors'].append(
@@ -399,7 +549,7 @@ class FCSParser(BaseParser):
         # Check 2: Required channels present (check all naming conventions)
         channels_found = False
         for channel_set in self.REQUIRED_CHANNELS:
-            if all(ch in self.data.columns for ch in channel_set):
+            if all(ch in columns for ch in channel_set):
                 channels_found = True
                 qc_results['detected_channels'] = channel_set
                 break
@@ -411,18 +561,23 @@ class FCSParser(BaseParser):
             )
         
         # Check 3: Check for negative FSC/SSC values (should be rare)
-        fsc_cols = [col for col in self.data.columns if 'FSC' in col and '-A' in col]
-        ssc_cols = [col for col in self.data.columns if 'SSC' in col and '-A' in col]
+        fsc_cols = [col for col in columns if 'FSC' in col and '-A' in col]
+        ssc_cols = [col for col in columns if 'SSC' in col and '-A' in col]
         
         for col in fsc_cols + ssc_cols:
-            neg_count = (self.data[col] < 0).sum()
-            if neg_count > len(self.data) * 0.01:  # More than 1% negative
+            neg_count = int((self.column_values(col) < 0).sum())
+            if neg_count > event_count * 0.01:  # More than 1% negative
                 qc_results['warnings'].append(
-                    f"High negative {col} values: {neg_count} events ({neg_count/len(self.data)*100:.1f}%)"
+                    f"High negative {col} values: {neg_count} events ({neg_count/event_count*100:.1f}%)"
                 )
         
         # Check 4: Data completeness (no NaN)
-        nan_count = self.data.isnull().sum().sum()
+        nan_count = 0
+        for col in self.channel_names:
+            if col in columns:
+                values = self.column_values(col)
+                if values.dtype.kind == 'f':
+                    nan_count += int(np.isnan(values).sum())
         if nan_count > 0:
             qc_results['warnings'].append(
                 f"Missing values detected: {nan_count} NaN entries"
@@ -430,8 +585,11 @@ class FCSParser(BaseParser):
         
         # Check 5: Extreme outliers (beyond typical flow cytometry range)
         for col in self.channel_names:
-            if col in self.data.columns:
-                max_val = self.data[col].max()
+            if col in columns:
+                values = self.column_values(col)
+                if values.size == 0:
+                    continue
+                max_val = np.nanmax(values)
                 # Typical max for flow cytometry is 2^18 (262144) or 2^20 (1048576)
                 if max_val > 1048576:
                     qc_results['warnings'].append(
@@ -440,7 +598,7 @@ class FCSParser(BaseParser):
         
         # Check 6: Event count consistency
         expected_events = int(self.metadata.get('$TOT', 0))
-        actual_events = len(self.data)
+        actual_events = event_count
         if expected_events > 0 and abs(expected_events - actual_events) > 10:
             qc_results['warnings'].append(
                 f"Event count mismatch: expected {expected_events}, got {actual_events}"
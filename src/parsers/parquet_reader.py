@@ -0,0 +1,221 @@
+"""
+Column-projected Parquet loading for event files.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from loguru import logger
+
+from .parquet_writer import ParquetAppendWriter, ParquetWriter
+
+if TYPE_CHECKING:
+    import pandas as pd  # Loaded on first use (DataFrame input/output only)
+
+
+# Filters accepted by read(): a dataset expression, or the pyarrow DNF list
+# form, e.g. [('particle_size_nm', '>=', 30), ('particle_size_nm', '<=', 200)]
+FilterType = Union[pc.Expression, List[Any], None]
+
+
+class ParquetReader:
+    """
+    Utility class for reading only the columns and row groups a task needs.
+
+    Batch scripts typically need one scatter channel or particle_size_nm
+    out of 30+ columns; reading just those columns (memory-mapped, with
+    row-group pruning on filters) cuts I/O and peak memory proportionally.
+    """
+
+    @staticmethod
+    def columns(parquet_path: Path) -> List[str]:
+        """
+        Get column names from the file schema without reading data.
+
+        Args:
+            parquet_path: Path to Parquet file
+
+        Returns:
+            List of column names
+        """
+        return list(pq.read_schema(parquet_path).names)
+
+    @staticmethod
+    def find_channel(
+        available: Sequence[str],
+        preferred: Optional[str] = None,
+        contains: Sequence[str] = ('FSC', 'H'),
+    ) -> Optional[str]:
+        """
+        Pick a channel: the preferred name if present, else the first
+        column containing all given substrings.
+
+        Args:
+            available: Column names (e.g. from columns())
+            preferred: Channel to use if present (e.g. 'VFSC-H')
+            contains: Substrings the fallback channel must contain
+
+        Returns:
+            Channel name, or None if nothing matches
+        """
+        if preferred and preferred in available:
+            return preferred
+        for col in available:
+            if all(part in col for part in contains):
+                return col
+        return None
+
+    @staticmethod
+    def read(
+        parquet_path: Path,
+        columns: Optional[Sequence[str]] = None,
+        optional_columns: Optional[Sequence[str]] = None,
+        filters: FilterType = None,
+        memory_map: bool = True,
+        as_pandas: bool = True,
+    ) -> Union['pd.DataFrame', pa.Table]:
+        """
+        Read selected columns and matching row groups from a Parquet file.
+
+        Args:
+            parquet_path: Path to Parquet file
+            columns: Required columns (KeyError if any is missing); None reads all
+            optional_columns: Columns to include only if present
+                (e.g. an existing 'particle_size_nm')
+            filters: Row filter; row groups whose statistics cannot match
+                are skipped, remaining rows are filtered exactly
+            memory_map: Memory-map the file instead of buffered reads
+            as_pandas: Return a DataFrame (True) or an Arrow Table (False)
+
+        Returns:
+            DataFrame (with a fresh RangeIndex) or Arrow Table
+
+        Raises:
+            KeyError: If a required column is missing
+        """
+        selected: Optional[List[str]] = None
+        if columns is not None or optional_columns:
+            available = ParquetReader.columns(parquet_path)
+            required = list(columns) if columns is not None else []
+            missing = [col for col in required if col not in available]
+            if missing:
+                raise KeyError(f"Columns not found in {Path(parquet_path).name}: {missing}")
+            selected = required + [
+                col for col in (optional_columns or [])
+                if col in available and col not in required
+            ]
+
+        table = pq.read_table(
+            parquet_path,
+            columns=selected,
+            filters=filters,
+            memory_map=memory_map,
+            use_pandas_metadata=False,
+        )
+        logger.debug(
+            f"Read {table.num_columns} columns x {table.num_rows:,} rows from {Path(parquet_path).name}"
+        )
+        return table.to_pandas() if as_pandas else table
+
+    @staticmethod
+    def iter_row_groups(
+        parquet_path: Path,
+        columns: Optional[Sequence[str]] = None,
+        memory_map: bool = True,
+    ) -> Iterator[pa.Table]:
+        """
+        Iterate over a file one row group at a time.
+
+        Args:
+            parquet_path: Path to Parquet file
+            columns: Columns to read (default: all)
+            memory_map: Memory-map the file
+
+        Yields:
+            Arrow Table for each row group
+        """
+        with pq.ParquetFile(parquet_path, memory_map=memory_map) as pf:
+            for i in range(pf.num_row_groups):
+                yield pf.read_row_group(i, columns=list(columns) if columns is not None else None)
+
+    @staticmethod
+    def write_with_columns(
+        input_path: Path,
+        output_path: Path,
+        new_columns: Union['pd.DataFrame', Dict[str, Any]],
+        row_mask: Optional[np.ndarray] = None,
+        compression: str = 'snappy',
+    ) -> Path:
+        """
+        Rewrite a Parquet file with added/replaced columns, streaming row groups.
+
+        Only one row group of the input is held in memory at a time; the
+        computed columns (typically derived from a column-projected read)
+        are sliced alongside. output_path may equal input_path: the new
+        file is written to a temp file and atomically renamed.
+
+        Args:
+            input_path: Source Parquet file
+            output_path: Destination Parquet file
+            new_columns: Columns to add or replace, one value per kept row
+            row_mask: Optional boolean mask over input rows; rows where it
+                is False are dropped (new_columns align with kept rows). If
+                every row is dropped the output is an empty file with the
+                output schema
+            compression: Compression codec for the output
+
+        Returns:
+            Output path
+        """
+        if isinstance(new_columns, dict):
+            new_arrays = {name: np.asarray(values) for name, values in new_columns.items()}
+        else:
+            new_arrays = {name: new_columns[name].to_numpy() for name in new_columns.columns}
+
+        n_kept = int(np.count_nonzero(row_mask)) if row_mask is not None else pq.read_metadata(input_path).num_rows
+        for name, values in new_arrays.items():
+            if len(values) != n_kept:
+                raise ValueError(f"Column '{name}' has {len(values)} values for {n_kept} rows")
+
+        # Keep provenance metadata; the stale pandas schema entry is dropped
+        metadata = {
+            k: v for k, v in ParquetWriter.read_metadata(input_path).items()
+            if k != 'pandas'
+        }
+
+        # Output schema up front, so a file whose rows are all dropped is
+        # still written (empty, with the new columns) rather than skipped
+        schema = pq.read_schema(input_path).remove_metadata()
+        for name, values in new_arrays.items():
+            # Object arrays have no Arrow type of their own: infer from the values
+            field = pa.field(name, pa.array(values if values.dtype == object else values[:0]).type)
+            if name in schema.names:
+                schema = schema.set(schema.get_field_index(name), field)
+            else:
+                schema = schema.append(field)
+
+        input_offset = 0
+        output_offset = 0
+        with ParquetAppendWriter(
+            output_path, schema=schema, metadata=metadata, compression=compression, keep_partial=False
+        ) as writer:
+            for chunk in ParquetReader.iter_row_groups(input_path):
+                n = chunk.num_rows
+                if row_mask is not None:
+                    chunk = chunk.filter(pa.array(row_mask[input_offset:input_offset + n]))
+                input_offset += n
+
+                kept = chunk.num_rows
+                for name, values in new_arrays.items():
+                    column = pa.array(values[output_offset:output_offset + kept])
+                    if name in chunk.column_names:
+                        chunk = chunk.set_column(chunk.schema.get_field_index(name), name, column)
+                    else:
+                        chunk = chunk.append_column(name, column)
+                output_offset += kept
+                writer.write_batch(chunk.cast(schema))
+
+        return Path(output_path)
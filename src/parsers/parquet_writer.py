@@ -3,19 +3,102 @@ Utility class for writing DataFrames to Parquet with metadata.
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple, Union
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from loguru import logger
 
+if TYPE_CHECKING:
+    import pandas as pd  # Loaded on first use (DataFrame input/output only)
+
+
+# Default hive partition layout for event datasets:
+#   <root>/instrument_type=flow_cytometry/biological_sample_id=P5_F10/acquisition_date=2025-02-19/part-0.parquet
+DEFAULT_PARTITION_COLS = ['instrument_type', 'biological_sample_id', 'acquisition_date']
+
+# Row group sizing: ~128k events per group keeps each column chunk in the
+# low-MB range, small enough for min/max statistics to prune effectively
+# on FSC/SSC range queries while still compressing well.
+DEFAULT_ROW_GROUP_SIZE = 128_000
+
+# Schema metadata key holding all CRMIT/parser metadata as one JSON blob.
+# One compact entry keeps the footer small and avoids hundreds of
+# per-keyword entries for FCS TEXT segments.
+METADATA_KEY = b'crmit_metadata'
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for numpy scalars/arrays and pandas objects in parser metadata."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    pandas = sys.modules.get('pandas')  # No pandas objects unless pandas was imported
+    if pandas is not None:
+        if isinstance(value, pandas.DataFrame):
+            return value.to_dict(orient='list')
+        if isinstance(value, pandas.Series):
+            return value.tolist()
+        if isinstance(value, pandas.Timestamp):
+            return value.isoformat()
+    return str(value)
+
+
+def encode_metadata(
+    metadata: Dict[str, Any],
+    existing: Optional[Dict[bytes, bytes]] = None
+) -> Dict[bytes, bytes]:
+    """
+    Encode metadata as a single JSON entry for an Arrow schema.
+    
+    Args:
+        metadata: Metadata dictionary (values need not be strings)
+        existing: Existing schema metadata to keep (e.g. the b'pandas' entry)
+    
+    Returns:
+        Schema metadata suitable for Table.replace_schema_metadata()
+    """
+    encoded = dict(existing or {})
+    encoded[METADATA_KEY] = json.dumps(
+        metadata, default=_json_default, separators=(',', ':')
+    ).encode()
+    return encoded
+
+
+def decode_metadata(schema_metadata: Optional[Dict[bytes, bytes]]) -> Dict[str, Any]:
+    """
+    Decode Arrow schema metadata written by encode_metadata().
+    
+    The JSON blob is expanded into top-level keys. Other entries (including
+    files written before the blob format) are returned as decoded strings.
+    """
+    if not schema_metadata:
+        return {}
+    
+    decoded: Dict[str, Any] = {}
+    for k, v in schema_metadata.items():
+        if k in (METADATA_KEY, b'ARROW:schema'):
+            continue
+        decoded[k.decode()] = v.decode()
+    
+    if METADATA_KEY in schema_metadata:
+        decoded.update(json.loads(schema_metadata[METADATA_KEY]))
+    return decoded
+
 
 class ParquetWriter:
     """Utility class for writing DataFrames to Parquet format with metadata."""
     
     @staticmethod
     def write(
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         output_path: Path,
         metadata: Optional[Dict[str, Any]] = None,
         compression: str = 'snappy',
@@ -29,23 +112,31 @@ class ParquetWriter:
             output_path: Output file path
             metadata: Dictionary of metadata to embed
             compression: Compression codec ('snappy', 'gzip', 'zstd', 'none')
-            partition_cols: Columns to partition by (for dataset writing)
+            partition_cols: Columns to partition by. When given, output_path is
+                treated as a dataset root directory and write_dataset() is used.
         """
+        if partition_cols:
+            ParquetWriter.write_dataset(
+                data,
+                output_path,
+                partition_cols=partition_cols,
+                metadata=metadata,
+                compression=compression,
+            )
+            return
+        
         try:
             # Create output directory if needed
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Convert DataFrame to Arrow Table
-            table = pa.Table.from_pandas(data)
+            # Convert DataFrame to Arrow Table (index is not event data)
+            table = pa.Table.from_pandas(data, preserve_index=False)
             
-            # Add metadata if provided
+            # Add metadata if provided (schema-only change, no data copy)
             if metadata:
-                metadata_bytes = {
-                    k.encode(): str(v).encode() 
-                    for k, v in metadata.items()
-                }
-                schema = table.schema.with_metadata(metadata_bytes)
-                table = table.cast(schema)
+                table = table.replace_schema_metadata(
+                    encode_metadata(metadata, table.schema.metadata)
+                )
             
             # Write to Parquet
             pq.write_table(
@@ -54,6 +145,7 @@ class ParquetWriter:
                 compression=compression,
                 use_dictionary=True,
                 write_statistics=True,
+                row_group_size=DEFAULT_ROW_GROUP_SIZE,
                 version='2.6'  # Latest Parquet format
             )
             
@@ -64,6 +156,171 @@ class ParquetWriter:
             logger.error(f"Failed to write Parquet file: {e}")
             raise
     
+    @staticmethod
+    def write_dataset(
+        data: Union['pd.DataFrame', pa.Table],
+        root_dir: Path,
+        partition_cols: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        compression: str = 'snappy',
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        basename_template: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Write events as a hive-partitioned Parquet dataset.
+        
+        Args:
+            data: DataFrame or Arrow Table to write
+            root_dir: Dataset root directory
+            partition_cols: Columns to partition by (default: DEFAULT_PARTITION_COLS)
+            metadata: Dictionary of metadata to embed in every file footer
+            compression: Compression codec ('snappy', 'gzip', 'zstd', 'none')
+            row_group_size: Maximum rows per row group
+            basename_template: File name template, must contain '{i}'.
+                Defaults to a unique per-call name so repeated writes into
+                the same partition append files instead of overwriting.
+        
+        Returns:
+            List of written file paths
+        
+        Raises:
+            ValueError: If a partition column is missing from data
+        """
+        partition_cols = list(partition_cols or DEFAULT_PARTITION_COLS)
+        
+        try:
+            table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+            
+            missing = [col for col in partition_cols if col not in table.column_names]
+            if missing:
+                raise ValueError(f"Partition columns not found in data: {missing}")
+            
+            if metadata:
+                table = table.replace_schema_metadata(
+                    encode_metadata(metadata, table.schema.metadata)
+                )
+            
+            # Partition values become directory names, so they must be strings
+            partition_schema = pa.schema([(col, pa.string()) for col in partition_cols])
+            for col in partition_cols:
+                idx = table.schema.get_field_index(col)
+                if table.schema.field(idx).type != pa.string():
+                    table = table.set_column(idx, col, pc.cast(table.column(col), pa.string()))
+            
+            root_dir = Path(root_dir)
+            root_dir.mkdir(parents=True, exist_ok=True)
+            
+            if basename_template is None:
+                basename_template = f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet"
+            
+            import pyarrow.dataset as ds  # Loads pandas: only when writing datasets
+            
+            file_format = ds.ParquetFileFormat()
+            written: List[str] = []
+            ds.write_dataset(
+                table,
+                root_dir,
+                format=file_format,
+                partitioning=ds.partitioning(partition_schema, flavor='hive'),
+                file_options=file_format.make_write_options(
+                    compression=compression,
+                    use_dictionary=True,
+                    write_statistics=True,
+                    version='2.6',
+                ),
+                basename_template=basename_template,
+                max_rows_per_group=row_group_size,
+                min_rows_per_group=min(row_group_size, 16_384),
+                existing_data_behavior='overwrite_or_ignore',
+                file_visitor=lambda f: written.append(f.path),
+            )
+            
+            logger.info(f"Γ£ô Wrote Parquet dataset: {root_dir} ({len(written)} files, {table.num_rows:,} rows)")
+            return written
+            
+        except Exception as e:
+            logger.error(f"Failed to write Parquet dataset: {e}")
+            raise
+    
+    @staticmethod
+    def build_filter(
+        equals: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    ) -> Optional[pc.Expression]:
+        """
+        Build a dataset filter expression from simple criteria.
+        
+        Args:
+            equals: Column -> value (or list of values) for equality/membership,
+                e.g. {'biological_sample_id': 'P5_F10', 'treatment': ['CD81', 'ISO']}
+            ranges: Column -> (min, max) inclusive bounds, either may be None,
+                e.g. {'FSC-A': (1000, 50000)}
+        
+        Returns:
+            Combined expression, or None if no criteria given
+        
+        Equality on partition columns prunes whole directories; ranges on
+        event columns prune row groups via their min/max statistics.
+        """
+        expr: Optional[pc.Expression] = None
+        
+        def _and(current: Optional[pc.Expression], new: pc.Expression) -> pc.Expression:
+            return new if current is None else current & new
+        
+        for col, value in (equals or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                expr = _and(expr, pc.field(col).isin(list(value)))
+            else:
+                expr = _and(expr, pc.field(col) == value)
+        
+        for col, (low, high) in (ranges or {}).items():
+            if low is not None:
+                expr = _and(expr, pc.field(col) >= low)
+            if high is not None:
+                expr = _and(expr, pc.field(col) <= high)
+        
+        return expr
+    
+    @staticmethod
+    def read_dataset(
+        root_dir: Path,
+        columns: Optional[List[str]] = None,
+        filter_expr: Optional[pc.Expression] = None,
+        equals: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        as_pandas: bool = True,
+    ) -> Union['pd.DataFrame', pa.Table]:
+        """
+        Read a hive-partitioned dataset with filter pushdown.
+        
+        Args:
+            root_dir: Dataset root directory (or a single Parquet file)
+            columns: Columns to read (default: all)
+            filter_expr: Prebuilt filter expression (combined with equals/ranges)
+            equals: Equality criteria, see build_filter()
+            ranges: Range criteria, see build_filter()
+            as_pandas: Return a DataFrame (True) or an Arrow Table (False)
+        
+        Returns:
+            Matching rows as DataFrame or Arrow Table
+        """
+        import pyarrow.dataset as ds
+        
+        try:
+            dataset = ds.dataset(Path(root_dir), format='parquet', partitioning='hive')
+            
+            expr = ParquetWriter.build_filter(equals, ranges)
+            if filter_expr is not None:
+                expr = filter_expr if expr is None else expr & filter_expr
+            
+            table = dataset.to_table(columns=columns, filter=expr)
+            logger.info(f"Γ£ô Read Parquet dataset: {Path(root_dir).name} ({table.num_rows:,} rows)")
+            return table.to_pandas() if as_pandas else table
+            
+        except Exception as e:
+            logger.error(f"Failed to read Parquet dataset: {e}")
+            raise
+    
     @staticmethod
     def read_with_metadata(parquet_path: Path) -> tuple:
         """
@@ -79,13 +336,9 @@ class ParquetWriter:
             # Read Parquet file
             table = pq.read_table(parquet_path)
             
-            # Extract metadata
-            metadata = {}
-            if table.schema.metadata:
-                metadata = {
-                    k.decode(): v.decode() 
-                    for k, v in table.schema.metadata.items()
-                }
+            # Extract metadata from the file footer (includes entries added
+            # after the schema was written, e.g. by ParquetAppendWriter)
+            metadata = ParquetWriter.read_metadata(parquet_path)
             
             # Convert to DataFrame
             df = table.to_pandas()
@@ -97,6 +350,19 @@ class ParquetWriter:
             logger.error(f"Failed to read Parquet file: {e}")
             raise
     
+    @staticmethod
+    def read_metadata(parquet_path: Path) -> Dict[str, Any]:
+        """
+        Read embedded metadata from the Parquet footer without loading data.
+        
+        Args:
+            parquet_path: Path to Parquet file
+            
+        Returns:
+            Decoded metadata dictionary
+        """
+        return decode_metadata(pq.read_metadata(parquet_path).metadata)
+    
     @staticmethod
     def get_file_info(parquet_path: Path) -> Dict[str, Any]:
         """
@@ -143,3 +409,279 @@ class ParquetWriter:
         except Exception as e:
             logger.error(f"Failed to get Parquet info: {e}")
             raise
+
+
+class ParquetAppendWriter:
+    """
+    Append-mode Parquet writer for streaming or chunked sources.
+    
+    Keeps one pq.ParquetWriter handle open and accepts successive record
+    batches, so long acquisitions never have to be held in memory as a
+    whole. Data goes to a temporary file next to the target and is
+    atomically renamed into place on close, so readers never see a
+    half-written file at output_path.
+    
+    Running metadata (event count, batch count and per-column
+    count/min/max/mean/std sketches for numeric columns) is accumulated
+    incrementally and written to the footer on close.
+    
+    If the writing code raises inside the context manager, the file
+    written so far is still closed out (valid footer, complete=False)
+    and published when keep_partial=True, otherwise it is discarded.
+    That only covers failures the process survives: after a hard kill
+    (SIGKILL, OOM) only the footerless temp file is left. To make a run
+    readable while it progresses, call checkpoint() periodically; each
+    call publishes everything written so far (complete=False).
+    
+    Usage:
+        with ParquetAppendWriter(output_path, metadata={'sample_id': 'P5_F10'}) as writer:
+            for batch in parser.iter_record_batches():
+                writer.write_batch(batch)
+        print(writer.running_metadata['event_count'])
+    """
+    
+    def __init__(
+        self,
+        output_path: Path,
+        schema: Optional[pa.Schema] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        compression: str = 'snappy',
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        keep_partial: bool = True,
+    ):
+        """
+        Initialize append writer.
+        
+        Args:
+            output_path: Final Parquet file path
+            schema: Arrow schema (default: taken from the first batch).
+                Given a schema, close() writes an empty file if no events
+                arrived
+            metadata: Static metadata to embed alongside running metadata
+            compression: Compression codec ('snappy', 'gzip', 'zstd', 'none')
+            row_group_size: Rows buffered before a row group is written
+            keep_partial: Publish the partial file if writing fails mid-run
+        """
+        self.output_path = Path(output_path)
+        self.temp_path = self.output_path.with_name(
+            f".{self.output_path.name}.{uuid.uuid4().hex[:8]}.tmp"
+        )
+        self.schema = schema
+        self.metadata = dict(metadata or {})
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.keep_partial = keep_partial
+        
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._buffer: List[pa.RecordBatch] = []
+        self._buffered_rows = 0
+        self._closed = False
+        
+        self.event_count = 0
+        self.batch_count = 0
+        self.row_group_count = 0
+        self._sketches: Dict[str, Dict[str, float]] = {}
+        self._started_at = datetime.now()
+    
+    def __enter__(self) -> 'ParquetAppendWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):  # type: ignore[no-untyped-def]
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort(str(exc_val))
+        return False
+    
+    def _open(self, schema: pa.Schema) -> None:
+        """Open the underlying writer on the temporary path."""
+        self.schema = schema
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(
+            self.temp_path,
+            schema,
+            compression=self.compression,
+            use_dictionary=True,
+            write_statistics=True,
+            version='2.6',
+        )
+    
+    def write_batch(self, batch: Union[pa.RecordBatch, pa.Table, 'pd.DataFrame']) -> None:
+        """
+        Append a batch of events.
+        
+        Args:
+            batch: RecordBatch, Table or DataFrame matching the writer schema
+        """
+        if self._closed:
+            raise ValueError("Cannot write to a closed ParquetAppendWriter")
+        
+        if not isinstance(batch, (pa.RecordBatch, pa.Table)):  # DataFrame
+            batch = pa.RecordBatch.from_pandas(batch, schema=self.schema, preserve_index=False)
+        batches = batch.to_batches() if isinstance(batch, pa.Table) else [batch]
+        
+        for rb in batches:
+            if rb.num_rows == 0:
+                continue
+            if self._writer is None:
+                self._open(self.schema or rb.schema)
+            self._update_sketches(rb)
+            self._buffer.append(rb)
+            self._buffered_rows += rb.num_rows
+            self.event_count += rb.num_rows
+        
+        self.batch_count += 1
+        if self._buffered_rows >= self.row_group_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write buffered batches as row group(s)."""
+        if self._writer is None or not self._buffer:
+            return
+        table = pa.Table.from_batches(self._buffer, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.row_group_count += -(-table.num_rows // self.row_group_size)
+        self._buffer = []
+        self._buffered_rows = 0
+    
+    def checkpoint(self) -> Optional[Path]:
+        """
+        Publish the events written so far as a readable file, then continue.
+        
+        The temp file is closed out (footer with running metadata,
+        complete=False) and renamed to output_path; a new temp file is
+        started with the published row groups copied in, one at a time.
+        Each checkpoint therefore rereads everything written so far, so
+        call it every few row groups or on a timer, not per batch.
+        
+        Returns:
+            Output path, or None if nothing was written yet
+        """
+        if self._closed:
+            raise ValueError("Cannot checkpoint a closed ParquetAppendWriter")
+        if self._writer is None:
+            return None
+        
+        self._finalize(complete=False)
+        self.temp_path = self.output_path.with_name(
+            f".{self.output_path.name}.{uuid.uuid4().hex[:8]}.tmp"
+        )
+        assert self.schema is not None
+        self._open(self.schema)
+        with pq.ParquetFile(self.output_path) as published:
+            for i in range(published.num_row_groups):
+                self._writer.write_table(published.read_row_group(i))  # type: ignore[union-attr]
+        logger.info(f"Checkpointed Parquet: {self.output_path.name} ({self.event_count:,} events)")
+        return self.output_path
+    
+    def _update_sketches(self, batch: pa.RecordBatch) -> None:
+        """Update per-column running count/min/max/sum/sum-of-squares."""
+        for name, column in zip(batch.schema.names, batch.columns):
+            if not (pa.types.is_floating(column.type) or pa.types.is_integer(column.type)):
+                continue
+            values = column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            sketch = self._sketches.setdefault(
+                name, {'count': 0, 'min': np.inf, 'max': -np.inf, 'sum': 0.0, 'sum_sq': 0.0}
+            )
+            sketch['count'] += int(values.size)
+            sketch['min'] = min(sketch['min'], float(values.min()))
+            sketch['max'] = max(sketch['max'], float(values.max()))
+            sketch['sum'] += float(values.sum())
+            sketch['sum_sq'] += float(np.dot(values, values))
+    
+    @property
+    def running_metadata(self) -> Dict[str, Any]:
+        """Current event count and per-column sketches."""
+        columns = {}
+        for name, sk in self._sketches.items():
+            n = sk['count']
+            mean = sk['sum'] / n
+            var = max(sk['sum_sq'] / n - mean * mean, 0.0) * n / (n - 1) if n > 1 else 0.0
+            columns[name] = {
+                'count': n,
+                'min': sk['min'],
+                'max': sk['max'],
+                'mean': mean,
+                'std': float(np.sqrt(var)),
+            }
+        return {
+            'event_count': self.event_count,
+            'batch_count': self.batch_count,
+            'row_group_count': self.row_group_count,
+            'started_at': self._started_at.isoformat(),
+            'column_stats': columns,
+        }
+    
+    def _finalize(self, complete: bool, error: Optional[str] = None) -> None:
+        """Write footer metadata, close the handle and publish atomically."""
+        self.flush()
+        assert self._writer is not None
+        footer = {**self.metadata, **self.running_metadata, 'complete': complete}
+        if error:
+            footer['error'] = error
+        self._writer.add_key_value_metadata(encode_metadata(footer))
+        self._writer.close()
+        self._writer = None
+        os.replace(self.temp_path, self.output_path)
+    
+    def close(self) -> Optional[Path]:
+        """
+        Flush remaining events, write footer and publish the file.
+        
+        Without events, an empty file is published if a schema was given
+        to the constructor; otherwise nothing is written.
+        
+        Returns:
+            Output path, or None if nothing was written
+        """
+        if self._closed:
+            return self.output_path if self.output_path.exists() else None
+        self._closed = True
+        
+        if self._writer is None:
+            if self.schema is None:
+                logger.warning(f"No events written, skipping {self.output_path.name}")
+                return None
+            self._open(self.schema)
+        
+        self._finalize(complete=True)
+        file_size_mb = self.output_path.stat().st_size / (1024 * 1024)
+        logger.info(f"Γ£ô Wrote Parquet: {self.output_path.name} ({self.event_count:,} events, {file_size_mb:.2f} MB)")
+        return self.output_path
+    
+    def abort(self, error: Optional[str] = None) -> Optional[Path]:
+        """
+        Stop writing after a failure.
+        
+        With keep_partial=True the events written so far are closed out
+        into a readable file (metadata complete=False); otherwise the
+        temporary file is removed.
+        
+        Returns:
+            Output path if a partial file was published, else None
+        """
+        if self._closed:
+            return None
+        self._closed = True
+        
+        if self._writer is None:
+            return None
+        
+        if self.keep_partial:
+            try:
+                self._finalize(complete=False, error=error)
+                logger.warning(f"Published partial Parquet: {self.output_path.name} ({self.event_count:,} events)")
+                return self.output_path
+            except Exception as e:
+                logger.error(f"Failed to close out partial Parquet file: {e}")
+        
+        try:
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            self._writer = None
+            self.temp_path.unlink(missing_ok=True)
+        return None
@@ -34,13 +34,17 @@ Flow Cytometry Application:
 - Multi-wavelength analysis enables particle characterization
 """
 
-from typing import Tuple, Optional, Dict, List, Any
+from typing import TYPE_CHECKING, Tuple, Optional, Dict, List, Any
 import numpy as np
 from loguru import logger
-import miepython
-from scipy.optimize import minimize_scalar, OptimizeResult
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from scipy.optimize import OptimizeResult
+
+# miepython (numba) and scipy are imported on first use: importing this
+# module stays cheap for the API, which only needs them once sizing runs
+
 
 @dataclass
 class MieScatterResult:
@@ -228,6 +232,8 @@ class MieScatterCalculator:
         # single_sphere(m, x, n_pole=0) returns (qext, qsca, qback, g)
         # n_pole=0 means include all multipole terms (auto-sized for accuracy)
         # Typical series length: 10-50 terms depending on x
+        import miepython
+
         try:
             qext, qsca, qback, g = miepython.single_sphere(self.m, x, 0)
         except Exception as e:
@@ -353,8 +359,10 @@ class MieScatterCalculator:
         # - Robust to local minima
         # - Guaranteed to stay within bounds
         # - Fast convergence for smooth objectives
+        from scipy.optimize import minimize_scalar
+
         try:
-            res: OptimizeResult = minimize_scalar(  # type: ignore[assignment]
+            res: 'OptimizeResult' = minimize_scalar(  # type: ignore[assignment]
                 objective,
                 bounds=(min_diameter, max_diameter),
                 method='bounded',
@@ -9,24 +9,40 @@ Date: November 14, 2025
 Task: 1.3.1 - FCS Scatter Plot Generation
 """
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-import seaborn as sns
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import TYPE_CHECKING, Any, Optional, Tuple, List, Dict
 from loguru import logger
 
-# Set style for publication-quality plots
-sns.set_style("whitegrid")
-plt.rcParams['figure.dpi'] = 300
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.labelsize'] = 12
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['xtick.labelsize'] = 10
-plt.rcParams['ytick.labelsize'] = 10
+if TYPE_CHECKING:
+    import pandas as pd
+    from matplotlib.figure import Figure
+
+_plt: Any = None
+
+
+def _pyplot() -> Any:
+    """
+    matplotlib.pyplot with the publication style applied, imported on
+    first use (matplotlib and seaborn take seconds to import, and the
+    worker only needs calculate_particle_size from this module).
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # Set style for publication-quality plots
+        sns.set_style("whitegrid")
+        plt.rcParams['figure.dpi'] = 300
+        plt.rcParams['savefig.dpi'] = 300
+        plt.rcParams['font.size'] = 10
+        plt.rcParams['axes.labelsize'] = 12
+        plt.rcParams['axes.titlesize'] = 14
+        plt.rcParams['xtick.labelsize'] = 10
+        plt.rcParams['ytick.labelsize'] = 10
+        _plt = plt
+    return _plt
 
 
 class FCSPlotter:
@@ -54,7 +70,7 @@ class FCSPlotter:
     
     def plot_scatter(
         self,
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         x_channel: str,
         y_channel: str,
         title: Optional[str] = None,
@@ -65,7 +81,7 @@ class FCSPlotter:
         sample_size: int = 10000,
         colormap: str = "viridis",
         use_particle_size: bool = False
-    ) -> Figure:
+    ) -> 'Figure':
         """
         Create scatter plot for two FCS channels with multiple visualization options.
         
@@ -153,6 +169,7 @@ class FCSPlotter:
         # --------------------------------
         # 8x8 inch figure at 300 DPI = 2400x2400 pixel image
         # Square aspect ratio is standard for flow cytometry
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(8, 8))
         
         # Step 4: Generate plot based on selected type
@@ -253,7 +270,7 @@ class FCSPlotter:
     
     def plot_histogram(
         self,
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         channel: str,
         title: Optional[str] = None,
         output_file: Optional[Path | str] = None,
@@ -262,7 +279,7 @@ class FCSPlotter:
         gate_threshold: Optional[float] = None,
         show_stats: bool = True,
         color: str = 'steelblue'
-    ) -> Figure:
+    ) -> 'Figure':
         """
         Create 1D histogram for fluorescence intensity analysis.
         
@@ -296,6 +313,7 @@ class FCSPlotter:
             raise ValueError(f"No valid data in channel '{channel}'")
         
         # Create figure
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(10, 6))
         
         # Plot histogram
@@ -395,10 +413,10 @@ class FCSPlotter:
     
     def plot_fsc_ssc(
         self,
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         output_file: Optional[Path] = None,
         plot_type: str = "hexbin"
-    ) -> Figure:
+    ) -> 'Figure':
         """
         Create standard FSC-A vs SSC-A scatter plot (debris gating view).
         
@@ -434,10 +452,10 @@ class FCSPlotter:
     
     def plot_fluorescence_channels(
         self,
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         marker_channels: Optional[List[str]] = None,
         output_prefix: Optional[str] = None
-    ) -> List[Figure]:
+    ) -> List['Figure']:
         """
         Create plots for fluorescence markers vs SSC.
         
@@ -497,13 +515,13 @@ class FCSPlotter:
     
     def plot_marker_histograms(
         self,
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         marker_channels: Optional[List[str]] = None,
         output_file: Optional[Path | str] = None,
         bins: int = 256,
         log_scale: bool = True,
         gate_thresholds: Optional[dict] = None
-    ) -> Optional[Figure]:
+    ) -> Optional['Figure']:
         """
         Create multi-panel histogram plot for marker comparison.
         
@@ -542,6 +560,7 @@ class FCSPlotter:
         n_markers = len(marker_channels)
         
         # Create subplots
+        plt = _pyplot()
         fig, axes_obj = plt.subplots(1, n_markers, figsize=(5*n_markers, 5))
         
         # Handle single channel case - convert to list of Axes
@@ -643,9 +662,9 @@ class FCSPlotter:
     
     def create_summary_plot(
         self,
-        data: pd.DataFrame,
+        data: 'pd.DataFrame',
         output_file: Optional[Path] = None
-    ) -> Figure:
+    ) -> 'Figure':
         """
         Create 2x2 summary plot showing key scatter plots.
         
@@ -656,6 +675,7 @@ class FCSPlotter:
         Returns:
             matplotlib Figure object
         """
+        plt = _pyplot()
         fig, axes = plt.subplots(2, 2, figsize=(12, 12))
         
         # Get sample info
@@ -732,6 +752,8 @@ def generate_fcs_plots(parquet_file: Path, output_dir: Path = Path("figures/fcs"
     logger.info(f"Generating plots for {parquet_file.name}")
     
     # Load data
+    import pandas as pd
+
     data = pd.read_parquet(parquet_file)
     
     # Initialize plotter
@@ -759,20 +781,21 @@ def generate_fcs_plots(parquet_file: Path, output_dir: Path = Path("figures/fcs"
     )
     
     # Close all figures to free memory
+    plt = _pyplot()
     plt.close('all')
     
     logger.success(f"? Plots generated for {sample_id}")
 
 
 def calculate_particle_size(
-    data: pd.DataFrame,
+    data: 'pd.DataFrame',
     fsc_channel: str = 'VFSC-H',
     use_mie_theory: bool = True,
     wavelength_nm: float = 488.0,
     n_particle: float = 1.40,
     n_medium: float = 1.33,
     calibration_beads: Optional[Dict[float, float]] = None
-) -> pd.DataFrame:
+) -> 'pd.DataFrame':
     """
     Calculate particle size from FSC using rigorous Mie scattering theory.
     
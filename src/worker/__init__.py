@@ -0,0 +1,18 @@
+"""
+CRMIT Worker Module
+===================
+
+Background processing for uploaded files.
+
+Modules:
+- pool.py     - ProcessPoolExecutor-based job pool
+- tasks.py    - Pipeline functions executed in worker processes
+- runner.py   - Queue runner claiming ProcessingJob rows with leases
+- __main__.py - Standalone runner: `python -m src.worker`
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+__version__ = "1.0.0"
+__author__ = "CRMIT Backend Team"
@@ -0,0 +1,111 @@
+"""
+Standalone Job Runner
+=====================
+
+Runs a JobRunner outside the API so processing scales across processes
+and hosts. Every runner claims jobs from the same processing_jobs table.
+
+Usage:
+    python -m src.worker                       # poll until SIGINT/SIGTERM
+    python -m src.worker --once                # drain the queue, then exit
+    python -m src.worker --concurrency 8 --job-type fcs_parse
+
+Set CRMIT_RUN_WORKER_IN_API=false on the API when dedicated workers are
+used, so uploads are only queued there.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from loguru import logger
+
+from src.api.config import get_settings
+from src.database.connection import check_connection, close_connections
+from src.worker.pool import ProcessingPool, SUPPORTED_JOB_TYPES
+from src.worker.runner import JobRunner, default_worker_id
+
+settings = get_settings()
+
+
+def parse_args(argv=None) -> argparse.Namespace:  # type: ignore[no-untyped-def]
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="CRMIT processing job runner")
+    parser.add_argument("--worker-id", default=default_worker_id(),
+                        help="Lease owner ID (default: host:pid)")
+    parser.add_argument("--concurrency", type=int, default=settings.max_workers,
+                        help="Worker processes (default: CRMIT_MAX_WORKERS)")
+    parser.add_argument("--poll-interval", type=float, default=settings.job_poll_interval_seconds,
+                        help="Seconds between queue polls")
+    parser.add_argument("--job-type", dest="job_types", action="append", choices=SUPPORTED_JOB_TYPES,
+                        help="Only claim this job type (repeatable; default: all)")
+    parser.add_argument("--once", action="store_true",
+                        help="Exit when the queue is empty")
+    return parser.parse_args(argv)
+
+
+async def run_worker(args: argparse.Namespace) -> int:
+    """
+    Run the job runner until stopped (or the queue is drained with --once).
+
+    Returns:
+        Process exit code
+    """
+    if not await check_connection():
+        logger.error("❌ Database unavailable; the job runner needs the processing_jobs table")
+        return 1
+
+    pool = ProcessingPool(max_workers=args.concurrency)
+    runner = JobRunner(
+        pool=pool,
+        worker_id=args.worker_id,
+        poll_interval=args.poll_interval,
+        job_types=args.job_types or SUPPORTED_JOB_TYPES,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: KeyboardInterrupt ends asyncio.run() instead
+
+    try:
+        if args.once:
+            drain = asyncio.create_task(runner.drain())
+            stopped = asyncio.create_task(stop.wait())
+            await asyncio.wait([drain, stopped], return_when=asyncio.FIRST_COMPLETED)
+            stopped.cancel()
+            if not drain.done():
+                drain.cancel()
+            await asyncio.gather(drain, return_exceptions=True)
+        else:
+            await runner.start()
+            await stop.wait()
+    finally:
+        logger.info("🛑 Job runner shutting down...")
+        await runner.stop()
+        await pool.shutdown()
+        await close_connections()
+    return 0
+
+
+def main() -> None:
+    """Entry point for `python -m src.worker`."""
+    args = parse_args()
+    logger.info(f"🏃 Starting job runner {args.worker_id} ({args.concurrency} workers)")
+    settings.create_directories()
+    sys.exit(asyncio.run(run_worker(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+Parquet Backfill
+================
+
+Loads historical Parquet outputs (data/parquet) into fcs_results and
+nta_results, so plates processed before the upload API existed show up
+in the database.
+
+How it works:
+1. Scan the root for *.parquet files (statistics/ directories are
+   skipped) and drop files recorded in the checkpoint manifest with the
+   same size and modification time
+2. Summarize files in a process pool. Each worker reads the schema, then
+   only the columns it needs (scatter, fluorescence height channels and
+   particle_size_nm for FCS events; size_nm and weights for NTA
+   distributions), with the same summary functions as the upload
+   pipeline (tasks.fcs_event_summary / size_distribution_summary)
+3. Upsert each batch of summaries (bulk_upsert_*_results, matched on
+   parquet_file_path), creating missing samples, then append the batch
+   to the manifest. The next batch is summarized while this one is
+   written
+
+An interrupted run resumes where the manifest ends; re-running after
+files changed updates their rows. Particle sizes are only reported for
+files that already carry a particle_size_nm column: Mie sizing is not
+re-run here.
+
+Usage:
+    python -m src.worker.backfill                          # data/parquet, all workers
+    python -m src.worker.backfill data/parquet/nanofacs --workers 8
+    python -m src.worker.backfill --manifest /tmp/backfill.jsonl --batch-size 1000
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pyarrow.parquet as pq
+from loguru import logger
+
+from src.api.config import get_settings
+from src.database.connection import DatabaseSession, close_connections
+from src.database.crud import bulk_upsert_fcs_results, bulk_upsert_nta_results, get_or_create_sample_ids
+from src.parsers.parquet_reader import ParquetReader
+from src.parsers.parquet_writer import decode_metadata
+
+settings = get_settings()
+
+MANIFEST_NAME = "backfill_manifest.jsonl"
+
+# Result kind → bulk upsert function
+UPSERTS = {
+    "fcs": bulk_upsert_fcs_results,
+    "nta": bulk_upsert_nta_results,
+}
+
+# Per-event metadata columns written by FCSParser (not channels)
+FCS_METADATA_COLUMNS = (
+    "sample_id", "biological_sample_id", "measurement_id", "is_baseline", "file_name",
+    "instrument_type", "acquisition_date", "parse_timestamp",
+    "particle_size_nm", "size_in_calibrated_range",
+)
+
+# Columns weighting an NTA size distribution (see tasks.size_distribution_summary)
+NTA_WEIGHT_COLUMNS = ("concentration_particles_ml", "particle_count")
+
+
+# ============================================================================
+# Per-file summaries (run in worker processes)
+# ============================================================================
+
+def _first_value(parquet_file: pq.ParquetFile, column: str) -> Optional[str]:
+    """First non-null value of a column, reading one row group of one column."""
+    if column not in parquet_file.schema_arrow.names or parquet_file.num_row_groups == 0:
+        return None
+    values = parquet_file.read_row_group(0, columns=[column]).column(0).drop_null()
+    return str(values[0].as_py()) if len(values) else None
+
+
+def hive_partitions(path: str) -> Dict[str, str]:
+    """
+    Partition values encoded in a hive-style path
+    (.../instrument_type=flow_cytometry/biological_sample_id=P5_F10/...).
+
+    Files written by ParquetWriter.write_dataset do not contain their
+    partition columns; the values only exist in the directory names.
+    """
+    partitions = {}
+    for part in Path(path).parent.parts:
+        key, sep, value = part.partition("=")
+        if sep and key:
+            partitions[key] = unquote(value)
+    return partitions
+
+
+def summarize_parquet(path: str) -> Dict[str, Any]:
+    """
+    Compute result fields for one Parquet file.
+
+    Args:
+        path: Parquet file written by the FCS or NTA parser
+
+    Returns:
+        Dictionary with path, kind ("fcs", "nta" or None if not an event /
+        size distribution file), sample_id, sample fields and result
+        fields; or an error message
+    """
+    # Imported on first use: tasks pulls in the parsers
+    from src.worker.tasks import (
+        fcs_event_summary,
+        fluorescence_channels,
+        size_distribution_summary,
+        stain_channels,
+    )
+
+    summary: Dict[str, Any] = {"path": path, "kind": None}
+    try:
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        columns = parquet_file.schema_arrow.names
+        metadata = decode_metadata(parquet_file.metadata.metadata)
+
+        partitions = hive_partitions(path)
+
+        if "size_nm" in columns:
+            kind = "nta"
+        elif (
+            partitions.get("instrument_type", "flow_cytometry") == "flow_cytometry"
+            and ParquetReader.find_channel(columns, preferred='VFSC-H')
+        ):
+            kind = "fcs"  # Scatter channels; instrument_type may only be in the path
+        else:
+            return summary
+
+        sample_id = _first_value(parquet_file, "sample_id") or metadata.get("sample_id") or Path(path).stem
+        biological_sample_id = (
+            _first_value(parquet_file, "biological_sample_id") or partitions.get("biological_sample_id")
+        )
+        summary.update(
+            kind=kind,
+            sample_id=sample_id,
+            sample_fields={"biological_sample_id": biological_sample_id} if biological_sample_id else {},
+        )
+
+        if kind == "fcs":
+            channels = [c for c in columns if c not in FCS_METADATA_COLUMNS]
+            fsc_channel = ParquetReader.find_channel(channels, preferred='VFSC-H')
+            ssc_channel = ParquetReader.find_channel(channels, contains=('SSC', 'H'))
+            fsc_area = f"{fsc_channel[:-2]}-A" if fsc_channel and fsc_channel.endswith('-H') else None
+            wanted = [
+                c for c in (fsc_channel, fsc_area, ssc_channel, *fluorescence_channels(channels), "particle_size_nm")
+                if c and c in columns
+            ]
+            table = parquet_file.read(columns=wanted)
+            sizes = None
+            if "particle_size_nm" in wanted:
+                sizes = table.column("particle_size_nm").to_numpy().astype(np.float64, copy=False)
+            name = _first_value(parquet_file, "file_name") or sample_id
+            fields: Dict[str, Any] = {"total_events": table.num_rows}
+            fields.update(fcs_event_summary(
+                lambda channel: table.column(channel).to_numpy(),
+                [c for c in wanted if c != "particle_size_nm"],
+                sizes,
+                stain_channels(channels, name),
+            ))
+        else:
+            wanted = ["size_nm"] + [c for c in NTA_WEIGHT_COLUMNS if c in columns]
+            fields = size_distribution_summary(parquet_file.read(columns=wanted).to_pandas()) or {}
+            if not fields:
+                summary["kind"] = None  # e.g. zeta potential profile: no size distribution
+                return summary
+
+        fields["parquet_file_path"] = path
+        summary["fields"] = fields
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    return summary
+
+
+# ============================================================================
+# Manifest
+# ============================================================================
+
+def _file_key(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_manifest(manifest: Path) -> Dict[str, Tuple[int, int]]:
+    """Files already loaded: path → (size, mtime_ns). Later entries win."""
+    done: Dict[str, Tuple[int, int]] = {}
+    if not manifest.exists():
+        return done
+    with manifest.open() as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                done[entry["path"]] = (entry["size"], entry["mtime_ns"])
+            except (ValueError, KeyError):
+                continue  # Torn last line of an interrupted run
+    return done
+
+
+def find_pending(root: Path, done: Dict[str, Tuple[int, int]]) -> List[Path]:
+    """Parquet files under root that are new or changed since they were loaded."""
+    pending = []
+    for path in sorted(root.rglob("*.parquet")):
+        if "statistics" in path.parts or not path.is_file():
+            continue
+        if done.get(str(path)) != _file_key(path):
+            pending.append(path)
+    return pending
+
+
+# ============================================================================
+# Backfill
+# ============================================================================
+
+def _batches(paths: List[Path], size: int) -> Iterable[List[Path]]:
+    for start in range(0, len(paths), size):
+        yield paths[start:start + size]
+
+
+async def _write_batch(summaries: List[Dict[str, Any]], counts: Dict[str, int]) -> None:
+    """Upsert one batch of summaries, grouped by result kind."""
+    by_kind: Dict[str, List[Dict[str, Any]]] = {}
+    for summary in summaries:
+        if summary.get("error"):
+            counts["failed"] += 1
+            logger.warning(f"⚠️ {summary['path']}: {summary['error']}")
+        elif summary["kind"] is None:
+            counts["skipped"] += 1
+        else:
+            by_kind.setdefault(summary["kind"], []).append(summary)
+
+    async with DatabaseSession() as db:
+        for kind, items in by_kind.items():
+            sample_ids = await get_or_create_sample_ids(
+                db, {item["sample_id"]: item["sample_fields"] for item in items}
+            )
+            rows = [{**item["fields"], "sample_id": sample_ids[item["sample_id"]]} for item in items]
+            written = await UPSERTS[kind](db, rows)
+            counts["inserted"] += written["inserted"]
+            counts["updated"] += written["updated"]
+
+
+def _append_manifest(manifest: Path, paths: List[Path]) -> None:
+    with manifest.open("a") as f:
+        for path in paths:
+            size, mtime_ns = _file_key(path)
+            f.write(json.dumps({"path": str(path), "size": size, "mtime_ns": mtime_ns}) + "\n")
+
+
+async def run_backfill(
+    root: Path,
+    manifest: Optional[Path] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 500,
+) -> Dict[str, int]:
+    """
+    Backfill results for all new or changed Parquet files under root.
+
+    Args:
+        root: Directory to scan (e.g. data/parquet)
+        manifest: Checkpoint file (default: root/backfill_manifest.jsonl)
+        workers: Worker processes (default: settings.max_workers; 0 runs
+            summaries in this process)
+        batch_size: Files per database transaction and manifest checkpoint
+
+    Returns:
+        Dictionary with files, inserted, updated, skipped and failed counts
+    """
+    root = Path(root)
+    manifest = Path(manifest) if manifest else root / MANIFEST_NAME
+    pending = find_pending(root, load_manifest(manifest))
+    counts = {"files": len(pending), "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
+    logger.info(f"🗂️ Backfill: {len(pending)} Parquet files to load from {root}")
+    if not pending:
+        return counts
+
+    workers = settings.max_workers if workers is None else workers
+    executor: Optional[Executor] = None
+    if workers > 0:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    loop = asyncio.get_running_loop()
+
+    async def summarize(batch: List[Path]) -> List[Dict[str, Any]]:
+        if executor is None:
+            return [summarize_parquet(str(path)) for path in batch]
+        return await asyncio.gather(*(loop.run_in_executor(executor, summarize_parquet, str(path)) for path in batch))
+
+    def submit(batch: List[Path]) -> "asyncio.Task[List[Dict[str, Any]]]":
+        return asyncio.create_task(summarize(batch))
+
+    try:
+        batches = list(_batches(pending, batch_size))
+        running = submit(batches[0])
+        for index, batch in enumerate(batches):
+            summaries = await running
+            if index + 1 < len(batches):
+                running = submit(batches[index + 1])  # Summarize ahead while this batch is written
+            await _write_batch(summaries, counts)
+            _append_manifest(manifest, [Path(s["path"]) for s in summaries if not s.get("error")])
+            logger.info(f"📥 Backfill {min((index + 1) * batch_size, len(pending))}/{len(pending)}: {counts}")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    logger.success(f"✅ Backfill complete: {counts}")
+    return counts
+
+
+# ============================================================================
+# Command Line
+# ============================================================================
+
+def parse_args(argv=None) -> argparse.Namespace:  # type: ignore[no-untyped-def]
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Load historical Parquet outputs into the database")
+    parser.add_argument("root", nargs="?", type=Path, default=settings.parquet_dir,
+                        help="Directory to scan (default: CRMIT_PARQUET_DIR)")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help=f"Checkpoint file (default: <root>/{MANIFEST_NAME})")
+    parser.add_argument("--workers", type=int, default=settings.max_workers,
+                        help="Worker processes (0: no pool)")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Files per transaction / checkpoint")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the backfill; returns the process exit code."""
+    try:
+        counts = await run_backfill(args.root, args.manifest, args.workers, args.batch_size)
+    except Exception as e:
+        logger.error(f"❌ Backfill failed: {e}")
+        return 1
+    finally:
+        await close_connections()
+    return 1 if counts["failed"] else 0
+
+
+def main() -> None:
+    """Entry point for `python -m src.worker.backfill`."""
+    sys.exit(asyncio.run(run(parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+Processing Worker Pool
+======================
+
+Runs upload processing jobs in a bounded ProcessPoolExecutor so parsing
+never blocks the API event loop.
+
+Flow:
+1. Upload endpoint saves the file and creates a ProcessingJob
+2. A JobRunner claims the job and calls ProcessingPool.submit(), which
+   schedules the pipeline on a worker process
+3. Worker reports progress through a queue → ProgressReporter, which
+   publishes every update and writes them to the DB in coalesced batches
+4. On completion results are saved (FCSResult/NTAResult) and the job is
+   marked completed; failures and timeouts mark it failed
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import multiprocessing
+import threading
+import traceback
+
+from loguru import logger
+
+from src.api.config import get_settings
+from src.api.metrics import STAGE_DURATION, record_pipeline
+from src.database.connection import DatabaseSession
+from src.database.crud import save_job_results, update_job_status, update_sample
+from src.worker import tasks
+from src.worker.progress import ProgressReporter
+
+settings = get_settings()
+
+# Job type → (pipeline run in the worker process, Parquet subdirectory)
+JOB_TASKS: Dict[str, Tuple[Callable[..., Dict[str, Any]], str]] = {
+    'fcs_parse': (tasks.run_fcs_pipeline, 'fcs'),
+    'nta_parse': (tasks.run_nta_pipeline, 'nta'),
+}
+SUPPORTED_JOB_TYPES = tuple(JOB_TASKS)
+
+
+class ProcessingPool:
+    """
+    Bounded process pool for upload processing jobs.
+
+    Sized by settings.max_workers; each job is limited to
+    settings.task_timeout_seconds. A job that times out is marked failed
+    and its worker process is killed by restarting the pool; other jobs
+    that were running on the old pool are resubmitted once.
+
+    Usage:
+        pool = get_processing_pool()
+        pool.start()
+        pool.submit(job_id, 'fcs_parse', sample_db_id=1, sample_id='S1', file_path=path)
+        ...
+        await pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        task_timeout_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize pool (processes are started by start()).
+
+        Args:
+            max_workers: Number of worker processes (default: settings.max_workers)
+            task_timeout_seconds: Per-job time limit (default: settings.task_timeout_seconds)
+        """
+        self.max_workers = max_workers or settings.max_workers
+        self.task_timeout_seconds = task_timeout_seconds or settings.task_timeout_seconds
+        # spawn on every platform: forking a process that runs an event
+        # loop and DB connections is unsafe, and Windows only has spawn
+        self._mp_context = multiprocessing.get_context('spawn')
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._progress_thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self.progress = ProgressReporter()
+        # Status written when a job task is cancelled (None: caller handles it)
+        self._cancel_outcomes: Dict[str, Optional[Tuple[str, str]]] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._completed = 0
+        self._failed = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        """Whether the pool has been started."""
+        return self._executor is not None
+
+    def start(self) -> None:
+        """
+        Start worker processes and the progress listener.
+
+        Must be called from within the running event loop.
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._progress_queue = self._mp_context.Queue()
+        self._executor = self._make_executor()
+        self._warm_up(self._executor)
+        self._progress_thread = threading.Thread(
+            target=self._drain_progress, name="job-progress", daemon=True
+        )
+        self._progress_thread.start()
+        logger.info(
+            f"⚙️ Processing pool started: {self.max_workers} workers, "
+            f"{self.task_timeout_seconds}s timeout"
+        )
+
+    async def shutdown(self, cancel_pending: bool = True) -> None:
+        """
+        Stop accepting jobs, cancel queued ones and stop worker processes.
+
+        Args:
+            cancel_pending: Cancel jobs still waiting or running
+        """
+        if not self.running:
+            return
+        if cancel_pending:
+            for task in list(self._jobs.values()):
+                task.cancel()
+        if self._jobs:
+            await asyncio.gather(*self._jobs.values(), return_exceptions=True)
+        await self.progress.close()
+
+        executor, self._executor = self._executor, None
+        executor.shutdown(wait=False, cancel_futures=True)  # type: ignore[union-attr]
+        self._terminate_processes(executor)
+        self._progress_queue.put(None)  # type: ignore[union-attr]
+        if self._progress_thread is not None:
+            self._progress_thread.join(timeout=5)
+        logger.info("⚙️ Processing pool stopped")
+
+    def _make_executor(self) -> ProcessPoolExecutor:
+        """Create the executor with the progress queue installed in each worker."""
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._mp_context,
+            initializer=tasks.init_worker,
+            initargs=(self._progress_queue,),
+        )
+
+    def _warm_up(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Spawn every worker process now and let it import the pipelines'
+        dependencies (tasks.warm_up), so the first jobs do not pay the
+        process start and import cost. Fire-and-forget: jobs submitted
+        meanwhile simply queue behind the warm-up calls.
+        """
+        if not settings.worker_warm_up:
+            return
+        for _ in range(self.max_workers):
+            executor.submit(tasks.warm_up).add_done_callback(self._log_warm_up)
+
+    @staticmethod
+    def _log_warm_up(future: Future) -> None:
+        if future.cancelled() or isinstance(future.exception(), BrokenProcessPool):
+            return  # Pool shut down or restarted before the worker finished importing
+        if future.exception() is not None:
+            logger.warning(f"⚠️ Worker warm-up failed: {future.exception()}")
+        else:
+            logger.debug(f"⚙️ Worker warmed up in {future.result():.2f}s")
+
+    @staticmethod
+    def _terminate_processes(executor: Optional[ProcessPoolExecutor]) -> None:
+        """Kill an executor's worker processes (shutdown() alone waits for running tasks)."""
+        processes = getattr(executor, '_processes', None) or {}
+        for process in list(processes.values()):
+            if process.is_alive():
+                process.terminate()
+
+    def _restart_executor(self) -> None:
+        """Replace the executor, killing any stuck worker."""
+        old = self._executor
+        self._executor = self._make_executor()
+        self._warm_up(self._executor)
+        if old is not None:
+            old.shutdown(wait=False, cancel_futures=True)
+            self._terminate_processes(old)
+        logger.warning("⚙️ Processing pool restarted")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with worker count, timeout and job counters
+        """
+        return {
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "task_timeout_seconds": self.task_timeout_seconds,
+            "active_jobs": len(self._jobs),
+            "completed_jobs": self._completed,
+            "failed_jobs": self._failed,
+            **self.progress.stats(),
+        }
+
+    @property
+    def free_slots(self) -> int:
+        """Number of jobs that can be submitted without queueing."""
+        return max(self.max_workers - len(self._jobs), 0)
+
+    def active_jobs(self) -> List[str]:
+        """Job IDs currently queued or running in this pool."""
+        return list(self._jobs)
+
+    def task(self, job_id: str) -> Optional[asyncio.Task]:
+        """The asyncio.Task for an active job, if any."""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str, outcome: Optional[Tuple[str, str]] = None) -> bool:
+        """
+        Cancel a queued or running job; its result is discarded.
+
+        A job already executing in a worker process runs to completion
+        there, but nothing is saved.
+
+        Args:
+            job_id: Job UUID
+            outcome: (status, message) to record, or None if the caller
+                has already updated the job (e.g. user cancellation)
+
+        Returns:
+            True if the job was active in this pool
+        """
+        task = self._jobs.get(job_id)
+        if task is None:
+            return False
+        self._cancel_outcomes[job_id] = outcome
+        task.cancel()
+        return True
+
+    # ------------------------------------------------------------------
+    # Job submission
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        job_id: str,
+        job_type: str,
+        file_path: Path,
+        sample_id: str,
+        sample_db_id: Optional[int] = None,
+        worker_id: Optional[str] = None,
+    ) -> asyncio.Task:
+        """
+        Schedule a processing job and return immediately.
+
+        Args:
+            job_id: Job UUID (ProcessingJob.job_id)
+            job_type: Job type (see SUPPORTED_JOB_TYPES)
+            file_path: Uploaded file to process
+            sample_id: Sample identifier (e.g., "P5_F10_CD81")
+            sample_db_id: Database ID of the sample (None in file-based mode)
+            worker_id: Lease owner when a JobRunner claimed the job; the
+                outcome is then only written while it still holds the lease
+
+        Returns:
+            asyncio.Task that completes when results are saved
+
+        Raises:
+            ValueError: If job_type is not supported
+        """
+        if job_type not in SUPPORTED_JOB_TYPES:
+            raise ValueError(f"Unsupported job type: {job_type}")
+        if not self.running:
+            self.start()
+
+        task = asyncio.create_task(
+            self._run(job_id, job_type, Path(file_path), sample_id, sample_db_id, worker_id),
+            name=f"job-{job_id}",
+        )
+        self._jobs[job_id] = task
+        self.progress.track(job_id)
+        task.add_done_callback(lambda _: self._forget(job_id))
+        logger.info(f"📋 Queued job {job_id} ({job_type}) for {sample_id}")
+        return task
+
+    def _forget(self, job_id: str) -> None:
+        """Drop bookkeeping for a finished job task."""
+        self._jobs.pop(job_id, None)
+        self._cancel_outcomes.pop(job_id, None)
+
+    async def _run(
+        self,
+        job_id: str,
+        job_type: str,
+        file_path: Path,
+        sample_id: str,
+        sample_db_id: Optional[int],
+        worker_id: Optional[str] = None,
+    ) -> None:
+        """Run one job in the pool and persist its outcome."""
+        pipeline, subdir = JOB_TASKS[job_type]
+        parquet_path = settings.parquet_dir / subdir / f"{sample_id}_{job_id[:8]}.parquet"
+        args = (pipeline, job_id, str(file_path), str(parquet_path), sample_id)
+
+        try:
+            try:
+                try:
+                    result = await self._execute(*args)
+                except BrokenProcessPool:
+                    # Pool was restarted under us (another job timed out)
+                    logger.warning(f"⚠️ Worker pool restarted, resubmitting job {job_id}")
+                    result = await self._execute(*args)
+            finally:
+                # Stop accepting progress; its last value lands before the final status
+                await self.progress.finish(job_id)
+        except asyncio.TimeoutError:
+            self._restart_executor()
+            await self._fail(
+                job_id, sample_id,
+                f"Processing timed out after {self.task_timeout_seconds}s",
+                worker_id=worker_id,
+            )
+            return
+        except asyncio.CancelledError:
+            outcome = self._cancel_outcomes.get(job_id, ("cancelled", "Cancelled during shutdown"))
+            if outcome is not None:
+                await self._set_status(job_id, outcome[0], error_message=outcome[1], worker_id=worker_id)
+            raise
+        except Exception as e:
+            await self._fail(
+                job_id, sample_id, str(e),
+                "".join(traceback.format_exception(type(e), e, e.__traceback__)),
+                worker_id=worker_id,
+            )
+            return
+
+        record_pipeline(job_type, result.get('metrics'))
+        try:
+            with STAGE_DURATION.time(pipeline=job_type, stage="db_commit"):
+                async with DatabaseSession() as db:
+                    job = await save_job_results(
+                        db, job_id, sample_id, sample_db_id, str(file_path),
+                        result_data=result['result_data'],
+                        fcs_result=result.get('fcs_result'),
+                        nta_result=result.get('nta_result'),
+                        worker_id=worker_id,
+                    )
+        except Exception as db_error:
+            await self._fail(
+                job_id, sample_id, f"Could not save results: {db_error}",
+                "".join(traceback.format_exception(type(db_error), db_error, db_error.__traceback__)),
+                worker_id=worker_id,
+            )
+            return
+        if job is not None and job.status != "completed":
+            logger.info(f"🚫 Job {job_id} was cancelled or reassigned ({job.status}); results discarded")
+            return
+        self._completed += 1
+        logger.success(f"✅ Job {job_id} completed ({job_type})")
+
+    async def _execute(self, fn, *args) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+        """
+        Run fn in a worker process, bounded by the task timeout.
+
+        Jobs wait for a free slot here rather than in the executor's queue,
+        so the timeout covers execution only, not time spent queued.
+        """
+        async with self._slots:  # type: ignore[union-attr]
+            future = self._executor.submit(fn, *args)  # type: ignore[union-attr]
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.task_timeout_seconds)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+
+    async def _fail(
+        self,
+        job_id: str,
+        sample_id: str,
+        message: str,
+        error_traceback: Optional[str] = None,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        """Mark a job (and its sample) as failed."""
+        self._failed += 1
+        logger.error(f"❌ Job {job_id} failed: {message}")
+        await self._set_status(
+            job_id, "failed", error_message=message,
+            error_traceback=error_traceback, sample_id=sample_id, worker_id=worker_id,
+        )
+
+    async def _set_status(
+        self,
+        job_id: str,
+        status: str,
+        sample_id: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Write a job status, tolerating an unavailable database.
+
+        With worker_id (passed through kwargs) nothing is written once the
+        lease is lost, the sample status included.
+        """
+        try:
+            async with DatabaseSession() as db:
+                job = await update_job_status(db, job_id, status, **kwargs)
+                if sample_id is not None and (job is not None or kwargs.get('worker_id') is None):
+                    await update_sample(db, sample_id, processing_status=status)
+        except Exception as db_error:
+            logger.warning(f"⚠️ Could not update job {job_id}: {db_error}")
+
+    # ------------------------------------------------------------------
+    # Progress reporting
+    # ------------------------------------------------------------------
+
+    def _drain_progress(self) -> None:
+        """Forward worker progress messages to the event loop (runs in a thread)."""
+        while True:
+            message = self._progress_queue.get()  # type: ignore[union-attr]
+            if message is None:
+                break
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                continue
+            # Late messages for finished jobs are ignored by the reporter
+            loop.call_soon_threadsafe(self.progress.report, *message)
+
+
+# ============================================================================
+# Global Pool
+# ============================================================================
+
+_pool: Optional[ProcessingPool] = None
+
+
+def get_processing_pool() -> ProcessingPool:
+    """
+    Get or create the global processing pool.
+
+    Returns:
+        ProcessingPool instance (started on first submit or via start())
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessingPool()
+    return _pool
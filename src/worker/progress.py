@@ -0,0 +1,139 @@
+"""
+Progress Reporter
+=================
+
+Coalescing write-behind for job progress.
+
+Pipelines may report progress as often as they like (per chunk, per file
+of a batch). Each report is published to live subscribers immediately
+(src/api/job_events.py), but only the latest value per job is kept for
+the database. Pending values are written together, in one UPDATE
+transaction, at most every `job_progress_flush_ms`, and a job's pending
+value is flushed before its status changes (completion, failure,
+cancellation) so the final progress row is never lost.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from typing import Dict, Optional, Set, Tuple
+import asyncio
+
+from loguru import logger
+
+from src.api.config import get_settings
+from src.api.job_events import get_job_event_broker
+from src.database.connection import DatabaseSession
+from src.database.crud import update_jobs_progress
+
+settings = get_settings()
+
+
+class ProgressReporter:
+    """
+    Coalesces progress reports and flushes them in batches.
+
+    Usage (on the event loop):
+        reporter.track(job_id)
+        reporter.report(job_id, 40, "Computing statistics")   # cheap, sync
+        await reporter.finish(job_id)    # before writing the final status
+        await reporter.flush()           # e.g. on shutdown
+    """
+
+    def __init__(self, flush_interval_ms: Optional[float] = None):
+        """
+        Initialize reporter.
+
+        Args:
+            flush_interval_ms: Maximum delay before a report reaches the
+                database (default: settings.job_progress_flush_ms)
+        """
+        interval = flush_interval_ms if flush_interval_ms is not None else settings.job_progress_flush_ms
+        self.flush_interval = interval / 1000
+        self._tracked: Set[str] = set()
+        self._pending: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.reports = 0
+        self.writes = 0
+
+    def track(self, job_id: str) -> None:
+        """Start accepting reports for a job."""
+        self._tracked.add(job_id)
+
+    def report(self, job_id: str, percent: int, step: Optional[str] = None) -> None:
+        """
+        Record progress: published now, written on the next flush.
+
+        Reports for untracked (finished) jobs are ignored.
+        """
+        if job_id not in self._tracked:
+            return
+        self.reports += 1
+        self._pending[job_id] = (percent, step)
+        self._publish(job_id, percent, step)
+
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.flush_interval, self._schedule_flush)
+
+    def _publish(self, job_id: str, percent: int, step: Optional[str]) -> None:
+        """Push the new progress to subscribers, on top of the last known state."""
+        broker = get_job_event_broker()
+        snapshot = dict(broker.latest(job_id) or {
+            "job_id": job_id, "error_message": None, "completed_at": None, "current_step": None,
+        })
+        snapshot.update(status="running", progress_percent=percent)
+        if step:
+            snapshot["current_step"] = step
+        broker.publish(job_id, snapshot)
+
+    def _schedule_flush(self) -> None:
+        self._flush_handle = None
+        task = asyncio.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self, job_id: Optional[str] = None) -> int:
+        """
+        Write pending progress to the database in one transaction.
+
+        Args:
+            job_id: Flush only this job (default: all pending jobs)
+
+        Returns:
+            Number of jobs written
+        """
+        async with self._lock:
+            if job_id is None:
+                batch, self._pending = self._pending, {}
+            elif job_id in self._pending:
+                batch = {job_id: self._pending.pop(job_id)}
+            else:
+                return 0
+            if not batch:
+                return 0
+            try:
+                async with DatabaseSession() as db:
+                    await update_jobs_progress(db, [(jid, p, s) for jid, (p, s) in batch.items()])
+                self.writes += 1
+            except Exception as db_error:
+                logger.debug(f"Progress for {len(batch)} job(s) not saved: {db_error}")
+            return len(batch)
+
+    async def finish(self, job_id: str) -> None:
+        """Stop accepting reports for a job and write its pending progress."""
+        self._tracked.discard(job_id)
+        await self.flush(job_id)
+
+    async def close(self) -> None:
+        """Cancel the timer and write everything still pending."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Reports received vs. database transactions, for /status."""
+        return {"progress_reports": self.reports, "progress_writes": self.writes}
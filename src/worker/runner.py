@@ -0,0 +1,277 @@
+"""
+Job Runner
+==========
+
+Polls the processing_jobs table, claims pending jobs and executes them on
+a ProcessingPool. Any number of runners (API processes, `python -m
+src.worker` processes, other hosts) can drain the same queue.
+
+Queue protocol:
+1. claim_next_job() atomically moves a pending job to running and gives
+   this runner a lease (SKIP LOCKED on PostgreSQL)
+2. Heartbeats renew the lease while the job runs; if the renewal fails
+   (job cancelled, or lease lost) the local task is dropped
+3. Jobs whose lease expired (worker crashed) are requeued by any runner,
+   or failed after job_max_attempts
+4. On graceful shutdown running jobs are released back to pending
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Set
+import asyncio
+import os
+import socket
+
+from loguru import logger
+
+from src.api.config import get_settings
+from src.database.connection import DatabaseSession
+from src.database.crud import (
+    claim_next_job,
+    get_sample_by_db_id,
+    heartbeat_job,
+    release_job,
+    requeue_expired_jobs,
+    update_job_status,
+)
+from src.database.models import ProcessingJob  # type: ignore[import-not-found]
+from src.worker.pool import ProcessingPool, SUPPORTED_JOB_TYPES, get_processing_pool
+
+settings = get_settings()
+
+
+def default_worker_id() -> str:
+    """Worker identifier unique per process: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobRunner:
+    """
+    Claims queued ProcessingJob rows and runs them on a ProcessingPool.
+
+    Usage:
+        runner = JobRunner()
+        await runner.start()      # background polling
+        runner.wake()             # poll now (e.g. after an upload)
+        await runner.stop()       # release running jobs, stop polling
+
+    Standalone: `python -m src.worker` (see src/worker/__main__.py).
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ProcessingPool] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        job_types: Sequence[str] = SUPPORTED_JOB_TYPES,
+    ):
+        """
+        Initialize runner.
+
+        Args:
+            pool: Pool executing claimed jobs (default: global pool)
+            worker_id: Lease owner ID (default: host:pid)
+            poll_interval: Seconds between queue polls (default: settings)
+            lease_seconds: Lease duration (default: settings.job_lease_seconds)
+            max_attempts: Attempts before an expired job is failed (default: settings)
+            job_types: Job types this runner claims
+        """
+        self.pool = pool or get_processing_pool()
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval or settings.job_poll_interval_seconds
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.max_attempts = max_attempts or settings.job_max_attempts
+        self.job_types = tuple(job_types)
+        self._claimed: Set[str] = set()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._tasks: list[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start polling and heartbeat loops in the background."""
+        if self._tasks:
+            return
+        self._stopping = False
+        self.pool.start()
+        self._tasks = [
+            asyncio.create_task(self.run(), name="job-runner"),
+            asyncio.create_task(self._heartbeat_loop(), name="job-heartbeat"),
+        ]
+        logger.info(f"🏃 Job runner started: {self.worker_id} ({', '.join(self.job_types)})")
+
+    async def stop(self) -> None:
+        """Stop polling and release running jobs back to the queue."""
+        self._stopping = True
+        self._wake.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.release_all()
+        logger.info(f"🏃 Job runner stopped: {self.worker_id}")
+
+    async def drain(self) -> None:
+        """Process jobs until the queue is empty and local jobs finished."""
+        self.pool.start()
+        heartbeat = asyncio.create_task(self._heartbeat_loop(), name="job-heartbeat")
+        try:
+            await self.run(stop_when_idle=True)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    def wake(self) -> None:
+        """Poll the queue now instead of waiting for the next interval."""
+        self._wake.set()
+
+    async def release_all(self) -> None:
+        """Drop local tasks for claimed jobs and return them to pending."""
+        for job_id in list(self._claimed):
+            self.pool.cancel(job_id, outcome=None)
+            try:
+                async with DatabaseSession() as db:
+                    await release_job(db, job_id, self.worker_id)
+            except Exception as db_error:
+                logger.warning(f"⚠️ Could not release job {job_id}: {db_error}")
+        self._claimed.clear()
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    async def run(self, stop_when_idle: bool = False) -> None:
+        """
+        Poll the queue until stopped.
+
+        Args:
+            stop_when_idle: Return once the queue is empty and all claimed
+                jobs have finished (used by `python -m src.worker --once`)
+        """
+        while not self._stopping:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.warning(f"⚠️ Job queue poll failed: {e}")
+                claimed = 0
+
+            if stop_when_idle and claimed == 0 and not self._claimed:
+                return
+            if claimed and self.pool.free_slots:
+                continue  # Queue may hold more work; poll again immediately
+
+            self._wake.clear()
+            wait = [asyncio.create_task(self._wake.wait())]
+            running = [task for job_id in self._claimed if (task := self.pool.task(job_id))]
+            try:
+                # Wake on interval, explicit wake(), or a local job finishing
+                await asyncio.wait(wait + running, timeout=self.poll_interval,
+                                   return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                wait[0].cancel()
+
+    async def run_once(self) -> int:
+        """
+        Requeue expired leases, then claim jobs while the pool has free slots.
+
+        Returns:
+            Number of jobs claimed
+        """
+        async with DatabaseSession() as db:
+            await requeue_expired_jobs(db, self.max_attempts)
+
+        claimed = 0
+        while self.pool.free_slots > 0 and not self._stopping:
+            async with DatabaseSession() as db:
+                job = await claim_next_job(db, self.worker_id, self.lease_seconds, self.job_types)
+                if job is None:
+                    break
+                inputs = await self._resolve_inputs(db, job)
+            if inputs is None:
+                continue
+
+            job_id = str(job.job_id)
+            self._claimed.add(job_id)
+            task = self.pool.submit(
+                job_id=job_id, job_type=str(job.job_type), worker_id=self.worker_id, **inputs
+            )
+            task.add_done_callback(lambda _, job_id=job_id: self._claimed.discard(job_id))
+            claimed += 1
+        return claimed
+
+    async def _resolve_inputs(self, db, job: ProcessingJob) -> Optional[Dict[str, Any]]:  # type: ignore[no-untyped-def]
+        """
+        Find the input file and sample for a claimed job.
+
+        Uses job.parameters['file_path'], falling back to the sample's
+        stored file path for jobs created before parameters existed.
+        Jobs without an input file are failed.
+        """
+        parameters = job.parameters or {}
+        sample = await get_sample_by_db_id(db, job.sample_id) if job.sample_id is not None else None
+
+        file_path = parameters.get('file_path')
+        if file_path is None and sample is not None:
+            file_path = sample.file_path_nta if job.job_type == 'nta_parse' else sample.file_path_fcs
+
+        if not file_path:
+            await update_job_status(db, str(job.job_id), "failed", error_message="Job has no input file")
+            return None
+
+        return {
+            "file_path": Path(file_path),
+            "sample_id": sample.sample_id if sample is not None else Path(file_path).stem,
+            "sample_db_id": job.sample_id,
+        }
+
+    # ------------------------------------------------------------------
+    # Heartbeats
+    # ------------------------------------------------------------------
+
+    async def _heartbeat_loop(self) -> None:
+        """Renew leases every third of the lease duration."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self.heartbeat()
+
+    async def heartbeat(self) -> None:
+        """Renew leases for claimed jobs; drop jobs that were cancelled or lost."""
+        for job_id in list(self._claimed):
+            try:
+                async with DatabaseSession() as db:
+                    alive = await heartbeat_job(db, job_id, self.worker_id, self.lease_seconds)
+            except Exception as db_error:
+                logger.warning(f"⚠️ Heartbeat failed for job {job_id}: {db_error}")
+                continue
+            if not alive:
+                logger.warning(f"🚫 Job {job_id} cancelled or lease lost; stopping local task")
+                self.pool.cancel(job_id, outcome=None)
+                self._claimed.discard(job_id)
+
+
+# ============================================================================
+# Global Runner
+# ============================================================================
+
+_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """
+    Get or create the global job runner (uses the global pool).
+
+    Returns:
+        JobRunner instance
+    """
+    global _runner
+    if _runner is None:
+        _runner = JobRunner()
+    return _runner
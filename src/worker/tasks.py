@@ -0,0 +1,548 @@
+"""
+Processing Tasks
+================
+
+Pipeline functions executed inside ProcessingPool worker processes.
+
+Tasks run outside the API event loop, so they must be module-level
+(picklable) and exchange only plain Python data with the parent.
+Progress is sent back through a queue installed by init_worker(); the
+parent process writes it to the database. Stage timings travel back in
+the result ('metrics', see src/api/metrics.py StageTimer).
+
+Pipelines:
+- run_fcs_pipeline: parse → size → stats → Parquet
+- run_nta_pipeline: parse → size distribution stats → Parquet
+
+Each file is decoded once: statistics are computed on NumPy views of
+the parsed Arrow Table and the Parquet file is written from the same
+Table. fcs_event_summary() computes every FCSResult statistic (scatter,
+particle size, fluorescence, marker positivity, debris and doublets)
+and is shared with the Parquet backfill.
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence
+import math
+import re
+import time
+
+import numpy as np
+import pyarrow as pa
+from loguru import logger
+
+from src.api.config import get_settings
+from src.api.metrics import StageTimer
+from src.parsers.parquet_reader import ParquetReader
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# NTAResult size bins (nm) → column name
+NTA_SIZE_BINS = {
+    (30, 50): 'bin_30_50nm_pct',
+    (50, 80): 'bin_50_80nm_pct',
+    (80, 100): 'bin_80_100nm_pct',
+    (100, 120): 'bin_100_120nm_pct',
+    (120, 150): 'bin_120_150nm_pct',
+    (150, 200): 'bin_150_200nm_pct',
+}
+
+# Marker → FCSResult positivity column
+MARKER_COLUMNS = {
+    'CD9': 'cd9_positive_pct',
+    'CD81': 'cd81_positive_pct',
+    'CD63': 'cd63_positive_pct',
+}
+# "CD81", "cd-81", "CD 9" but not "CD90"
+_MARKER_PATTERN = re.compile(r'CD[\s_-]?(9|81|63)(?!\d)', re.IGNORECASE)
+
+# Robust standard deviation of a normal distribution per unit of MAD
+MAD_TO_SD = 1.4826
+
+# Imported by warm_up() so the first job does not pay for them. The
+# parent process (API, job runner) only imports this module, which
+# keeps pandas, fcsparser, scipy and miepython out of it.
+WARM_UP_MODULES = (
+    "pandas",
+    "fcsparser",
+    "src.parsers.fcs_parser",
+    "src.parsers.nta_parser",
+    "src.physics.mie_scatter",
+    "src.visualization.fcs_plots",
+    "scipy.optimize",
+    "miepython",
+)
+
+# Progress queue, installed in each worker process by init_worker()
+_progress_queue = None
+
+
+def init_worker(progress_queue) -> None:  # type: ignore[no-untyped-def]
+    """
+    Worker process initializer.
+
+    Args:
+        progress_queue: multiprocessing.Queue shared with the parent
+    """
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def warm_up() -> float:
+    """
+    Import the pipelines' heavy dependencies in a worker process.
+
+    Submitted once per worker by ProcessingPool.start() (worker_warm_up),
+    so processes are spawned and loaded while the API starts instead of
+    on the first upload.
+
+    Returns:
+        Seconds spent importing
+    """
+    start = time.perf_counter()
+    for module in WARM_UP_MODULES:
+        try:
+            import_module(module)
+        except ImportError as e:
+            logger.warning(f"⚠️ Worker warm-up: {module} unavailable ({e})")
+    return time.perf_counter() - start
+
+
+def report_progress(job_id: str, percent: int, step: str) -> None:
+    """
+    Send a progress update to the parent process.
+
+    Args:
+        job_id: Job UUID
+        percent: Progress percentage (0-100)
+        step: Description of current step
+    """
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, percent, step))
+
+
+def _finite(value: Any) -> Optional[float]:
+    """Convert to float, mapping NaN/inf to None (JSON and DB safe)."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def scatter_summary(values: np.ndarray, prefix: str) -> Dict[str, Optional[float]]:
+    """
+    Mean/median/std/CV for one scatter channel, keyed by FCSResult column.
+
+    CV is reported in percent, as in the QC and feature extraction modules.
+    """
+    from src.parsers.fcs_parser import FCSParser
+
+    stats = FCSParser._channel_stats(values)
+    return {
+        f'{prefix}_mean': _finite(stats['mean']),
+        f'{prefix}_median': _finite(stats['median']),
+        f'{prefix}_std': _finite(stats['std']),
+        f'{prefix}_cv': _finite(stats['cv'] * 100),
+    }
+
+
+def particle_size_summary(sizes: np.ndarray) -> Dict[str, Optional[float]]:
+    """
+    Particle size mean/median/std/D10/D90, keyed by FCSResult column.
+
+    Non-finite sizes (events outside the calibration) are ignored.
+    """
+    sizes = sizes[np.isfinite(sizes)]
+    if not sizes.size:
+        return {}
+    d10, d50, d90 = np.percentile(sizes, [10, 50, 90])
+    return {
+        'particle_size_mean_nm': _finite(sizes.mean()),
+        'particle_size_median_nm': _finite(d50),
+        'particle_size_std_nm': _finite(sizes.std(ddof=1)) if sizes.size > 1 else None,
+        'particle_size_d10_nm': _finite(d10),
+        'particle_size_d90_nm': _finite(d90),
+    }
+
+
+def markers_in(text: str) -> List[str]:
+    """Markers (MARKER_COLUMNS keys) named in a filename or stain keyword."""
+    return sorted({f"CD{match}" for match in _MARKER_PATTERN.findall(text or '')})
+
+
+def fluorescence_channels(channels: Sequence[str]) -> List[str]:
+    """Fluorescence height channels: no scatter, width or time, or named after a marker."""
+    return [
+        c for c in channels
+        if (c.endswith('-H') and 'FSC' not in c.upper() and 'SSC' not in c.upper())
+        or (markers_in(c) and not c.endswith('-A'))
+    ]
+
+
+def stain_channels(channels: Sequence[str], name: str) -> Dict[str, str]:
+    """
+    Fluorescence channel measuring each marker.
+
+    Channels named after a marker win (fcsparser names channels by their
+    $PnS stain label when one is set); otherwise markers named in the
+    file name (e.g. "P5_F10_CD81") are read from settings.fcs_marker_channel.
+
+    Args:
+        channels: Channel names
+        name: File name or sample ID
+
+    Returns:
+        Dictionary of marker → channel
+    """
+    fluorescence = fluorescence_channels(channels)
+    stains: Dict[str, str] = {}
+    for channel in fluorescence:
+        for marker in markers_in(channel):
+            stains.setdefault(marker, channel)
+    default_channel = get_settings().fcs_marker_channel
+    if default_channel in fluorescence:
+        for marker in markers_in(name):
+            stains.setdefault(marker, default_channel)
+    return stains
+
+
+def robust_gate(values: np.ndarray, k: float) -> float:
+    """Upper gate median + k robust SDs (from the MAD), insensitive to a minority population."""
+    median = np.median(values)
+    return float(median + k * MAD_TO_SD * np.median(np.abs(values - median)))
+
+
+def fluorescence_summary(values: np.ndarray, k: float) -> Dict[str, Optional[float]]:
+    """
+    Statistics and positive fraction of one fluorescence channel.
+
+    Events above robust_gate() of the channel count as positive, so the
+    gate follows the noise of each acquisition; it assumes stained
+    events are the minority (as for EV samples).
+    """
+    values = values[np.isfinite(values)]
+    if not values.size:
+        return {}
+    threshold = robust_gate(values, k)
+    mean = float(values.mean())
+    std = float(values.std(ddof=1)) if values.size > 1 else None
+    return {
+        'mean': _finite(mean),
+        'median': _finite(np.median(values)),
+        'cv': _finite(std / mean * 100) if std is not None and mean else None,
+        'threshold': _finite(threshold),
+        'positive_pct': float(100 * np.count_nonzero(values > threshold) / values.size),
+    }
+
+
+def fcs_event_summary(
+    column: Callable[[str], np.ndarray],
+    channels: Sequence[str],
+    sizes: Optional[np.ndarray] = None,
+    stains: Optional[Mapping[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    FCSResult statistics from event arrays.
+
+    Args:
+        column: Returns one channel as a NumPy array (e.g. the parser's
+            zero-copy column_values)
+        channels: Available channel names
+        sizes: particle_size_nm per event, if sized
+        stains: Marker → fluorescence channel (see stain_channels)
+
+    Returns:
+        FCSResult column values: fsc_/ssc_ mean, median, std, CV;
+        particle size summary; fluorescence_stats per channel;
+        cd9/cd81/cd63_positive_pct for stained markers; debris_pct
+        (non-positive scatter or sized below fcs_debris_max_size_nm) and
+        doublets_pct (FSC area/height ratio above the robust gate)
+    """
+    settings = get_settings()
+    k = settings.fcs_gate_mad_multiplier
+    summary: Dict[str, Any] = {}
+
+    fsc_channel = ParquetReader.find_channel(channels, preferred='VFSC-H')
+    ssc_channel = ParquetReader.find_channel(channels, contains=('SSC', 'H'))
+    fsc = np.asarray(column(fsc_channel), dtype=np.float64) if fsc_channel else None
+    ssc = np.asarray(column(ssc_channel), dtype=np.float64) if ssc_channel else None
+    if fsc is not None:
+        summary.update(scatter_summary(fsc, 'fsc'))
+    if ssc is not None:
+        summary.update(scatter_summary(ssc, 'ssc'))
+    if sizes is not None:
+        summary.update(particle_size_summary(sizes))
+
+    fluorescence = {}
+    for channel in fluorescence_channels(channels):
+        stats = fluorescence_summary(np.asarray(column(channel), dtype=np.float64), k)
+        if stats:
+            fluorescence[channel] = stats
+    if fluorescence:
+        summary['fluorescence_stats'] = fluorescence
+    for marker, channel in (stains or {}).items():
+        if marker in MARKER_COLUMNS and channel in fluorescence:
+            summary[MARKER_COLUMNS[marker]] = fluorescence[channel]['positive_pct']
+
+    if fsc is not None and fsc.size:
+        debris = fsc <= 0
+        if ssc is not None:
+            debris |= ssc <= 0
+        if sizes is not None and sizes.size == fsc.size:
+            debris |= sizes < settings.fcs_debris_max_size_nm  # NaN (unsized) compares False
+        summary['debris_pct'] = float(100 * np.count_nonzero(debris) / fsc.size)
+
+        # Coincident particles: pulse area grows faster than height
+        area_channel = f"{fsc_channel[:-2]}-A" if fsc_channel and fsc_channel.endswith('-H') else None
+        if area_channel in channels:
+            area = np.asarray(column(area_channel), dtype=np.float64)
+            valid = (fsc > 0) & np.isfinite(area)
+            if np.any(valid):
+                ratio = area[valid] / fsc[valid]
+                summary['doublets_pct'] = float(100 * np.count_nonzero(ratio > robust_gate(ratio, k)) / ratio.size)
+    return summary
+
+
+def _size_events(fsc_values: np.ndarray, fsc_channel: str) -> Optional['pd.DataFrame']:
+    """
+    Mie-based particle sizing for one FSC channel.
+
+    Returns:
+        DataFrame with particle_size_nm (and size_in_calibrated_range when
+        calibrated), or None if sizing failed
+    """
+    import pandas as pd
+    from src.visualization.fcs_plots import calculate_particle_size
+
+    try:
+        sized = calculate_particle_size(pd.DataFrame({fsc_channel: fsc_values}), fsc_channel=fsc_channel)
+    except Exception as e:
+        logger.warning(f"⚠️ Particle sizing failed: {e}")
+        return None
+    return sized.drop(columns=[fsc_channel])
+
+
+def run_fcs_pipeline(
+    job_id: str,
+    file_path: str,
+    parquet_path: str,
+    sample_id: str,
+) -> Dict[str, Any]:
+    """
+    Parse an FCS file, size particles, compute summary statistics and
+    write the events to Parquet.
+
+    Args:
+        job_id: Job UUID (for progress reports and Parquet metadata)
+        file_path: Path to the uploaded FCS file
+        parquet_path: Destination Parquet file
+        sample_id: Sample identifier
+
+    Returns:
+        Dictionary with:
+        - fcs_result: FCSResult column values (including parquet_file_path)
+        - result_data: JSON summary stored on the ProcessingJob
+        - metrics: Stage timings and counts (StageTimer.as_dict())
+    """
+    from src.parsers.fcs_parser import FCSParser
+
+    timer = StageTimer()
+    report_progress(job_id, 5, "Parsing FCS file")
+    with timer.stage("parse"):
+        parser = FCSParser(Path(file_path))
+        if not parser.validate():
+            logger.warning("⚠️ FCS file validation failed, continuing anyway...")
+        table = parser.parse_arrow()
+    channels = list(parser.channel_names)
+
+    # Size particles from the forward scatter height channel
+    report_progress(job_id, 25, "Calculating particle sizes")
+    fsc_channel = ParquetReader.find_channel(channels, preferred='VFSC-H')
+    with timer.stage("sizing"):
+        sized = _size_events(parser.column_values(fsc_channel), fsc_channel) if fsc_channel else None
+        if sized is not None:
+            for name in sized.columns:
+                table = table.append_column(name, pa.array(sized[name].to_numpy()))
+            parser.table = table
+
+    report_progress(job_id, 60, "Computing statistics")
+    ssc_channel = ParquetReader.find_channel(channels, contains=('SSC', 'H'))
+    stains = stain_channels(channels, parser.file_path.stem)
+    fcs_result: Dict[str, Any] = {'total_events': table.num_rows}
+    with timer.stage("stats"):
+        sizes = sized['particle_size_nm'].to_numpy(dtype=np.float64) if sized is not None else None
+        fcs_result.update(fcs_event_summary(parser.column_values, channels, sizes, stains))
+
+    report_progress(job_id, 80, "Writing Parquet")
+    output = Path(parquet_path)
+    with timer.stage("parquet_write"):
+        parser.to_parquet(output, metadata={'job_id': job_id, 'sample_id': sample_id})
+    fcs_result['parquet_file_path'] = str(output)
+
+    result_data = {
+        'event_count': table.num_rows,
+        'channels': channels,
+        'fsc_channel': fsc_channel,
+        'ssc_channel': ssc_channel,
+        'mean_fsc': fcs_result.get('fsc_mean'),
+        'mean_ssc': fcs_result.get('ssc_mean'),
+        'particle_size_median_nm': fcs_result.get('particle_size_median_nm'),
+        'stain_channels': stains,
+        'marker_positive_pct': {
+            marker: fcs_result[column] for marker, column in MARKER_COLUMNS.items() if column in fcs_result
+        },
+        'debris_pct': fcs_result.get('debris_pct'),
+        'doublets_pct': fcs_result.get('doublets_pct'),
+        'parquet_file': str(output),
+    }
+
+    report_progress(job_id, 95, "Saving results")
+    metrics = timer.as_dict(
+        events=table.num_rows,
+        bytes_in=Path(file_path).stat().st_size,
+        bytes_out=output.stat().st_size,
+    )
+    return {'fcs_result': fcs_result, 'result_data': result_data, 'metrics': metrics}
+
+
+def _weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles: List[float]) -> np.ndarray:
+    """Quantiles of a binned distribution (sizes weighted by count/concentration)."""
+    order = np.argsort(values)
+    values, weights = values[order], weights[order]
+    cdf = np.cumsum(weights) / weights.sum()
+    idx = np.searchsorted(cdf, quantiles, side='left')
+    return values[np.minimum(idx, len(values) - 1)]
+
+
+def size_distribution_summary(data: 'pd.DataFrame') -> Optional[Dict[str, Any]]:
+    """
+    NTAResult size fields from a ZetaView size distribution.
+
+    Sizes are weighted by concentration (particles/mL) when available,
+    otherwise by particle count. With both, the concentration error is
+    the Poisson error of the particle count (concentration / sqrt(N)).
+
+    Returns:
+        NTAResult column values, or None if the file has no size distribution
+    """
+    if 'size_nm' not in data.columns:
+        return None
+
+    weight_column = None
+    for column in ('concentration_particles_ml', 'particle_count'):
+        if column in data.columns and data[column].fillna(0).sum() > 0:
+            weight_column = column
+            break
+    if weight_column is None:
+        return None
+
+    sizes = data['size_nm'].to_numpy(dtype=np.float64)
+    weights = data[weight_column].fillna(0).to_numpy(dtype=np.float64)
+    valid = np.isfinite(sizes) & (weights > 0)
+    sizes, weights = sizes[valid], weights[valid]
+    if sizes.size == 0:
+        return None
+
+    mean = float(np.average(sizes, weights=weights))
+    std = float(np.sqrt(np.average((sizes - mean) ** 2, weights=weights)))
+    d10, d50, d90 = _weighted_quantiles(sizes, weights, [0.1, 0.5, 0.9])
+    total = weights.sum()
+
+    summary: Dict[str, Any] = {
+        'mean_size_nm': mean,
+        'median_size_nm': float(d50),
+        'mode_size_nm': float(sizes[np.argmax(weights)]),
+        'd10_nm': float(d10),
+        'd50_nm': float(d50),
+        'd90_nm': float(d90),
+        'std_dev_nm': std,
+    }
+    for (low, high), column in NTA_SIZE_BINS.items():
+        in_bin = (sizes >= low) & (sizes < high)
+        summary[column] = float(100 * weights[in_bin].sum() / total)
+    if weight_column == 'concentration_particles_ml':
+        summary['concentration_particles_ml'] = float(total)
+        # Poisson counting error of the tracked particles behind the estimate
+        if 'particle_count' in data.columns:
+            counted = float(data['particle_count'].fillna(0).to_numpy(dtype=np.float64)[valid].sum())
+            if counted > 0:
+                summary['concentration_particles_ml_error'] = float(total / math.sqrt(counted))
+    return summary
+
+
+def run_nta_pipeline(
+    job_id: str,
+    file_path: str,
+    parquet_path: str,
+    sample_id: str,
+) -> Dict[str, Any]:
+    """
+    Parse a ZetaView NTA file, summarize the size distribution and write
+    the data to Parquet.
+
+    Args:
+        job_id: Job UUID (for progress reports and Parquet metadata)
+        file_path: Path to the uploaded NTA file
+        parquet_path: Destination Parquet file
+        sample_id: Sample identifier
+
+    Returns:
+        Dictionary with:
+        - nta_result: NTAResult column values (None if the file has no
+          size distribution, e.g. zeta potential profiles)
+        - result_data: JSON summary stored on the ProcessingJob
+        - metrics: Stage timings and counts (StageTimer.as_dict())
+    """
+    import pandas as pd
+    from src.parsers.nta_parser import NTAParser
+
+    timer = StageTimer()
+    report_progress(job_id, 10, "Parsing NTA file")
+    with timer.stage("parse"):
+        parser = NTAParser(Path(file_path))
+        if not parser.validate():
+            logger.warning("⚠️ NTA file validation failed, continuing anyway...")
+        data = parser.parse()
+
+    report_progress(job_id, 50, "Computing size distribution")
+    with timer.stage("stats"):
+        nta_result = size_distribution_summary(data)
+    if nta_result is not None:
+        params = parser.measurement_params
+        nta_result.update({
+            'temperature_celsius': params.get('temperature'),
+            'ph': params.get('ph'),
+            'conductivity': params.get('conductivity'),
+        })
+        if 'measurement_datetime' in data.columns:
+            nta_result['measurement_date'] = pd.Timestamp(data['measurement_datetime'].iloc[0]).to_pydatetime()
+
+    report_progress(job_id, 80, "Writing Parquet")
+    output = Path(parquet_path)
+    with timer.stage("parquet_write"):
+        parser.to_parquet(output, metadata={'job_id': job_id, 'sample_id': sample_id})
+    if nta_result is not None:
+        nta_result['parquet_file_path'] = str(output)
+
+    result_data = {
+        'data_points': len(data),
+        'measurement_type': parser.measurement_type,
+        'columns': list(data.columns),
+        'mean_size_nm': nta_result['mean_size_nm'] if nta_result else None,
+        'median_size_nm': nta_result['median_size_nm'] if nta_result else None,
+        'concentration_particles_ml': nta_result.get('concentration_particles_ml') if nta_result else None,
+        'parquet_file': str(output),
+    }
+
+    report_progress(job_id, 95, "Saving results")
+    metrics = timer.as_dict(
+        events=len(data),
+        bytes_in=Path(file_path).stat().st_size,
+        bytes_out=output.stat().st_size,
+    )
+    return {'nta_result': nta_result, 'result_data': result_data, 'metrics': metrics}
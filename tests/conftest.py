@@ -0,0 +1,44 @@
+"""
+Shared Test Fixtures
+====================
+
+Fixtures used across test modules.
+
+Fixtures:
+- sqlite_db: Temporary SQLite database wired into src.database.connection
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+from pathlib import Path
+import pytest_asyncio
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api import response_cache
+from src.api.config import get_settings
+from src.database import connection, crud
+
+
+@pytest_asyncio.fixture
+async def sqlite_db(tmp_path, monkeypatch):
+    """
+    Point the global engine at a fresh SQLite database with all tables.
+
+    Yields:
+        Session factory bound to the temporary database
+    """
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'database_url', f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(settings, 'parquet_dir', tmp_path / "parquet")
+    monkeypatch.setattr(settings, 'db_use_null_pool', True)
+    await connection.close_connections()
+    crud.invalidate_status_counts()
+    monkeypatch.setattr(response_cache, '_cache', None)
+
+    await connection.init_database()
+    yield connection.get_session_factory()
+    await connection.close_connections()
@@ -0,0 +1,100 @@
+"""
+Bulk Load Tests
+===============
+
+Tests for the bulk CRUD functions and the batch output loader in
+src/database/bulk_load.py.
+
+Tests:
+- bulk_create_* insert a batch with one statement and one commit
+- Processing logs of the batch scripts load into fcs_results /
+  nta_results, creating samples and skipping failed runs and rows that
+  were already loaded
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+import uuid
+from pathlib import Path
+import pandas as pd
+import pytest
+from sqlalchemy import event, func, select
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import connection
+from src.database.bulk_load import load_results
+from src.database.crud import bulk_create_fcs_results, bulk_create_processing_jobs, create_sample
+from src.database.models import FCSResult, NTAResult, ProcessingJob, Sample
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_single_statement(sqlite_db):
+    async with sqlite_db() as db:
+        sample = await create_sample(db, sample_id="BULK1")
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+    try:
+        async with sqlite_db() as db:
+            count = await bulk_create_fcs_results(db, [
+                {"sample_id": sample.id, "total_events": n, "parquet_file_path": f"{n}.parquet"}
+                if n % 2 else
+                {"sample_id": sample.id, "total_events": n, "parquet_file_path": f"{n}.parquet", "fsc_mean": 1.5}
+                for n in range(200)
+            ])
+    finally:
+        event.remove(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+
+    assert count == 200
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT")]) == 1
+
+    async with sqlite_db() as db:
+        jobs = await bulk_create_processing_jobs(db, [
+            {"job_id": str(uuid.uuid4()), "job_type": "fcs_parse", "sample_id": sample.id} for _ in range(3)
+        ])
+        assert jobs == 3
+        assert await db.scalar(select(func.count()).where(ProcessingJob.status == "pending")) == 3
+        assert await db.scalar(select(func.count()).where(FCSResult.fsc_mean == 1.5)) == 100
+
+
+@pytest.mark.asyncio
+async def test_load_batch_processing_logs(sqlite_db, tmp_path):
+    async with sqlite_db() as db:
+        await create_sample(db, sample_id="EXISTING")
+
+    fcs_log = tmp_path / "processing_log_fcs.csv"
+    pd.DataFrame([
+        {"sample_id": "EXISTING", "status": "success", "events_parsed": 1000, "output_file": "a.parquet"},
+        {"sample_id": "NEW", "status": "success", "events_parsed": 2000, "output_file": "b.parquet",
+         "biological_sample_id": "P5_F10"},
+        {"sample_id": "BROKEN", "status": "error", "events_parsed": None, "output_file": None},
+    ]).to_csv(fcs_log, index=False)
+
+    nta_output = tmp_path / "NTA1_size.parquet"
+    pd.DataFrame({
+        "size_nm": [50.0, 100.0, 150.0],
+        "concentration_particles_ml": [1e8, 2e8, 1e8],
+    }).to_parquet(nta_output)
+    nta_log = tmp_path / "processing_log_nta.csv"
+    pd.DataFrame([
+        {"sample_id": "NTA1", "success": True, "output_file": str(nta_output), "measurement_type": "size"},
+    ]).to_csv(nta_log, index=False)
+
+    async with sqlite_db() as db:
+        fcs = await load_results(db, "fcs", [fcs_log])
+        again = await load_results(db, "fcs", [fcs_log])
+        nta = await load_results(db, "nta", [nta_log])
+
+        assert fcs == {"rows_read": 3, "loaded": 2, "skipped": 1, "duplicates": 0}
+        assert again["loaded"] == 0 and again["duplicates"] == 2
+        assert nta["loaded"] == 1
+        new = (await db.execute(select(Sample).where(Sample.sample_id == "NEW"))).scalar_one()
+        assert new.biological_sample_id == "P5_F10"
+        result = (await db.execute(select(NTAResult))).scalar_one()
+        assert result.median_size_nm == 100.0
+        assert result.concentration_particles_ml == pytest.approx(4e8)
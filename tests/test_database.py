@@ -0,0 +1,75 @@
+"""
+Database Connection Tests
+=========================
+
+Tests for engine and pool configuration in src/database/connection.py.
+
+Tests:
+- The engine pools connections using the db_pool_* settings
+- NullPool is used only when explicitly requested
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool, QueuePool
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.config import get_settings
+from src.database import connection
+
+
+@pytest.fixture
+def sqlite_url(tmp_path, monkeypatch):
+    """Point settings at a temporary SQLite file with pooling enabled."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'database_url', f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    monkeypatch.setattr(settings, 'db_use_null_pool', False)
+    monkeypatch.setattr(settings, 'db_pool_size', 3)
+    monkeypatch.setattr(settings, 'db_max_overflow', 2)
+    return settings
+
+
+@pytest.mark.asyncio
+async def test_engine_pools_connections(sqlite_url):
+    """Sessions reuse pooled connections and pool_stats reports usage."""
+    await connection.close_connections()
+    try:
+        engine = connection.get_engine()
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 3
+
+        factory = connection.get_session_factory()
+        async with factory() as session:
+            await session.execute(text("SELECT 1"))
+            assert connection.pool_stats()["checked_out"] == 1
+        for _ in range(5):
+            async with factory() as session:
+                await session.execute(text("SELECT 1"))
+
+        stats = connection.pool_stats()
+        assert stats["pool"] == type(engine.pool).__name__
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1  # One connection, reused
+        assert stats["max_overflow"] == 2
+    finally:
+        await connection.close_connections()
+    assert connection.pool_stats() == {"pool": None}
+
+
+@pytest.mark.asyncio
+async def test_null_pool_is_opt_in(sqlite_url, monkeypatch):
+    """db_use_null_pool switches pooling off."""
+    monkeypatch.setattr(sqlite_url, 'db_use_null_pool', True)
+    await connection.close_connections()
+    try:
+        assert isinstance(connection.get_engine().pool, NullPool)
+        assert connection.pool_stats() == {"pool": "NullPool"}
+    finally:
+        await connection.close_connections()
@@ -0,0 +1,172 @@
+"""
+Event Query Tests
+=================
+
+Tests for the binned event endpoints in src/api/routers/events.py.
+
+Tests:
+- 1D histograms honour bins, explicit edges, transforms and gates
+- 2D densities bin a channel pair
+- Results are cached per file version
+- Unknown channels and malformed gates are rejected with 400
+- Arrow IPC responses round-trip events and histograms
+- JSON event previews render NaN and infinite values as null
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.arrow_stream import ARROW_STREAM
+from src.api.routers import events
+from src.database.models import FCSResult, Sample
+
+N_EVENTS = 10_000
+
+
+@pytest_asyncio.fixture
+async def event_sample(sqlite_db, tmp_path):
+    """A sample whose FCS result points at a synthetic event file."""
+    rng = np.random.default_rng(0)
+    fsc = rng.lognormal(7, 1, N_EVENTS)
+    fsc[:100] = -5.0  # Negative (baseline-subtracted) events
+    table = pa.table({"VFSC-H": fsc, "VSSC1-H": rng.lognormal(6, 1, N_EVENTS), "Time": np.arange(N_EVENTS)})
+    parquet_path = tmp_path / "events.parquet"
+    pq.write_table(table, parquet_path, row_group_size=2_000)
+
+    async with sqlite_db() as db:
+        sample = Sample(sample_id="EV1", biological_sample_id="EV1", treatment="CD81")
+        db.add(sample)
+        await db.flush()
+        db.add(FCSResult(sample_id=sample.id, total_events=N_EVENTS, parquet_file_path=str(parquet_path)))
+        await db.commit()
+
+    events.compute_histogram.cache_clear()
+    events.compute_density2d.cache_clear()
+    return sqlite_db, table
+
+
+async def _histogram(db, **kwargs):  # type: ignore[no-untyped-def]
+    params = dict(channel="VFSC-H", bins=256, edges=None, range_min=None, range_max=None,
+                  transform="linear", cofactor=150.0, gate=None, result_id=None, accept=None)
+    params.update(kwargs)
+    return await events.get_event_histogram(sample_id="EV1", db=db, **params)
+
+
+@pytest.mark.asyncio
+async def test_histogram_transforms_and_gates(event_sample):
+    factory, table = event_sample
+    fsc = table.column("VFSC-H").to_numpy()
+
+    async with factory() as db:
+        linear = await _histogram(db, bins=50)
+        logged = await _histogram(db, transform="log", edges="0,2,4,6,8,10")
+        gated = await _histogram(db, gate=["VFSC-H:1000:"], transform="arcsinh")
+
+    assert len(linear["counts"]) == 50 and len(linear["edges"]) == 51
+    assert linear["binned_events"] == linear["gated_events"] == N_EVENTS
+
+    assert logged["edges"] == [0, 2, 4, 6, 8, 10]
+    assert sum(logged["counts"]) == np.histogram(np.log10(fsc[fsc > 0]), bins=[0, 2, 4, 6, 8, 10])[0].sum()
+
+    assert gated["gated_events"] == int((fsc >= 1000).sum())
+    assert gated["edges"][0] >= np.arcsinh(1000 / 150.0) - 1e-9
+
+
+@pytest.mark.asyncio
+async def test_density2d_and_cache(event_sample):
+    factory, _ = event_sample
+    async with factory() as db:
+        kwargs = dict(x_channel="VFSC-H", y_channel="VSSC1-H", bins_x=32, bins_y=16,
+                      x_min=None, x_max=None, y_min=None, y_max=None,
+                      transform="log", cofactor=150.0, gate=None, result_id=None, accept=None)
+        first = await events.get_event_density2d(sample_id="EV1", db=db, **kwargs)
+        second = await events.get_event_density2d(sample_id="EV1", db=db, **kwargs)
+
+    assert np.asarray(first["counts"]).shape == (32, 16)
+    assert first["binned_events"] == N_EVENTS - 100  # Negative FSC dropped by log
+    assert second == first
+    assert events.compute_density2d.cache_info().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_bad_requests(event_sample):
+    factory, _ = event_sample
+    async with factory() as db:
+        for kwargs in ({"channel": "NOPE"}, {"gate": ["VFSC-H"]}, {"transform": "sqrt"}, {"edges": "3,1"}):
+            with pytest.raises(HTTPException) as excinfo:
+                await _histogram(db, **kwargs)
+            assert excinfo.value.status_code == 400
+        with pytest.raises(HTTPException) as excinfo:
+            await events.get_event_histogram(sample_id="missing", db=db, channel="VFSC-H", bins=8, edges=None,
+                                             range_min=None, range_max=None, transform="linear",
+                                             cofactor=150.0, gate=None, result_id=None, accept=None)
+        assert excinfo.value.status_code == 404
+
+
+async def _read_arrow(response) -> pa.Table:  # type: ignore[no-untyped-def]
+    assert response.media_type == ARROW_STREAM
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    return pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+
+
+@pytest.mark.asyncio
+async def test_arrow_events_and_histogram(event_sample):
+    factory, table = event_sample
+    fsc = table.column("VFSC-H").to_numpy()
+
+    async with factory() as db:
+        params = dict(columns=["VFSC-H"], gate=["VFSC-H:1000:"], result_id=None, db=db)
+        streamed = await _read_arrow(await events.get_events(sample_id="EV1", limit=None, accept=ARROW_STREAM, **params))
+        limited = await _read_arrow(await events.get_events(sample_id="EV1", limit=7, accept=ARROW_STREAM, **params))
+        preview = await events.get_events(sample_id="EV1", limit=5, accept=None, **params)
+        histogram = await _read_arrow(await _histogram(db, bins=20, accept=ARROW_STREAM))
+        as_json = await _histogram(db, bins=20)
+
+    assert streamed.column_names == ["VFSC-H"]
+    assert streamed.num_rows == int((fsc >= 1000).sum())
+    assert np.array_equal(streamed.column("VFSC-H").to_numpy(), fsc[fsc >= 1000])
+    assert limited.num_rows == 7
+    assert preview["num_events"] == 5 and list(preview["data"]) == ["VFSC-H"]
+
+    assert histogram.column_names == ["edge_low", "edge_high", "count"]
+    assert histogram.column("count").to_pylist() == as_json["counts"]
+    assert histogram.schema.metadata[b"gated_events"] == str(N_EVENTS).encode()
+
+
+@pytest.mark.asyncio
+async def test_json_events_with_nan(sqlite_db, tmp_path):
+    """Unsized events (NaN) and infinities become null instead of failing to render."""
+    table = pa.table({
+        "VFSC-H": [1.0, 2.0, 3.0],
+        "particle_size_nm": [80.0, float("nan"), float("inf")],
+        "Time": [0, 1, 2],
+    })
+    parquet_path = tmp_path / "unsized.parquet"
+    pq.write_table(table, parquet_path)
+    async with sqlite_db() as db:
+        sample = Sample(sample_id="EV2", biological_sample_id="EV2", treatment="CD81")
+        db.add(sample)
+        await db.flush()
+        db.add(FCSResult(sample_id=sample.id, total_events=3, parquet_file_path=str(parquet_path)))
+        await db.commit()
+
+        preview = await events.get_events(
+            sample_id="EV2", columns=None, gate=None, limit=None, result_id=None, accept=None, db=db,
+        )
+
+    assert preview["data"]["particle_size_nm"] == [80.0, None, None]
+    assert preview["data"]["Time"] == [0, 1, 2]
+    JSONResponse(preview)  # Raises on non-finite floats
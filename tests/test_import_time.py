@@ -0,0 +1,80 @@
+"""
+Import Time Tests
+=================
+
+Cold start budget for the API and for spawned worker processes.
+
+Each check runs in a fresh interpreter, since the test session has
+already imported everything.
+
+Tests:
+- Importing the API app (and the worker tasks module every spawned
+  worker imports) stays within budget without loading pandas, fcsparser,
+  matplotlib, seaborn, scipy or miepython
+- Worker warm-up loads the pipeline dependencies
+- The database layer does not import API modules (job events, response
+  cache); those register themselves as CRUD listeners
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ["pandas", "fcsparser", "matplotlib", "seaborn", "scipy", "miepython"]
+
+# Generous: ~1.5s locally, mostly FastAPI, SQLAlchemy and pyarrow
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+def _import_in_subprocess(module: str, then: str = "") -> dict:
+    """Import a module in a new interpreter; report the time taken and heavy modules loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"{then}\n"
+        f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["src.api.main", "src.worker.tasks"])
+def test_import_within_budget_without_heavy_modules(module):
+    """Scientific libraries are loaded on first use, not on import."""
+    report = _import_in_subprocess(module)
+
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+def test_warm_up_loads_pipeline_dependencies():
+    """warm_up() preloads what the FCS and NTA pipelines need."""
+    report = _import_in_subprocess("src.worker.tasks", then="src.worker.tasks.warm_up()")
+
+    assert {"pandas", "fcsparser", "scipy", "miepython"} <= set(report["loaded"])
+
+
+def test_crud_does_not_load_api_state():
+    """CRUD users such as scripts and backfills get no API job events or response cache."""
+    code = (
+        "import sys\n"
+        "import src.database.crud\n"
+        "print([m for m in ('src.api.job_events', 'src.api.response_cache') if m in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,91 @@
+"""
+Job Event Tests
+===============
+
+Tests for the in-process job event broker and the SSE stream at
+GET /jobs/{job_id}/events.
+
+Tests:
+- Slow subscribers keep the newest snapshot
+- The stream sends the current state, every update, and closes on a
+  terminal status without querying the database per update
+- Unknown jobs return 404
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.job_events import JobEventBroker
+from src.api.routers import jobs
+from src.database import connection
+from src.database.crud import create_processing_job, update_job_progress, update_job_status
+
+
+@pytest.mark.asyncio
+async def test_broker_drops_oldest_for_slow_subscribers():
+    broker = JobEventBroker(queue_size=2)
+    async with broker.subscribe("job") as slow, broker.subscribe("job") as other:
+        for percent in range(5):
+            broker.publish("job", {"progress_percent": percent})
+        assert [slow.get_nowait()["progress_percent"] for _ in range(2)] == [3, 4]
+        assert other.qsize() == 2
+        assert broker.stats() == {"jobs_watched": 1, "subscribers": 2}
+    assert broker.latest("job") == {"progress_percent": 4}
+    assert broker.stats() == {"jobs_watched": 0, "subscribers": 0}
+
+
+@pytest.mark.asyncio
+async def test_stream_pushes_updates_until_terminal(sqlite_db):
+    job_id = str(uuid.uuid4())
+    async with sqlite_db() as db:
+        await create_processing_job(db, job_id=job_id, job_type="fcs_parse")
+
+    response = await jobs.stream_job_events(job_id)
+    assert response.media_type == "text/event-stream"
+
+    queries = []
+    listener = lambda *args: queries.append(args[2])  # noqa: E731
+    event.listen(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+
+    async def collect(stream) -> list:  # type: ignore[no-untyped-def]
+        return [chunk async for chunk in stream]
+
+    reader = asyncio.create_task(collect(response.body_iterator))
+    # Many more clients watching the same job
+    watchers = asyncio.gather(*(collect(jobs._job_event_stream(job_id, None)) for _ in range(20)))
+    await asyncio.sleep(0.05)
+    waiting_queries = len(queries)
+
+    async with sqlite_db() as db:
+        await update_job_progress(db, job_id, 40, "Computing statistics")
+        await update_job_status(db, job_id, "completed", result_data={"event_count": 1})
+
+    chunks = await asyncio.wait_for(reader, timeout=5)
+    watched = await asyncio.wait_for(watchers, timeout=5)
+    event.remove(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+
+    messages = [json.loads(c.split("data: ", 1)[1]) for c in chunks if c.startswith("event: job")]
+    assert [m["status"] for m in messages] == ["pending", "running", "completed"]
+    assert messages[1]["progress_percent"] == 40
+    assert messages[-1]["progress_percent"] == 100
+    assert all(sum(c.startswith("event: job") for c in stream) == 2 for stream in watched)
+    assert waiting_queries == 0  # 21 subscribers, no database load
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_is_404(sqlite_db):
+    with pytest.raises(HTTPException) as excinfo:
+        await jobs.stream_job_events(str(uuid.uuid4()))
+    assert excinfo.value.status_code == 404
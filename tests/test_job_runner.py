@@ -0,0 +1,223 @@
+"""
+Job Runner Tests
+================
+
+Tests for the database-backed job queue (claims, leases, heartbeats)
+and the JobRunner that executes claimed jobs.
+
+Tests:
+- Concurrent claims never return the same job
+- Heartbeats stop succeeding once a job is cancelled
+- Expired leases are requeued, or failed after max attempts
+- Released jobs return to pending without using an attempt
+- A worker whose lease expired and whose job was reclaimed writes
+  neither results nor a status
+- run_once() claims a queued NTA job and saves its NTAResult
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import asyncio
+import shutil
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from sqlalchemy import select, update
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.crud import (
+    claim_next_job,
+    create_processing_job,
+    get_job_by_id,
+    heartbeat_job,
+    release_job,
+    requeue_expired_jobs,
+    update_job_status,
+)
+from src.database.models import FCSResult, NTAResult, ProcessingJob, Sample
+from src.worker.pool import ProcessingPool
+from src.worker.runner import JobRunner
+
+SAMPLE_NTA = (
+    Path(__file__).parent.parent / "NTA" / "EV_IPSC_P2_27_2_25_NTA"
+    / "20250227_0019_EV_IP_P2_F8-1000_size_488.txt"
+)
+
+
+async def _queue_jobs(factory, count: int, job_type: str = "fcs_parse", parameters=None) -> list:
+    """Create a sample and `count` pending jobs for it."""
+    async with factory() as db:
+        sample = Sample(sample_id=f"S_{uuid.uuid4().hex[:6]}", biological_sample_id="S", treatment="Control")
+        db.add(sample)
+        await db.commit()
+        job_ids = []
+        for _ in range(count):
+            job_id = str(uuid.uuid4())
+            await create_processing_job(db, job_id=job_id, job_type=job_type,
+                                        sample_id=sample.id, parameters=parameters)
+            job_ids.append(job_id)
+        return job_ids
+
+
+@pytest.mark.asyncio
+async def test_claims_are_exclusive(sqlite_db):
+    """Concurrent workers each get a different job, then the queue is empty."""
+    job_ids = await _queue_jobs(sqlite_db, 3)
+
+    async def claim(worker_id: str):
+        async with sqlite_db() as db:
+            job = await claim_next_job(db, worker_id, lease_seconds=60)
+            return job.job_id if job else None
+
+    claimed = await asyncio.gather(*(claim(f"worker-{i}") for i in range(5)))
+    assert sorted(c for c in claimed if c) == sorted(job_ids)
+    assert claimed.count(None) == 2
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_ids[0])
+    assert job.status == "running"
+    assert job.attempts == 1
+    assert job.worker_id.startswith("worker-")
+    assert job.lease_expires_at > datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_job_type_filter(sqlite_db):
+    """Runners only claim the job types they handle."""
+    await _queue_jobs(sqlite_db, 1, job_type="nta_parse")
+    async with sqlite_db() as db:
+        assert await claim_next_job(db, "w", 60, job_types=["fcs_parse"]) is None
+        assert await claim_next_job(db, "w", 60, job_types=["nta_parse"]) is not None
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_fails_after_cancel(sqlite_db):
+    """Heartbeats renew the lease until the job is cancelled."""
+    (job_id,) = await _queue_jobs(sqlite_db, 1)
+    async with sqlite_db() as db:
+        await claim_next_job(db, "w1", lease_seconds=60)
+        assert await heartbeat_job(db, job_id, "w1", 60)
+        assert not await heartbeat_job(db, job_id, "w2", 60)
+        await update_job_status(db, job_id, "cancelled")
+        assert not await heartbeat_job(db, job_id, "w1", 60)
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_requeued_or_failed(sqlite_db):
+    """Expired jobs with attempts left are requeued; exhausted ones fail."""
+    retry_id, exhausted_id = await _queue_jobs(sqlite_db, 2)
+    async with sqlite_db() as db:
+        await claim_next_job(db, "crashed", 60)
+        await claim_next_job(db, "crashed", 60)
+        await db.execute(
+            update(ProcessingJob).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await db.execute(
+            update(ProcessingJob).where(ProcessingJob.job_id == exhausted_id).values(attempts=3)
+        )
+        await db.commit()
+
+        counts = await requeue_expired_jobs(db, max_attempts=3)
+        assert counts == {"requeued": 1, "failed": 1}
+
+        retry = await get_job_by_id(db, retry_id)
+        exhausted = await get_job_by_id(db, exhausted_id)
+        await db.refresh(retry)
+        await db.refresh(exhausted)
+    assert retry.status == "pending"
+    assert retry.worker_id is None
+    assert exhausted.status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_release_returns_job_to_queue(sqlite_db):
+    """A released job is pending again and its attempt is not counted."""
+    (job_id,) = await _queue_jobs(sqlite_db, 1)
+    async with sqlite_db() as db:
+        await claim_next_job(db, "w1", 60)
+        assert not await release_job(db, job_id, "w2")
+        assert await release_job(db, job_id, "w1")
+        job = await get_job_by_id(db, job_id)
+        await db.refresh(job)
+    assert job.status == "pending"
+    assert job.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_cannot_save_reclaimed_job(sqlite_db, tmp_path, monkeypatch):
+    """After its lease expired and w2 claimed the job, w1's results and failures are dropped."""
+    (job_id,) = await _queue_jobs(sqlite_db, 1)
+    async with sqlite_db() as db:
+        await claim_next_job(db, "w1", 60)
+        await db.execute(update(ProcessingJob).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        await db.commit()
+        await requeue_expired_jobs(db, max_attempts=3)
+        await claim_next_job(db, "w2", 60)
+        job = await get_job_by_id(db, job_id)
+        sample_id, sample_db_id = (await db.execute(select(Sample.sample_id, Sample.id))).one()
+
+    outcomes = [
+        {"result_data": {"event_count": 3}, "fcs_result": {"total_events": 3, "parquet_file_path": "w1.parquet"}},
+        RuntimeError("w1 crashed late"),
+    ]
+
+    async def execute(*args):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    pool = ProcessingPool(max_workers=1)
+    pool.start()
+    monkeypatch.setattr(pool, "_execute", execute)
+    try:
+        for _ in range(2):
+            await pool.submit(job_id, "fcs_parse", tmp_path / "x.fcs", sample_id, sample_db_id, worker_id="w1")
+    finally:
+        await pool.shutdown()
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_id)
+        await db.refresh(job)
+        results = (await db.execute(select(FCSResult))).scalars().all()
+        sample = (await db.execute(select(Sample))).scalar_one()
+    assert (job.status, job.worker_id, job.attempts) == ("running", "w2", 2)
+    assert results == []
+    assert sample.processing_status != "failed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not SAMPLE_NTA.exists(), reason="Sample NTA file not available")
+async def test_runner_executes_nta_job(sqlite_db, tmp_path):
+    """run_once() claims a queued NTA job and the pool saves its NTAResult."""
+    file_path = tmp_path / SAMPLE_NTA.name
+    shutil.copy(SAMPLE_NTA, file_path)
+    (job_id,) = await _queue_jobs(sqlite_db, 1, job_type="nta_parse",
+                                  parameters={"file_path": str(file_path)})
+
+    pool = ProcessingPool(max_workers=1, task_timeout_seconds=120)
+    runner = JobRunner(pool=pool, worker_id="test-runner", poll_interval=0.1)
+    pool.start()
+    try:
+        assert await runner.run_once() == 1
+        task = pool.task(job_id)
+        if task is not None:
+            await task
+    finally:
+        await runner.stop()
+        await pool.shutdown()
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_id)
+        result = (await db.execute(select(NTAResult))).scalar_one()
+
+    assert job.status == "completed"
+    assert job.worker_id == "test-runner"
+    assert result.median_size_nm > 0
+    assert result.d10_nm <= result.d50_nm <= result.d90_nm
+    assert Path(result.parquet_file_path).exists()
@@ -0,0 +1,63 @@
+"""
+Metrics Tests
+=============
+
+Tests for the metrics registry in src/api/metrics.py and the /metrics
+endpoint.
+
+Tests:
+- Histograms render cumulative Prometheus buckets, sum and count
+- Requests are labelled by route template, not raw path
+- Pipeline measurements returned by worker tasks are recorded
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+from pathlib import Path
+import httpx
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.main import app
+from src.api.metrics import MetricsRegistry, StageTimer, record_pipeline, registry
+
+
+def test_histogram_prometheus_format():
+    local = MetricsRegistry()
+    histogram = local.histogram("test_seconds", "Test latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, stage="parse")
+
+    text = local.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{stage="parse",le="1"} 2' in text
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'test_seconds_count{stage="parse"} 3' in text
+    assert local.summary()["test_seconds"]["parse"]["p50_le_ms"] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_labels_route_templates(sqlite_db):
+    timer = StageTimer()
+    with timer.stage("parse"):
+        pass
+    record_pipeline("fcs_parse", timer.as_dict(events=1234, bytes_in=4096, bytes_out=2048))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/health")
+        await client.get("/api/v1/samples/XYZ/events/histogram")  # Unknown sample, still labelled by template
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'route="/health"' in text
+    assert 'route="/api/v1/samples/{sample_id}/events/histogram"' in text
+    assert "XYZ" not in text
+    assert 'crmit_pipeline_stage_duration_seconds_count{pipeline="fcs_parse",stage="parse"}' in text
+    assert registry.summary()["crmit_pipeline_events_total"]["fcs_parse"] >= 1234
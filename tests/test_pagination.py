@@ -0,0 +1,123 @@
+"""
+Pagination Tests
+================
+
+Tests for keyset (cursor) pagination of the samples and jobs listings.
+
+Tests:
+- Walking next_cursor visits every row once, newest first
+- Equal timestamps are ordered by id (no rows skipped or repeated)
+- Totals come from the cached counters or an exact COUNT
+- Malformed cursors are rejected with 400
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from fastapi import HTTPException
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.pagination import decode_cursor, encode_cursor
+from src.api.routers import jobs, samples
+from src.database.models import ProcessingJob, Sample
+
+ROWS = 250
+BASE_TIME = datetime(2025, 11, 21, 12, 0, 0)
+
+
+async def _populate(factory) -> None:
+    """ROWS samples and jobs; timestamps repeat in groups of 10."""
+    async with factory() as db:
+        db.add_all(
+            Sample(sample_id=f"S{i:04d}", biological_sample_id="S", treatment="CD81",
+                   upload_timestamp=BASE_TIME + timedelta(minutes=i // 10))
+            for i in range(ROWS)
+        )
+        db.add_all(
+            ProcessingJob(job_id=str(uuid.uuid4()), job_type="fcs_parse" if i % 2 else "nta_parse",
+                          status="completed" if i % 5 else "failed",
+                          created_at=BASE_TIME + timedelta(minutes=i // 10))
+            for i in range(ROWS)
+        )
+        await db.commit()
+
+
+async def _list_jobs(db, **kwargs):  # type: ignore[no-untyped-def]
+    params = dict(skip=0, limit=100, status_filter=None, job_type=None, cursor=None, include_total=True)
+    params.update(kwargs)
+    return await jobs.list_jobs(db=db, **params)
+
+
+async def _list_samples(db, **kwargs):  # type: ignore[no-untyped-def]
+    params = dict(skip=0, limit=100, treatment=None, qc_status=None, processing_status=None,
+                  cursor=None, include_total=True)
+    params.update(kwargs)
+    return await samples.list_samples(db=db, **params)
+
+
+def test_cursor_round_trip():
+    """Cursors decode to the sort key they were built from."""
+    assert decode_cursor(encode_cursor(BASE_TIME, 42)) == (BASE_TIME, 42)
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor("not-a-cursor")
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_jobs_cursor_walk(sqlite_db):
+    """Following next_cursor returns every job exactly once, newest first."""
+    await _populate(sqlite_db)
+
+    seen, cursor, pages = [], None, 0
+    async with sqlite_db() as db:
+        while True:
+            page = await _list_jobs(db, cursor=cursor, include_total=False)
+            seen.extend(page["jobs"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+    assert pages == 3
+    assert len({job["id"] for job in seen}) == ROWS
+    keys = [(job["created_at"], job["id"]) for job in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_samples_cursor_walk_with_filter(sqlite_db):
+    """Filtered sample pages chain correctly and report exact totals."""
+    await _populate(sqlite_db)
+
+    async with sqlite_db() as db:
+        first = await _list_samples(db, limit=200, treatment="CD81")
+        second = await _list_samples(db, limit=200, treatment="CD81", cursor=first["next_cursor"])
+
+    assert first["total"] == ROWS
+    assert len(first["samples"]) == 200
+    assert len(second["samples"]) == ROWS - 200
+    assert second["next_cursor"] is None
+    ids = [s["id"] for s in first["samples"] + second["samples"]]
+    assert len(set(ids)) == ROWS
+    assert first["samples"][0]["sample_id"] == f"S{ROWS - 1:04d}"
+
+
+@pytest.mark.asyncio
+async def test_totals(sqlite_db):
+    """Status totals come from the counters; job_type totals are exact."""
+    await _populate(sqlite_db)
+
+    async with sqlite_db() as db:
+        assert (await _list_jobs(db))["total"] == ROWS
+        assert (await _list_jobs(db, status_filter="failed"))["total"] == ROWS // 5
+        assert (await _list_jobs(db, job_type="fcs_parse"))["total"] == ROWS // 2
+        assert (await _list_jobs(db, include_total=False))["total"] is None
+        assert (await _list_samples(db, processing_status="pending"))["total"] == ROWS
+        assert (await _list_samples(db, skip=240))["samples"][0]["sample_id"] == "S0009"
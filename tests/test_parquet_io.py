@@ -0,0 +1,305 @@
+"""
+Parquet I/O Tests
+=================
+
+Tests for Parquet writing and reading helpers in src/parsers.
+
+Tests:
+- Hive-partitioned dataset layout
+- Filter pushdown on partition and event columns
+- Metadata embedding round trip
+- Append-mode writer
+- Column-projected reads and streaming column rewrites
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+from pathlib import Path
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers.base_parser import BaseParser
+from src.parsers.parquet_writer import ParquetWriter, ParquetAppendWriter, METADATA_KEY
+from src.parsers.parquet_reader import ParquetReader
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def event_data():
+    """Create synthetic FCS event data for two samples."""
+    rng = np.random.default_rng(42)
+    n = 2000
+    return pd.DataFrame({
+        'FSC-A': rng.uniform(0, 100000, n),
+        'SSC-A': rng.uniform(0, 50000, n),
+        'instrument_type': 'flow_cytometry',
+        'biological_sample_id': np.where(np.arange(n) < n // 2, 'P5_F10', 'P5_F16'),
+        'acquisition_date': '2025-02-19',
+        'treatment': np.where(np.arange(n) % 2 == 0, 'CD81', 'ISO'),
+    })
+
+
+# ============================================================================
+# Dataset Tests
+# ============================================================================
+
+class TestPartitionedDataset:
+    """Test hive-partitioned dataset writing and reading."""
+
+    def test_write_dataset_layout(self, event_data, tmp_path):
+        """Files land in hive-style partition directories."""
+        root = tmp_path / "events"
+        written = ParquetWriter.write_dataset(event_data, root, metadata={'source': 'test'})
+
+        assert len(written) == 2
+        assert (root / "instrument_type=flow_cytometry" / "biological_sample_id=P5_F10"
+                / "acquisition_date=2025-02-19").is_dir()
+
+    def test_write_honors_partition_cols(self, event_data, tmp_path):
+        """ParquetWriter.write delegates to the dataset writer."""
+        root = tmp_path / "events"
+        ParquetWriter.write(event_data, root, partition_cols=['biological_sample_id'])
+
+        assert (root / "biological_sample_id=P5_F16").is_dir()
+
+    def test_missing_partition_column(self, event_data, tmp_path):
+        """Partitioning on an absent column raises ValueError."""
+        with pytest.raises(ValueError):
+            ParquetWriter.write_dataset(event_data, tmp_path / "events", partition_cols=['missing'])
+
+    def test_read_with_filters(self, event_data, tmp_path):
+        """Equality and range filters return only matching rows."""
+        root = tmp_path / "events"
+        ParquetWriter.write_dataset(event_data, root)
+
+        df = ParquetWriter.read_dataset(
+            root,
+            columns=['FSC-A', 'treatment'],
+            equals={'biological_sample_id': 'P5_F10', 'treatment': 'CD81'},
+            ranges={'FSC-A': (10000, 50000)},
+        )
+
+        expected = event_data[
+            (event_data['biological_sample_id'] == 'P5_F10')
+            & (event_data['treatment'] == 'CD81')
+            & event_data['FSC-A'].between(10000, 50000)
+        ]
+        assert list(df.columns) == ['FSC-A', 'treatment']
+        assert len(df) == len(expected)
+        assert df['FSC-A'].between(10000, 50000).all()
+
+    def test_repeated_writes_append(self, event_data, tmp_path):
+        """Writing twice into the same partitions keeps both batches."""
+        root = tmp_path / "events"
+        ParquetWriter.write_dataset(event_data, root)
+        ParquetWriter.write_dataset(event_data, root)
+
+        table = ParquetWriter.read_dataset(root, as_pandas=False)
+        assert table.num_rows == 2 * len(event_data)
+
+
+# ============================================================================
+# Metadata Tests
+# ============================================================================
+
+class _StubParser(BaseParser):
+    """Minimal parser with pre-set data and metadata."""
+
+    def parse(self):
+        return self.data
+
+    def extract_metadata(self):
+        return self.metadata
+
+    def validate(self):
+        return True
+
+
+class TestMetadataEmbedding:
+    """Test metadata attached by BaseParser.to_parquet."""
+
+    def test_to_parquet_metadata_round_trip(self, event_data, tmp_path):
+        """Parser metadata is stored as one JSON entry and decoded on read."""
+        parser = _StubParser(tmp_path / "sample.fcs")
+        parser.data = event_data
+        parser.metadata = {
+            '$TOT': np.int64(len(event_data)),
+            '$CYT': 'CytoFLEX nano',
+            '_channels_': pd.DataFrame({'$PnN': ['FSC-A', 'SSC-A']}),
+        }
+
+        output = tmp_path / "sample.parquet"
+        parser.to_parquet(output, metadata={'qc_passed': True})
+
+        schema_meta = pq.read_schema(output).metadata
+        assert METADATA_KEY in schema_meta
+        assert b'$CYT' not in schema_meta
+
+        df, meta = ParquetWriter.read_with_metadata(output)
+        assert meta['$TOT'] == len(event_data)
+        assert meta['$CYT'] == 'CytoFLEX nano'
+        assert meta['qc_passed'] is True
+        assert meta['_channels_'] == {'$PnN': ['FSC-A', 'SSC-A']}
+        assert '__index_level_0__' not in df.columns
+        assert len(df) == len(event_data)
+
+
+# ============================================================================
+# Append Writer Tests
+# ============================================================================
+
+class TestAppendWriter:
+    """Test incremental append-mode writing."""
+
+    def test_append_batches(self, event_data, tmp_path):
+        """Successive batches land in one file with running metadata."""
+        output = tmp_path / "events.parquet"
+        table = pa.Table.from_pandas(event_data, preserve_index=False)
+
+        with ParquetAppendWriter(output, metadata={'sample_id': 'P5_F10'}, row_group_size=500) as writer:
+            for batch in table.to_batches(max_chunksize=300):
+                writer.write_batch(batch)
+            assert not output.exists()
+
+        assert pq.read_metadata(output).num_rows == len(event_data)
+        meta = ParquetWriter.read_metadata(output)
+        assert meta['complete'] is True
+        assert meta['sample_id'] == 'P5_F10'
+        assert meta['event_count'] == len(event_data)
+        fsc = meta['column_stats']['FSC-A']
+        assert fsc['mean'] == pytest.approx(event_data['FSC-A'].mean())
+        assert fsc['std'] == pytest.approx(event_data['FSC-A'].std(), rel=1e-6)
+        assert fsc['max'] == pytest.approx(event_data['FSC-A'].max())
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_checkpoint_publishes_readable_file(self, event_data, tmp_path):
+        """checkpoint() makes the events so far readable while writing continues."""
+        output = tmp_path / "events.parquet"
+        table = pa.Table.from_pandas(event_data, preserve_index=False)
+
+        with ParquetAppendWriter(output, row_group_size=500) as writer:
+            writer.write_batch(table.slice(0, 1000))
+            assert writer.checkpoint() == output
+            assert pq.read_table(output).num_rows == 1000
+            assert ParquetWriter.read_metadata(output)['complete'] is False
+            writer.write_batch(table.slice(1000))
+
+        assert pq.read_table(output).equals(table.replace_schema_metadata(None), check_metadata=False)
+        meta = ParquetWriter.read_metadata(output)
+        assert meta['complete'] is True and meta['event_count'] == len(event_data)
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+    def test_failure_publishes_partial_file(self, event_data, tmp_path):
+        """A crash mid-run still leaves a readable file marked incomplete."""
+        output = tmp_path / "events.parquet"
+
+        with pytest.raises(RuntimeError):
+            with ParquetAppendWriter(output) as writer:
+                writer.write_batch(event_data.iloc[:1000])
+                raise RuntimeError("acquisition interrupted")
+
+        assert pq.read_table(output).num_rows == 1000
+        meta = ParquetWriter.read_metadata(output)
+        assert meta['complete'] is False
+        assert 'interrupted' in meta['error']
+
+    def test_failure_discards_when_not_keeping_partial(self, event_data, tmp_path):
+        """keep_partial=False removes the temporary file on failure."""
+        output = tmp_path / "events.parquet"
+
+        with pytest.raises(RuntimeError):
+            with ParquetAppendWriter(output, keep_partial=False) as writer:
+                writer.write_batch(event_data)
+                raise RuntimeError("boom")
+
+        assert not output.exists()
+        assert list(tmp_path.iterdir()) == []
+
+
+# ============================================================================
+# Projected Reader Tests
+# ============================================================================
+
+class TestParquetReader:
+    """Test column-projected reads and streaming column rewrites."""
+
+    @pytest.fixture
+    def event_file(self, event_data, tmp_path):
+        """Write event data as a single file with several row groups."""
+        path = tmp_path / "events.parquet"
+        pq.write_table(pa.Table.from_pandas(event_data, preserve_index=False), path, row_group_size=300)
+        return path
+
+    def test_read_projection(self, event_file):
+        """Only required and present optional columns are read."""
+        df = ParquetReader.read(event_file, columns=['FSC-A'], optional_columns=['particle_size_nm', 'SSC-A'])
+        assert list(df.columns) == ['FSC-A', 'SSC-A']
+
+        with pytest.raises(KeyError):
+            ParquetReader.read(event_file, columns=['VFSC-H'])
+
+    def test_read_filters(self, event_data, event_file):
+        """Row filters return only matching events."""
+        df = ParquetReader.read(event_file, columns=['FSC-A'], filters=[('FSC-A', '<', 20000)])
+        assert len(df) == (event_data['FSC-A'] < 20000).sum()
+
+    def test_find_channel(self):
+        """Preferred channel wins, else first FSC-H style column."""
+        assert ParquetReader.find_channel(['FSC-A', 'VFSC-H', 'FSC-H'], preferred='VFSC-H') == 'VFSC-H'
+        assert ParquetReader.find_channel(['FSC-A', 'FSC-H']) == 'FSC-H'
+        assert ParquetReader.find_channel(['SSC-A']) is None
+
+    def test_write_with_columns_in_place(self, event_data, event_file):
+        """New columns are added without touching the others."""
+        sizes = event_data['FSC-A'].to_numpy() / 1000
+        ParquetReader.write_with_columns(event_file, event_file, {'particle_size_nm': sizes})
+
+        df = pq.read_table(event_file).to_pandas()
+        assert list(df.columns) == list(event_data.columns) + ['particle_size_nm']
+        np.testing.assert_allclose(df['particle_size_nm'], sizes)
+        pd.testing.assert_series_equal(df['treatment'], event_data['treatment'])
+
+    def test_write_with_columns_row_mask(self, event_data, event_file, tmp_path):
+        """A row mask drops events; new columns align with kept rows."""
+        mask = event_data['FSC-A'].to_numpy() <= 50000
+        flags = np.arange(mask.sum()) % 2 == 0
+        output = tmp_path / "filtered.parquet"
+        ParquetReader.write_with_columns(event_file, output, {'flag': flags}, row_mask=mask)
+
+        df = pq.read_table(output).to_pandas()
+        assert len(df) == mask.sum()
+        np.testing.assert_allclose(df['FSC-A'], event_data['FSC-A'][mask])
+        np.testing.assert_array_equal(df['flag'], flags)
+
+    def test_write_with_columns_all_rows_dropped(self, event_data, event_file):
+        """Dropping every row still rewrites the file: empty, with the new columns."""
+        mask = np.zeros(len(event_data), dtype=bool)
+        ParquetReader.write_with_columns(event_file, event_file, {'flag': np.zeros(0, dtype=bool)}, row_mask=mask)
+
+        table = pq.read_table(event_file)
+        assert table.num_rows == 0
+        assert table.column_names == list(event_data.columns) + ['flag']
+        assert table.schema.field('flag').type == pa.bool_()
+        assert ParquetWriter.read_metadata(event_file)['event_count'] == 0
+
+    def test_write_with_columns_length_mismatch(self, event_file, tmp_path):
+        """Misaligned columns are rejected before anything is written."""
+        output = tmp_path / "out.parquet"
+        with pytest.raises(ValueError):
+            ParquetReader.write_with_columns(event_file, output, {'x': np.zeros(5)})
+        assert not output.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
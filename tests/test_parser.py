@@ -9,10 +9,20 @@ Date: November 13, 2025
 Status: STUB - Implementation pending
 """
 
+import sys
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers import fcs_parser
+from src.parsers.fcs_parser import FCSParser
+
+SAMPLE_FCS = Path(__file__).parent.parent / "nanoFACS" / "EXP 6-10-2025" / "water.fcs"
+
 
 class TestFCSParser:
     """Tests for FCS parser."""
@@ -33,6 +43,61 @@ class TestFCSParser:
         """Test FCS file parsing."""
         # TODO: Test with sample FCS file
         pass
+    
+    def test_parse_arrow_keeps_source_dtype(self, monkeypatch):
+        """$DATATYPE=D channels stay float64 unless float32 is requested."""
+        events = np.array([[0.1, 2.0 ** 24 + 1], [1e-9, 3.0]], dtype='>f8')  # Big-endian, as on disk
+        
+        class DoubleFCS:
+            def __init__(self, path, read_data):
+                self.annotation = {'$DATATYPE': 'D', '$DATE': '19-FEB-2025'}
+                self.data = events
+            
+            def reformat_meta(self):
+                pass
+            
+            def get_channel_names(self):
+                return ['FSC-H', 'SSC-H']
+        
+        monkeypatch.setattr(fcs_parser, '_FCSFile', DoubleFCS)
+        
+        table = FCSParser(Path("P5_F10_CD81.fcs")).parse_arrow()
+        assert table.schema.field('FSC-H').type == 'double'
+        np.testing.assert_array_equal(table.column('SSC-H').to_numpy(), events[:, 1])
+        
+        table = FCSParser(Path("P5_F10_CD81.fcs")).parse_arrow(dtype=np.float32)
+        assert table.schema.field('FSC-H').type == 'float'
+    
+    @pytest.mark.skipif(not SAMPLE_FCS.exists(), reason="sample FCS file not available")
+    def test_parse_arrow_matches_parse(self, tmp_path):
+        """Arrow-native parsing yields the same events, stats and QC as parse()."""
+        pandas_parser = FCSParser(SAMPLE_FCS)
+        df = pandas_parser.parse()
+        
+        arrow_parser = FCSParser(SAMPLE_FCS)
+        table = arrow_parser.parse_arrow()
+        
+        assert arrow_parser.data is None
+        assert table.num_rows == len(df)
+        assert arrow_parser.channel_names == pandas_parser.channel_names
+        
+        channel = arrow_parser.channel_names[0]
+        np.testing.assert_array_equal(arrow_parser.column_values(channel), df[channel].to_numpy())
+        
+        arrow_stats = arrow_parser.get_statistics()[channel]
+        assert arrow_stats['mean'] == pytest.approx(df[channel].mean(), rel=1e-5)
+        assert arrow_stats['skewness'] == pytest.approx(df[channel].skew(), rel=1e-4)
+        assert arrow_parser.validate_quality() == pandas_parser.validate_quality()
+        
+        # Persist without pandas conversion
+        arrow_parser.to_parquet(tmp_path / "events.parquet")
+        assert arrow_parser.data is None
+        assert len(pd.read_parquet(tmp_path / "events.parquet")) == len(df)
+        
+        # Record batches are bounded by chunk_size
+        batches = list(arrow_parser.iter_record_batches(batch_size=5000))
+        assert sum(b.num_rows for b in batches) == len(df)
+        assert max(b.num_rows for b in batches) <= 5000
 
 
 class TestNTAParser:
@@ -0,0 +1,92 @@
+"""
+Progress Reporter Tests
+=======================
+
+Tests for the coalescing job progress reporter in src/worker/progress.py.
+
+Tests:
+- Many reports across jobs are written in one UPDATE transaction, while
+  subscribers receive every report
+- A flush after the final status does not overwrite it; reports for
+  finished jobs are ignored
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import sys
+import uuid
+from pathlib import Path
+import pytest
+from sqlalchemy import event
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.job_events import get_job_event_broker
+from src.database import connection
+from src.database.crud import create_processing_job, get_job_by_id, update_job_status
+from src.worker.progress import ProgressReporter
+
+
+async def _create_jobs(sqlite_db, count):
+    job_ids = [str(uuid.uuid4()) for _ in range(count)]
+    async with sqlite_db() as db:
+        for job_id in job_ids:
+            await create_processing_job(db, job_id=job_id, job_type="fcs_parse")
+    return job_ids
+
+
+@pytest.mark.asyncio
+async def test_reports_coalesced_into_one_write(sqlite_db):
+    first, second = await _create_jobs(sqlite_db, 2)
+    reporter = ProgressReporter(flush_interval_ms=60_000)
+    reporter.track(first)
+    reporter.track(second)
+
+    updates = []
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+    try:
+        async with get_job_event_broker().subscribe(first) as queue:
+            for percent in range(10, 100, 10):
+                reporter.report(first, percent, f"Step {percent}")
+                updates.append(queue.get_nowait()["progress_percent"])
+            reporter.report(second, 50)
+            assert statements == []
+            await reporter.close()
+    finally:
+        event.remove(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+
+    assert updates == list(range(10, 100, 10))
+    assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+    assert reporter.stats() == {"progress_reports": 10, "progress_writes": 1}
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, first)
+        other = await get_job_by_id(db, second)
+    assert (job.status, job.progress_percent, job.current_step) == ("running", 90, "Step 90")
+    assert job.started_at is not None
+    assert (other.status, other.progress_percent) == ("running", 50)
+
+
+@pytest.mark.asyncio
+async def test_flush_never_overwrites_final_status(sqlite_db):
+    (job_id,) = await _create_jobs(sqlite_db, 1)
+    reporter = ProgressReporter(flush_interval_ms=60_000)
+    reporter.track(job_id)
+    reporter.report(job_id, 40, "Parsing")
+
+    async with sqlite_db() as db:
+        await update_job_status(db, job_id, "failed", error_message="boom")
+    assert await reporter.flush() == 1
+
+    await reporter.finish(job_id)
+    reporter.report(job_id, 80, "Late")
+    assert await reporter.flush() == 0
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_id)
+    assert job.status == "failed"
+    assert job.current_step != "Late"
@@ -0,0 +1,132 @@
+"""
+Query Count Benchmarks
+======================
+
+Listing endpoints must issue a constant number of SQL statements no
+matter how many rows a page contains (no N+1 lookups).
+
+Tests:
+- GET /jobs query count is flat for limit 10 → 1000
+- GET /samples/{id}, /fcs and /nta use a fixed number of queries
+- Status counters use one GROUP BY and are cached until a state change
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import json
+import sys
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+import pytest
+from sqlalchemy import event
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.routers import jobs, samples
+from src.database import connection
+from src.database.crud import get_job_counts, get_sample_counts, update_job_status
+from src.database.models import FCSResult, NTAResult, ProcessingJob, Sample
+
+ROWS = 1000
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed on the global engine."""
+    statements = []
+    engine = connection.get_engine().sync_engine
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+
+async def _populate(factory) -> None:
+    """ROWS samples with one job each; the first sample gets ROWS results."""
+    async with factory() as db:
+        db.add_all(
+            Sample(sample_id=f"S{i:04d}", biological_sample_id=f"S{i:04d}", treatment="CD81")
+            for i in range(ROWS)
+        )
+        await db.flush()
+        db.add_all(
+            ProcessingJob(job_id=str(uuid.uuid4()), job_type="fcs_parse", status="completed", sample_id=i + 1)
+            for i in range(ROWS)
+        )
+        db.add_all(FCSResult(sample_id=1, total_events=i, parquet_file_path=f"{i}.parquet") for i in range(ROWS))
+        db.add_all(NTAResult(sample_id=1, mean_size_nm=float(i), median_size_nm=float(i), parquet_file_path=f"{i}.parquet") for i in range(ROWS))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_query_count_is_flat(sqlite_db):
+    """Listing 10, 100 or 1000 jobs takes the same number of queries."""
+    await _populate(sqlite_db)
+
+    counts = {}
+    for limit in (10, 100, ROWS):
+        async with sqlite_db() as db:
+            with count_queries() as statements:
+                page = await jobs.list_jobs(skip=0, limit=limit, status_filter=None, job_type="fcs_parse",
+                                            cursor=None, include_total=True, db=db)
+        assert len(page["jobs"]) == limit
+        assert page["total"] == ROWS
+        assert all(job["sample_id"] for job in page["jobs"])
+        counts[limit] = len(statements)
+
+    assert counts[10] == counts[100] == counts[ROWS] == 2  # COUNT + page
+
+
+@pytest.mark.asyncio
+async def test_sample_endpoints_query_count(sqlite_db):
+    """Sample detail and result endpoints do not query per result row."""
+    await _populate(sqlite_db)
+
+    async with sqlite_db() as db:
+        with count_queries() as statements:
+            detail = json.loads((await samples.get_sample(sample_id="S0000", if_none_match=None, db=db)).body)
+        assert detail["results"]["fcs_count"] == ROWS
+        assert len(statements) == 1
+
+        with count_queries() as statements:
+            fcs = json.loads((await samples.get_fcs_results(sample_id="S0000", accept=None,
+                                                            if_none_match=None, db=db)).body)
+            nta = json.loads((await samples.get_nta_results(sample_id="S0000", accept=None,
+                                                            if_none_match=None, db=db)).body)
+        assert len(fcs["results"]) == len(nta["results"]) == ROWS
+        assert len(statements) == 4  # Sample + selectin load, per endpoint
+
+
+@pytest.mark.asyncio
+async def test_status_counts_grouped_and_cached(sqlite_db):
+    """Counters take one query each, then come from cache until a job changes."""
+    await _populate(sqlite_db)
+
+    async with sqlite_db() as db:
+        with count_queries() as statements:
+            sample_counts = await get_sample_counts(db)
+            job_counts = await get_job_counts(db)
+        assert len(statements) == 2
+        assert sample_counts["total"] == sample_counts["pending"] == ROWS
+        assert job_counts["total"] == job_counts["completed"] == ROWS
+
+        with count_queries() as statements:
+            assert await get_job_counts(db) == job_counts
+        assert statements == []
+
+        page = await jobs.list_jobs(skip=0, limit=1, status_filter=None, job_type=None,
+                                    cursor=None, include_total=False, db=db)
+        await update_job_status(db, page["jobs"][0]["job_id"], "failed")
+        with count_queries() as statements:
+            job_counts = await get_job_counts(db)
+        assert len(statements) == 1
+        assert job_counts["failed"] == 1
+        assert job_counts["completed"] == ROWS - 1
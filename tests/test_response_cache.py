@@ -0,0 +1,126 @@
+"""
+Response Cache Tests
+====================
+
+Tests for the versioned response cache in src/api/response_cache.py and
+its use by the sample endpoints.
+
+Tests:
+- The local backend evicts least recently used entries past its byte
+  bound and expires entries after their TTL
+- Sample versions are dropped once no entry cached under an older
+  version can still be served, and are never reused; a body built while
+  its sample was invalidated is not cached
+- Repeated requests are served without queries; If-None-Match gets 304
+- Sample updates and new results invalidate the cached responses
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import json
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy import event
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api import response_cache
+from src.api.response_cache import LocalCacheBackend
+from src.api.routers import samples
+from src.database import connection
+from src.database.crud import create_fcs_result, create_sample, update_sample
+
+
+@pytest.mark.asyncio
+async def test_local_backend_bounds():
+    backend = LocalCacheBackend(max_bytes=10)
+    await backend.set("a", b"1234", ttl_seconds=60)
+    await backend.set("b", b"1234", ttl_seconds=60)
+    assert await backend.get("a") == b"1234"  # a is now most recent
+    await backend.set("c", b"1234", ttl_seconds=60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1234"
+    assert backend.stats()["bytes"] == 8
+
+    await backend.set("d", b"xy", ttl_seconds=-1)
+    assert await backend.get("d") is None
+    assert await backend.incr_version("s") == 1 and await backend.get_version("s") == 1
+
+
+@pytest.mark.asyncio
+async def test_local_backend_versions_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    backend = LocalCacheBackend(max_bytes=100)
+    await backend.set("fcs:S1:v0", b"old", ttl_seconds=60)
+    first = await backend.incr_version("sample:S1")
+    await backend.set(f"fcs:S1:v{first}", b"new", ttl_seconds=60)
+
+    now[0] += 61  # Every entry cached before the version changed has expired
+    assert await backend.get_version("sample:S1") == 0
+    assert backend.stats()["versions"] == 0
+    assert await backend.get("fcs:S1:v0") is None
+    assert await backend.incr_version("sample:S1") == first + 1  # Dropped versions are not reused
+
+
+@pytest.mark.asyncio
+async def test_body_invalidated_during_build_not_cached(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = response_cache.ResponseCache(LocalCacheBackend(max_bytes=1000), ttl_seconds=60)
+    await cache.get_or_build("meta", "S1", _payload("warm-up"))  # Versions outlive 60s entries
+
+    async def build_then_write():
+        await cache.invalidate("S1")  # A write commits while the old state is being built
+        now[0] += 30  # ...and the build finishes later
+        return {"state": "before write"}
+
+    await cache.get_or_build("fcs", "S1", build_then_write)
+    now[0] += 31  # The version expires; S1 reads version 0 again
+    body, _ = await cache.get_or_build("fcs", "S1", _payload("after write"))
+
+    assert json.loads(body) == {"state": "after write"}
+
+
+def _payload(state):
+    async def build():
+        return {"state": state}
+    return build
+
+
+@pytest.mark.asyncio
+async def test_sample_responses_cached_and_invalidated(sqlite_db):
+    async with sqlite_db() as db:
+        sample = await create_sample(db, sample_id="RC1", treatment="CD81")
+
+    queries = []
+    listener = lambda *args: queries.append(args[2])  # noqa: E731
+    event.listen(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+    try:
+        async with sqlite_db() as db:
+            first = await samples.get_sample(sample_id="RC1", if_none_match=None, db=db)
+            queries.clear()
+            second = await samples.get_sample(sample_id="RC1", if_none_match=None, db=db)
+            not_modified = await samples.get_sample(sample_id="RC1", if_none_match=first.headers["etag"], db=db)
+        assert queries == []
+    finally:
+        event.remove(connection.get_engine().sync_engine, "before_cursor_execute", listener)
+
+    assert second.body == first.body
+    assert not_modified.status_code == 304 and not_modified.body == b""
+
+    async with sqlite_db() as db:
+        await update_sample(db, "RC1", treatment="CD63")
+        await create_fcs_result(db, sample_id=sample.id, total_events=10, parquet_file_path="x.parquet")
+        updated = await samples.get_sample(sample_id="RC1", if_none_match=first.headers["etag"], db=db)
+        fcs = await samples.get_fcs_results(sample_id="RC1", accept=None, if_none_match=None, db=db)
+
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != first.headers["etag"]
+    details = json.loads(updated.body)
+    assert details["treatment"] == "CD63" and details["results"]["fcs_count"] == 1
+    assert len(json.loads(fcs.body)["results"]) == 1
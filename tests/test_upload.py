@@ -0,0 +1,235 @@
+"""
+Upload Tests
+============
+
+Tests for the upload helpers and endpoints in src/api/routers/upload.py.
+
+Tests:
+- Uploads are written in chunks with size and SHA-256 computed on the fly
+- Oversized uploads are rejected with 413 and leave no file behind
+- Batch uploads queue every valid file and report per-file outcomes
+- Batch files over the per-file budget fail without being saved or queued
+- Re-uploaded content reuses the stored file, and once processed its
+  results, without queueing another job
+- Resumable upload sessions accept ranges in any order, report missing
+  ranges after an interrupted PUT, and verify the SHA-256 on finalize
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import hashlib
+import io
+import sys
+from pathlib import Path
+import pytest
+from fastapi import HTTPException, Request, UploadFile
+from sqlalchemy import select
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.routers import upload
+from src.database.crud import create_fcs_result, set_blob_results
+from src.database.models import FCSResult, FileBlob, ProcessingJob, Sample
+
+
+@pytest.mark.asyncio
+async def test_save_uploaded_file_streams_and_hashes(tmp_path, monkeypatch):
+    """Content is copied intact and hashed while it is written."""
+    monkeypatch.setattr(upload.settings, "upload_chunk_size_kb", 1)
+    content = bytes(range(256)) * 40  # 10 KB → several chunks
+    destination = tmp_path / "uploads" / "sample.fcs"
+
+    saved = await upload.save_uploaded_file(UploadFile(io.BytesIO(content), filename="sample.fcs"), destination)
+
+    assert saved.path == destination
+    assert destination.read_bytes() == content
+    assert saved.size_bytes == len(content)
+    assert saved.sha256 == hashlib.sha256(content).hexdigest()
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_rejected(tmp_path, monkeypatch):
+    """Uploads over max_upload_size_mb fail with 413 and no partial file."""
+    monkeypatch.setattr(upload.settings, "max_upload_size_mb", 1)
+    monkeypatch.setattr(upload.settings, "upload_chunk_size_kb", 256)
+    content = b"\0" * (1024 * 1024 + 1)
+    destination = tmp_path / "big.fcs"
+
+    with pytest.raises(HTTPException) as excinfo:
+        await upload.save_uploaded_file(UploadFile(io.BytesIO(content), filename="big.fcs"), destination)
+
+    assert excinfo.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_queues_all_files(sqlite_db, tmp_path, monkeypatch):
+    """Batch uploads queue one job per valid file and report failures per file."""
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    monkeypatch.setattr(upload.settings, "batch_upload_concurrency", 2)
+    files = [
+        UploadFile(io.BytesIO(b"FCS3.1 a"), filename="P1_CD81.fcs"),
+        UploadFile(io.BytesIO(b"FCS3.1 b"), filename="P2_CD9.fcs"),
+        UploadFile(io.BytesIO(b"size data"), filename="P1_CD81.txt"),
+        UploadFile(io.BytesIO(b"image"), filename="grid.png"),
+    ]
+
+    result = await upload.upload_batch(files=files)
+
+    assert result["uploaded"] == 3
+    assert result["failed"] == 1
+    assert [d["filename"] for d in result["details"]] == [f.filename for f in files]
+    assert result["details"][3]["status"] == "failed"
+    assert len(set(result["job_ids"])) == 3
+
+    async with sqlite_db() as db:
+        jobs = (await db.execute(select(ProcessingJob))).scalars().all()
+        samples = (await db.execute(select(Sample))).scalars().all()
+    assert {job.job_id for job in jobs} == set(result["job_ids"])
+    assert all(job.status == "pending" for job in jobs)
+    assert all(Path(job.parameters["file_path"]).exists() for job in jobs)
+    assert sorted(s.sample_id for s in samples) == ["P1_CD81", "P2_CD9"]
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_rejects_files_over_budget(sqlite_db, tmp_path, monkeypatch):
+    """Files above batch_upload_max_file_mb are reported failed; the rest are queued."""
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    monkeypatch.setattr(upload.settings, "batch_upload_max_file_mb", 1)
+    files = [
+        UploadFile(io.BytesIO(b"FCS3.1 small"), filename="P1_CD81.fcs"),
+        UploadFile(io.BytesIO(b"\0" * (1024 * 1024 + 1)), filename="P2_CD9.fcs"),
+    ]
+
+    result = await upload.upload_batch(files=files)
+
+    assert (result["uploaded"], result["failed"]) == (1, 1)
+    assert result["details"][1]["status"] == "failed"
+    assert "1MB" in result["details"][1]["error"]
+    async with sqlite_db() as db:
+        samples = (await db.execute(select(Sample))).scalars().all()
+        jobs = (await db.execute(select(ProcessingJob))).scalars().all()
+    assert [s.sample_id for s in samples] == ["P1_CD81"] and len(jobs) == 1
+    assert len(list((tmp_path / "uploads").iterdir())) == 1
+
+
+async def _upload_fcs(db, content, filename):
+    return await upload.upload_fcs_file(
+        file=UploadFile(io.BytesIO(content), filename=filename), treatment=None, concentration_ug=None,
+        preparation_method=None, operator=None, notes=None, db=db,
+    )
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_file_and_results(sqlite_db, tmp_path, monkeypatch):
+    """Known content is stored once; processed content is linked, not parsed again."""
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    content = b"FCS3.1 plate 7"
+
+    async with sqlite_db() as db:
+        first = await _upload_fcs(db, content, "P7_CD81.fcs")
+        pending_copy = await _upload_fcs(db, content, "P7_CD81_again.fcs")
+    assert not first["deduplicated"] and not pending_copy["deduplicated"]
+    assert pending_copy["job_id"] != first["job_id"]  # Not processed yet: parsed again, same stored file
+    assert len(list((tmp_path / "uploads").iterdir())) == 1
+
+    async with sqlite_db() as db:
+        job = (await db.execute(select(ProcessingJob).where(ProcessingJob.job_id == first["job_id"]))).scalar_one()
+        result = await create_fcs_result(db, sample_id=job.sample_id, total_events=42, parquet_file_path="p7.parquet")
+        await set_blob_results(db, job.parameters["file_path"], fcs_result_id=result.id)
+
+        linked = await _upload_fcs(db, content, "P7_resubmitted.fcs")
+        sample = (await db.execute(select(Sample).where(Sample.sample_id == "P7_resubmitted"))).scalar_one()
+        results = (await db.execute(select(FCSResult).where(FCSResult.sample_id == sample.id))).scalars().all()
+        blob = (await db.execute(select(FileBlob))).scalar_one()
+        job_count = len((await db.execute(select(ProcessingJob))).scalars().all())
+
+    assert linked["deduplicated"] and linked["processing_status"] == "completed"
+    assert linked["job_id"] == first["job_id"]
+    assert [(r.total_events, r.parquet_file_path) for r in results] == [(42, "p7.parquet")]
+    assert sample.processing_status == "completed"
+    assert sample.file_path_fcs == upload.stored_path(Path(blob.storage_path))
+    assert blob.upload_count == 3 and job_count == 2
+    assert len(list((tmp_path / "uploads").iterdir())) == 1
+
+
+def _range_request(body: bytes) -> Request:
+    """PUT request whose body is streamed in two parts."""
+    parts = [body[:len(body) // 2], body[len(body) // 2:]]
+
+    async def receive():
+        return {"type": "http.request", "body": parts.pop(0), "more_body": bool(parts)}
+
+    return Request({"type": "http", "method": "PUT", "headers": []}, receive)
+
+
+async def _put_range(upload_id, content, start, end, body=None):
+    return await upload.upload_session_range(
+        upload_id=upload_id,
+        request=_range_request(content[start:end + 1] if body is None else body),
+        content_range=f"bytes {start}-{end}/{len(content)}",
+        x_content_sha256=None,
+    )
+
+
+async def _create_session(content, filename, sha256=None):
+    return await upload.create_upload_session(
+        filename=filename, size_bytes=len(content), sha256=sha256 or hashlib.sha256(content).hexdigest(),
+        treatment="CD81", concentration_ug=None, preparation_method=None, temperature_celsius=None,
+        operator=None, notes=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_session_resumes_and_finalizes(sqlite_db, tmp_path, monkeypatch):
+    """Ranges arrive out of order; a cut-off PUT is reported missing and resent."""
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    monkeypatch.setattr(upload.settings, "upload_chunk_size_kb", 1)
+    content = bytes(range(256)) * 48  # 12 KB in 4 KB ranges
+    session = await _create_session(content, "P9_CD81.fcs")
+    upload_id = session["upload_id"]
+
+    await _put_range(upload_id, content, 8192, 12287)
+    await _put_range(upload_id, content, 0, 4095)
+    with pytest.raises(HTTPException) as excinfo:
+        await _put_range(upload_id, content, 4096, 8191, body=content[4096:6000])  # Connection dropped
+    assert excinfo.value.status_code == 400
+
+    progress = await upload.get_upload_session(upload_id)
+    assert progress["missing"] == [[4096, 8191]] and progress["received_bytes"] == 8192
+    with pytest.raises(HTTPException) as excinfo:
+        async with sqlite_db() as db:
+            await upload.finalize_upload_session(upload_id=upload_id, db=db)
+    assert excinfo.value.status_code == 409
+
+    await _put_range(upload_id, content, 4096, 8191)
+    async with sqlite_db() as db:
+        result = await upload.finalize_upload_session(upload_id=upload_id, db=db)
+        job = (await db.execute(select(ProcessingJob))).scalar_one()
+        sample = (await db.execute(select(Sample))).scalar_one()
+
+    stored = Path(job.parameters["file_path"])
+    assert result["job_id"] == job.job_id and result["content_sha256"] == hashlib.sha256(content).hexdigest()
+    assert stored.read_bytes() == content
+    assert (sample.sample_id, sample.treatment) == ("P9_CD81", "CD81")
+    assert list((tmp_path / "uploads" / ".sessions").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_session_rejects_checksum_mismatch(sqlite_db, tmp_path, monkeypatch):
+    """A file that does not match its declared SHA-256 is discarded with 422."""
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    content = b"NTA size distribution" * 10
+    session = await _create_session(content, "P9.txt", sha256=hashlib.sha256(b"other").hexdigest())
+    await _put_range(session["upload_id"], content, 0, len(content) - 1)
+
+    with pytest.raises(HTTPException) as excinfo:
+        async with sqlite_db() as db:
+            await upload.finalize_upload_session(upload_id=session["upload_id"], db=db)
+
+    assert excinfo.value.status_code == 422
+    assert [p.name for p in (tmp_path / "uploads").iterdir()] == [".sessions"]
+    assert list((tmp_path / "uploads" / ".sessions").iterdir()) == []
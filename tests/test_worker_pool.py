@@ -0,0 +1,188 @@
+"""
+Worker Pool Tests
+=================
+
+Tests for the out-of-event-loop processing pool in src/worker.
+
+Tests:
+- FCS job runs parse → size → stats → Parquet and saves results
+- Event statistics gate marker positivity, debris and doublets; NTA
+  concentrations carry a counting error
+- Per-job timeout marks the job failed
+- A result save that fails marks the job failed and leaves no results
+- Unsupported job types are rejected
+
+Author: CRMIT Backend Team
+Date: November 21, 2025
+"""
+
+import shutil
+import sys
+import uuid
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.crud import create_processing_job, get_job_by_id
+from src.database.models import FCSResult, Sample
+from src.worker.pool import ProcessingPool
+from src.worker.tasks import fcs_event_summary, size_distribution_summary, stain_channels
+
+SAMPLE_FCS = Path(__file__).parent.parent / "nanoFACS" / "EXP 6-10-2025" / "water.fcs"
+
+
+async def _create_job(factory, sample_id: str) -> tuple:
+    """Create a sample and a pending fcs_parse job."""
+    async with factory() as db:
+        sample = Sample(sample_id=sample_id, biological_sample_id=sample_id, treatment="Control")
+        db.add(sample)
+        await db.commit()
+        job_id = str(uuid.uuid4())
+        await create_processing_job(db, job_id=job_id, job_type="fcs_parse", sample_id=sample.id)
+        return sample.id, job_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not SAMPLE_FCS.exists(), reason="Sample FCS file not available")
+async def test_fcs_job_completes(sqlite_db, tmp_path):
+    """A submitted FCS job saves an FCSResult and marks the job completed."""
+    file_path = tmp_path / "water.fcs"
+    shutil.copy(SAMPLE_FCS, file_path)
+    sample_db_id, job_id = await _create_job(sqlite_db, "water")
+
+    pool = ProcessingPool(max_workers=1, task_timeout_seconds=120)
+    pool.start()
+    try:
+        await pool.submit(job_id, "fcs_parse", file_path, "water", sample_db_id)
+    finally:
+        await pool.shutdown()
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_id)
+        result = (await db.execute(select(FCSResult))).scalar_one()
+        sample = (await db.execute(select(Sample))).scalar_one()
+
+    assert job.status == "completed"
+    assert job.progress_percent == 100
+    assert job.started_at is not None
+    assert job.result_data["event_count"] == result.total_events > 0
+    assert result.fsc_mean is not None and result.ssc_cv is not None
+    assert result.debris_pct is not None and result.doublets_pct is not None
+    assert "B531-H" in result.fluorescence_stats
+    assert Path(result.parquet_file_path).exists()
+    assert sample.processing_status == "completed"
+    assert pool.stats()["completed_jobs"] == 1
+
+
+def test_event_summary_gates_markers_debris_and_doublets():
+    """Positive, debris and doublet fractions come from one set of event arrays."""
+    rng = np.random.default_rng(7)
+    n = 10_000
+    fsc = rng.normal(1000, 50, n)
+    fsc[:500] = 0  # Debris: no forward scatter
+    area = fsc * 1.2
+    area[500:800] *= 2  # Doublets: twice the area for the same height
+    stained = rng.normal(100, 10, n)
+    stained[:2000] += 1000  # 20 % stained events
+    columns = {
+        "VFSC-H": fsc, "VFSC-A": area, "VSSC1-H": rng.normal(500, 20, n),
+        "B531-H": stained, "R670-H": rng.normal(100, 10, n), "Time": np.arange(n, dtype=float),
+    }
+    channels = list(columns)
+
+    stains = stain_channels(channels, "P5_F10_CD81")
+    summary = fcs_event_summary(columns.__getitem__, channels, stains=stains)
+
+    assert stains == {"CD81": "B531-H"}
+    assert summary["cd81_positive_pct"] == pytest.approx(20, abs=0.5)
+    assert "cd9_positive_pct" not in summary
+    assert summary["fluorescence_stats"]["R670-H"]["positive_pct"] < 1
+    assert set(summary["fluorescence_stats"]) == {"B531-H", "R670-H"}
+    assert summary["debris_pct"] == pytest.approx(5)
+    assert summary["doublets_pct"] == pytest.approx(300 / 9500 * 100, abs=0.2)
+    assert summary["fsc_median"] == pytest.approx(1000, rel=0.05)
+
+
+def test_nta_concentration_error():
+    """Concentration error is the Poisson error of the tracked particle count."""
+    data = pd.DataFrame({
+        "size_nm": [50.0, 100.0, 150.0],
+        "concentration_particles_ml": [1e9, 2e9, 1e9],
+        "particle_count": [25, 50, 25],
+    })
+
+    summary = size_distribution_summary(data)
+
+    assert summary["concentration_particles_ml"] == 4e9
+    assert summary["concentration_particles_ml_error"] == pytest.approx(4e8)
+
+
+@pytest.mark.asyncio
+async def test_failed_result_save_marks_job_failed(sqlite_db, tmp_path, monkeypatch):
+    """Results are saved with the job status in one transaction, or not at all."""
+    sample_db_id, job_id = await _create_job(sqlite_db, "unsaved")
+
+    async def execute(*args):
+        return {
+            "result_data": {"event_count": 3},
+            "fcs_result": {"total_events": 3, "parquet_file_path": "unsaved.parquet"},
+            "nta_result": {"no_such_column": 1.0},  # Fails after the FCS row was added
+        }
+
+    pool = ProcessingPool(max_workers=1)
+    pool.start()
+    monkeypatch.setattr(pool, "_execute", execute)
+    try:
+        await pool.submit(job_id, "fcs_parse", tmp_path / "unsaved.fcs", "unsaved", sample_db_id)
+    finally:
+        await pool.shutdown()
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_id)
+        results = (await db.execute(select(FCSResult))).scalars().all()
+        sample = (await db.execute(select(Sample))).scalar_one()
+
+    assert job.status == "failed"
+    assert job.error_message.startswith("Could not save results")
+    assert results == []
+    assert sample.processing_status == "failed"
+    assert pool.stats()["completed_jobs"] == 0 and pool.stats()["failed_jobs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_marks_job_failed(sqlite_db, tmp_path):
+    """A job exceeding the time limit is failed and the pool keeps working."""
+    file_path = tmp_path / "missing.fcs"
+    sample_db_id, job_id = await _create_job(sqlite_db, "slow")
+
+    pool = ProcessingPool(max_workers=1, task_timeout_seconds=0.01)
+    pool.start()
+    try:
+        await pool.submit(job_id, "fcs_parse", file_path, "slow", sample_db_id)
+        assert pool.running
+    finally:
+        await pool.shutdown()
+
+    async with sqlite_db() as db:
+        job = await get_job_by_id(db, job_id)
+    assert job.status == "failed"
+    assert "timed out" in job.error_message
+    assert pool.stats()["failed_jobs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unsupported_job_type():
+    """Unknown job types are rejected before anything is scheduled."""
+    pool = ProcessingPool(max_workers=1)
+    with pytest.raises(ValueError):
+        pool.submit("job", "tem_parse", Path("x.tif"), "S1")
+    assert not pool.running
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])